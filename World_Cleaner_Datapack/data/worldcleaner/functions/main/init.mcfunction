@@ -1 +1,3 @@
 # Setup Data Tracking
+# Through A Tag, So The Pack Still Loads (And Does Nothing) Before remove_markers_2.py Has Written A Plan
+function #worldcleaner:plan/start
\ No newline at end of file
@@ -1 +1,2 @@
-kill @e[type=marker]
\ No newline at end of file
+# Runs The Next Step Of The Plan Written By remove_markers_2.py, Once The Last One Is Done
+execute if data storage cleanup:marker {state: "ready"} run function #worldcleaner:plan/next
\ No newline at end of file
@@ -1,10 +1,22 @@
+import argparse
 import os
 import sys
-import uuid
-from typing import List, Optional
+from typing import List, Optional, Tuple
 
 import nbt
-from nbt.world import WorldFolder
+
+from palette_index import ChunkSummary
+from projected_nbt import get_string_pattern, is_full_status
+from scan_cache import get_default_cache_path
+from scan_checkpoint import ScanCheckpoint, open_checkpoint
+from scan_engine import ChunkContext, ChunkVisitor, ProjectionPath, RegionTask, get_region_tasks, iter_scan, print_skipped_chunks
+from scan_profile import ScanProfiler, default_top, open_profiler, profile_modes
+from scan_stats import ScanStats, default_stats_file_name, open_stats
+
+barrier_block_id: str = "minecraft:barrier"
+
+# If This Isn't Anywhere In The Decompressed Chunk, No Palette Can Contain A Barrier
+barrier_pattern: bytes = get_string_pattern(value=barrier_block_id)
 
 
 def check_blocks(chunk: nbt.chunk, dimension: str):
@@ -31,89 +43,115 @@ def check_blocks(chunk: nbt.chunk, dimension: str):
     # print(f"Dimension: %s - Chunk (%s, %s)" % (dimension, x_pos, z_pos))
 
     # If Not full, chunk is not fully generated yet and can be ignored for illegal item searching
-    if chunk_status is not None and chunk_status.value.strip() != "full":
+    if chunk_status is not None and not is_full_status(status=chunk_status.value):
         return
 
-    has_barriers: bool = False
     for section in chunk_data["Sections"]:
         if "Palette" in section:
             palette = section["Palette"]
             for state in palette:
                 # print(state["Name"])
 
-                if state["Name"].value == "minecraft:barrier":
-                    has_barriers: bool = True
+                # One Barrier Is Enough To Answer The Question
+                if state["Name"].value == barrier_block_id:
+                    return True
 
     # print("Has Barrier Blocks: %s" % has_barriers)
-    return has_barriers
+    return False
 
 
-def main_single_player(world_folder: str):
-    # TODO: Scan Player Inventories And Ender Chests
+class BarrierVisitor(ChunkVisitor):
+    # Results Are (Has Barrier, Failure Message) For Each Chunk
+    name: str = "barrier_scanner"
+
+    # Only The Tags Read By check_blocks(...) Get Decoded, The BlockStates Arrays Are Skipped
+    # Barriers Are Blocks, So 1.17+ Entity Regions Are Never Opened
+    terrain_paths: List[ProjectionPath] = [
+        ("DataVersion",),
+        ("Level", "Status"),
+        ("Level", "xPos"),
+        ("Level", "zPos"),
+        ("Level", "Sections", "Palette")
+    ]
+
+    def full_chunks_only(self, task: RegionTask) -> bool:
+        # check_blocks(...) Ignores Chunks That Aren't Fully Generated
+        return True
+
+    def index_filter(self, summary: ChunkSummary) -> bool:
+        return barrier_block_id in summary.blocks
+
+    def prefilter(self, chunk_bytes: bytes) -> bool:
+        # Most Chunks Have No Barriers, So Only Parse The Ones Whose Raw Bytes Mention One
+        return barrier_pattern in chunk_bytes
+
+    def empty_result(self, context: ChunkContext) -> Tuple[bool, str]:
+        return False, ""
+
+    def visit(self, chunk: nbt.nbt.NBTFile, context: ChunkContext) -> Tuple[bool, str]:
+        return check_blocks(chunk=chunk, dimension=context.dimension) is True, ""
 
-    nether_path: str = os.path.join(world_folder, "DIM-1")
-    overworld_path: str = world_folder
-    the_end_path: str = os.path.join(world_folder, "DIM1")
-    custom_dimensions_path: str = os.path.join(world_folder, "dimensions")
+    def error(self, context: ChunkContext, error: Exception) -> Tuple[bool, str]:
+        lines: List[str] = [
+            "Failed To Read Chunk (%s, %s) Due To Invalid Data!!!" % (context.x, context.z),
+            "-" * 40,
+            "Trace: %s" % error,
+            "-" * 40
+        ]
+        return False, "\n".join(lines) + "\n"
 
-    dimensions_to_scan: List[str] = [overworld_path]
+    def is_empty(self, result: Tuple[bool, str]) -> bool:
+        return not result[0] and result[1] == ""
 
-    # If The Nether Exists, Add To The Scan List
-    if os.path.exists(nether_path):
-        dimensions_to_scan.append(nether_path)
+    def is_final(self, result: Tuple[bool, str]) -> bool:
+        # One Barrier Is Enough To Answer The Question
+        return result[0]
 
-    # If The End Exists, Add To The Scan List
-    if os.path.exists(the_end_path):
-        dimensions_to_scan.append(the_end_path)
+    def decode_result(self, value: list) -> Tuple[bool, str]:
+        return value[0], value[1]
 
-    # If Custom Dimensions Exist, Add To The Scan List
-    if os.path.exists(custom_dimensions_path):
-        for namespace in os.listdir(custom_dimensions_path):
-            namespace_path: str = os.path.join(custom_dimensions_path, namespace)
-            if os.path.isfile(namespace_path):
-                continue
 
-            for dimension in os.listdir(namespace_path):
-                dimension_path: str = os.path.join(namespace_path, dimension)
-                if os.path.isfile(dimension_path):
-                    continue
+def get_dimension_path(task: RegionTask) -> str:
+    # Folder Names Can Repeat Across Custom Dimension Namespaces, The Path Can't
+    return os.path.dirname(os.path.dirname(task.region_path))
 
-                # print(dimension_path)
-                dimensions_to_scan.append(dimension_path)
+
+def main_single_player(world_folder: str, workers: int = 1, cache_path: Optional[str] = None, use_index: bool = False, stats: Optional[ScanStats] = None, profiler: Optional[ScanProfiler] = None, checkpoint: Optional[ScanCheckpoint] = None):
+    # TODO: Scan Player Inventories And Ender Chests
+    visitor: BarrierVisitor = BarrierVisitor()
+    region_tasks: List[RegionTask] = [task for task in get_region_tasks(world_folder=world_folder) if visitor.wants_region(task=task)]
+
+    # Dimensions Without Any Region Files Are Skipped (E.g Empty World), Same As Before
+    dimensions: List[str] = []
+    for task in region_tasks:
+        if get_dimension_path(task=task) not in dimensions:
+            dimensions.append(get_dimension_path(task=task))
 
     has_barriers: bool = False
+    printed_dimensions: int = 0
+    skipped_chunks: int = 0
     try:
-        for dimension in dimensions_to_scan:
-            try:
-                world = WorldFolder(dimension)
-            except nbt.world.UnknownWorldFormat:
-                # E.g Empty World
-                continue
-
-            # For Retrieving The Right Dimension Name Regardless Of Trailing Slashes
-            # TODO: Grab Actual In Game Dimension Names (Like With /execute in namespace:dimension_name) When Possible
-            if dimension.endswith("/") or dimension.endswith("\\"):
-                dimension_folder_name: str = os.path.basename(os.path.dirname(dimension))
-            else:
-                dimension_folder_name: str = os.path.basename(dimension)
-
-            for chunk in world.iter_nbt():
-                try:
-                    # Check Block Entities
-                    barriers = check_blocks(chunk=chunk, dimension=dimension_folder_name)
-
-                    if barriers:
-                        has_barriers: bool = True
-                except UnicodeDecodeError as e:
-                    # This won't catch the issue as the issue is in world.iter_nbt(), not check_storages(...)
-                    # hermitcraft6 currently breaks the scanner. Docm77 Alien Tech Books Are To Blame
-                    # TODO: See Bug Report With Patch For Fix: https://github.com/twoolie/NBT/issues/144
-                    print("Failed To Read Chunk (%s, %s) Due To Invalid Data!!!" % ("x", "z"))
-                    print("-" * 40)
-                    print("Trace: %s" % e)
-                    print("-" * 40)
+        for region_result in iter_scan(region_tasks=region_tasks, visitors=[visitor], workers=workers, cache_path=cache_path, stats=stats, profiler=profiler, checkpoint=checkpoint, use_index=use_index):
+            # Every Dimension Before This One Has Been Fully Scanned
+            while dimensions[printed_dimensions] != get_dimension_path(task=region_result.task):
+                print("Has Barrier Blocks: %s" % has_barriers)
+                printed_dimensions += 1
+
+            for _, (chunk_has_barriers, message) in region_result.results[visitor.name]:
+                sys.stdout.write(message)
+                has_barriers: bool = has_barriers or chunk_has_barriers
+
+            skipped_chunks += region_result.skipped_chunks
+
+            # The Answer Is Shared By Every Dimension, So Once A Barrier Is Found The Rest Of The World Can Be Skipped
+            if has_barriers:
+                break
 
+        for _ in dimensions[printed_dimensions:]:
             print("Has Barrier Blocks: %s" % has_barriers)
+
+        # Only Counts The Regions Scanned Before A Barrier Was Found
+        print_skipped_chunks(skipped_chunks=skipped_chunks)
     except KeyboardInterrupt:
         return 3
 
@@ -123,13 +161,45 @@ def main_single_player(world_folder: str):
 # https://www.2b2t.online/wiki/World%20Downloads
 # https://download.scicraft.net/
 if __name__ == "__main__":
-    if len(sys.argv) == 1:
+    parser: argparse.ArgumentParser = argparse.ArgumentParser(description="Checks If A World Has Any Barrier Blocks")
+    parser.add_argument("world_folder", nargs="?", default=None, help="Path To The World Folder")
+    parser.add_argument("--workers", type=int, default=1, help="Number Of Processes To Scan Region Files With")
+    parser.add_argument("--stats", nargs="?", default=None, const="", help="Show Live Progress And Write Throughput And Phase Timings (Optionally Takes A Report File Path, Defaults To %s)" % default_stats_file_name)
+    parser.add_argument("--profile", nargs="?", default=None, const="", help="Profile The Scan Across Worker Processes (Optionally Takes An Output File Path, Defaults To scan_profile.pstats Or scan_profile.folded)")
+    parser.add_argument("--profile-mode", choices=profile_modes, default="cprofile", help="Deterministic cProfile Or Low Overhead Stack Sampling")
+    parser.add_argument("--profile-top", type=int, default=default_top, help="Number Of Functions To Show In The Profile Summary")
+    parser.add_argument("--checkpoint", nargs="?", default=None, const="", help="Save Finished Regions So An Interrupted Scan Can Be Resumed (Optionally Takes A File Path, Defaults To A File In The World Folder)")
+    parser.add_argument("--resume", action="store_true", help="Continue An Interrupted Scan After The Last Region It Finished (Implies --checkpoint)")
+    parser.add_argument("--cache", nargs="?", default=None, const="", help="Reuse Results Of Chunks That Haven't Changed Since The Last Run (Optionally Takes A Cache File Path)")
+    parser.add_argument("--index", action="store_true", help="Keep A Palette Index Next To Each Region File And Only Read Chunks It Says Have A Match")
+    arguments: argparse.Namespace = parser.parse_args()
+
+    if arguments.world_folder is None:
         print("No World Folder Specified!!!")
         sys.exit(1)
 
-    world_folder_path: str = sys.argv[1]
+    world_folder_path: str = arguments.world_folder
     if not os.path.exists(world_folder_path):
         print("World Folder Does Not Exist!!!")
         sys.exit(2)
 
-    sys.exit(main_single_player(world_folder=world_folder_path))
+    # Defaults To A Cache File Inside The World Folder
+    scan_cache_path: Optional[str] = arguments.cache
+    if scan_cache_path == "":
+        scan_cache_path: str = get_default_cache_path(world_folder=world_folder_path)
+
+    scan_stats: Optional[ScanStats] = open_stats(stats_path=arguments.stats)
+    scan_profiler: Optional[ScanProfiler] = open_profiler(profile_path=arguments.profile, mode=arguments.profile_mode, top=arguments.profile_top)
+    scan_checkpoint: Optional[ScanCheckpoint] = open_checkpoint(world_folder=world_folder_path, name="barrier_scanner", checkpoint_path=arguments.checkpoint, resume=arguments.resume)
+    exit_code: Optional[int] = main_single_player(world_folder=world_folder_path, workers=arguments.workers, cache_path=scan_cache_path, use_index=arguments.index, stats=scan_stats, profiler=scan_profiler, checkpoint=scan_checkpoint)
+    if scan_stats is not None:
+        scan_stats.finish()
+
+    if scan_profiler is not None:
+        scan_profiler.finish()
+
+    # Only Kept For --resume When The Scan Was Interrupted
+    if scan_checkpoint is not None:
+        scan_checkpoint.finish(interrupted=exit_code == 3)
+
+    sys.exit(exit_code)
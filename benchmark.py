@@ -0,0 +1,458 @@
+import argparse
+import asyncio
+import os
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from nbt.nbt import NBTFile, TAG_Byte, TAG_Compound, TAG_Double, TAG_Int, TAG_Int_Array, TAG_List, TAG_Long, TAG_Long_Array, TAG_String
+from nbt.region import RegionFile
+
+from fake_rcon_server import FakeRconServer
+from rcon_client import RconPool, default_max_in_flight, pipelined_max_in_flight
+from region_reader import MappedRegionFile
+
+# Writes Synthetic Anvil Worlds And Times The Scripts Against Them, So Speed Can Be Measured Without Downloading Real Worlds
+# Chunks Use The 1.16/1.17 Layout (Everything Under "Level"), As That's What The Scripts Read
+legacy_data_version: int = 2586  # 1.16.5
+split_entities_data_version: int = 2730  # 1.17.1
+
+repository_folder: str = os.path.dirname(os.path.abspath(__file__))
+scripts: List[str] = ["scanner", "barrier_scanner", "item_counter", "block_counter", "remove_markers", "remove_markers_2"]
+
+# Scripts That Rewrite The World (Or Write Next To It) Get A Fresh Copy Each Run
+modifying_scripts: List[str] = ["remove_markers"]
+
+# Stored Items Are Picked From These, A Few Are Enough To Give item_counter Something To Total
+item_ids: List[str] = ["minecraft:dirt", "minecraft:cobblestone", "minecraft:diamond", "minecraft:netherite_ingot", "minecraft:written_book"]
+block_ids: List[str] = ["minecraft:air", "minecraft:stone", "minecraft:dirt", "minecraft:deepslate"]
+sections_per_chunk: int = 4
+
+# Each RCON Connection Runs On Its Own Server Thread, Which Is How Vanilla Takes Several Commands At Once
+default_rcon_connections: int = 4
+
+
+class WorldOptions(NamedTuple):
+    regions: int = 4
+    chunks_per_region: int = 1024
+    # Average Number Of Chests Per Chunk
+    block_entities: float = 2.0
+    # Chances Per Chest Slot, Chunk, Or Chunk Respectively
+    shulker_chance: float = 0.1
+    marker_chance: float = 0.05
+    barrier_chance: float = 0.0
+    # Average Number Of Non-Marker Entities Per Chunk
+    entities: float = 0.5
+    # 1.17+ Worlds Keep Entities In The entities Folder
+    split_entities: bool = True
+    seed: int = 0
+
+
+class BenchmarkResult(NamedTuple):
+    script: str
+    seconds: float
+    chunks: int
+    megabytes: float
+    # Largest Single Process, In Megabytes (None When The Platform Can't Report It)
+    peak_rss: Optional[float]
+    return_code: int
+
+
+def make_item(item_id: str, count: int, slot: int) -> TAG_Compound:
+    item: TAG_Compound = TAG_Compound()
+    item.tags.append(TAG_String(name="id", value=item_id))
+    item.tags.append(TAG_Byte(name="Count", value=count))
+    item.tags.append(TAG_Byte(name="Slot", value=slot))
+    return item
+
+
+def make_shulker_box(slot: int, rnd: random.Random) -> TAG_Compound:
+    shulker_box: TAG_Compound = make_item(item_id="minecraft:shulker_box", count=1, slot=slot)
+
+    contents: TAG_List = TAG_List(name="Items", type=TAG_Compound)
+    for embedded_slot in range(rnd.randint(1, 27)):
+        contents.tags.append(make_item(item_id=rnd.choice(item_ids), count=rnd.randint(1, 64), slot=embedded_slot))
+
+    block_entity_tag: TAG_Compound = TAG_Compound(name="BlockEntityTag")
+    block_entity_tag.tags.append(contents)
+
+    tag: TAG_Compound = TAG_Compound(name="tag")
+    tag.tags.append(block_entity_tag)
+    shulker_box.tags.append(tag)
+    return shulker_box
+
+
+def make_chest(x: int, y: int, z: int, rnd: random.Random, options: WorldOptions) -> TAG_Compound:
+    chest: TAG_Compound = TAG_Compound()
+    chest.tags.append(TAG_String(name="id", value="minecraft:chest"))
+    chest.tags.append(TAG_Int(name="x", value=x))
+    chest.tags.append(TAG_Int(name="y", value=y))
+    chest.tags.append(TAG_Int(name="z", value=z))
+
+    items: TAG_List = TAG_List(name="Items", type=TAG_Compound)
+    for slot in range(rnd.randint(1, 27)):
+        if rnd.random() < options.shulker_chance:
+            items.tags.append(make_shulker_box(slot=slot, rnd=rnd))
+        else:
+            items.tags.append(make_item(item_id=rnd.choice(item_ids), count=rnd.randint(1, 64), slot=slot))
+
+    chest.tags.append(items)
+    return chest
+
+
+def make_uuid(rnd: random.Random) -> TAG_Int_Array:
+    entity_uuid: TAG_Int_Array = TAG_Int_Array(name="UUID")
+    entity_uuid.value = [rnd.randint(-2 ** 31, 2 ** 31 - 1) for _ in range(4)]
+    return entity_uuid
+
+
+def make_position(x: float, y: float, z: float) -> TAG_List:
+    position: TAG_List = TAG_List(name="Pos", type=TAG_Double)
+    position.tags.extend([TAG_Double(value=x), TAG_Double(value=y), TAG_Double(value=z)])
+    return position
+
+
+def make_entity(chunk_x: int, chunk_z: int, marker: bool, rnd: random.Random) -> TAG_Compound:
+    entity: TAG_Compound = TAG_Compound()
+    entity.tags.append(TAG_String(name="id", value="minecraft:marker" if marker else "minecraft:item"))
+    entity.tags.append(make_position(x=(chunk_x << 4) + rnd.random() * 16, y=70.0, z=(chunk_z << 4) + rnd.random() * 16))
+    entity.tags.append(make_uuid(rnd=rnd))
+
+    if marker:
+        # Markers Are Meant For Datapacks To Be Able To Store NBT Data
+        data: TAG_Compound = TAG_Compound(name="data")
+        data.tags.append(TAG_Int(name="id", value=rnd.randint(0, 1000)))
+        entity.tags.append(data)
+    else:
+        item: TAG_Compound = TAG_Compound(name="Item")
+        item.tags.append(TAG_String(name="id", value=rnd.choice(item_ids)))
+        item.tags.append(TAG_Byte(name="Count", value=rnd.randint(1, 64)))
+        entity.tags.append(item)
+
+    return entity
+
+
+def make_entities(chunk_x: int, chunk_z: int, rnd: random.Random, options: WorldOptions) -> TAG_List:
+    entities: TAG_List = TAG_List(name="Entities", type=TAG_Compound)
+    for _ in range(get_count(average=options.entities, rnd=rnd)):
+        entities.tags.append(make_entity(chunk_x=chunk_x, chunk_z=chunk_z, marker=False, rnd=rnd))
+
+    if rnd.random() < options.marker_chance:
+        entities.tags.append(make_entity(chunk_x=chunk_x, chunk_z=chunk_z, marker=True, rnd=rnd))
+
+    return entities
+
+
+def make_section(y: int, barrier: bool, rnd: random.Random) -> TAG_Compound:
+    section: TAG_Compound = TAG_Compound()
+    section.tags.append(TAG_Byte(name="Y", value=y))
+
+    palette: TAG_List = TAG_List(name="Palette", type=TAG_Compound)
+    for block_id in block_ids + (["minecraft:barrier"] if barrier else []):
+        state: TAG_Compound = TAG_Compound()
+        state.tags.append(TAG_String(name="Name", value=block_id))
+        palette.tags.append(state)
+
+    # 1.16+ Layout, 4 Bits Per Block (The Minimum) And 16 Blocks Per Long Without Spanning
+    block_states: TAG_Long_Array = TAG_Long_Array(name="BlockStates")
+    values: List[int] = []
+    for _ in range(4096 // 16):
+        value: int = 0
+        for index in range(16):
+            value |= rnd.randrange(len(palette.tags)) << (index * 4)
+
+        # Stored As Signed Longs
+        values.append(value - (1 << 64) if value >= 1 << 63 else value)
+
+    block_states.value = values
+    section.tags.append(palette)
+    section.tags.append(block_states)
+    return section
+
+
+def get_count(average: float, rnd: random.Random) -> int:
+    # Whole Part Always, Plus One More With The Fractional Part As The Chance
+    count: int = int(average)
+    if rnd.random() < average - count:
+        count += 1
+
+    return count
+
+
+def make_chunk(chunk_x: int, chunk_z: int, sections: List[TAG_Compound], barrier_sections: List[TAG_Compound],
+               rnd: random.Random, options: WorldOptions) -> NBTFile:
+    chunk: NBTFile = NBTFile()
+    chunk.name = ""
+    chunk.tags.append(TAG_Int(name="DataVersion", value=split_entities_data_version if options.split_entities else legacy_data_version))
+
+    level: TAG_Compound = TAG_Compound(name="Level")
+    level.tags.append(TAG_Int(name="xPos", value=chunk_x))
+    level.tags.append(TAG_Int(name="zPos", value=chunk_z))
+    level.tags.append(TAG_String(name="Status", value="full"))
+    level.tags.append(TAG_Long(name="LastUpdate", value=0))
+
+    # Sections Are Shared Between Chunks, As Encoding Them Is Only Needed Once And Scanners Don't Care Which Blocks They Are
+    chunk_sections: TAG_List = TAG_List(name="Sections", type=TAG_Compound)
+    has_barrier: bool = rnd.random() < options.barrier_chance
+    for y in range(sections_per_chunk):
+        chunk_sections.tags.append(barrier_sections[y] if has_barrier and y == 0 else sections[y])
+
+    level.tags.append(chunk_sections)
+
+    block_entities: TAG_List = TAG_List(name="TileEntities", type=TAG_Compound)
+    for _ in range(get_count(average=options.block_entities, rnd=rnd)):
+        block_entities.tags.append(make_chest(x=(chunk_x << 4) + rnd.randrange(16), y=64, z=(chunk_z << 4) + rnd.randrange(16), rnd=rnd, options=options))
+
+    level.tags.append(block_entities)
+
+    if options.split_entities:
+        level.tags.append(TAG_List(name="Entities", type=TAG_Compound))
+    else:
+        level.tags.append(make_entities(chunk_x=chunk_x, chunk_z=chunk_z, rnd=rnd, options=options))
+
+    chunk.tags.append(level)
+    return chunk
+
+
+def make_entity_chunk(chunk_x: int, chunk_z: int, rnd: random.Random, options: WorldOptions) -> NBTFile:
+    chunk: NBTFile = NBTFile()
+    chunk.name = ""
+    chunk.tags.append(TAG_Int(name="DataVersion", value=split_entities_data_version))
+
+    position: TAG_Int_Array = TAG_Int_Array(name="Position")
+    position.value = [chunk_x, chunk_z]
+    chunk.tags.append(position)
+    chunk.tags.append(make_entities(chunk_x=chunk_x, chunk_z=chunk_z, rnd=rnd, options=options))
+    return chunk
+
+
+def write_level(world_folder: str, options: WorldOptions):
+    level: NBTFile = NBTFile()
+    level.name = ""
+
+    data: TAG_Compound = TAG_Compound(name="Data")
+    data.tags.append(TAG_Int(name="DataVersion", value=split_entities_data_version if options.split_entities else legacy_data_version))
+    data.tags.append(TAG_String(name="LevelName", value="Benchmark"))
+    level.tags.append(data)
+    level.write_file(filename=os.path.join(world_folder, "level.dat"))
+
+
+def generate_world(world_folder: str, options: WorldOptions):
+    rnd: random.Random = random.Random(options.seed)
+    region_folder: str = os.path.join(world_folder, "region")
+    entity_folder: str = os.path.join(world_folder, "entities")
+    os.makedirs(region_folder, exist_ok=True)
+    if options.split_entities:
+        os.makedirs(entity_folder, exist_ok=True)
+
+    sections: List[TAG_Compound] = [make_section(y=y, barrier=False, rnd=rnd) for y in range(sections_per_chunk)]
+    barrier_sections: List[TAG_Compound] = [make_section(y=y, barrier=True, rnd=rnd) for y in range(sections_per_chunk)]
+
+    # Regions Are Laid Out In A Square Around The Origin
+    side: int = max(1, int(options.regions ** 0.5 + 0.999))
+    for index in range(options.regions):
+        region_x: int = index % side - side // 2
+        region_z: int = index // side - side // 2
+        region_file_name: str = "r.%s.%s.mca" % (region_x, region_z)
+
+        with open(os.path.join(region_folder, region_file_name), mode="w+b") as f:
+            region: RegionFile = RegionFile(fileobj=f)
+            for chunk_index in range(min(options.chunks_per_region, 1024)):
+                x, z = chunk_index % 32, chunk_index // 32
+                region.write_chunk(x, z, make_chunk(chunk_x=region_x * 32 + x, chunk_z=region_z * 32 + z, sections=sections,
+                                                    barrier_sections=barrier_sections, rnd=rnd, options=options))
+
+        if options.split_entities:
+            with open(os.path.join(entity_folder, region_file_name), mode="w+b") as f:
+                region: RegionFile = RegionFile(fileobj=f)
+                for chunk_index in range(min(options.chunks_per_region, 1024)):
+                    x, z = chunk_index % 32, chunk_index // 32
+                    region.write_chunk(x, z, make_entity_chunk(chunk_x=region_x * 32 + x, chunk_z=region_z * 32 + z, rnd=rnd, options=options))
+
+    write_level(world_folder=world_folder, options=options)
+
+
+def measure_world(world_folder: str) -> Dict[str, float]:
+    # Counts Every Chunk And Byte In The Region Files (Terrain And Entities), Which Is What A Full Scan Reads
+    chunks: int = 0
+    size: int = 0
+    for folder_name in ["region", "entities"]:
+        folder: str = os.path.join(world_folder, folder_name)
+        if not os.path.exists(folder):
+            continue
+
+        for region_file_name in os.listdir(folder):
+            if not region_file_name.endswith(".mca"):
+                continue
+
+            region_path: str = os.path.join(folder, region_file_name)
+            size += os.path.getsize(region_path)
+
+            with MappedRegionFile(filename=region_path) as region:
+                chunks += region.chunk_count()
+
+    return {"chunks": chunks, "megabytes": size / (1024 * 1024)}
+
+
+def run_script(script: str, world_folder: str, working_folder: str, workers: int) -> Dict[str, Optional[float]]:
+    command: List[str] = [sys.executable, os.path.join(repository_folder, "%s.py" % script), world_folder, "--workers", str(workers)]
+
+    started: float = time.perf_counter()
+    process: subprocess.Popen = subprocess.Popen(command, cwd=working_folder, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+    # wait4() Reports The Peak RSS Of This Script Alone (Including Its Worker Processes), Rather Than Every Child So Far
+    peak_rss: Optional[float] = None
+    if hasattr(os, "wait4"):
+        _, status, usage = os.wait4(process.pid, 0)
+        return_code: int = os.waitstatus_to_exitcode(status)
+        process.returncode = return_code
+
+        # Kilobytes On Linux, Bytes On macOS
+        peak_rss: float = usage.ru_maxrss / (1024 * 1024 if sys.platform == "darwin" else 1024)
+    else:
+        return_code: int = process.wait()
+
+    return {"seconds": time.perf_counter() - started, "peak_rss": peak_rss, "return_code": return_code}
+
+
+def benchmark(world_folder: str, selected_scripts: List[str], workers: int = 1, repeat: int = 1) -> List[BenchmarkResult]:
+    world_size: Dict[str, float] = measure_world(world_folder=world_folder)
+    results: List[BenchmarkResult] = []
+
+    with tempfile.TemporaryDirectory() as working_folder:
+        # remove_markers_2.py Writes Its Datapack Function Relative To The Working Directory
+        os.makedirs(os.path.join(working_folder, "World_Cleaner_Datapack", "data", "worldcleaner", "functions", "main"))
+
+        for script in selected_scripts:
+            for _ in range(repeat):
+                target_folder: str = world_folder
+                if script in modifying_scripts:
+                    target_folder: str = os.path.join(working_folder, "world")
+                    shutil.rmtree(target_folder, ignore_errors=True)
+                    shutil.copytree(world_folder, target_folder)
+
+                run: Dict[str, Optional[float]] = run_script(script=script, world_folder=os.path.abspath(target_folder), working_folder=working_folder, workers=workers)
+                results.append(BenchmarkResult(script=script, seconds=run["seconds"], chunks=int(world_size["chunks"]), megabytes=world_size["megabytes"],
+                                               peak_rss=run["peak_rss"], return_code=int(run["return_code"])))
+
+    return results
+
+
+def format_results(results: List[BenchmarkResult]) -> str:
+    lines: List[str] = ["%-18s %10s %14s %10s %14s" % ("Script", "Seconds", "Chunks/Sec", "MB/Sec", "Peak RSS (MB)")]
+    for result in results:
+        peak_rss: str = "n/a" if result.peak_rss is None else "%.1f" % result.peak_rss
+        line: str = "%-18s %10.2f %14.1f %10.2f %14s" % (result.script, result.seconds, result.chunks / result.seconds, result.megabytes / result.seconds, peak_rss)
+        if result.return_code != 0:
+            line += "  (Exited With %s)" % result.return_code
+
+        lines.append(line)
+
+    return "\n".join(lines)
+
+
+def benchmark_rcon(commands: int, connections: int = default_rcon_connections, max_in_flight: int = default_max_in_flight) -> List[Tuple[str, float]]:
+    # Sends A Batch Of /forceload Commands Followed By /save-all To A Fake Server, Over One Connection, Over A Pool Of Them,
+    #   And Pipelined When max_in_flight Allows It (Which Needs A Server That Reads RCON As A Stream, Vanilla Drops The Connection)
+    forceload_commands: List[str] = ["forceload add %s %s" % ((index % 1024) << 4, (index // 1024) << 4) for index in range(commands)]
+    password: str = "benchmark"
+
+    modes: List[Tuple[str, int, int]] = [("Serial", 1, 1), ("Pooled", connections, 1)]
+    if max_in_flight > 1:
+        modes.append(("Pipelined", connections, max_in_flight))
+
+    async def run() -> List[Tuple[str, float]]:
+        timings: List[Tuple[str, float]] = []
+        async with FakeRconServer(password=password, pipelining=max_in_flight > 1) as server:
+            for label, pool_connections, pool_in_flight in modes:
+                started: float = time.perf_counter()
+                async with RconPool(password=password, port=server.port, connections=pool_connections, max_in_flight=pool_in_flight) as pool:
+                    await pool.run_commands(commands=forceload_commands)
+                    await pool.command(command="save-all")
+
+                timings.append((label, time.perf_counter() - started))
+
+        return timings
+
+    return asyncio.run(run())
+
+
+def format_rcon_results(results: List[Tuple[str, float]], commands: int) -> str:
+    lines: List[str] = ["%-18s %10s %14s" % ("Mode", "Seconds", "Commands/Sec")]
+    for label, seconds in results:
+        lines.append("%-18s %10.2f %14.1f" % (label, seconds, (commands + 1) / seconds))
+
+    return "\n".join(lines)
+
+
+def add_world_arguments(parser: argparse.ArgumentParser):
+    defaults: WorldOptions = WorldOptions()
+    parser.add_argument("--regions", type=int, default=defaults.regions, help="Number Of Region Files To Write")
+    parser.add_argument("--chunks-per-region", type=int, default=defaults.chunks_per_region, help="Chunks In Each Region File (Up To 1024)")
+    parser.add_argument("--block-entities", type=float, default=defaults.block_entities, help="Average Number Of Chests Per Chunk")
+    parser.add_argument("--shulker-chance", type=float, default=defaults.shulker_chance, help="Chance Of Each Chest Slot Holding A Filled Shulker Box")
+    parser.add_argument("--marker-chance", type=float, default=defaults.marker_chance, help="Chance Of Each Chunk Having A Marker")
+    parser.add_argument("--barrier-chance", type=float, default=defaults.barrier_chance, help="Chance Of Each Chunk Having Barrier Blocks")
+    parser.add_argument("--entities", type=float, default=defaults.entities, help="Average Number Of Item Entities Per Chunk")
+    parser.add_argument("--legacy", action="store_true", help="Write A Pre-1.17 World With Entities Stored In The Terrain Chunks")
+    parser.add_argument("--seed", type=int, default=defaults.seed, help="Random Seed, The Same Options And Seed Always Write The Same World")
+
+
+def get_world_options(arguments: argparse.Namespace) -> WorldOptions:
+    return WorldOptions(regions=arguments.regions, chunks_per_region=arguments.chunks_per_region, block_entities=arguments.block_entities,
+                        shulker_chance=arguments.shulker_chance, marker_chance=arguments.marker_chance, barrier_chance=arguments.barrier_chance,
+                        entities=arguments.entities, split_entities=not arguments.legacy, seed=arguments.seed)
+
+
+if __name__ == "__main__":
+    parser: argparse.ArgumentParser = argparse.ArgumentParser(description="Generates Synthetic Worlds And Benchmarks The Scanners Against Them")
+    subparsers = parser.add_subparsers(dest="mode")
+
+    generate_parser: argparse.ArgumentParser = subparsers.add_parser("generate", help="Write A Synthetic World")
+    generate_parser.add_argument("world_folder", help="Folder To Write The World To")
+    add_world_arguments(parser=generate_parser)
+
+    run_parser: argparse.ArgumentParser = subparsers.add_parser("run", help="Time The Scripts Against A World (A Synthetic One Is Generated If None Is Given)")
+    run_parser.add_argument("world_folder", nargs="?", default=None, help="Path To The World Folder")
+    run_parser.add_argument("--scripts", nargs="+", choices=scripts, default=scripts, help="Scripts To Time")
+    run_parser.add_argument("--workers", type=int, default=1, help="Number Of Processes Each Script Scans With")
+    run_parser.add_argument("--repeat", type=int, default=1, help="Number Of Times To Run Each Script")
+    add_world_arguments(parser=run_parser)
+
+    rcon_parser: argparse.ArgumentParser = subparsers.add_parser("rcon", help="Time Bulk RCON Commands Against A Local Fake Server")
+    rcon_parser.add_argument("--commands", type=int, default=10000, help="Number Of /forceload Commands To Send")
+    rcon_parser.add_argument("--connections", type=int, default=default_rcon_connections, help="Number Of Pooled Connections For The Pooled And Pipelined Runs")
+    rcon_parser.add_argument("--max-in-flight", type=int, default=default_max_in_flight, help="Most Unanswered Commands Per Connection, Above 1 Adds A Pipelined Run (Vanilla Servers Don't Accept Pipelining, E.g. %s)" % pipelined_max_in_flight)
+    arguments: argparse.Namespace = parser.parse_args()
+
+    if arguments.mode is None:
+        parser.print_help()
+        sys.exit(1)
+
+    if arguments.mode == "generate":
+        started_generating: float = time.perf_counter()
+        generate_world(world_folder=arguments.world_folder, options=get_world_options(arguments=arguments))
+        print("Generated %s In %.2f Seconds" % (arguments.world_folder, time.perf_counter() - started_generating))
+        sys.exit(0)
+
+    if arguments.mode == "rcon":
+        print(format_rcon_results(results=benchmark_rcon(commands=arguments.commands, connections=arguments.connections, max_in_flight=arguments.max_in_flight), commands=arguments.commands))
+        sys.exit(0)
+
+    if arguments.world_folder is not None:
+        if not os.path.exists(arguments.world_folder):
+            print("World Folder Does Not Exist!!!")
+            sys.exit(2)
+
+        print(format_results(results=benchmark(world_folder=arguments.world_folder, selected_scripts=arguments.scripts,
+                                               workers=arguments.workers, repeat=arguments.repeat)))
+        sys.exit(0)
+
+    with tempfile.TemporaryDirectory() as generated_folder:
+        generate_world(world_folder=generated_folder, options=get_world_options(arguments=arguments))
+        print(format_results(results=benchmark(world_folder=generated_folder, selected_scripts=arguments.scripts,
+                                               workers=arguments.workers, repeat=arguments.repeat)))
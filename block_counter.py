@@ -0,0 +1,223 @@
+import argparse
+import os
+import sys
+from typing import FrozenSet, List, Optional, Tuple
+
+import nbt
+import numpy as np
+
+from block_states import BlockStatesError, ChunkBlocks, count_chunk_blocks
+from item_aggregator import ItemAggregate
+from palette_index import ChunkSummary
+from projected_nbt import get_string_pattern, is_full_status
+from scan_cache import get_default_cache_path
+from scan_checkpoint import ScanCheckpoint, open_checkpoint
+from scan_engine import ChunkContext, ChunkVisitor, ProjectionPath, RegionTask, get_region_tasks, iter_scan, print_skipped_chunks
+from scan_profile import ScanProfiler, default_top, open_profiler, profile_modes
+from scan_stats import ScanStats, default_stats_file_name, open_stats
+
+# Counts Blocks Across A Whole World (Or Just The Given Block IDs) And Optionally Lists Where They Are
+# E.g. `--blocks minecraft:barrier --positions` Says How Many Barriers There Are And Where, Which barrier_scanner.py Can't
+
+# Written With --csv, Nothing Is Written Into The World Folder Otherwise
+default_csv_file_name: str = "total_block_list.csv"
+
+
+def get_block_id(block_id: str) -> str:
+    # Same As In Commands, No Namespace Means minecraft
+    return block_id if ":" in block_id else "minecraft:%s" % block_id
+
+
+def is_full_chunk(chunk: nbt.nbt.NBTFile) -> bool:
+    chunk_data: nbt.nbt.TAG_Compound = chunk["Level"] if "Level" in chunk else chunk
+
+    # Cause Apparently 2b2t World Downloads Have Some Tags Missing
+    if "Status" not in chunk_data:
+        return True
+
+    # If Not full, chunk is not fully generated yet and its blocks aren't final
+    return is_full_status(status=chunk_data["Status"].value)
+
+
+class BlockCountVisitor(ChunkVisitor):
+    # Results Are The Failure Message And Block Counts (And Positions) Of Each Chunk
+    # Only The Tags Read By count_chunk_blocks(...) Get Decoded, Blocks Are Never In 1.17+ Entity Regions
+    terrain_paths: List[ProjectionPath] = [
+        ("Level", "Status"),
+        ("Level", "xPos"),
+        ("Level", "zPos"),
+        ("Level", "Sections", "Y"),
+        ("Level", "Sections", "Palette"),
+        ("Level", "Sections", "BlockStates"),
+        # 1.18+ Chunk Layout
+        ("Status",),
+        ("xPos",),
+        ("zPos",),
+        ("sections", "Y"),
+        ("sections", "block_states")
+    ]
+
+    def __init__(self, block_ids: Optional[List[str]] = None, find_positions: bool = False):
+        self.block_ids: Optional[FrozenSet[str]] = frozenset(block_ids) if block_ids is not None else None
+        self.find_positions: bool = find_positions
+
+        # The Blocks Asked For Are Part Of The Cached Results, So Each Selection Gets Its Own Namespace
+        self.name: str = "block_counter"
+        if self.block_ids is not None:
+            self.name += ":" + ",".join(sorted(self.block_ids))
+
+        if find_positions:
+            self.name += ":positions"
+
+        # If None Of These Are Anywhere In The Decompressed Chunk, No Palette Can Contain The Blocks
+        self.patterns: List[bytes] = [get_string_pattern(value=block_id) for block_id in sorted(self.block_ids)] if self.block_ids is not None else []
+
+    def full_chunks_only(self, task: RegionTask) -> bool:
+        # Blocks Of Chunks That Aren't Fully Generated Aren't Final, So They Aren't Counted
+        return True
+
+    def index_filter(self, summary: ChunkSummary) -> bool:
+        return self.block_ids is None or not summary.blocks.isdisjoint(self.block_ids)
+
+    def prefilter(self, chunk_bytes: bytes) -> bool:
+        return self.block_ids is None or any(pattern in chunk_bytes for pattern in self.patterns)
+
+    def empty_result(self, context: ChunkContext) -> Tuple[str, ChunkBlocks]:
+        return "", ChunkBlocks(histogram={})
+
+    def visit(self, chunk: nbt.nbt.NBTFile, context: ChunkContext) -> Tuple[str, ChunkBlocks]:
+        if not is_full_chunk(chunk=chunk):
+            return self.empty_result(context=context)
+
+        try:
+            return "", count_chunk_blocks(chunk=chunk, block_ids=self.block_ids, find_positions=self.find_positions)
+        except BlockStatesError as e:
+            return self.error(context=context, error=e)
+
+    def error(self, context: ChunkContext, error: Exception) -> Tuple[str, ChunkBlocks]:
+        lines: List[str] = [
+            "Failed To Read Chunk (%s, %s) Due To Invalid Data!!!" % (context.x, context.z),
+            "-" * 40,
+            "Trace: %s" % error,
+            "-" * 40
+        ]
+        return "\n".join(lines) + "\n", ChunkBlocks(histogram={})
+
+    def is_empty(self, result: Tuple[str, ChunkBlocks]) -> bool:
+        return result[0] == "" and len(result[1].histogram) == 0
+
+    def encode_result(self, result: Tuple[str, ChunkBlocks]) -> list:
+        message, chunk_blocks = result
+        positions: Optional[dict] = {block_id: block_positions.tolist() for block_id, block_positions in chunk_blocks.positions.items()} if chunk_blocks.positions is not None else None
+        return [message, chunk_blocks.histogram, positions]
+
+    def decode_result(self, value: list) -> Tuple[str, ChunkBlocks]:
+        message, histogram, positions = value
+        if positions is None:
+            return message, ChunkBlocks(histogram=histogram)
+
+        return message, ChunkBlocks(histogram=histogram, positions={block_id: np.array(block_positions, dtype=np.int64).reshape(-1, 3) for block_id, block_positions in positions.items()})
+
+
+def main_single_player(world_folder: str, workers: int = 1, cache_path: Optional[str] = None, block_ids: Optional[List[str]] = None, find_positions: bool = False,
+                       per_chunk: bool = False, by_dimension: bool = False, use_index: bool = False, csv_path: Optional[str] = None, stats: Optional[ScanStats] = None,
+                       profiler: Optional[ScanProfiler] = None, checkpoint: Optional[ScanCheckpoint] = None):
+    visitor: BlockCountVisitor = BlockCountVisitor(block_ids=block_ids, find_positions=find_positions)
+
+    block_totals: ItemAggregate = ItemAggregate(by_dimension=by_dimension, id_header="Block ID")
+    skipped_chunks: int = 0
+    try:
+        for region_result in iter_scan(region_tasks=get_region_tasks(world_folder=world_folder), visitors=[visitor], workers=workers, cache_path=cache_path, stats=stats, profiler=profiler, checkpoint=checkpoint, use_index=use_index):
+            for context, (message, chunk_blocks) in region_result.results[visitor.name]:
+                sys.stdout.write(message)
+
+                if per_chunk and len(chunk_blocks.histogram) > 0:
+                    print("Chunk (%s, %s) - %s" % (*context.get_chunk_coordinates(), context.dimension))
+                    print("-" * 40)
+                    for block_id, count in sorted(chunk_blocks.histogram.items(), key=lambda entry: (-entry[1], entry[0])):
+                        print("%s: %s" % (block_id, count))
+
+                    print("-" * 40)
+
+                if chunk_blocks.positions is not None:
+                    for block_id, positions in chunk_blocks.positions.items():
+                        for x, y, z in positions.tolist():
+                            print("%s - (%s, %s, %s) - %s" % (block_id, x, y, z, context.dimension))
+
+                for block_id, count in chunk_blocks.histogram.items():
+                    block_totals.add(item_id=block_id, count=count, dimension=context.dimension)
+
+            skipped_chunks += region_result.skipped_chunks
+
+        print("-"*100)
+        print(block_totals.format_table())
+        if csv_path is not None:
+            block_totals.write_csv(csv_path=csv_path)
+
+        print_skipped_chunks(skipped_chunks=skipped_chunks)
+    except KeyboardInterrupt:
+        return 3
+
+
+if __name__ == "__main__":
+    parser: argparse.ArgumentParser = argparse.ArgumentParser(description="Counts Blocks In A World")
+    parser.add_argument("world_folder", nargs="?", default=None, help="Path To The World Folder")
+    parser.add_argument("--workers", type=int, default=1, help="Number Of Processes To Scan Region Files With")
+    parser.add_argument("--stats", nargs="?", default=None, const="", help="Show Live Progress And Write Throughput And Phase Timings (Optionally Takes A Report File Path, Defaults To %s)" % default_stats_file_name)
+    parser.add_argument("--profile", nargs="?", default=None, const="", help="Profile The Scan Across Worker Processes (Optionally Takes An Output File Path, Defaults To scan_profile.pstats Or scan_profile.folded)")
+    parser.add_argument("--profile-mode", choices=profile_modes, default="cprofile", help="Deterministic cProfile Or Low Overhead Stack Sampling")
+    parser.add_argument("--profile-top", type=int, default=default_top, help="Number Of Functions To Show In The Profile Summary")
+    parser.add_argument("--checkpoint", nargs="?", default=None, const="", help="Save Finished Regions So An Interrupted Scan Can Be Resumed (Optionally Takes A File Path, Defaults To A File In The World Folder)")
+    parser.add_argument("--resume", action="store_true", help="Continue An Interrupted Scan After The Last Region It Finished (Implies --checkpoint)")
+    parser.add_argument("--cache", nargs="?", default=None, const="", help="Reuse Results Of Chunks That Haven't Changed Since The Last Run (Optionally Takes A Cache File Path)")
+    parser.add_argument("--blocks", nargs="+", default=None, help="Block IDs To Count (Defaults To Every Block)")
+    parser.add_argument("--positions", action="store_true", help="List The Coordinates Of Every Block Given With --blocks")
+    parser.add_argument("--per-chunk", action="store_true", help="Show The Block Counts Of Each Chunk")
+    parser.add_argument("--by-dimension", action="store_true", help="Break Down Totals By Dimension")
+    parser.add_argument("--index", action="store_true", help="Keep A Palette Index Next To Each Region File And Only Read Chunks It Says Have A Match")
+    parser.add_argument("--csv", nargs="?", default=None, const="", help="Also Write The Totals To A CSV File (Optionally Takes A File Path, Defaults To %s In The World Folder)" % default_csv_file_name)
+    arguments: argparse.Namespace = parser.parse_args()
+
+    if arguments.world_folder is None:
+        print("No World Folder Specified!!!")
+        sys.exit(1)
+
+    world_folder_path: str = arguments.world_folder
+    if not os.path.exists(world_folder_path):
+        print("World Folder Does Not Exist!!!")
+        sys.exit(2)
+
+    # Listing Every Block In The World Isn't Something Anyone Wants
+    if arguments.positions and arguments.blocks is None:
+        print("--positions Needs --blocks!!!")
+        sys.exit(4)
+
+    # Defaults To A Cache File Inside The World Folder
+    scan_cache_path: Optional[str] = arguments.cache
+    if scan_cache_path == "":
+        scan_cache_path: str = get_default_cache_path(world_folder=world_folder_path)
+
+    # Defaults To A CSV File Inside The World Folder
+    totals_csv_path: Optional[str] = arguments.csv
+    if totals_csv_path == "":
+        totals_csv_path: str = os.path.join(world_folder_path, default_csv_file_name)
+
+    selected_block_ids: Optional[List[str]] = [get_block_id(block_id=block_id) for block_id in arguments.blocks] if arguments.blocks is not None else None
+
+    scan_stats: Optional[ScanStats] = open_stats(stats_path=arguments.stats)
+    scan_profiler: Optional[ScanProfiler] = open_profiler(profile_path=arguments.profile, mode=arguments.profile_mode, top=arguments.profile_top)
+    scan_checkpoint: Optional[ScanCheckpoint] = open_checkpoint(world_folder=world_folder_path, name="block_counter", checkpoint_path=arguments.checkpoint, resume=arguments.resume)
+    exit_code: Optional[int] = main_single_player(world_folder=world_folder_path, workers=arguments.workers, cache_path=scan_cache_path, block_ids=selected_block_ids,
+                                                  find_positions=arguments.positions, per_chunk=arguments.per_chunk, by_dimension=arguments.by_dimension,
+                                                  use_index=arguments.index, csv_path=totals_csv_path, stats=scan_stats, profiler=scan_profiler, checkpoint=scan_checkpoint)
+    if scan_stats is not None:
+        scan_stats.finish()
+
+    if scan_profiler is not None:
+        scan_profiler.finish()
+
+    # Only Kept For --resume When The Scan Was Interrupted
+    if scan_checkpoint is not None:
+        scan_checkpoint.finish(interrupted=exit_code == 3)
+
+    sys.exit(exit_code)
@@ -0,0 +1,199 @@
+from collections import Counter
+from typing import Dict, FrozenSet, List, NamedTuple, Optional, Tuple
+
+import nbt
+import numpy as np
+from nbt.nbt import TAG_Long_Array
+
+# Unpacks Section Block States Into Palette Indices With NumPy, A Few Array Operations Per Section Instead Of A Python Loop Per Block
+# Blocks Are Stored In YZX Order, So Index = y * 256 + z * 16 + x Within The 16x16x16 Section
+# https://minecraft.fandom.com/wiki/Chunk_format#Block_format
+blocks_per_section: int = 4096
+
+# Block States Never Use Fewer Bits Than This Per Block
+min_block_bits: int = 4
+
+
+class BlockStatesError(Exception):
+    pass
+
+
+class Section(NamedTuple):
+    # Section Height In Sections (Can Be Negative In 1.18+)
+    y: int
+    # Block ID Of Each Palette Entry, Properties Are Left Out
+    palette: List[str]
+    # None When Every Block Is The First Palette Entry (1.18+ Leaves The Data Out Then)
+    block_states: Optional[TAG_Long_Array]
+
+
+class ChunkBlocks(NamedTuple):
+    # Block ID -> Count
+    histogram: Dict[str, int]
+    # Block ID -> (x, y, z) World Coordinates Of Each Block, Only When Positions Were Asked For
+    positions: Optional[Dict[str, np.ndarray]] = None
+
+
+def get_bits(palette_size: int) -> int:
+    return max(min_block_bits, (palette_size - 1).bit_length())
+
+
+def get_padded_length(bits: int, count: int = blocks_per_section) -> int:
+    # 20w17a (1.16)+: Each Long Holds As Many Whole Values As Fit, The Leftover High Bits Are Padding
+    values_per_long: int = 64 // bits
+    return -(-count // values_per_long)
+
+
+def get_spanning_length(bits: int, count: int = blocks_per_section) -> int:
+    # Before 20w17a: One Continuous Bit Stream, So Values Can Start In One Long And End In The Next
+    return -(-count * bits // 64)
+
+
+def get_longs(block_states: TAG_Long_Array) -> np.ndarray:
+    # Projected Chunks Keep The Raw Bytes (See projected_nbt.PackedLongArray), Which Skips Making A Python int Per Long
+    raw: Optional[bytes] = getattr(block_states, "raw", None)
+    if raw is not None:
+        return np.frombuffer(raw, dtype=">u8").astype(np.uint64)
+
+    return np.array(block_states.value, dtype=np.int64).view(np.uint64)
+
+
+def unpack_padded(longs: np.ndarray, bits: int, count: int = blocks_per_section) -> np.ndarray:
+    # Every Long Is Shifted By Every Value Offset At Once, (Longs, Values Per Long) Flattens Back Into Block Order
+    shifts: np.ndarray = np.arange(64 // bits, dtype=np.uint64) * np.uint64(bits)
+    values: np.ndarray = (longs[:, np.newaxis] >> shifts) & np.uint64((1 << bits) - 1)
+    return values.reshape(-1)[:count]
+
+
+def unpack_spanning(longs: np.ndarray, bits: int, count: int = blocks_per_section) -> np.ndarray:
+    offsets: np.ndarray = np.arange(count, dtype=np.uint64) * np.uint64(bits)
+    long_indices: np.ndarray = (offsets >> np.uint64(6)).astype(np.intp)
+    shifts: np.ndarray = offsets & np.uint64(63)
+
+    # One Extra Long, So The Last Value Can Look At The Long After It Like The Others
+    extended: np.ndarray = np.append(longs, np.uint64(0))
+    values: np.ndarray = extended[long_indices] >> shifts
+
+    # Values Running Past The End Of Their Long Take Their High Bits From The Start Of The Next One
+    spanning: np.ndarray = shifts + np.uint64(bits) > np.uint64(64)
+    values[spanning] |= extended[long_indices[spanning] + 1] << (np.uint64(64) - shifts[spanning])
+    return values & np.uint64((1 << bits) - 1)
+
+
+def unpack_block_states(block_states: TAG_Long_Array, palette_size: int, count: int = blocks_per_section) -> np.ndarray:
+    # Returns The Palette Index Of Every Block
+    # The Two Layouts Are Told Apart By Length Instead Of DataVersion, Which 2b2t World Downloads Don't Always Have
+    # (Both Lengths Are The Same For 4, 8 And 16 Bits, Where The Layouts Are Too)
+    bits: int = get_bits(palette_size=palette_size)
+    longs: np.ndarray = get_longs(block_states=block_states)
+
+    if len(longs) == get_padded_length(bits=bits, count=count):
+        indices: np.ndarray = unpack_padded(longs=longs, bits=bits, count=count)
+    elif len(longs) == get_spanning_length(bits=bits, count=count):
+        indices: np.ndarray = unpack_spanning(longs=longs, bits=bits, count=count)
+    else:
+        raise BlockStatesError("%s longs don't hold %s blocks of %s bits" % (len(longs), count, bits))
+
+    # bincount(...) Doesn't Take Unsigned 64 Bit Integers
+    return indices.astype(np.intp)
+
+
+def get_section_indices(section: Section) -> np.ndarray:
+    if section.block_states is None:
+        return np.zeros(blocks_per_section, dtype=np.intp)
+
+    return unpack_block_states(block_states=section.block_states, palette_size=len(section.palette))
+
+
+def get_palette(palette: nbt.nbt.TAG_List) -> List[str]:
+    return [state["Name"].value for state in palette]
+
+
+def get_sections(chunk: nbt.nbt.NBTFile) -> List[Section]:
+    sections: List[Section] = []
+
+    # 1.13-1.17: Level.Sections[].Palette And BlockStates
+    if "Level" in chunk and "Sections" in chunk["Level"]:
+        for section in chunk["Level"]["Sections"]:
+            # Sections Only Holding Light Data Don't Have Any Blocks
+            if "Palette" not in section or "BlockStates" not in section:
+                continue
+
+            sections.append(Section(y=section["Y"].value, palette=get_palette(palette=section["Palette"]), block_states=section["BlockStates"]))
+
+    # 1.18+: sections[].block_states.palette And data
+    if "sections" in chunk:
+        for section in chunk["sections"]:
+            if "block_states" not in section or "palette" not in section["block_states"]:
+                continue
+
+            block_states: nbt.nbt.TAG_Compound = section["block_states"]
+            sections.append(Section(y=section["Y"].value, palette=get_palette(palette=block_states["palette"]),
+                                    block_states=block_states["data"] if "data" in block_states else None))
+
+    return sections
+
+
+def count_section_blocks(section: Section, block_ids: Optional[FrozenSet[str]] = None) -> Counter:
+    # Counts Blocks Of The Given IDs (Or Every Block) In One Section
+    wanted: List[int] = [index for index, block_id in enumerate(section.palette) if block_ids is None or block_id in block_ids]
+    histogram: Counter = Counter()
+
+    # Sections Without Any Of The Blocks Are Never Unpacked
+    if len(wanted) == 0:
+        return histogram
+
+    if section.block_states is None:
+        if wanted[0] == 0:
+            histogram[section.palette[0]] += blocks_per_section
+
+        return histogram
+
+    counts: np.ndarray = np.bincount(get_section_indices(section=section), minlength=len(section.palette))
+    for index in wanted:
+        if counts[index] > 0:
+            histogram[section.palette[index]] += int(counts[index])
+
+    return histogram
+
+
+def find_section_blocks(section: Section, block_id: str, chunk_x: int, chunk_z: int) -> np.ndarray:
+    # Returns The (x, y, z) World Coordinates Of Every Block With The Given ID In One Section
+    wanted: List[int] = [index for index, palette_id in enumerate(section.palette) if palette_id == block_id]
+    if len(wanted) == 0:
+        return np.empty((0, 3), dtype=np.int64)
+
+    # Looked Up By Palette Index, Sized For Every Index The Bits Per Block Can Hold (Corrupt Data Can Point Past The Palette)
+    matches: np.ndarray = np.zeros(1 << get_bits(palette_size=len(section.palette)), dtype=bool)
+    matches[wanted] = True
+
+    found: np.ndarray = np.flatnonzero(matches[get_section_indices(section=section)])
+    return np.stack([chunk_x * 16 + (found & 15), section.y * 16 + (found >> 8), chunk_z * 16 + ((found >> 4) & 15)], axis=1)
+
+
+def get_chunk_position(chunk: nbt.nbt.NBTFile) -> Optional[Tuple[int, int]]:
+    chunk_data: nbt.nbt.TAG_Compound = chunk["Level"] if "Level" in chunk else chunk
+    if "xPos" not in chunk_data or "zPos" not in chunk_data:
+        return None
+
+    return chunk_data["xPos"].value, chunk_data["zPos"].value
+
+
+def count_chunk_blocks(chunk: nbt.nbt.NBTFile, block_ids: Optional[FrozenSet[str]] = None, find_positions: bool = False) -> ChunkBlocks:
+    histogram: Counter = Counter()
+    positions: Dict[str, List[np.ndarray]] = {}
+
+    chunk_position: Optional[Tuple[int, int]] = get_chunk_position(chunk=chunk)
+    for section in get_sections(chunk=chunk):
+        section_histogram: Counter = count_section_blocks(section=section, block_ids=block_ids)
+        histogram.update(section_histogram)
+
+        # Without A Position, There's Nothing To Place The Blocks Relative To
+        if find_positions and block_ids is not None and chunk_position is not None:
+            for block_id in sorted(section_histogram):
+                positions.setdefault(block_id, []).append(find_section_blocks(section=section, block_id=block_id, chunk_x=chunk_position[0], chunk_z=chunk_position[1]))
+
+    if not find_positions:
+        return ChunkBlocks(histogram=dict(histogram))
+
+    return ChunkBlocks(histogram=dict(histogram), positions={block_id: np.concatenate(arrays) for block_id, arrays in sorted(positions.items())})
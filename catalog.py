@@ -0,0 +1,265 @@
+import argparse
+import json
+import os
+import sqlite3
+import sys
+from typing import Any, List, Optional, Tuple
+
+from output_sinks import ChunkErrorRecord, EntityRecord, ItemRecord, OutputSink, Record, format_record, open_sink, output_formats, record_from_dict, record_to_dict, record_types
+from scan_cache import get_default_cache_path
+from scan_checkpoint import ScanCheckpoint, open_checkpoint
+from scan_engine import get_region_tasks, iter_scan
+from scan_profile import ScanProfiler, default_top, open_profiler, profile_modes
+from scan_stats import ScanStats, default_stats_file_name, open_stats
+from scanner import ItemSearchVisitor
+
+# Writes Everything scanner.py Finds Into An Indexed Database, So Questions Like
+# "Where Are All The Lecterns With Books?" Don't Need Another Scan Of The Whole World
+# Records Are Stored Whole (As JSON) Next To The Indexed Columns, So Query Results Can Go Through The Same Output Sinks
+# JSON Rather Than Pickles, As The Catalog Sits In The World Folder And Reading A Pickle From A Downloaded World Could Run Code
+default_catalog_file_name: str = "world_catalog.sqlite3"
+
+# Kept In PRAGMA user_version, Catalogs Built By Other Versions (E.g. With Pickled Records) Have To Be Built Again
+catalog_version: int = 2
+
+# Rows Are Inserted In Batches Of This Many Records
+batch_size: int = 10000
+
+
+def get_default_catalog_path(world_folder: str) -> str:
+    return os.path.join(world_folder, default_catalog_file_name)
+
+
+def get_record_items(record: Record) -> List[ItemRecord]:
+    items: List[ItemRecord] = list(getattr(record, "items", []))
+    if isinstance(record, EntityRecord) and record.item is not None:
+        items.append(record.item)
+
+    return items
+
+
+def create_tables(connection: sqlite3.Connection):
+    # Rebuilt From Scratch Each Time, The Scan Cache Is What Makes Rebuilding Cheap
+    connection.execute("DROP TABLE IF EXISTS items")
+    connection.execute("DROP TABLE IF EXISTS records")
+    connection.execute("CREATE TABLE records ("
+                       "record_id INTEGER PRIMARY KEY, "
+                       "record_type TEXT NOT NULL, "
+                       "dimension TEXT NOT NULL, "
+                       "id TEXT NOT NULL, "
+                       "x REAL NOT NULL, "
+                       "y REAL NOT NULL, "
+                       "z REAL NOT NULL, "
+                       "record TEXT NOT NULL)")
+    connection.execute("CREATE TABLE items ("
+                       "record_id INTEGER NOT NULL REFERENCES records (record_id), "
+                       "id TEXT NOT NULL, "
+                       "count INTEGER NOT NULL, "
+                       "slot INTEGER)")
+
+
+def create_indexes(connection: sqlite3.Connection):
+    # Created After The Rows Are In, Which Is Much Faster Than Updating Them On Every Insert
+    connection.execute("CREATE INDEX records_position ON records (dimension, x, z)")
+    connection.execute("CREATE INDEX records_id ON records (id, dimension)")
+    connection.execute("CREATE INDEX items_id ON items (id, record_id)")
+    connection.execute("ANALYZE")
+    connection.execute("PRAGMA user_version = %s" % catalog_version)
+
+
+def insert_records(connection: sqlite3.Connection, records: List[Record], next_record_id: int) -> Tuple[int, int]:
+    # Returns The Next Free Record ID And How Many Items Were Inserted
+    record_rows: List[tuple] = []
+    item_rows: List[tuple] = []
+    for record in records:
+        record_rows.append((next_record_id, record_types[type(record)], record.dimension, record.id,
+                            record.x, record.y, record.z, json.dumps(record_to_dict(record=record), separators=(",", ":"))))
+
+        for item in get_record_items(record=record):
+            item_rows.append((next_record_id, item.id, item.count, item.slot))
+
+        next_record_id += 1
+
+    connection.executemany("INSERT INTO records VALUES (?, ?, ?, ?, ?, ?, ?, ?)", record_rows)
+    connection.executemany("INSERT INTO items VALUES (?, ?, ?, ?)", item_rows)
+    return next_record_id, len(item_rows)
+
+
+def build_catalog(world_folder: str, catalog_path: str, workers: int = 1, cache_path: Optional[str] = None, stats: Optional[ScanStats] = None, profiler: Optional[ScanProfiler] = None, checkpoint: Optional[ScanCheckpoint] = None):
+    visitor: ItemSearchVisitor = ItemSearchVisitor()
+
+    connection: sqlite3.Connection = sqlite3.connect(catalog_path)
+    try:
+        # Nothing Else Reads The Catalog While It's Being Built, So Durability Can Wait Until The Final Commit
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=OFF")
+        create_tables(connection=connection)
+
+        next_record_id: int = 1
+        total_items: int = 0
+        pending: List[Record] = []
+        for region_result in iter_scan(region_tasks=get_region_tasks(world_folder=world_folder), visitors=[visitor], workers=workers, cache_path=cache_path, stats=stats, profiler=profiler, checkpoint=checkpoint):
+            for _, records in region_result.results[visitor.name]:
+                for record in records:
+                    if isinstance(record, ChunkErrorRecord):
+                        print("\n".join(format_record(record=record)))
+                        continue
+
+                    pending.append(record)
+
+            if len(pending) >= batch_size:
+                next_record_id, inserted_items = insert_records(connection=connection, records=pending, next_record_id=next_record_id)
+                total_items += inserted_items
+                pending.clear()
+
+        next_record_id, inserted_items = insert_records(connection=connection, records=pending, next_record_id=next_record_id)
+        total_items += inserted_items
+
+        create_indexes(connection=connection)
+        connection.commit()
+    finally:
+        connection.close()
+
+    print("Cataloged %s Records And %s Items To %s" % (next_record_id - 1, total_items, catalog_path))
+
+
+def get_catalog_version(catalog_path: str) -> int:
+    connection: sqlite3.Connection = sqlite3.connect(catalog_path)
+    try:
+        return connection.execute("PRAGMA user_version").fetchone()[0]
+    finally:
+        connection.close()
+
+
+def query_catalog(catalog_path: str, dimension: Optional[str] = None, record_id: Optional[str] = None, item_id: Optional[str] = None,
+                  minimum: Optional[List[float]] = None, maximum: Optional[List[float]] = None) -> List[Record]:
+    conditions: List[str] = []
+    parameters: List[Any] = []
+
+    if dimension is not None:
+        conditions.append("dimension = ?")
+        parameters.append(dimension)
+
+    if record_id is not None:
+        conditions.append("id = ?")
+        parameters.append(record_id)
+
+    # Bounding Box Corners Are (X, Y, Z) And Inclusive
+    for corner, operator in [(minimum, ">="), (maximum, "<=")]:
+        if corner is not None:
+            for axis, value in zip(["x", "y", "z"], corner):
+                conditions.append("%s %s ?" % (axis, operator))
+                parameters.append(value)
+
+    if item_id is not None:
+        conditions.append("record_id IN (SELECT record_id FROM items WHERE id = ?)")
+        parameters.append(item_id)
+
+    query: str = "SELECT record FROM records"
+    if len(conditions) > 0:
+        query += " WHERE " + " AND ".join(conditions)
+
+    # Same Order As The Scan Found Them
+    query += " ORDER BY record_id"
+
+    connection: sqlite3.Connection = sqlite3.connect(catalog_path)
+    try:
+        return [record_from_dict(record_dict=json.loads(record)) for record, in connection.execute(query, parameters)]
+    finally:
+        connection.close()
+
+
+def main_query(catalog_path: str, dimension: Optional[str] = None, record_id: Optional[str] = None, item_id: Optional[str] = None,
+               minimum: Optional[List[float]] = None, maximum: Optional[List[float]] = None, output_format: str = "text", output_path: Optional[str] = None):
+    if not os.path.exists(catalog_path):
+        print("Catalog Does Not Exist!!! (Run catalog.py build First)")
+        return 4
+
+    if get_catalog_version(catalog_path=catalog_path) != catalog_version:
+        print("Catalog Was Built By A Different Version!!! (Run catalog.py build Again)")
+        return 4
+
+    records: List[Record] = query_catalog(catalog_path=catalog_path, dimension=dimension, record_id=record_id, item_id=item_id, minimum=minimum, maximum=maximum)
+
+    sink: OutputSink = open_sink(output_format=output_format, output_path=output_path)
+    try:
+        sink.write_all(records=records)
+    finally:
+        sink.close()
+
+
+if __name__ == "__main__":
+    parser: argparse.ArgumentParser = argparse.ArgumentParser(description="Builds And Queries An Indexed Catalog Of A World's Block Entities, Entities And Items")
+    subparsers = parser.add_subparsers(dest="mode")
+
+    build_parser: argparse.ArgumentParser = subparsers.add_parser("build", help="Scan The World And Write The Catalog")
+    build_parser.add_argument("world_folder", nargs="?", default=None, help="Path To The World Folder")
+    build_parser.add_argument("--catalog", default=None, help="Catalog File Path (Defaults To %s In The World Folder)" % default_catalog_file_name)
+    build_parser.add_argument("--workers", type=int, default=1, help="Number Of Processes To Scan Region Files With")
+    build_parser.add_argument("--stats", nargs="?", default=None, const="", help="Show Live Progress And Write Throughput And Phase Timings (Optionally Takes A Report File Path, Defaults To %s)" % default_stats_file_name)
+    build_parser.add_argument("--profile", nargs="?", default=None, const="", help="Profile The Scan Across Worker Processes (Optionally Takes An Output File Path, Defaults To scan_profile.pstats Or scan_profile.folded)")
+    build_parser.add_argument("--profile-mode", choices=profile_modes, default="cprofile", help="Deterministic cProfile Or Low Overhead Stack Sampling")
+    build_parser.add_argument("--profile-top", type=int, default=default_top, help="Number Of Functions To Show In The Profile Summary")
+    build_parser.add_argument("--checkpoint", nargs="?", default=None, const="", help="Save Finished Regions So An Interrupted Scan Can Be Resumed (Optionally Takes A File Path, Defaults To A File In The World Folder)")
+    build_parser.add_argument("--resume", action="store_true", help="Continue An Interrupted Scan After The Last Region It Finished (Implies --checkpoint)")
+    build_parser.add_argument("--cache", nargs="?", default=None, const="", help="Reuse Results Of Chunks That Haven't Changed Since The Last Run (Optionally Takes A Cache File Path)")
+
+    query_parser: argparse.ArgumentParser = subparsers.add_parser("query", help="Search A Previously Built Catalog")
+    query_parser.add_argument("world_folder", nargs="?", default=None, help="Path To The World Folder")
+    query_parser.add_argument("--catalog", default=None, help="Catalog File Path (Defaults To %s In The World Folder)" % default_catalog_file_name)
+    query_parser.add_argument("--dimension", default=None, help="Dimension Folder Name (E.g. DIM-1)")
+    query_parser.add_argument("--id", default=None, help="Block Entity Or Entity ID (E.g. minecraft:lectern)")
+    query_parser.add_argument("--item", default=None, help="Only Containers Holding This Item ID (E.g. minecraft:netherite_ingot)")
+    query_parser.add_argument("--min", nargs=3, type=float, default=None, metavar=("X", "Y", "Z"), help="Lower Corner Of The Bounding Box")
+    query_parser.add_argument("--max", nargs=3, type=float, default=None, metavar=("X", "Y", "Z"), help="Upper Corner Of The Bounding Box")
+    query_parser.add_argument("--output-format", choices=output_formats, default="text", help="Format To Write Matching Records In")
+    query_parser.add_argument("--output", default=None, help="File To Write Output To (Defaults To Standard Output)")
+    arguments: argparse.Namespace = parser.parse_args()
+
+    if arguments.mode is None:
+        parser.print_help()
+        sys.exit(1)
+
+    if arguments.world_folder is None:
+        print("No World Folder Specified!!!")
+        sys.exit(1)
+
+    world_folder_path: str = arguments.world_folder
+    if not os.path.exists(world_folder_path):
+        print("World Folder Does Not Exist!!!")
+        sys.exit(2)
+
+    world_catalog_path: str = arguments.catalog
+    if world_catalog_path is None:
+        world_catalog_path: str = get_default_catalog_path(world_folder=world_folder_path)
+
+    if arguments.mode == "build":
+        # Defaults To A Cache File Inside The World Folder
+        scan_cache_path: Optional[str] = arguments.cache
+        if scan_cache_path == "":
+            scan_cache_path: str = get_default_cache_path(world_folder=world_folder_path)
+
+        scan_checkpoint: Optional[ScanCheckpoint] = open_checkpoint(world_folder=world_folder_path, name="catalog", checkpoint_path=arguments.checkpoint, resume=arguments.resume)
+        try:
+            scan_stats: Optional[ScanStats] = open_stats(stats_path=arguments.stats)
+            scan_profiler: Optional[ScanProfiler] = open_profiler(profile_path=arguments.profile, mode=arguments.profile_mode, top=arguments.profile_top)
+            exit_code: Optional[int] = build_catalog(world_folder=world_folder_path, catalog_path=world_catalog_path, workers=arguments.workers, cache_path=scan_cache_path, stats=scan_stats, profiler=scan_profiler, checkpoint=scan_checkpoint)
+            if scan_stats is not None:
+                scan_stats.finish()
+
+            if scan_profiler is not None:
+                scan_profiler.finish()
+
+            if scan_checkpoint is not None:
+                scan_checkpoint.finish()
+
+            sys.exit(exit_code)
+        except KeyboardInterrupt:
+            # Only Kept For --resume When The Scan Was Interrupted
+            if scan_checkpoint is not None:
+                scan_checkpoint.finish(interrupted=True)
+
+            sys.exit(3)
+
+    sys.exit(main_query(catalog_path=world_catalog_path, dimension=arguments.dimension, record_id=arguments.id, item_id=arguments.item,
+                        minimum=arguments.min, maximum=arguments.max, output_format=arguments.output_format, output_path=arguments.output))
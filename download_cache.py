@@ -0,0 +1,174 @@
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+from typing import Dict, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+# Keeps Mojang's Manifests And Server Jars On Disk, Named By Their SHA-1, So Every Scan Server Shares One Copy
+# Files With A Known SHA-1 (Version Manifests And Jars, Which Mojang Lists In The Manifests) Are Never Downloaded Twice,
+#   And Files That Can Change (The Version List) Are Only Downloaded Again When The Server Says They Changed
+default_cache_folder: str = os.path.join(os.path.expanduser("~"), ".cache", "WorldScanner")
+
+# Downloads Are Streamed To Disk In Pieces Of This Size
+download_chunk_size: int = 1 << 20
+
+# Seconds To Wait For Mojang Before Giving Up (Or Falling Back To A Cached Copy)
+request_timeout: float = 30.0
+
+
+class DownloadError(Exception):
+    pass
+
+
+def get_file_sha1(path: str) -> str:
+    digest = hashlib.sha1()
+    with open(path, mode="rb") as f:
+        for block in iter(lambda: f.read(download_chunk_size), b""):
+            digest.update(block)
+
+    return digest.hexdigest()
+
+
+class DownloadCache:
+    def __init__(self, cache_folder: str = default_cache_folder, user_agent: Optional[str] = None, session: Optional[requests.Session] = None):
+        self.cache_folder: str = cache_folder
+        self.blob_folder: str = os.path.join(cache_folder, "blobs")
+        self.index_path: str = os.path.join(cache_folder, "index.json")
+        os.makedirs(self.blob_folder, exist_ok=True)
+
+        # One Pooled Session, So Every Request Reuses The Same Connections
+        if session is None:
+            session: requests.Session = requests.Session()
+            adapter: HTTPAdapter = HTTPAdapter(pool_connections=4, pool_maxsize=4)
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+
+        if user_agent is not None:
+            session.headers["User-Agent"] = user_agent
+
+        self.session: requests.Session = session
+
+        # URL -> SHA-1 Of The Last Copy, Plus The ETag/Last-Modified To Ask Whether It Changed
+        self.index: Dict[str, Dict[str, str]] = self.read_index()
+
+    def read_index(self) -> Dict[str, Dict[str, str]]:
+        if not os.path.exists(self.index_path):
+            return {}
+
+        try:
+            with open(self.index_path, mode="r") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            # Only Costs A Download Each
+            return {}
+
+    def write_index(self):
+        # Several Scan Servers Can Share The Cache, So The Index Is Swapped In Whole
+        temporary_file, temporary_path = tempfile.mkstemp(prefix="index.", suffix=".tmp", dir=self.cache_folder)
+        with open(temporary_file, mode="w") as f:
+            json.dump(self.index, f, indent=2, sort_keys=True)
+
+        os.replace(temporary_path, self.index_path)
+
+    def get_blob_path(self, sha1: str) -> str:
+        return os.path.join(self.blob_folder, sha1[:2], sha1)
+
+    def has_blob(self, sha1: str) -> bool:
+        return os.path.exists(self.get_blob_path(sha1=sha1))
+
+    def store_response(self, response: requests.Response, expected_sha1: Optional[str] = None) -> str:
+        # Streams The Body Into The Cache And Returns Its SHA-1, A Body That Doesn't Match expected_sha1 Is Thrown Away
+        digest = hashlib.sha1()
+        temporary_file, temporary_path = tempfile.mkstemp(suffix=".tmp", dir=self.blob_folder)
+        try:
+            with open(temporary_file, mode="wb") as f:
+                for block in response.iter_content(chunk_size=download_chunk_size):
+                    digest.update(block)
+                    f.write(block)
+
+            sha1: str = digest.hexdigest()
+            if expected_sha1 is not None and sha1 != expected_sha1.lower():
+                raise DownloadError("%s has SHA-1 %s instead of %s" % (response.url, sha1, expected_sha1))
+
+            os.makedirs(os.path.dirname(self.get_blob_path(sha1=sha1)), exist_ok=True)
+            os.replace(temporary_path, self.get_blob_path(sha1=sha1))
+            return sha1
+        except BaseException:
+            if os.path.exists(temporary_path):
+                os.remove(temporary_path)
+
+            raise
+
+    def get_blob(self, url: str, sha1: str) -> str:
+        # For Files Whose SHA-1 Is Known Up Front, Returns The Path Of The Cached Copy
+        sha1: str = sha1.lower()
+        if self.has_blob(sha1=sha1):
+            return self.get_blob_path(sha1=sha1)
+
+        with self.session.get(url=url, stream=True, timeout=request_timeout) as response:
+            if response.status_code != 200:
+                raise DownloadError("Downloading %s failed with status %s" % (url, response.status_code))
+
+            self.store_response(response=response, expected_sha1=sha1)
+
+        return self.get_blob_path(sha1=sha1)
+
+    def get_file(self, url: str) -> str:
+        # For Files That Can Change, The Cached Copy Is Revalidated With A Conditional Request
+        entry: Optional[Dict[str, str]] = self.index.get(url)
+        if entry is not None and not self.has_blob(sha1=entry["sha1"]):
+            entry: Optional[Dict[str, str]] = None
+
+        headers: Dict[str, str] = {}
+        if entry is not None:
+            if "etag" in entry:
+                headers["If-None-Match"] = entry["etag"]
+
+            if "last_modified" in entry:
+                headers["If-Modified-Since"] = entry["last_modified"]
+
+        try:
+            with self.session.get(url=url, headers=headers, stream=True, timeout=request_timeout) as response:
+                if response.status_code == 304 and entry is not None:
+                    return self.get_blob_path(sha1=entry["sha1"])
+
+                if response.status_code != 200:
+                    raise DownloadError("Downloading %s failed with status %s" % (url, response.status_code))
+
+                sha1: str = self.store_response(response=response)
+                entry: Dict[str, str] = {"sha1": sha1}
+                if "ETag" in response.headers:
+                    entry["etag"] = response.headers["ETag"]
+
+                if "Last-Modified" in response.headers:
+                    entry["last_modified"] = response.headers["Last-Modified"]
+        except (requests.RequestException, DownloadError):
+            # Offline Or Mojang Is Having A Bad Day, An Older Copy Still Beats Nothing
+            if entry is not None:
+                return self.get_blob_path(sha1=entry["sha1"])
+
+            raise
+
+        self.index[url] = entry
+        self.write_index()
+        return self.get_blob_path(sha1=sha1)
+
+    def get_json(self, url: str, sha1: Optional[str] = None) -> dict:
+        path: str = self.get_file(url=url) if sha1 is None else self.get_blob(url=url, sha1=sha1)
+        with open(path, mode="r", encoding="utf-8") as f:
+            return json.load(f)
+
+
+def link_file(source: str, destination: str):
+    # Hard Links Cost No Space, Copies Are For When The Cache Is On Another File System
+    if os.path.exists(destination):
+        os.remove(destination)
+
+    try:
+        os.link(source, destination)
+    except OSError:
+        shutil.copyfile(source, destination)
@@ -0,0 +1,123 @@
+import argparse
+import asyncio
+import sys
+import time
+from typing import List, Optional
+
+from fake_rcon_server import FakeRconServer, get_fake_response
+
+# Stands In For server.jar When Trying Out server_supervisor.py (And Anything Driving The Server Over RCON)
+# Writes The Same Log Lines Minecraft Does For Startup, Saving, Lag And /debug, Reads Console Commands From stdin,
+#   And Optionally Answers RCON Like FakeRconServer On A Given Port
+tick_seconds: float = 0.05
+
+# As Named In The Log
+dimension_folders: List[str] = ["world", "DIM-1", "DIM1"]
+
+
+def log(message: str, level: str = "INFO"):
+    print("[%s] [Server thread/%s]: %s" % (time.strftime("%H:%M:%S"), level, message), flush=True)
+
+
+class FakeMinecraftServer:
+    def __init__(self, startup_seconds: float = 1.0, tps: float = 20.0, lag_every: Optional[float] = None):
+        self.startup_seconds: float = startup_seconds
+        self.tps: float = tps
+        self.lag_every: Optional[float] = lag_every
+        self.debug_started: Optional[float] = None
+        self.running: bool = True
+
+    def run_command(self, command: str, source: Optional[str] = None) -> str:
+        command: str = command.strip().lstrip("/")
+        if command.startswith("save-all"):
+            self.feedback(message="Saving the game (this may take a moment!)", source=source)
+            if command == "save-all flush":
+                # One Line Per Dimension, All Before The Feedback
+                for dimension_folder in dimension_folders:
+                    log(message="ThreadedAnvilChunkStorage (%s): All chunks are saved" % dimension_folder)
+
+            return self.feedback(message="Saved the game", source=source)
+
+        if command == "debug start":
+            self.debug_started: float = time.time()
+            return self.feedback(message="Started debug profiling", source=source)
+
+        if command == "debug stop" and self.debug_started is not None:
+            seconds: float = time.time() - self.debug_started
+            self.debug_started: Optional[float] = None
+            return self.feedback(message="Stopped debug profiling after %.2f seconds and %d ticks (%.2f ticks per second)" % (seconds, seconds * self.tps, self.tps), source=source)
+
+        if command == "stop":
+            log(message="Stopping the server")
+            self.running: bool = False
+            return ""
+
+        return self.feedback(message=get_fake_response(command=command), source=source)
+
+    @staticmethod
+    def feedback(message: str, source: Optional[str]) -> str:
+        # Commands Sent Over RCON Show Up In The Log Like "[Rcon: Saved the game]"
+        if len(message) > 0:
+            log(message=message if source is None else "[%s: %s]" % (source, message))
+
+        return message
+
+    async def read_console(self):
+        reader: asyncio.StreamReader = asyncio.StreamReader()
+        await asyncio.get_running_loop().connect_read_pipe(lambda: asyncio.StreamReaderProtocol(reader), sys.stdin)
+
+        while self.running:
+            line: bytes = await reader.readline()
+            if len(line) == 0:
+                # stdin Was Closed, Same As The Real Server This Just Keeps Running Until It's Stopped Or Killed
+                return
+
+            self.run_command(command=line.decode("utf-8", errors="replace"))
+
+    async def report_lag(self):
+        while self.running:
+            await asyncio.sleep(self.lag_every)
+            log(message="Can't keep up! Is the server overloaded? Running 2500ms or 50 ticks behind", level="WARN")
+
+    async def run(self, rcon_port: Optional[int] = None, rcon_password: str = ""):
+        log(message="Starting minecraft server version Fake")
+        log(message="Preparing level \"world\"")
+        await asyncio.sleep(self.startup_seconds)
+
+        log(message="Done (%.3fs)! For help, type \"help\"" % self.startup_seconds)
+
+        # Like Vanilla, RCON Only Starts Listening After "Done"
+        rcon_server: Optional[FakeRconServer] = None
+        if rcon_port is not None:
+            rcon_server: FakeRconServer = FakeRconServer(password=rcon_password, handler=lambda command: self.run_command(command=command, source="Rcon"))
+            await rcon_server.start(port=rcon_port)
+            log(message="RCON running on 127.0.0.1:%s" % rcon_server.port)
+
+        tasks: List[asyncio.Task] = [asyncio.ensure_future(self.read_console())]
+        if self.lag_every is not None:
+            tasks.append(asyncio.ensure_future(self.report_lag()))
+
+        while self.running:
+            await asyncio.sleep(tick_seconds)
+
+        for task in tasks:
+            task.cancel()
+
+        if rcon_server is not None:
+            await rcon_server.close()
+
+
+if __name__ == "__main__":
+    parser: argparse.ArgumentParser = argparse.ArgumentParser(description="Pretends To Be A Minecraft Server For Testing The Server Supervisor")
+    parser.add_argument("--startup-seconds", type=float, default=1.0, help="Seconds Before The Server Says It's Done Starting")
+    parser.add_argument("--tps", type=float, default=20.0, help="Ticks Per Second Reported By /debug stop")
+    parser.add_argument("--lag-every", type=float, default=None, help="Seconds Between \"Can't keep up!\" Warnings (Never By Default)")
+    parser.add_argument("--rcon-port", type=int, default=None, help="Port To Answer RCON On (No RCON By Default)")
+    parser.add_argument("--rcon-password", default="", help="RCON Password")
+    arguments: argparse.Namespace = parser.parse_args()
+
+    server: FakeMinecraftServer = FakeMinecraftServer(startup_seconds=arguments.startup_seconds, tps=arguments.tps, lag_every=arguments.lag_every)
+    try:
+        asyncio.run(server.run(rcon_port=arguments.rcon_port, rcon_password=arguments.rcon_password))
+    except KeyboardInterrupt:
+        sys.exit(3)
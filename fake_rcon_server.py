@@ -0,0 +1,111 @@
+import asyncio
+from typing import Callable, List, Optional, Tuple
+
+from rcon_client import RconError, encode_packet, failed_login_id, max_response_fragment, packet_type_command, packet_type_login, packet_type_response, read_packet
+from rcon_client import _packet_header, _packet_length
+
+# Speaks The Server Side Of Minecraft's RCON On Localhost, For Trying Clients Out (And Timing Them) Without A Server
+# Used By The Tests, benchmark.py --rcon And fake_minecraft_server.py, Never By Anything Talking To A Real Server
+# Responses Are Split Into Fragments And Unknown Packet Types Are Answered The Same Way Minecraft Does
+# Requests Are Read Like Vanilla Does (One Read Of Up To 1460 Bytes, Which Has To Be Exactly One Packet Or The Connection Is Dropped),
+#   Unless pipelining Is Set, Then They're Read As A Stream Like Servers That Accept Pipelined Commands
+vanilla_read_size: int = 1460
+
+
+class FakeRconServer:
+    def __init__(self, password: str, handler: Optional[Callable[[str], str]] = None, pipelining: bool = False):
+        self.password: str = password
+        self.pipelining: bool = pipelining
+        self.handler: Callable[[str], str] = handler if handler is not None else get_fake_response
+        self.server: Optional[asyncio.AbstractServer] = None
+        self.port: Optional[int] = None
+
+        # Every Command Received, In The Order It Was Run
+        self.commands: List[str] = []
+
+        # Connections Closed Because A Read Didn't Hold Exactly One Packet
+        self.dropped_connections: int = 0
+
+        # Cleared To Hold Back Answers (Commands Are Still Read), E.g. To See A Client Stop Sending
+        self.answering: asyncio.Event = asyncio.Event()
+        self.answering.set()
+
+    async def start(self, port: int = 0) -> int:
+        # Listens On A Free Port Unless One Is Given, The Port Is Returned
+        self.server: asyncio.AbstractServer = await asyncio.start_server(self.handle_client, host="127.0.0.1", port=port)
+        self.port: int = self.server.sockets[0].getsockname()[1]
+        return self.port
+
+    async def handle_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        authenticated: bool = False
+        try:
+            while True:
+                request: Optional[Tuple[int, int, bytes]] = await self.read_request(reader=reader)
+                if request is None:
+                    break
+
+                request_id, packet_type, payload = request
+                if packet_type == packet_type_login:
+                    authenticated: bool = payload.decode("utf-8") == self.password
+                    writer.write(encode_packet(request_id=request_id if authenticated else failed_login_id, packet_type=packet_type_command, payload=""))
+                elif not authenticated:
+                    break
+                elif packet_type == packet_type_command:
+                    command: str = payload.decode("utf-8")
+                    self.commands.append(command)
+
+                    await self.answering.wait()
+                    response: bytes = self.handler(command).encode("utf-8")
+                    for start in range(0, max(len(response), 1), max_response_fragment):
+                        writer.write(encode_packet(request_id=request_id, packet_type=packet_type_response, payload=response[start:start + max_response_fragment].decode("utf-8", errors="replace")))
+                else:
+                    writer.write(encode_packet(request_id=request_id, packet_type=packet_type_response, payload="Unknown request %x" % packet_type))
+
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError, RconError):
+            pass
+        finally:
+            writer.close()
+
+    async def read_request(self, reader: asyncio.StreamReader) -> Optional[Tuple[int, int, bytes]]:
+        # None Means The Connection Is Dropped
+        if self.pipelining:
+            return await read_packet(reader=reader)
+
+        data: bytes = await reader.read(vanilla_read_size)
+        if len(data) == 0:
+            return None
+
+        if len(data) < _packet_length.size + _packet_header.size + 2 or _packet_length.unpack_from(data)[0] != len(data) - _packet_length.size:
+            self.dropped_connections += 1
+            return None
+
+        request_id, packet_type = _packet_header.unpack_from(data, _packet_length.size)
+        return request_id, packet_type, data[_packet_length.size + _packet_header.size:-2]
+
+    async def close(self):
+        if self.server is not None:
+            self.server.close()
+            await self.server.wait_closed()
+
+    async def __aenter__(self) -> "FakeRconServer":
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.close()
+
+
+def get_fake_response(command: str) -> str:
+    # Close Enough To What Minecraft Says For The Commands The Scripts Send
+    arguments: List[str] = command.lstrip("/").split()
+    if arguments[:2] == ["forceload", "add"]:
+        return "Marked chunk %s to be force loaded" % " ".join(arguments[2:])
+
+    if arguments[:2] == ["forceload", "remove"]:
+        return "Unmarked chunk %s for force loading" % " ".join(arguments[2:])
+
+    if arguments[:1] == ["save-all"]:
+        return "Saved the game"
+
+    return ""
@@ -0,0 +1,237 @@
+import glob
+import os
+import shutil
+import time
+from typing import Dict, Iterable, List, NamedTuple, Optional, TextIO, Tuple
+
+import humanize
+
+# Turns Chunk Coordinates Into A Datapack Plan That A Running Server Works Through A Few Chunks At A Time
+# Neighboring Chunks Are Merged Into forceload Rectangles, The Rectangles Are Packed Into Numbered Steps Of At Most
+#   chunk_budget Chunks, And tick.mcfunction Runs The Next Step Once The Previous One Is Finished
+# Progress Is Kept In The cleanup:marker Storage, So A Reload Carries On Where It Left Off:
+#   {plan: <Plan ID>, step: <Next Step>, group: <Group Of Next Step>, state: "ready" | "loading" | "done"}
+plan_storage: str = "cleanup:marker"
+plan_namespace: str = "worldcleaner:plan"
+
+# One forceload Command Can't Load More Than This Many Chunks
+max_forceload_chunks: int = 256
+
+# tick.mcfunction Only Checks Which Group The Next Step Is In, And Each Group Only Checks Its Own Steps,
+#   So Finding The Next Step Doesn't Get Slower With Thousands Of Steps
+steps_per_group: int = 64
+
+default_chunk_budget: int = 64
+
+# Forceloaded Chunks Load Their Entities Asynchronously, So Markers Are Killed This Many Ticks Later
+default_wait_ticks: int = 10
+
+# Called By init.mcfunction And tick.mcfunction (Through Tags That Skip Them While No Plan Has Been Written), So They're Swapped In Last
+entry_functions: List[str] = ["next.mcfunction", "start.mcfunction"]
+
+
+class ChunkRange(NamedTuple):
+    # Inclusive Chunk Coordinates
+    dimension_id: str
+    x1: int
+    z1: int
+    x2: int
+    z2: int
+
+    def chunk_count(self) -> int:
+        return (self.x2 - self.x1 + 1) * (self.z2 - self.z1 + 1)
+
+    def get_block_coordinates(self) -> str:
+        # Cause Forceload Takes Block Coords
+        return "%s %s %s %s" % (self.x1 << 4, self.z1 << 4, self.x2 << 4, self.z2 << 4)
+
+
+def merge_chunk_ranges(dimension_id: str, chunks: Iterable[Tuple[int, int]]) -> List[ChunkRange]:
+    # Runs Of Neighboring Chunks In Each Row Are Merged First, Then Runs Covering The Same Columns In Consecutive Rows
+    # Only The Given Chunks Are Covered, Nothing Extra Gets Loaded
+    rows: Dict[int, List[int]] = {}
+    for x, z in set(chunks):
+        rows.setdefault(z, []).append(x)
+
+    merged: List[ChunkRange] = []
+    # Ranges That Can Still Grow Into The Next Row, Keyed By Their Columns
+    open_ranges: Dict[Tuple[int, int], ChunkRange] = {}
+    previous_z: Optional[int] = None
+    for z in sorted(rows):
+        if previous_z is not None and z != previous_z + 1:
+            merged.extend(open_ranges.values())
+            open_ranges: Dict[Tuple[int, int], ChunkRange] = {}
+
+        row_ranges: Dict[Tuple[int, int], ChunkRange] = {}
+        for x1, x2 in get_row_runs(xs=sorted(rows[z])):
+            if (x1, x2) in open_ranges:
+                row_ranges[(x1, x2)] = open_ranges.pop((x1, x2))._replace(z2=z)
+            else:
+                row_ranges[(x1, x2)] = ChunkRange(dimension_id=dimension_id, x1=x1, z1=z, x2=x2, z2=z)
+
+        # Anything That Didn't Continue Into This Row Is Finished
+        merged.extend(open_ranges.values())
+        open_ranges: Dict[Tuple[int, int], ChunkRange] = row_ranges
+        previous_z: int = z
+
+    merged.extend(open_ranges.values())
+    return sorted(merged, key=lambda chunk_range: (chunk_range.z1, chunk_range.x1))
+
+
+def get_row_runs(xs: List[int]) -> List[Tuple[int, int]]:
+    runs: List[Tuple[int, int]] = []
+    for x in xs:
+        if len(runs) > 0 and runs[-1][1] == x - 1:
+            runs[-1] = (runs[-1][0], x)
+        else:
+            runs.append((x, x))
+
+    return runs
+
+
+def split_chunk_range(chunk_range: ChunkRange, max_chunks: int) -> List[ChunkRange]:
+    # Cuts A Range Into Pieces Of At Most max_chunks Chunks, Whole Rows At A Time Where The Rows Fit
+    if chunk_range.chunk_count() <= max_chunks:
+        return [chunk_range]
+
+    width: int = chunk_range.x2 - chunk_range.x1 + 1
+    if width > max_chunks:
+        piece_width: int = max_chunks
+        piece_height: int = 1
+    else:
+        piece_width: int = width
+        piece_height: int = max_chunks // width
+
+    pieces: List[ChunkRange] = []
+    for z in range(chunk_range.z1, chunk_range.z2 + 1, piece_height):
+        for x in range(chunk_range.x1, chunk_range.x2 + 1, piece_width):
+            pieces.append(chunk_range._replace(x1=x, z1=z, x2=min(x + piece_width - 1, chunk_range.x2), z2=min(z + piece_height - 1, chunk_range.z2)))
+
+    return pieces
+
+
+def get_group(step: int) -> int:
+    # Steps Start At 1
+    return (step - 1) // steps_per_group
+
+
+class ForceloadPlanWriter:
+    def __init__(self, plan_folder: str, chunk_budget: int = default_chunk_budget, wait_ticks: int = default_wait_ticks):
+        if chunk_budget < 1:
+            raise ValueError("The chunk budget has to be at least 1, not %s" % chunk_budget)
+
+        self.plan_folder: str = plan_folder
+        self.chunk_budget: int = chunk_budget
+        self.max_range_chunks: int = min(chunk_budget, max_forceload_chunks)
+        self.wait_ticks: int = wait_ticks
+
+        # A New ID Makes Servers Start This Plan From The First Step, Instead Of Wherever The Last Plan Was
+        self.plan_id: int = int(time.time())
+
+        self.steps: int = 0
+        self.chunks: int = 0
+        self.pending: List[ChunkRange] = []
+        self.pending_chunks: int = 0
+        self.closed: bool = False
+
+        # The Plan Is Written Next To The Old One And Only Swapped In By close(), So An Interrupted Run Leaves The Old Plan Working
+        self.staging_folder: str = os.path.join(os.path.dirname(os.path.abspath(plan_folder)), ".%s.partial" % os.path.basename(os.path.abspath(plan_folder)))
+        shutil.rmtree(self.staging_folder, ignore_errors=True)
+        os.makedirs(self.staging_folder)
+
+    def add_chunks(self, dimension_id: str, chunks: List[Tuple[int, int]]):
+        # Steps Are Written As Soon As They Are Full, So Only The Current Step Is Kept
+        for merged_range in merge_chunk_ranges(dimension_id=dimension_id, chunks=chunks):
+            for chunk_range in split_chunk_range(chunk_range=merged_range, max_chunks=self.max_range_chunks):
+                if self.pending_chunks + chunk_range.chunk_count() > self.chunk_budget:
+                    self.write_step()
+
+                self.pending.append(chunk_range)
+                self.pending_chunks += chunk_range.chunk_count()
+                self.chunks += chunk_range.chunk_count()
+
+    def write_step(self):
+        if len(self.pending) == 0:
+            return
+
+        self.steps += 1
+        step: int = self.steps
+
+        with self.open_function(name="step_%s" % step) as step_function:
+            # Keeps tick.mcfunction From Starting Another Step Until This One Is Released
+            step_function.write("data modify storage %s state set value \"loading\"\n" % plan_storage)
+            step_function.write("say Killing Markers In %s Chunks - (On Step %s, %s Chunks So Far)\n" % (humanize.intcomma(self.pending_chunks), humanize.intcomma(step), humanize.intcomma(self.chunks)))
+            for chunk_range in self.pending:
+                step_function.write("execute in %s run forceload add %s\n" % (chunk_range.dimension_id, chunk_range.get_block_coordinates()))
+
+            step_function.write("schedule function %s/release_%s %st\n" % (plan_namespace, step, self.wait_ticks))
+
+        with self.open_function(name="release_%s" % step) as release_function:
+            for dimension_id in sorted(set(chunk_range.dimension_id for chunk_range in self.pending)):
+                release_function.write("execute in %s run kill @e[type=minecraft:marker]\n" % dimension_id)
+
+            # Only What This Step Loaded, Other Forceloaded Chunks Stay Loaded
+            for chunk_range in self.pending:
+                release_function.write("execute in %s run forceload remove %s\n" % (chunk_range.dimension_id, chunk_range.get_block_coordinates()))
+
+            release_function.write("data merge storage %s {step: %s, group: %s, state: \"ready\"}\n" % (plan_storage, step + 1, get_group(step=step + 1)))
+
+        self.pending: List[ChunkRange] = []
+        self.pending_chunks: int = 0
+
+    def close(self):
+        self.write_step()
+
+        # Running Past The Last Step Finishes The Plan
+        final_step: int = self.steps + 1
+        final_group: int = get_group(step=final_step)
+
+        with self.open_function(name="next") as next_function:
+            next_function.write("# Called By tick.mcfunction Whenever The Last Step Is Done\n")
+            for group in range(final_group + 1):
+                next_function.write("execute if data storage %s {group: %s} run function %s/group_%s\n" % (plan_storage, group, plan_namespace, group))
+
+        for group in range(final_group + 1):
+            with self.open_function(name="group_%s" % group) as group_function:
+                for step in range(group * steps_per_group + 1, min((group + 1) * steps_per_group, final_step) + 1):
+                    target: str = "done" if step == final_step else "step_%s" % step
+                    group_function.write("execute if data storage %s {step: %s} run function %s/%s\n" % (plan_storage, step, plan_namespace, target))
+
+        with self.open_function(name="done") as done_function:
+            done_function.write("say Marker Cleanup Finished - %s Chunks In %s Steps\n" % (humanize.intcomma(self.chunks), humanize.intcomma(self.steps)))
+            done_function.write("data modify storage %s state set value \"done\"\n" % plan_storage)
+
+        with self.open_function(name="start") as start_function:
+            start_function.write("# Called By init.mcfunction On Every (Re)Load\n")
+            start_function.write("execute unless data storage %s {plan: %s} run data merge storage %s {plan: %s, step: 1, group: 0, state: \"ready\"}\n" % (plan_storage, self.plan_id, plan_storage, self.plan_id))
+            start_function.write("# A Step That Was Cut Off By A Reload Is Run Again, Forceloading The Same Chunks Twice Is Harmless\n")
+            start_function.write("execute if data storage %s {state: \"loading\"} run data modify storage %s state set value \"ready\"\n" % (plan_storage, plan_storage))
+
+        self.install()
+        self.closed: bool = True
+
+    def install(self):
+        # Swaps The Finished Plan In, Each Function Is Replaced Whole
+        os.makedirs(self.plan_folder, exist_ok=True)
+        new_functions: List[str] = sorted(os.listdir(self.staging_folder), key=lambda name: (name in entry_functions, name))
+        for name in new_functions:
+            os.replace(os.path.join(self.staging_folder, name), os.path.join(self.plan_folder, name))
+
+        # Steps Left Over From A Bigger Plan Would Still Be Loaded By The Server
+        for old_function in glob.glob(os.path.join(self.plan_folder, "*.mcfunction")):
+            if os.path.basename(old_function) not in new_functions:
+                os.remove(old_function)
+
+        os.rmdir(self.staging_folder)
+
+    def abort(self):
+        # Throws Away An Unfinished Plan (Does Nothing After close()), The Old Plan Stays As It Was
+        if self.closed:
+            return
+
+        # Without Any Plan The Datapack's Optional Tags Call Nothing, So There's No Need To Write An Empty One
+        shutil.rmtree(self.staging_folder, ignore_errors=True)
+        self.closed: bool = True
+
+    def open_function(self, name: str) -> TextIO:
+        return open(os.path.join(self.staging_folder, "%s.mcfunction" % name), mode="w")
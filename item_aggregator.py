@@ -0,0 +1,95 @@
+import csv
+import sys
+from collections import Counter
+from typing import List, Optional, Tuple
+
+# Item Totals That Can Be Built Up Separately (Per Chunk, Per Region Or Per Worker) And Merged In Any Order
+# Keys Are (Item ID, Dimension, Container), With Dimension And Container Left Empty Unless A Breakdown Was Asked For
+ItemKey = Tuple[str, str, str]
+
+
+class ItemAggregate:
+    def __init__(self, by_dimension: bool = False, by_container: bool = False, id_header: str = "Item ID"):
+        self.by_dimension: bool = by_dimension
+        self.by_container: bool = by_container
+        # Also Used For Block Totals, Which Only Differ In What The First Column Is Called
+        self.id_header: str = id_header
+        self.counts: Counter = Counter()
+
+    def add(self, item_id: str, count: int, dimension: Optional[str] = None, container: Optional[str] = None):
+        # Interned So Millions Of Keys Share The Same Few Thousand Strings
+        key: ItemKey = (sys.intern(item_id),
+                        sys.intern(dimension) if self.by_dimension and dimension is not None else "",
+                        sys.intern(container) if self.by_container and container is not None else "")
+        self.counts[key] += count
+
+    def merge(self, other: "ItemAggregate") -> "ItemAggregate":
+        if other.by_dimension != self.by_dimension or other.by_container != self.by_container:
+            raise ValueError("Cannot Merge Item Totals With Different Breakdowns!!!")
+
+        # Counter.update() Adds Counts Together, So Merging Is Associative And Order Doesn't Matter
+        self.counts.update(other.counts)
+        return self
+
+    def get_counts(self) -> List[list]:
+        # [Item ID, Dimension, Container, Count] Rows, So Totals Can Be Stored As JSON
+        return [[item_id, dimension, container, count] for (item_id, dimension, container), count in self.counts.items()]
+
+    def add_counts(self, counts: List[list]) -> "ItemAggregate":
+        # Inverse Of get_counts(...)
+        for item_id, dimension, container, count in counts:
+            self.counts[(sys.intern(item_id), sys.intern(dimension), sys.intern(container))] += count
+
+        return self
+
+    def get_total(self) -> int:
+        return sum(self.counts.values())
+
+    def get_header(self) -> List[str]:
+        header: List[str] = [self.id_header]
+        if self.by_dimension:
+            header.append("Dimension")
+
+        if self.by_container:
+            header.append("Container")
+
+        header.extend(["Count", "Total"])
+        return header
+
+    def get_rows(self) -> List[list]:
+        # Largest Counts First, Ties Broken By Key So The Output Is The Same Every Run
+        total: int = self.get_total()
+        rows: List[list] = []
+        for (item_id, dimension, container), count in sorted(self.counts.items(), key=lambda entry: (-entry[1], entry[0])):
+            row: list = [item_id]
+            if self.by_dimension:
+                row.append(dimension)
+
+            if self.by_container:
+                row.append(container)
+
+            row.extend([count, total])
+            rows.append(row)
+
+        return rows
+
+    def format_table(self) -> str:
+        header: List[str] = self.get_header()
+        rows: List[List[str]] = [[str(value) for value in row] for row in self.get_rows()]
+        widths: List[int] = [max([len(header[column])] + [len(row[column]) for row in rows]) for column in range(len(header))]
+
+        # Text Columns Are Left Aligned, Counts Are Right Aligned
+        text_columns: int = len(header) - 2
+        lines: List[str] = []
+        for row in [header] + rows:
+            cells: List[str] = [value.ljust(widths[column]) if column < text_columns else value.rjust(widths[column])
+                                for column, value in enumerate(row)]
+            lines.append("  ".join(cells).rstrip())
+
+        return "\n".join(lines)
+
+    def write_csv(self, csv_path: str):
+        with open(file=csv_path, mode="w", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f)
+            writer.writerow(self.get_header())
+            writer.writerows(self.get_rows())
@@ -1,19 +1,34 @@
+import argparse
 import os
 import sys
-import uuid
-import pandas as pd
-from typing import List, Optional
+from typing import List, NamedTuple, Optional, Tuple, Union
 
 import nbt
-from nbt.world import WorldFolder
+
+from item_aggregator import ItemAggregate
+from output_sinks import BlockEntityRecord, ChunkErrorRecord, ItemRecord, format_item, record_from_dict, record_to_dict
+from projected_nbt import get_snbt, is_full_status
+from scan_cache import get_default_cache_path
+from scan_checkpoint import ScanCheckpoint, open_checkpoint
+from scan_engine import ChunkContext, ChunkVisitor, ProjectionPath, RegionTask, get_region_tasks, iter_scan, print_skipped_chunks
+from scan_profile import ScanProfiler, default_top, open_profiler, profile_modes
+from scan_stats import ScanStats, default_stats_file_name, open_stats
 
 # The Purpose Of This Script Is To Help Me Determine What Items Need To Be Sorted In My SSP
 # It's Not Meant For General Public Use
 
-total_item_list: dict = {}
+
+class StorageRecord(NamedTuple):
+    # A Storage Block Entity As It's Printed, contents[i] Lists What items[i] Holds (Shulker Boxes And Bundles)
+    block_entity: BlockEntityRecord
+    contents: List[List[ItemRecord]]
+
+
+# The Records Found In A Chunk (Or Region) And The Item Counts That Go With Them
+ItemCountResult = Tuple[List[Union[StorageRecord, ChunkErrorRecord]], ItemAggregate]
 
 
-def check_block_entities(chunk: nbt.chunk, dimension: str):
+def check_block_entities(chunk: nbt.chunk, dimension: str, records: List[StorageRecord], item_totals: ItemAggregate):
     # The author themselves' mentioned just looking up the data myself and not using nbt.chunk.Chunk
     chunk_data: nbt.nbt = chunk["Level"]
     chunk_status: Optional[str] = None
@@ -23,7 +38,7 @@ def check_block_entities(chunk: nbt.chunk, dimension: str):
         chunk_status: str = chunk_data["Status"]
 
     # If Not full, chunk is not fully generated yet and can be ignored for illegal item searching
-    if chunk_status is not None and chunk_status.value.strip() != "full":
+    if chunk_status is not None and not is_full_status(status=chunk_status.value):
         return
 
     for entity in chunk_data["TileEntities"]:
@@ -31,21 +46,17 @@ def check_block_entities(chunk: nbt.chunk, dimension: str):
         x, y, z = entity["x"].value, entity["y"].value, entity["z"].value
 
         # Check Storages With `Items` tag
-        check_storages(be_id=be_id, entity=entity, x=x, y=y, z=z, dimension=dimension)
+        check_storages(be_id=be_id, entity=entity, x=x, y=y, z=z, dimension=dimension, records=records, item_totals=item_totals)
 
 
 # https://minecraft.fandom.com/wiki/Chunk_format
-def check_storages(be_id: str, entity: nbt.nbt, x: int, y: int, z: int, dimension: str):
+def check_storages(be_id: str, entity: nbt.nbt, x: int, y: int, z: int, dimension: str, records: List[StorageRecord], item_totals: ItemAggregate):
     # https://minecraft.fandom.com/wiki/Chunk_format#Block_entity_format
+    # The Chunk Can Be Shared With Other Visitors (And Cached), So Counts Are Worked Out Here Instead Of Written Back Into Its Tags
     if "Items" in entity and len(entity["Items"]) > 0:
-        # This Code Works, I Just Hid It So I Don't See Coords
-        print("%s - (%s, %s, %s) - %s" % (be_id, x, y, z, dimension))
-
-        # print("%s" % be_id)
-        print("-" * 40)
-
+        custom_name: Optional[str] = None
         if "CustomName" in entity:
-            print("Custom Name: %s" % entity["CustomName"])
+            custom_name: str = str(entity["CustomName"])
 
         items: nbt.nbt = entity["Items"]
         if "Items" in items:
@@ -57,12 +68,16 @@ def check_storages(be_id: str, entity: nbt.nbt, x: int, y: int, z: int, dimensio
         if "totalStoredAmount" in entity:
             tr_storage_unit_count: int = int(entity["totalStoredAmount"].value)
 
+        item_records: List[ItemRecord] = []
+        contents: List[List[ItemRecord]] = []
         for item in items:
-            # Modify Item Count So It Represents TechReborn Storage Units
+            count: int = int(item["Count"].value)
+
+            # Item Count Represents TechReborn Storage Units
             # Only Slot 1 (Output Slot) Counts For The Total Storage Units.
             #     Slot 0 (Input Slot) Doesn't Count, Even If It Has Items In It
             if tr_storage_unit_count is not None and int(item["Slot"].value) == 1:
-                item["Count"].value = tr_storage_unit_count
+                count: int = tr_storage_unit_count
 
             # Todo: Add Means Of Recursively Findings Contents of Shulkers In Chests (Even Chests With NBT Data)
             #     Make sure to have a limit on the recursion, so check what the vanilla limit is.
@@ -71,142 +86,223 @@ def check_storages(be_id: str, entity: nbt.nbt, x: int, y: int, z: int, dimensio
 
             # We Want To Display The Embedded Storage First, Then The Items Inside
             # TODO: Note: This Isn't Recursive, So Won't Display Bundles In Bundles Or Bundles In Shulker Boxes
-            print_item(item=item)
-            add_item(item=item)
+            item_records.append(get_item(item=item, count=count))
+            add_item(item_id=str(item["id"].value), count=count, item_totals=item_totals, dimension=dimension, container=be_id)
+
+            embedded_items: List[nbt.nbt] = []
             if "tag" in item and "BlockEntityTag" in item["tag"] and "Items" in item["tag"]["BlockEntityTag"] and len(item["tag"]["BlockEntityTag"]["Items"]) > 0:
                 # Shulker Boxes
-                print("-"*20)
-                for embedded_item in item["tag"]["BlockEntityTag"]["Items"]:
-                    print_item(item=embedded_item)
-
-                    # To Take Care Of Stacked Shulker Boxes (e.g. in TR Storage Units)
-                    if int(item["Count"].value) > 1:
-                        embedded_item["Count"].value = int(embedded_item["Count"].value) * int(item["Count"].value)
-
-                    add_item(item=embedded_item)
-                print("-"*20)
+                embedded_items: nbt.nbt = item["tag"]["BlockEntityTag"]["Items"]
             elif "tag" in item and "Items" in item["tag"] and len(item["tag"]["Items"]) > 0:
                 # Bundles
-                print("-"*20)
-                for embedded_item in item["tag"]["Items"]:
-                    print_item(item=embedded_item)
+                embedded_items: nbt.nbt = item["tag"]["Items"]
 
-                    # To Take Care Of Stacked Bundles (e.g. in TR Storage Units)
-                    if int(item["Count"].value) > 1:
-                        embedded_item["Count"].value = int(embedded_item["Count"].value) * int(item["Count"].value)
+            contents.append([get_item(item=embedded_item) for embedded_item in embedded_items])
+            for embedded_item in embedded_items:
+                # To Take Care Of Stacked Shulker Boxes And Bundles (e.g. in TR Storage Units)
+                embedded_count: int = int(embedded_item["Count"].value)
+                if count > 1:
+                    embedded_count *= count
 
-                    add_item(item=embedded_item)
-                print("-"*20)
+                add_item(item_id=str(embedded_item["id"].value), count=embedded_count, item_totals=item_totals, dimension=dimension, container=str(item["id"].value))
 
-        print("-" * 40)
-        print(" ")
+        records.append(StorageRecord(block_entity=BlockEntityRecord(kind="storage", dimension=dimension, id=be_id, x=x, y=y, z=z, custom_name=custom_name, items=item_records),
+                                     contents=contents))
 
 
-def add_item(item: nbt.nbt):
+def add_item(item_id: str, count: int, item_totals: ItemAggregate, dimension: str, container: str):
     # Block Entity Names Used To Not Be Prefixed With "minecraft:". E.g. Chest instead of minecraft:chest
     # Block Entities Could Still Have The Item ID System - https://minecraft-ids.grahamedgecombe.com/
+    # Container Is The Block Entity Holding The Item, Or The Shulker Box/Bundle For Embedded Items
+    item_totals.add(item_id=item_id, count=count, dimension=dimension, container=container)
 
-    if str(item["id"].value) in total_item_list:
-        total_item_list[str(item["id"].value)]["Count"] += int(item["Count"].value)
-    else:
-        total_item_list[str(item["id"].value)] = {}
-        total_item_list[str(item["id"].value)]["Count"] = int(item["Count"].value)
 
-
-def print_item(item: nbt.nbt):
-    # Block Entity Names Used To Not Be Prefixed With "minecraft:". E.g. Chest instead of minecraft:chest
-    # Block Entities Could Still Have The Item ID System - https://minecraft-ids.grahamedgecombe.com/
-    # TODO: Make Something Cleaner Than Nested If Statements And Copied Messages
+def get_item(item: nbt.nbt, count: Optional[int] = None) -> ItemRecord:
+    slot: Optional[int] = None
     if "Slot" in item:
-        if "tag" in item:
-            print("%s - Slot: %s - Count: %s - Tag: %s" % (item["id"], item["Slot"], item["Count"], item["tag"]))
-        else:
-            print("%s - Slot: %s - Count: %s" % (item["id"], item["Slot"], item["Count"]))
-    else:
-        if "tag" in item:
-            print("%s - Count: %s - Tag: %s" % (item["id"], item["Count"], item["tag"]))
-        else:
-            print("%s - Count: %s" % (item["id"], item["Count"]))
-
-
-def main_single_player(world_folder: str):
-    nether_path: str = os.path.join(world_folder, "DIM-1")
-    overworld_path: str = world_folder
-    the_end_path: str = os.path.join(world_folder, "DIM1")
-    custom_dimensions_path: str = os.path.join(world_folder, "dimensions")
-
-    dimensions_to_scan: List[str] = [overworld_path]
-
-    # If The Nether Exists, Add To The Scan List
-    if os.path.exists(nether_path):
-        dimensions_to_scan.append(nether_path)
-
-    # If The End Exists, Add To The Scan List
-    if os.path.exists(the_end_path):
-        dimensions_to_scan.append(the_end_path)
-
-    # If Custom Dimensions Exist, Add To The Scan List
-    if os.path.exists(custom_dimensions_path):
-        for namespace in os.listdir(custom_dimensions_path):
-            namespace_path: str = os.path.join(custom_dimensions_path, namespace)
-            if os.path.isfile(namespace_path):
-                continue
-
-            for dimension in os.listdir(namespace_path):
-                dimension_path: str = os.path.join(namespace_path, dimension)
-                if os.path.isfile(dimension_path):
-                    continue
-
-                # print(dimension_path)
-                dimensions_to_scan.append(dimension_path)
+        slot: int = int(item["Slot"].value)
+
+    # Item Tags Are Kept As SNBT, The Same As scanner.py
+    tag: Optional[str] = None
+    if "tag" in item:
+        tag: str = get_snbt(tag=item["tag"])
+
+    return ItemRecord(id=str(item["id"]), count=int(item["Count"].value) if count is None else count, slot=slot, tag=tag)
+
+
+def format_storage_record(record: Union[StorageRecord, ChunkErrorRecord]) -> List[str]:
+    # Returns The Lines This Script Used To Print For The Record
+    if isinstance(record, ChunkErrorRecord):
+        return [
+            "Failed To Read Chunk (%s, %s) Due To Invalid Data!!!" % (record.chunk_x, record.chunk_z),
+            "-" * 40,
+            "Trace: %s" % record.error,
+            "-" * 40
+        ]
+
+    block_entity: BlockEntityRecord = record.block_entity
+    lines: List[str] = ["%s - (%s, %s, %s) - %s" % (block_entity.id, block_entity.x, block_entity.y, block_entity.z, block_entity.dimension), "-" * 40]
+    if block_entity.custom_name is not None:
+        lines.append("Custom Name: %s" % block_entity.custom_name)
+
+    for item, embedded_items in zip(block_entity.items, record.contents):
+        lines.append(format_item(item=item))
+        if len(embedded_items) > 0:
+            lines.append("-" * 20)
+            lines.extend([format_item(item=embedded_item) for embedded_item in embedded_items])
+            lines.append("-" * 20)
+
+    lines.append("-" * 40)
+    lines.append(" ")
+    return lines
+
+
+def encode_storage_record(record: Union[StorageRecord, ChunkErrorRecord]) -> dict:
+    if isinstance(record, ChunkErrorRecord):
+        return record_to_dict(record=record)
+
+    return {"block_entity": record_to_dict(record=record.block_entity), "contents": [[item._asdict() for item in items] for items in record.contents]}
+
+
+def decode_storage_record(record_dict: dict) -> Union[StorageRecord, ChunkErrorRecord]:
+    # Inverse Of encode_storage_record(...)
+    if "block_entity" not in record_dict:
+        return record_from_dict(record_dict=record_dict)
+
+    return StorageRecord(block_entity=record_from_dict(record_dict=record_dict["block_entity"]),
+                         contents=[[ItemRecord(**item) for item in items] for items in record_dict["contents"]])
 
+
+class ItemCountVisitor(ChunkVisitor):
+    # Results Are The Storages Found In Each Chunk And Their Item Counts, Handed Back Merged Into One Per Region
+    # Only The Tags Read By check_block_entities(...) Get Decoded
+    terrain_paths: List[ProjectionPath] = [
+        ("Level", "Status"),
+        ("Level", "TileEntities")
+    ]
+
+    def __init__(self, by_dimension: bool = False, by_container: bool = False):
+        self.by_dimension: bool = by_dimension
+        self.by_container: bool = by_container
+
+        # Breakdowns Are Part Of The Cached Totals, So Each Combination Gets Its Own Namespace
+        self.name: str = "item_counter"
+        if by_dimension:
+            self.name += ":dimension"
+
+        if by_container:
+            self.name += ":container"
+
+    def full_chunks_only(self, task: RegionTask) -> bool:
+        # check_block_entities(...) Ignores Chunks That Aren't Fully Generated
+        return True
+
+    def new_totals(self) -> ItemAggregate:
+        return ItemAggregate(by_dimension=self.by_dimension, by_container=self.by_container)
+
+    def empty_result(self, context: ChunkContext) -> ItemCountResult:
+        return [], self.new_totals()
+
+    def visit(self, chunk: nbt.nbt.NBTFile, context: ChunkContext) -> ItemCountResult:
+        # Records Are Printed By The Front-End, In Region Order
+        records: List[Union[StorageRecord, ChunkErrorRecord]] = []
+        item_totals: ItemAggregate = self.new_totals()
+
+        # Check Block Entities
+        check_block_entities(chunk=chunk, dimension=context.dimension, records=records, item_totals=item_totals)
+        return records, item_totals
+
+    def is_empty(self, result: ItemCountResult) -> bool:
+        return len(result[0]) == 0 and len(result[1].counts) == 0
+
+    def combine_results(self, results: List[Tuple[ChunkContext, ItemCountResult]]) -> List[Tuple[ChunkContext, ItemCountResult]]:
+        # One Result Per Region (Under The First Chunk), So The Parent Merges One Total Per Region Instead Of One Per Chunk
+        if len(results) <= 1:
+            return results
+
+        region_records: List[Union[StorageRecord, ChunkErrorRecord]] = []
+        region_totals: ItemAggregate = self.new_totals()
+        for _, (records, item_totals) in results:
+            region_records.extend(records)
+            region_totals.merge(other=item_totals)
+
+        return [(results[0][0], (region_records, region_totals))]
+
+    def encode_result(self, result: ItemCountResult) -> list:
+        return [[encode_storage_record(record=record) for record in result[0]], result[1].get_counts()]
+
+    def decode_result(self, value: list) -> ItemCountResult:
+        return [decode_storage_record(record_dict=record_dict) for record_dict in value[0]], self.new_totals().add_counts(counts=value[1])
+
+    def error(self, context: ChunkContext, error: Exception) -> ItemCountResult:
+        return [ChunkErrorRecord(dimension=context.dimension, region=os.path.basename(context.region_path), chunk_x=context.x, chunk_z=context.z, error=str(error))], self.new_totals()
+
+
+def main_single_player(world_folder: str, workers: int = 1, cache_path: Optional[str] = None, by_dimension: bool = False, by_container: bool = False, stats: Optional[ScanStats] = None, profiler: Optional[ScanProfiler] = None, checkpoint: Optional[ScanCheckpoint] = None):
+    visitor: ItemCountVisitor = ItemCountVisitor(by_dimension=by_dimension, by_container=by_container)
+
+    item_totals: ItemAggregate = ItemAggregate(by_dimension=by_dimension, by_container=by_container)
+    skipped_chunks: int = 0
     try:
-        for dimension in dimensions_to_scan:
-            try:
-                world = WorldFolder(dimension)
-            except nbt.world.UnknownWorldFormat:
-                # E.g Empty World
-                continue
-
-            # For Retrieving The Right Dimension Name Regardless Of Trailing Slashes
-            # TODO: Grab Actual In Game Dimension Names (Like With /execute in namespace:dimension_name) When Possible
-            if dimension.endswith("/") or dimension.endswith("\\"):
-                dimension_folder_name: str = os.path.basename(os.path.dirname(dimension))
-            else:
-                dimension_folder_name: str = os.path.basename(dimension)
-
-            for chunk in world.iter_nbt():
-                try:
-                    # Check Block Entities
-                    check_block_entities(chunk=chunk, dimension=dimension_folder_name)
-                except UnicodeDecodeError as e:
-                    # This won't catch the issue as the issue is in world.iter_nbt(), not check_storages(...)
-                    # hermitcraft6 currently breaks the scanner. Docm77 Alien Tech Books Are To Blame
-                    # TODO: See Bug Report With Patch For Fix: https://github.com/twoolie/NBT/issues/144
-                    print("Failed To Read Chunk (%s, %s) Due To Invalid Data!!!" % ("x", "z"))
-                    print("-" * 40)
-                    print("Trace: %s" % e)
-                    print("-" * 40)
-
-        df = pd.DataFrame.from_dict(total_item_list, orient="index")
-        df.index.name = "Item ID"
-        df.sort_values(axis=0, ascending=False, inplace=True, by=["Count"])
-        df["Total"] = df["Count"].sum()
+        for region_result in iter_scan(region_tasks=get_region_tasks(world_folder=world_folder), visitors=[visitor], workers=workers, cache_path=cache_path, stats=stats, profiler=profiler, checkpoint=checkpoint):
+            for _, (records, chunk_item_totals) in region_result.results[visitor.name]:
+                for record in records:
+                    print("\n".join(format_storage_record(record=record)))
+
+                item_totals.merge(other=chunk_item_totals)
+
+            skipped_chunks += region_result.skipped_chunks
+
         print("-"*100)
-        print(df)
-        df.to_csv(os.path.join(world_folder, "total_item_list.csv"))
+        print(item_totals.format_table())
+        item_totals.write_csv(csv_path=os.path.join(world_folder, "total_item_list.csv"))
+        print_skipped_chunks(skipped_chunks=skipped_chunks)
     except KeyboardInterrupt:
         return 3
 
 
 if __name__ == "__main__":
-    if len(sys.argv) == 1:
+    parser: argparse.ArgumentParser = argparse.ArgumentParser(description="Counts Every Item Stored In A World")
+    parser.add_argument("world_folder", nargs="?", default=None, help="Path To The World Folder")
+    parser.add_argument("--workers", type=int, default=1, help="Number Of Processes To Scan Region Files With")
+    parser.add_argument("--stats", nargs="?", default=None, const="", help="Show Live Progress And Write Throughput And Phase Timings (Optionally Takes A Report File Path, Defaults To %s)" % default_stats_file_name)
+    parser.add_argument("--profile", nargs="?", default=None, const="", help="Profile The Scan Across Worker Processes (Optionally Takes An Output File Path, Defaults To scan_profile.pstats Or scan_profile.folded)")
+    parser.add_argument("--profile-mode", choices=profile_modes, default="cprofile", help="Deterministic cProfile Or Low Overhead Stack Sampling")
+    parser.add_argument("--profile-top", type=int, default=default_top, help="Number Of Functions To Show In The Profile Summary")
+    parser.add_argument("--checkpoint", nargs="?", default=None, const="", help="Save Finished Regions So An Interrupted Scan Can Be Resumed (Optionally Takes A File Path, Defaults To A File In The World Folder)")
+    parser.add_argument("--resume", action="store_true", help="Continue An Interrupted Scan After The Last Region It Finished (Implies --checkpoint)")
+    parser.add_argument("--cache", nargs="?", default=None, const="", help="Reuse Results Of Chunks That Haven't Changed Since The Last Run (Optionally Takes A Cache File Path)")
+    parser.add_argument("--by-dimension", action="store_true", help="Break Down Totals By Dimension")
+    parser.add_argument("--by-container", action="store_true", help="Break Down Totals By Container Type")
+    arguments: argparse.Namespace = parser.parse_args()
+
+    if arguments.world_folder is None:
         print("No World Folder Specified!!!")
         sys.exit(1)
 
-    world_folder_path: str = sys.argv[1]
+    world_folder_path: str = arguments.world_folder
     if not os.path.exists(world_folder_path):
         print("World Folder Does Not Exist!!!")
         sys.exit(2)
 
-    sys.exit(main_single_player(world_folder=world_folder_path))
+    # Defaults To A Cache File Inside The World Folder
+    scan_cache_path: Optional[str] = arguments.cache
+    if scan_cache_path == "":
+        scan_cache_path: str = get_default_cache_path(world_folder=world_folder_path)
+
+    scan_stats: Optional[ScanStats] = open_stats(stats_path=arguments.stats)
+    scan_profiler: Optional[ScanProfiler] = open_profiler(profile_path=arguments.profile, mode=arguments.profile_mode, top=arguments.profile_top)
+    scan_checkpoint: Optional[ScanCheckpoint] = open_checkpoint(world_folder=world_folder_path, name="item_counter", checkpoint_path=arguments.checkpoint, resume=arguments.resume)
+    exit_code: Optional[int] = main_single_player(world_folder=world_folder_path, workers=arguments.workers, cache_path=scan_cache_path,
+                                                  by_dimension=arguments.by_dimension, by_container=arguments.by_container, stats=scan_stats, profiler=scan_profiler, checkpoint=scan_checkpoint)
+    if scan_stats is not None:
+        scan_stats.finish()
+
+    if scan_profiler is not None:
+        scan_profiler.finish()
+
+    # Only Kept For --resume When The Scan Was Interrupted
+    if scan_checkpoint is not None:
+        scan_checkpoint.finish(interrupted=exit_code == 3)
+
+    sys.exit(exit_code)
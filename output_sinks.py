@@ -0,0 +1,379 @@
+import csv
+import io
+import json
+import sys
+from typing import Any, Dict, List, NamedTuple, Optional, TextIO, Union
+
+# Checks Produce Typed Records, Sinks Decide How They're Written
+# The Text Sink Reproduces The Original Human Readable Output, The Others Are Meant For Tools
+
+
+class ItemRecord(NamedTuple):
+    id: str
+    count: int
+    slot: Optional[int] = None
+    tag: Optional[str] = None
+
+
+class BlockEntityRecord(NamedTuple):
+    # Kind Is The Check That Produced The Record (storage, lectern or jukebox)
+    kind: str
+    dimension: str
+    id: str
+    x: int
+    y: int
+    z: int
+    custom_name: Optional[str] = None
+    page: Optional[int] = None
+    items: List[ItemRecord] = []
+
+
+class SignRecord(NamedTuple):
+    dimension: str
+    id: str
+    x: int
+    y: int
+    z: int
+    # Pre-1.8 Signs Can't Be Read Yet
+    readable: bool
+    glowing: Any = False
+    color: Optional[str] = None
+    lines: List[str] = []
+
+
+class EntityRecord(NamedTuple):
+    dimension: str
+    id: str
+    x: float
+    y: float
+    z: float
+    block: Optional[str] = None
+    item: Optional[ItemRecord] = None
+    items: List[ItemRecord] = []
+    custom_name: Optional[str] = None
+    health: Optional[float] = None
+    data: Optional[str] = None
+    uuid: Any = None
+
+
+class ChunkErrorRecord(NamedTuple):
+    dimension: str
+    region: str
+    chunk_x: int
+    chunk_z: int
+    error: str
+
+
+Record = Union[BlockEntityRecord, SignRecord, EntityRecord, ChunkErrorRecord]
+
+record_types: Dict[type, str] = {
+    BlockEntityRecord: "block_entity",
+    SignRecord: "sign",
+    EntityRecord: "entity",
+    ChunkErrorRecord: "chunk_error"
+}
+
+record_classes: Dict[str, type] = {record_type: record_class for record_class, record_type in record_types.items()}
+
+# Columns For Flat Formats, Every Record And Every Contained Item Becomes One Row
+row_fields: List[str] = ["record_type", "dimension", "id", "x", "y", "z", "container_id", "slot", "count", "tag",
+                         "custom_name", "page", "glowing", "color", "line_1", "line_2", "line_3", "line_4",
+                         "block", "health", "data", "uuid", "error"]
+
+# Flushed Once This Many Characters (Or Rows) Have Been Buffered
+buffer_size: int = 1 << 16
+
+output_formats: List[str] = ["text", "jsonl", "csv", "parquet"]
+
+
+def record_to_dict(record: Record) -> dict:
+    record_dict: dict = {"record_type": record_types[type(record)]}
+    for field, value in record._asdict().items():
+        if isinstance(value, ItemRecord):
+            value: dict = value._asdict()
+        elif isinstance(value, list) and len(value) > 0 and isinstance(value[0], ItemRecord):
+            value: List[dict] = [item._asdict() for item in value]
+
+        record_dict[field] = value
+
+    return record_dict
+
+
+def record_from_dict(record_dict: dict) -> Record:
+    # Inverse Of record_to_dict(...), For Records Read Back From JSON
+    fields: dict = dict(record_dict)
+    record_class: type = record_classes[fields.pop("record_type")]
+    if fields.get("item") is not None:
+        fields["item"] = ItemRecord(**fields["item"])
+
+    if "items" in fields:
+        fields["items"] = [ItemRecord(**item) for item in fields["items"]]
+
+    return record_class(**fields)
+
+
+def _flat_value(value: Any) -> Any:
+    # Lists (E.g. UUID Int Arrays) Don't Fit Into A Single Column
+    if isinstance(value, list):
+        return json.dumps(value)
+
+    return value
+
+
+def _item_row(item: ItemRecord, container: Record) -> dict:
+    return {
+        "record_type": "item",
+        "dimension": container.dimension,
+        "id": item.id,
+        "x": container.x,
+        "y": container.y,
+        "z": container.z,
+        "container_id": container.id,
+        "slot": item.slot,
+        "count": item.count,
+        "tag": item.tag
+    }
+
+
+def record_to_rows(record: Record) -> List[dict]:
+    row: dict = {"record_type": record_types[type(record)]}
+    items: List[ItemRecord] = []
+
+    if isinstance(record, ChunkErrorRecord):
+        row.update({"dimension": record.dimension, "id": record.region, "x": record.chunk_x, "z": record.chunk_z, "error": record.error})
+        return [row]
+
+    for field, value in record._asdict().items():
+        if field == "items":
+            items.extend(value)
+        elif field == "item":
+            if value is not None:
+                items.append(value)
+        elif field == "lines":
+            for line_number, line in enumerate(value):
+                row["line_%s" % (line_number + 1)] = line
+        elif field in row_fields:
+            row[field] = _flat_value(value)
+
+    rows: List[dict] = [row]
+    for item in items:
+        rows.append(_item_row(item=item, container=record))
+
+    return rows
+
+
+def format_item(item: ItemRecord) -> str:
+    # Block Entity Names Used To Not Be Prefixed With "minecraft:". E.g. Chest instead of minecraft:chest
+    # Block Entities Could Still Have The Item ID System - https://minecraft-ids.grahamedgecombe.com/
+    if item.slot is not None:
+        if item.tag is not None:
+            return "%s - Slot: %s - Count: %s - Tag: %s" % (item.id, item.slot, item.count, item.tag)
+
+        return "%s - Slot: %s - Count: %s" % (item.id, item.slot, item.count)
+
+    if item.tag is not None:
+        return "%s - Count: %s - Tag: %s" % (item.id, item.count, item.tag)
+
+    return "%s - Count: %s" % (item.id, item.count)
+
+
+def format_record(record: Record) -> List[str]:
+    # Returns The Lines The Scanner Used To Print For This Record
+    separator: str = "-" * 40
+    lines: List[str] = []
+
+    if isinstance(record, ChunkErrorRecord):
+        lines.append("Failed To Read Chunk (%s, %s) In %s Due To Invalid Data!!!" % (record.chunk_x, record.chunk_z, record.region))
+        lines.append(separator)
+        lines.append("Trace: %s" % record.error)
+        lines.append(separator)
+        return lines
+
+    header: str = "%s - (%s, %s, %s) - %s" % (record.id, record.x, record.y, record.z, record.dimension)
+
+    if isinstance(record, SignRecord):
+        lines.append(header)
+        lines.append(separator)
+        if not record.readable:
+            lines.append("Cannot Read Pre-1.8 Signs!!! Skipping For Now!!!")
+            lines.append(separator)
+            return lines
+
+        lines.append("Glowing: %s" % record.glowing)
+        lines.append("Color: %s" % record.color)
+        for line_number, line in enumerate(record.lines):
+            lines.append("Line %s: %s" % (line_number + 1, line))
+    elif isinstance(record, BlockEntityRecord) and record.kind == "lectern":
+        # Lecterns Don't Have A Slot Tag
+        if len(record.items) > 0:
+            lines.append(header)
+            lines.append(separator)
+            lines.extend([format_item(item=item) for item in record.items])
+
+        # Check For Page Tag Separately In Case It Doesn't Exist
+        if record.page is not None:
+            lines.append("Page: %s" % record.page)
+    elif isinstance(record, BlockEntityRecord):
+        lines.append(header)
+        lines.append(separator)
+        if record.custom_name is not None:
+            lines.append("Custom Name: %s" % record.custom_name)
+
+        lines.extend([format_item(item=item) for item in record.items])
+    elif isinstance(record, EntityRecord):
+        lines.append(header)
+        lines.append(separator)
+        if record.block is not None:
+            lines.append("Block: %s" % record.block)
+
+        # Item Entities and Item Frames
+        if record.item is not None:
+            lines.append("Item: %s" % format_item(item=record.item))
+
+        lines.extend([format_item(item=item) for item in record.items])
+
+        if record.custom_name is not None:
+            lines.append("Name: %s" % record.custom_name)
+
+        if record.health is not None:
+            lines.append("Health: %s" % record.health)
+
+        if record.data is not None:
+            lines.append("Data: %s" % record.data)
+
+        lines.append("UUID: %s" % record.uuid)
+
+    lines.append(separator)
+    lines.append(" ")
+    return lines
+
+
+class OutputSink:
+    def write(self, record: Record):
+        raise NotImplementedError(self.__class__.__name__)
+
+    def write_all(self, records: List[Record]):
+        for record in records:
+            self.write(record=record)
+
+    def close(self):
+        pass
+
+
+class _StreamSink(OutputSink):
+    def __init__(self, output_path: Optional[str], newline: Optional[str] = None):
+        # No Path (Or "-") Means Standard Output
+        self.should_close: bool = output_path is not None and output_path != "-"
+        if self.should_close:
+            self.stream: TextIO = open(output_path, mode="w", encoding="utf-8", newline=newline, buffering=buffer_size)
+        else:
+            self.stream: TextIO = sys.stdout
+
+        self.buffer: List[str] = []
+        self.buffered: int = 0
+
+    def _append(self, text: str):
+        # Many Small Writes Cost More Than The Scan Itself On Big Worlds, So Batch Them Up
+        self.buffer.append(text)
+        self.buffered += len(text)
+        if self.buffered >= buffer_size:
+            self.flush()
+
+    def flush(self):
+        if len(self.buffer) > 0:
+            self.stream.write("".join(self.buffer))
+            self.buffer.clear()
+            self.buffered = 0
+
+        self.stream.flush()
+
+    def close(self):
+        self.flush()
+        if self.should_close:
+            self.stream.close()
+
+
+class TextSink(_StreamSink):
+    def write(self, record: Record):
+        self._append("\n".join(format_record(record=record)) + "\n")
+
+
+class JsonLinesSink(_StreamSink):
+    def write(self, record: Record):
+        self._append(json.dumps(record_to_dict(record=record), ensure_ascii=False) + "\n")
+
+
+class CsvSink(_StreamSink):
+    def __init__(self, output_path: Optional[str]):
+        super().__init__(output_path=output_path, newline="")
+        self.row_buffer: io.StringIO = io.StringIO()
+        self.writer: csv.DictWriter = csv.DictWriter(self.row_buffer, fieldnames=row_fields)
+        self.writer.writeheader()
+
+    def write(self, record: Record):
+        self.writer.writerows(record_to_rows(record=record))
+        self._append(self.row_buffer.getvalue())
+        self.row_buffer.seek(0)
+        self.row_buffer.truncate()
+
+
+class ParquetSink(OutputSink):
+    def __init__(self, output_path: Optional[str]):
+        if output_path is None or output_path == "-":
+            raise ValueError("Parquet Output Needs A File Path!!!")
+
+        # Optional Dependency, Only Needed When Writing Parquet
+        try:
+            import pyarrow
+            import pyarrow.parquet
+        except ImportError:
+            raise ImportError("Parquet Output Needs pyarrow Installed!!! (pip3 install pyarrow)") from None
+
+        self.pyarrow = pyarrow
+        integer_fields: List[str] = ["slot", "count", "page"]
+        float_fields: List[str] = ["x", "y", "z", "health"]
+        self.schema = pyarrow.schema([(field, pyarrow.int64() if field in integer_fields else pyarrow.float64() if field in float_fields else pyarrow.string())
+                                      for field in row_fields])
+        self.writer = pyarrow.parquet.ParquetWriter(output_path, self.schema)
+        self.rows: List[dict] = []
+
+    def write(self, record: Record):
+        self.rows.extend(record_to_rows(record=record))
+        if len(self.rows) >= buffer_size:
+            self.flush()
+
+    def flush(self):
+        if len(self.rows) == 0:
+            return
+
+        columns: Dict[str, list] = {field: [] for field in row_fields}
+        for row in self.rows:
+            for field in row_fields:
+                value: Any = row.get(field)
+                if value is not None and self.schema.field(field).type == self.pyarrow.string():
+                    value: str = str(value)
+
+                columns[field].append(value)
+
+        self.writer.write_table(self.pyarrow.table(columns, schema=self.schema))
+        self.rows.clear()
+
+    def close(self):
+        self.flush()
+        self.writer.close()
+
+
+def open_sink(output_format: str = "text", output_path: Optional[str] = None) -> OutputSink:
+    if output_format == "text":
+        return TextSink(output_path=output_path)
+
+    if output_format == "jsonl":
+        return JsonLinesSink(output_path=output_path)
+
+    if output_format == "csv":
+        return CsvSink(output_path=output_path)
+
+    if output_format == "parquet":
+        return ParquetSink(output_path=output_path)
+
+    raise ValueError("Unknown Output Format: %s" % output_format)
@@ -0,0 +1,158 @@
+import json
+import os
+import tempfile
+import zlib
+from typing import Dict, FrozenSet, Iterable, List, NamedTuple, Optional, Tuple
+
+import nbt
+
+# Sidecar Index Next To Each Region File, Listing Which Blocks, Block Entities And Entities Each Chunk Has
+# Questions Like "Are There Any Barriers" Are Answered From The Index, Chunks Are Only Decompressed When The Index Says They Have A Match
+# Each Chunk's Entry Is Only Trusted While Its Region Header Timestamp Matches, Same As The Scan Cache
+index_version: int = 1
+index_file_suffix: str = ".palette"
+
+# Tags Read To Build A Chunk's Entry, Only Names And IDs Are Decoded
+index_terrain_paths: List[Tuple[str, ...]] = [
+    # 1.13-1.17
+    ("Level", "Sections", "Palette", "Name"),
+    ("Level", "TileEntities", "id"),
+    ("Level", "Entities", "id"),
+    # 1.18+
+    ("sections", "block_states", "palette", "Name"),
+    ("block_entities", "id")
+]
+
+index_entity_paths: List[Tuple[str, ...]] = [
+    ("Entities", "id")
+]
+
+
+class ChunkSummary(NamedTuple):
+    # Block IDs In The Chunk's Palettes (Without Properties)
+    blocks: FrozenSet[str]
+    block_entities: FrozenSet[str]
+    # Top Level Entities Only, Passengers Aren't Listed
+    entities: FrozenSet[str]
+
+    def contains(self, blocks: Iterable[str] = (), block_entities: Iterable[str] = (), entities: Iterable[str] = ()) -> bool:
+        return (not self.blocks.isdisjoint(blocks)) or (not self.block_entities.isdisjoint(block_entities)) or (not self.entities.isdisjoint(entities))
+
+
+def get_index_path(region_path: str) -> str:
+    # E.g. region/r.0.0.mca.palette, Which Minecraft And get_region_files(...) Both Ignore
+    return region_path + index_file_suffix
+
+
+def get_ids(tags: Optional[nbt.nbt.TAG_List], key: str) -> FrozenSet[str]:
+    if tags is None:
+        return frozenset()
+
+    return frozenset(tag[key].value for tag in tags if key in tag)
+
+
+def get_chunk_summary(chunk: nbt.nbt.NBTFile) -> ChunkSummary:
+    blocks: set = set()
+    block_entities: FrozenSet[str] = frozenset()
+    entities: FrozenSet[str] = frozenset()
+
+    if "Level" in chunk:
+        chunk_data: nbt.nbt.TAG_Compound = chunk["Level"]
+        for section in chunk_data["Sections"] if "Sections" in chunk_data else []:
+            if "Palette" in section:
+                blocks.update(get_ids(tags=section["Palette"], key="Name"))
+
+        block_entities: FrozenSet[str] = get_ids(tags=chunk_data["TileEntities"] if "TileEntities" in chunk_data else None, key="id")
+        entities: FrozenSet[str] = get_ids(tags=chunk_data["Entities"] if "Entities" in chunk_data else None, key="id")
+
+    if "sections" in chunk:
+        for section in chunk["sections"]:
+            if "block_states" in section and "palette" in section["block_states"]:
+                blocks.update(get_ids(tags=section["block_states"]["palette"], key="Name"))
+
+    if "block_entities" in chunk:
+        block_entities: FrozenSet[str] = block_entities | get_ids(tags=chunk["block_entities"], key="id")
+
+    # 1.17+ Entity Chunks
+    if "Entities" in chunk:
+        entities: FrozenSet[str] = entities | get_ids(tags=chunk["Entities"], key="id")
+
+    return ChunkSummary(blocks=frozenset(blocks), block_entities=block_entities, entities=entities)
+
+
+class RegionIndex:
+    # On Disk, Every ID Is Stored Once Per Region And Chunks Refer To Them By Number (Interned), Then The Whole Thing Is zlib Compressed
+    def __init__(self, region_path: str):
+        self.index_path: str = get_index_path(region_path=region_path)
+
+        # (Chunk X, Chunk Z) -> (Timestamp, Summary)
+        self.chunks: Dict[Tuple[int, int], Tuple[int, ChunkSummary]] = {}
+        self.changed: bool = False
+
+    def load(self) -> "RegionIndex":
+        if not os.path.isfile(self.index_path):
+            return self
+
+        try:
+            with open(self.index_path, mode="rb") as f:
+                document: dict = json.loads(zlib.decompress(f.read()))
+        except (OSError, ValueError, zlib.error):
+            # Only Costs Rebuilding The Region's Entries
+            return self
+
+        # Written By Another Version, So Rebuilt Instead Of Misread
+        if document.get("version") != index_version:
+            return self
+
+        names: List[str] = document["names"]
+        for chunk_x, chunk_z, timestamp, blocks, block_entities, entities in document["chunks"]:
+            self.chunks[(chunk_x, chunk_z)] = (timestamp, ChunkSummary(blocks=frozenset(names[name] for name in blocks),
+                                                                       block_entities=frozenset(names[name] for name in block_entities),
+                                                                       entities=frozenset(names[name] for name in entities)))
+
+        return self
+
+    def get_summary(self, x: int, z: int, timestamp: int) -> Optional[ChunkSummary]:
+        # A Timestamp Of 0 Means The Game Never Recorded When The Chunk Was Saved, So It Can't Be Trusted
+        if timestamp == 0 or (x, z) not in self.chunks:
+            return None
+
+        chunk_timestamp, summary = self.chunks[(x, z)]
+        return summary if chunk_timestamp == timestamp else None
+
+    def put_summary(self, x: int, z: int, timestamp: int, summary: ChunkSummary):
+        self.chunks[(x, z)] = (timestamp, summary)
+        self.changed: bool = True
+
+    def save(self):
+        if not self.changed:
+            return
+
+        names: Dict[str, int] = {}
+        chunks: List[list] = []
+        for (chunk_x, chunk_z), (timestamp, summary) in sorted(self.chunks.items()):
+            chunks.append([chunk_x, chunk_z, timestamp] + [[names.setdefault(name, len(names)) for name in sorted(ids)]
+                                                           for ids in [summary.blocks, summary.block_entities, summary.entities]])
+
+        document: dict = {
+            "version": index_version,
+            "names": list(names),
+            "chunks": chunks
+        }
+
+        # Swapped In Whole, So A Reader Never Sees Half An Index
+        try:
+            temporary_file, temporary_path = tempfile.mkstemp(prefix=os.path.basename(self.index_path) + ".", suffix=".tmp", dir=os.path.dirname(self.index_path))
+        except OSError:
+            # E.g. A Read Only World Download, Scanning Still Works Without The Index
+            return
+
+        try:
+            with open(temporary_file, mode="wb") as f:
+                f.write(zlib.compress(json.dumps(document, separators=(",", ":")).encode("utf-8")))
+
+            os.replace(temporary_path, self.index_path)
+            self.changed: bool = False
+        finally:
+            if os.path.exists(temporary_path):
+                os.remove(temporary_path)
@@ -0,0 +1,352 @@
+import argparse
+import asyncio
+import json
+import os
+import shlex
+import sys
+from collections import deque
+from typing import Deque, Dict, Iterator, List, NamedTuple, Optional, Set, Tuple
+
+from nbt.region import RegionFileFormatError
+
+from forceload_plan import ChunkRange, max_forceload_chunks, merge_chunk_ranges, split_chunk_range
+from rcon_client import RconPool, default_port
+from region_reader import MappedRegionFile
+from seed import get_server_command
+from server_supervisor import PerformanceSample, ServerSupervisor
+
+# Generates Every Chunk Within A Radius By Forceloading Them A Batch At A Time Over RCON, So They Can Be Scanned Afterwards
+# How Many Chunks Are Forceloaded At Once Grows While The Server Keeps Up And Is Halved When It Falls Behind,
+#   Chunks Already In The Region Files Are Skipped, And Progress Is Saved So An Interrupted Run Carries On Where It Stopped
+orders: List[str] = ["spiral", "region"]
+
+dimension_folders: Dict[str, str] = {
+    "minecraft:overworld": "",
+    "minecraft:the_nether": "DIM-1",
+    "minecraft:the_end": "DIM1"
+}
+
+default_progress_file_name: str = "pregeneration.json"
+
+# Seconds A Batch Stays Forceloaded, Long Enough For The Server To Generate It Fully
+default_hold_seconds: float = 5.0
+
+# Seconds Between Rounds Of Releasing Held Batches And Forceloading New Ones
+default_round_seconds: float = 1.0
+
+# The Window Is Only Resized This Often, A Little Over The 15 Seconds Vanilla Waits Between "Can't keep up!" Warnings,
+#   So A Period Without A Warning Means The Server Kept Up
+default_adjust_seconds: float = 20.0
+
+# Every /debug Measurement Leaves A Profiling Report Under debug/profiling, So TPS Is Only Measured With --sample-interval
+default_sample_seconds: float = 10.0
+
+
+class PregenerationPlan(NamedTuple):
+    # Block Coordinates For The Center And Radius, The Area Is A Square
+    center_x: int
+    center_z: int
+    radius: int
+    order: str = "spiral"
+    dimension_id: str = "minecraft:overworld"
+
+    def get_chunk_bounds(self) -> Tuple[int, int, int, int]:
+        # Inclusive (Min X, Min Z, Max X, Max Z) In Chunks
+        return (self.center_x - self.radius) >> 4, (self.center_z - self.radius) >> 4, (self.center_x + self.radius) >> 4, (self.center_z + self.radius) >> 4
+
+    def chunk_count(self) -> int:
+        min_x, min_z, max_x, max_z = self.get_chunk_bounds()
+        return (max_x - min_x + 1) * (max_z - min_z + 1)
+
+    def iter_chunks(self) -> Iterator[Tuple[int, int]]:
+        # Always The Same Order For The Same Plan, So A Position In It Is Enough To Resume From
+        if self.order == "region":
+            return iter_region_order(bounds=self.get_chunk_bounds(), center=(self.center_x >> 4, self.center_z >> 4))
+
+        return iter_spiral_order(bounds=self.get_chunk_bounds(), center=(self.center_x >> 4, self.center_z >> 4))
+
+
+def iter_square_ring(center_x: int, center_z: int, ring: int) -> Iterator[Tuple[int, int]]:
+    if ring == 0:
+        yield center_x, center_z
+        return
+
+    for x in range(center_x - ring, center_x + ring + 1):
+        yield x, center_z - ring
+
+    for z in range(center_z - ring + 1, center_z + ring + 1):
+        yield center_x + ring, z
+
+    for x in range(center_x + ring - 1, center_x - ring - 1, -1):
+        yield x, center_z + ring
+
+    for z in range(center_z + ring - 1, center_z - ring, -1):
+        yield center_x - ring, z
+
+
+def iter_spiral(bounds: Tuple[int, int, int, int], center: Tuple[int, int]) -> Iterator[Tuple[int, int]]:
+    # Rings Outwards From The Center, Skipping Whatever Is Outside The Bounds
+    min_x, min_z, max_x, max_z = bounds
+    rings: int = max(center[0] - min_x, max_x - center[0], center[1] - min_z, max_z - center[1])
+    for ring in range(rings + 1):
+        for x, z in iter_square_ring(center_x=center[0], center_z=center[1], ring=ring):
+            if min_x <= x <= max_x and min_z <= z <= max_z:
+                yield x, z
+
+
+def iter_spiral_order(bounds: Tuple[int, int, int, int], center: Tuple[int, int]) -> Iterator[Tuple[int, int]]:
+    # Nearest Chunks First, Which Is The Most Useful Order If The Run Gets Cut Short
+    return iter_spiral(bounds=bounds, center=center)
+
+
+def iter_region_order(bounds: Tuple[int, int, int, int], center: Tuple[int, int]) -> Iterator[Tuple[int, int]]:
+    # Regions Spiral Out From The Center One Whole Region At A Time, So The Server Writes Each Region File Once Instead Of Revisiting It Every Ring
+    min_x, min_z, max_x, max_z = bounds
+    region_bounds: Tuple[int, int, int, int] = (min_x >> 5, min_z >> 5, max_x >> 5, max_z >> 5)
+    for region_x, region_z in iter_spiral(bounds=region_bounds, center=(center[0] >> 5, center[1] >> 5)):
+        for z in range(max(region_z << 5, min_z), min((region_z << 5) + 31, max_z) + 1):
+            for x in range(max(region_x << 5, min_x), min((region_x << 5) + 31, max_x) + 1):
+                yield x, z
+
+
+class GeneratedChunks:
+    # Which Chunks Have An Entry In Their Region File's Header, Read Once Per Region File
+    def __init__(self, region_folder: str):
+        self.region_folder: str = region_folder
+        self.regions: Dict[Tuple[int, int], Set[Tuple[int, int]]] = {}
+
+    def is_generated(self, x: int, z: int) -> bool:
+        region: Tuple[int, int] = (x >> 5, z >> 5)
+        if region not in self.regions:
+            self.regions[region] = self.read_region(region_x=region[0], region_z=region[1])
+
+        return (x & 31, z & 31) in self.regions[region]
+
+    def read_region(self, region_x: int, region_z: int) -> Set[Tuple[int, int]]:
+        region_path: str = os.path.join(self.region_folder, "r.%s.%s.mca" % (region_x, region_z))
+        if not os.path.exists(region_path):
+            return set()
+
+        try:
+            with MappedRegionFile(filename=region_path) as region:
+                return set(region.locations)
+        except RegionFileFormatError:
+            # Broken Headers Get The Whole Region Generated Again
+            return set()
+
+
+class InFlightWindow:
+    # Additive Increase, Multiplicative Decrease: Grows By step While The Server Keeps Up, Halves As Soon As It Doesn't
+    def __init__(self, initial: int = 64, minimum: int = 16, maximum: int = 4096, step: int = 32, min_tps: float = 19.0, max_mspt: float = 45.0):
+        self.size: int = initial
+        self.minimum: int = minimum
+        self.maximum: int = maximum
+        self.step: int = step
+        self.min_tps: float = min_tps
+        self.max_mspt: float = max_mspt
+
+    def update(self, sample: Optional[PerformanceSample], falling_behind: bool) -> int:
+        # Called Once Per Adjustment Period, sample Is Only There When TPS Is Measured
+        if falling_behind or (sample is not None and ((sample.tps is not None and sample.tps < self.min_tps) or (sample.mspt is not None and sample.mspt > self.max_mspt))):
+            self.size: int = max(self.minimum, self.size // 2)
+        else:
+            self.size: int = min(self.maximum, self.size + self.step)
+
+        return self.size
+
+
+class Batch(NamedTuple):
+    ranges: List[ChunkRange]
+    chunks: int
+    # Plan Position Right After This Batch's Last Chunk
+    cursor: int
+    added: float
+
+
+def get_progress_path(world_folder: str) -> str:
+    return os.path.join(world_folder, default_progress_file_name)
+
+
+def load_progress(progress_path: str, plan: PregenerationPlan) -> int:
+    # Returns How Far Into The Plan A Previous Run Got, Progress Of A Different Plan Doesn't Count
+    if not os.path.exists(progress_path):
+        return 0
+
+    try:
+        with open(progress_path, mode="r") as f:
+            progress: dict = json.load(f)
+    except (OSError, ValueError):
+        return 0
+
+    if progress.get("plan") != list(plan):
+        return 0
+
+    return int(progress.get("cursor", 0))
+
+
+def save_progress(progress_path: str, plan: PregenerationPlan, cursor: int):
+    # Written Next To The Old One And Swapped In, So An Interruption Never Leaves Half A File
+    temporary_path: str = progress_path + ".tmp"
+    with open(temporary_path, mode="w") as f:
+        json.dump({"plan": list(plan), "cursor": cursor}, f)
+
+    os.replace(temporary_path, progress_path)
+
+
+def take_chunks(chunks: Iterator[Tuple[int, int]], generated: GeneratedChunks, limit: int) -> Tuple[List[Tuple[int, int]], int]:
+    # Returns Up To limit Chunks That Still Need Generating And How Many Plan Positions Were Used Up Finding Them
+    taken: List[Tuple[int, int]] = []
+    positions: int = 0
+    for x, z in chunks:
+        positions += 1
+        if not generated.is_generated(x=x, z=z):
+            taken.append((x, z))
+            if len(taken) >= limit:
+                break
+
+    return taken, positions
+
+
+async def pregenerate(plan: PregenerationPlan, world_folder: str, supervisor: ServerSupervisor, pool: RconPool, progress_path: Optional[str] = None,
+                      window: Optional[InFlightWindow] = None, hold_seconds: float = default_hold_seconds, round_seconds: float = default_round_seconds,
+                      adjust_seconds: float = default_adjust_seconds, sample_interval: Optional[float] = None, sample_seconds: float = default_sample_seconds) -> int:
+    # Returns How Many Chunks Were Forceloaded
+    # The Window Shrinks On "Can't keep up!" Warnings, With sample_interval TPS Is Also Measured With /debug That Often
+    if progress_path is None:
+        progress_path: str = get_progress_path(world_folder=world_folder)
+
+    if window is None:
+        window: InFlightWindow = InFlightWindow()
+
+    generated: GeneratedChunks = GeneratedChunks(region_folder=os.path.join(world_folder, dimension_folders.get(plan.dimension_id, ""), "region"))
+
+    cursor: int = load_progress(progress_path=progress_path, plan=plan)
+    chunks: Iterator[Tuple[int, int]] = plan.iter_chunks()
+    for _ in range(cursor):
+        next(chunks, None)
+
+    total: int = plan.chunk_count()
+    position: int = cursor
+    forceloaded: int = 0
+    in_flight: Deque[Batch] = deque()
+    in_flight_chunks: int = 0
+
+    loop: asyncio.AbstractEventLoop = asyncio.get_running_loop()
+    last_adjusted: float = loop.time()
+    last_sampled: Optional[float] = None
+
+    # Forceloads Left Behind By An Interrupted Run Would Stay Loaded Forever (This Server Is Only For Scanning)
+    await pool.command(command="execute in %s run forceload remove all" % plan.dimension_id)
+
+    exhausted: bool = False
+    while not exhausted or len(in_flight) > 0:
+        # Fill Up To The Window
+        while not exhausted and in_flight_chunks < window.size:
+            taken, positions = take_chunks(chunks=chunks, generated=generated, limit=min(window.size - in_flight_chunks, max_forceload_chunks))
+            position += positions
+            if len(taken) == 0:
+                exhausted: bool = True
+                break
+
+            ranges: List[ChunkRange] = [piece for merged_range in merge_chunk_ranges(dimension_id=plan.dimension_id, chunks=taken)
+                                        for piece in split_chunk_range(chunk_range=merged_range, max_chunks=max_forceload_chunks)]
+            await pool.run_commands(commands=["execute in %s run forceload add %s" % (chunk_range.dimension_id, chunk_range.get_block_coordinates()) for chunk_range in ranges])
+
+            in_flight.append(Batch(ranges=ranges, chunks=len(taken), cursor=position, added=loop.time()))
+            in_flight_chunks += len(taken)
+            forceloaded += len(taken)
+
+        if len(in_flight) == 0:
+            break
+
+        sample: Optional[PerformanceSample] = None
+        if sample_interval is not None and (last_sampled is None or loop.time() - last_sampled >= sample_interval):
+            # Measuring Takes sample_seconds, Which Stands In For This Round's Wait
+            sample: Optional[PerformanceSample] = await supervisor.measure_performance(pool=pool, seconds=sample_seconds)
+            last_sampled: float = loop.time()
+        else:
+            await asyncio.sleep(round_seconds)
+
+        # Batches Are Held For The Same Time, So They Finish In The Order They Were Added
+        now: float = loop.time()
+        released_cursor: Optional[int] = None
+        while len(in_flight) > 0 and now - in_flight[0].added >= hold_seconds:
+            batch: Batch = in_flight.popleft()
+            await pool.run_commands(commands=["execute in %s run forceload remove %s" % (chunk_range.dimension_id, chunk_range.get_block_coordinates()) for chunk_range in batch.ranges])
+            in_flight_chunks -= batch.chunks
+            released_cursor: int = batch.cursor
+
+        if released_cursor is not None:
+            save_progress(progress_path=progress_path, plan=plan, cursor=released_cursor)
+
+        if sample is not None or now - last_adjusted >= adjust_seconds:
+            window.update(sample=sample, falling_behind=supervisor.is_falling_behind(window=adjust_seconds))
+            last_adjusted: float = now
+
+        print("Position %s/%s - %s Chunks Forceloaded - %s In Flight (Window %s) - TPS %s" % (position, total, forceloaded, in_flight_chunks, window.size,
+                                                                                             "?" if sample is None or sample.tps is None else "%.1f" % sample.tps))
+
+    save_progress(progress_path=progress_path, plan=plan, cursor=position)
+    return forceloaded
+
+
+async def run_pregeneration(plan: PregenerationPlan, world_folder: str, server_command: List[str], server_folder: str, rcon_password: str,
+                            rcon_port: int = default_port, echo: bool = False, hold_seconds: float = default_hold_seconds, sample_interval: Optional[float] = None,
+                            sample_seconds: float = default_sample_seconds):
+    supervisor: ServerSupervisor = ServerSupervisor(command=server_command, cwd=server_folder, echo=echo)
+    await supervisor.start()
+    try:
+        # RCON Work Starts As Soon As The Server Says Its RCON Listener Is Up, Which Is Logged After "Done"
+        await supervisor.wait_until_rcon_ready()
+
+        async with RconPool(password=rcon_password, port=rcon_port) as pool:
+            forceloaded: int = await pregenerate(plan=plan, world_folder=world_folder, supervisor=supervisor, pool=pool, hold_seconds=hold_seconds,
+                                                  sample_interval=sample_interval, sample_seconds=sample_seconds)
+
+            # Makes Sure Every Generated Chunk Is In The Region Files Before Anything Scans Them
+            save_count: int = supervisor.save_count
+            await pool.command(command="save-all flush")
+            await supervisor.wait_for_save(since=save_count)
+
+        print("Forceloaded %s Chunks" % forceloaded)
+    finally:
+        await supervisor.stop()
+
+
+if __name__ == "__main__":
+    parser: argparse.ArgumentParser = argparse.ArgumentParser(description="Generates Every Chunk Within A Radius On A Server, As Fast As The Server Keeps Up With")
+    parser.add_argument("world_folder", nargs="?", default=None, help="Path To The Server's World Folder")
+    parser.add_argument("--radius", type=int, default=10000, help="Radius In Blocks")
+    parser.add_argument("--center", nargs=2, type=int, default=[0, 0], metavar=("X", "Z"), help="Center In Blocks")
+    parser.add_argument("--order", choices=orders, default="spiral", help="Spiral Out Chunk By Chunk, Or Region File By Region File")
+    parser.add_argument("--dimension", choices=list(dimension_folders), default="minecraft:overworld", help="Dimension To Generate")
+    parser.add_argument("--rcon-password", required=True, help="RCON Password Set In server.properties")
+    parser.add_argument("--rcon-port", type=int, default=default_port, help="RCON Port Set In server.properties")
+    parser.add_argument("--server-command", default=None, help="Command That Starts The Server (Defaults To java -jar server.jar nogui)")
+    parser.add_argument("--hold-seconds", type=float, default=default_hold_seconds, help="Seconds Each Batch Stays Forceloaded")
+    parser.add_argument("--sample-interval", type=float, default=None, help="Also Measure TPS With /debug Every This Many Seconds (Each Measurement Leaves A Report Under debug/profiling)")
+    parser.add_argument("--sample-seconds", type=float, default=default_sample_seconds, help="Seconds Each /debug Measurement Runs For")
+    parser.add_argument("--echo", action="store_true", help="Print The Server's Log")
+    arguments: argparse.Namespace = parser.parse_args()
+
+    if arguments.world_folder is None:
+        print("No World Folder Specified!!!")
+        sys.exit(1)
+
+    world_folder_path: str = os.path.abspath(arguments.world_folder)
+
+    # The World Folder Is Inside The Server's Folder
+    server_folder_path: str = os.path.dirname(world_folder_path)
+    if arguments.server_command is not None:
+        command: List[str] = shlex.split(arguments.server_command)
+    else:
+        command: List[str] = get_server_command()
+
+    pregeneration_plan: PregenerationPlan = PregenerationPlan(center_x=arguments.center[0], center_z=arguments.center[1], radius=arguments.radius,
+                                                              order=arguments.order, dimension_id=arguments.dimension)
+    try:
+        asyncio.run(run_pregeneration(plan=pregeneration_plan, world_folder=world_folder_path, server_command=command, server_folder=server_folder_path,
+                                      rcon_password=arguments.rcon_password, rcon_port=arguments.rcon_port, echo=arguments.echo, hold_seconds=arguments.hold_seconds,
+                                      sample_interval=arguments.sample_interval, sample_seconds=arguments.sample_seconds))
+    except KeyboardInterrupt:
+        sys.exit(3)
@@ -0,0 +1,318 @@
+import struct
+from io import BytesIO
+from typing import Dict, FrozenSet, Iterable, NamedTuple, Optional, Tuple
+
+from nbt.nbt import NBTFile, TAG, TAGLIST, TAG_Compound, TAG_List, TAG_Long_Array, TAG_Int, MalformedFileError
+from nbt.nbt import TAG_END, TAG_BYTE, TAG_SHORT, TAG_INT, TAG_LONG, TAG_FLOAT, TAG_DOUBLE
+from nbt.nbt import TAG_BYTE_ARRAY, TAG_STRING, TAG_LIST, TAG_COMPOUND, TAG_INT_ARRAY, TAG_LONG_ARRAY
+
+# Decodes Only The Tags A Check Actually Reads, Everything Else Is Skipped Over By Length Without Being Allocated
+# A Projection Maps Tag Names (As Raw Bytes) To Either A Nested Projection Or None (Keep The Whole Subtree)
+# Lists Of Compounds Are Walked Transparently, So ("Level", "Sections", "Palette") Keeps Just The Palette Of Each Section
+Projection = Dict[bytes, Optional["Projection"]]
+
+_unsigned_short: struct.Struct = struct.Struct(">H")
+_signed_int: struct.Struct = struct.Struct(">i")
+
+# Payload Sizes For Tags That Don't Carry Their Own Length
+_fixed_sizes: Dict[int, int] = {
+    TAG_BYTE: 1,
+    TAG_SHORT: 2,
+    TAG_INT: 4,
+    TAG_LONG: 8,
+    TAG_FLOAT: 4,
+    TAG_DOUBLE: 8
+}
+
+# Element Sizes For The Array Tags
+_array_sizes: Dict[int, int] = {
+    TAG_BYTE_ARRAY: 1,
+    TAG_INT_ARRAY: 4,
+    TAG_LONG_ARRAY: 8
+}
+
+
+# Only Fully Generated Chunks Are Worth Checking (1.20+ Adds The Namespace)
+full_statuses: FrozenSet[str] = frozenset(["full", "minecraft:full"])
+
+
+def is_full_status(status: Optional[str]) -> bool:
+    # A Missing Status Is Treated As Full, Cause Apparently 2b2t World Downloads Have Some Tags Missing
+    return status is None or status.strip() in full_statuses
+
+
+class ChunkHeader(NamedTuple):
+    # Either Can Be Missing (E.g. 2b2t World Downloads Or 1.17+ Entity Chunks)
+    data_version: Optional[int]
+    status: Optional[str]
+
+    def is_full(self) -> bool:
+        # Same As The Checks Do Once The Chunk Is Decoded
+        return is_full_status(status=self.status)
+
+
+class PackedLongArray(TAG_Long_Array):
+    # Keeps The Big Endian Bytes As They Are, So numpy.frombuffer(...) Can Read BlockStates Without A Python int Per Long
+    # value Still Works Like A Normal TAG_Long_Array, It's Just Decoded The First Time It's Asked For
+    raw: Optional[bytes] = None
+
+    @property
+    def value(self) -> Optional[list]:
+        if self._value is None and self.raw is not None:
+            self.update_fmt(len(self.raw) // 8)
+            self._value: list = list(self.fmt.unpack(self.raw))
+
+        return self._value
+
+    @value.setter
+    def value(self, value: Optional[list]):
+        self._value: Optional[list] = value
+        self.raw: Optional[bytes] = None
+
+    def _parse_buffer(self, buffer: BytesIO):
+        length: int = TAG_Int(buffer=buffer).value
+        self.value = None
+        self.raw: bytes = buffer.read(length * 8)
+        if length < 0 or len(self.raw) != length * 8:
+            raise MalformedFileError("Partial File Parse: file possibly truncated.")
+
+
+def make_projection(paths: Iterable[Tuple[str, ...]]) -> Projection:
+    projection: Projection = {}
+    # Shorter Paths First, So A Path That Keeps A Whole Subtree Wins Over Deeper Paths Into It
+    for path in sorted(paths, key=len):
+        current: Optional[Projection] = projection
+        for depth, key in enumerate(path):
+            encoded_key: bytes = key.encode("utf-8")
+            if depth == len(path) - 1:
+                current[encoded_key] = None
+                break
+
+            if encoded_key in current and current[encoded_key] is None:
+                # Already Keeping Everything Below This Key
+                break
+
+            current: Projection = current.setdefault(encoded_key, {})
+
+    return projection
+
+
+def get_string_pattern(value: str) -> bytes:
+    # NBT Strings Are Stored With A Big Endian Unsigned Short Length In Front Of Them
+    # Searching Raw Chunk Bytes For This Rules Out Chunks That Can't Contain The String Without Decoding Them
+    encoded_value: bytes = value.encode("utf-8")
+    return _unsigned_short.pack(len(encoded_value)) + encoded_value
+
+
+def skip_payload(data: bytes, offset: int, tag_type: int) -> int:
+    # Returns The Offset Just After The Payload Of A Tag Of The Given Type
+    if tag_type in _fixed_sizes:
+        return offset + _fixed_sizes[tag_type]
+
+    if tag_type == TAG_STRING:
+        return offset + 2 + _unsigned_short.unpack_from(data, offset)[0]
+
+    if tag_type in _array_sizes:
+        return offset + 4 + _signed_int.unpack_from(data, offset)[0] * _array_sizes[tag_type]
+
+    if tag_type == TAG_LIST:
+        element_type: int = data[offset]
+        length: int = _signed_int.unpack_from(data, offset + 1)[0]
+        offset += 5
+
+        # Lists Of Fixed Size Tags Can Be Jumped Over In One Go
+        if element_type in _fixed_sizes:
+            return offset + length * _fixed_sizes[element_type]
+
+        for _ in range(length):
+            offset: int = skip_payload(data=data, offset=offset, tag_type=element_type)
+
+        return offset
+
+    if tag_type == TAG_COMPOUND:
+        while True:
+            child_type: int = data[offset]
+            offset += 1
+            if child_type == TAG_END:
+                return offset
+
+            # Skip The Name, Then The Payload
+            offset += 2 + _unsigned_short.unpack_from(data, offset)[0]
+            offset: int = skip_payload(data=data, offset=offset, tag_type=child_type)
+
+    raise MalformedFileError("Unrecognised tag type %d" % tag_type)
+
+
+def _parse_payload(buffer: BytesIO, offset: int, tag_type: int, name: Optional[str]) -> Tuple[TAG, int]:
+    # Hands A Kept Subtree To The NBT Library, So Checks Get The Same TAG Objects As A Full Parse
+    if tag_type not in TAGLIST or tag_type == TAG_END:
+        raise MalformedFileError("Unrecognised tag type %d" % tag_type)
+
+    buffer.seek(offset)
+    tag: TAG = PackedLongArray() if tag_type == TAG_LONG_ARRAY else TAGLIST[tag_type]()
+    tag.name = name
+    tag._parse_buffer(buffer)
+
+    return tag, buffer.tell()
+
+
+def _read_compound(data: bytes, buffer: BytesIO, offset: int, projection: Projection, compound: TAG_Compound) -> int:
+    while True:
+        child_type: int = data[offset]
+        offset += 1
+        if child_type == TAG_END:
+            return offset
+
+        name_length: int = _unsigned_short.unpack_from(data, offset)[0]
+        raw_name: bytes = data[offset + 2:offset + 2 + name_length]
+        offset += 2 + name_length
+
+        # Names Are Compared As Raw Bytes, So Skipped Tags Are Never Decoded
+        if raw_name not in projection:
+            offset: int = skip_payload(data=data, offset=offset, tag_type=child_type)
+            continue
+
+        child_projection: Optional[Projection] = projection[raw_name]
+        name: str = raw_name.decode("utf-8")
+
+        if child_projection is not None and child_type == TAG_COMPOUND:
+            child: TAG_Compound = TAG_Compound(name=name)
+            offset: int = _read_compound(data=data, buffer=buffer, offset=offset, projection=child_projection, compound=child)
+        elif child_projection is not None and child_type == TAG_LIST and data[offset] == TAG_COMPOUND:
+            child: TAG_List = TAG_List(type=TAG_Compound, name=name)
+            length: int = _signed_int.unpack_from(data, offset + 1)[0]
+            offset += 5
+
+            for _ in range(length):
+                element: TAG_Compound = TAG_Compound()
+                offset: int = _read_compound(data=data, buffer=buffer, offset=offset, projection=child_projection, compound=element)
+                child.tags.append(element)
+        else:
+            # Either The Whole Subtree Was Asked For Or The Tag Has No Children To Project Into
+            child, offset = _parse_payload(buffer=buffer, offset=offset, tag_type=child_type, name=name)
+
+        compound.tags.append(child)
+
+
+def _read_string(data: bytes, offset: int) -> str:
+    length: int = _unsigned_short.unpack_from(data, offset)[0]
+    return data[offset + 2:offset + 2 + length].decode("utf-8")
+
+
+def read_chunk_header(data: bytes) -> ChunkHeader:
+    # Pulls Out DataVersion And Status (Level.Status Before 1.18, Status After) Without Decoding Anything Else,
+    #   So Chunks That Aren't Fully Generated Can Be Thrown Away Before The Real Decode
+    data_version: Optional[int] = None
+    status: Optional[str] = None
+
+    try:
+        if data[0] != TAG_COMPOUND:
+            raise MalformedFileError("First record is not a Compound Tag")
+
+        offset: int = 3 + _unsigned_short.unpack_from(data, 1)[0]
+        level_offset: Optional[int] = None
+        while True:
+            child_type: int = data[offset]
+            offset += 1
+            if child_type == TAG_END:
+                break
+
+            name_length: int = _unsigned_short.unpack_from(data, offset)[0]
+            raw_name: bytes = data[offset + 2:offset + 2 + name_length]
+            offset += 2 + name_length
+
+            if raw_name == b"DataVersion" and child_type == TAG_INT:
+                data_version: int = _signed_int.unpack_from(data, offset)[0]
+            elif raw_name == b"Status" and child_type == TAG_STRING:
+                status: str = _read_string(data=data, offset=offset)
+            elif raw_name == b"Level" and child_type == TAG_COMPOUND:
+                level_offset: int = offset
+
+            if data_version is not None and (status is not None or level_offset is not None):
+                break
+
+            offset: int = skip_payload(data=data, offset=offset, tag_type=child_type)
+
+        # Walked Separately, So Finding Status In Level Doesn't Depend On Where DataVersion Is
+        offset: Optional[int] = level_offset
+        while status is None and offset is not None:
+            child_type: int = data[offset]
+            offset += 1
+            if child_type == TAG_END:
+                break
+
+            name_length: int = _unsigned_short.unpack_from(data, offset)[0]
+            raw_name: bytes = data[offset + 2:offset + 2 + name_length]
+            offset += 2 + name_length
+
+            if raw_name == b"Status" and child_type == TAG_STRING:
+                status: str = _read_string(data=data, offset=offset)
+            else:
+                offset: int = skip_payload(data=data, offset=offset, tag_type=child_type)
+    except (IndexError, struct.error, UnicodeDecodeError) as e:
+        raise MalformedFileError("Partial File Parse: file possibly truncated. (%s)" % e)
+
+    return ChunkHeader(data_version=data_version, status=status)
+
+
+def read_projected_nbt(data: bytes, projection: Projection) -> NBTFile:
+    # Same Shape As NBTFile(buffer=...), But Only Containing The Projected Tags
+    root: NBTFile = NBTFile()
+
+    try:
+        if data[0] != TAG_COMPOUND:
+            raise MalformedFileError("First record is not a Compound Tag")
+
+        name_length: int = _unsigned_short.unpack_from(data, 1)[0]
+        root.name = data[3:3 + name_length].decode("utf-8")
+
+        _read_compound(data=data, buffer=BytesIO(data), offset=3 + name_length, projection=projection, compound=root)
+    except (IndexError, struct.error) as e:
+        raise MalformedFileError("Partial File Parse: file possibly truncated. (%s)" % e)
+
+    return root
+
+
+_snbt_suffixes: Dict[int, str] = {
+    TAG_BYTE: "b",
+    TAG_SHORT: "s",
+    TAG_INT: "",
+    TAG_LONG: "L",
+    TAG_FLOAT: "f",
+    TAG_DOUBLE: "d"
+}
+
+_snbt_array_prefixes: Dict[int, Tuple[str, str]] = {
+    TAG_BYTE_ARRAY: ("B", "b"),
+    TAG_INT_ARRAY: ("I", ""),
+    TAG_LONG_ARRAY: ("L", "L")
+}
+
+# Names Made Of These Don't Need Quotes
+_snbt_bare_characters: frozenset = frozenset("0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz_-.+")
+
+
+def _quote_snbt(value: str) -> str:
+    return '"%s"' % value.replace("\\", "\\\\").replace('"', '\\"')
+
+
+def get_snbt(tag: TAG) -> str:
+    # Same Text Form As /data get, e.g. {display:{Name:"..."},Enchantments:[{id:"minecraft:sharpness",lvl:5s}]}
+    # str(...) Of A Compound Only Gives A Summary Like {TAG_Compound('display'): {1 Entries}}
+    if tag.id == TAG_COMPOUND:
+        return "{%s}" % ",".join("%s:%s" % (child.name if len(child.name) > 0 and set(child.name) <= _snbt_bare_characters else _quote_snbt(value=child.name), get_snbt(tag=child))
+                                 for child in tag.tags)
+
+    if tag.id == TAG_LIST:
+        return "[%s]" % ",".join(get_snbt(tag=child) for child in tag.tags)
+
+    if tag.id == TAG_STRING:
+        return _quote_snbt(value=tag.value)
+
+    if tag.id in _snbt_array_prefixes:
+        prefix, suffix = _snbt_array_prefixes[tag.id]
+        # Byte Arrays Come Back As bytearray, Whose Values Are Unsigned
+        values: Iterable[int] = (value - 256 if value > 127 else value for value in tag.value) if tag.id == TAG_BYTE_ARRAY else tag.value
+        return "[%s;%s]" % (prefix, ",".join("%s%s" % (value, suffix) for value in values))
+
+    return "%s%s" % (tag.value, _snbt_suffixes[tag.id])
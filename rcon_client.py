@@ -0,0 +1,266 @@
+import asyncio
+import itertools
+import struct
+from collections import deque
+from typing import Deque, Dict, Iterable, Iterator, List, Optional, Tuple
+
+# Asyncio RCON Client That Keeps Its Connections Open And Spreads Commands Over A Pool Of Them
+# MCRcon Opens A Connection, Sends One Command And Waits For Its Answer, So Thousands Of /forceload Commands Are Thousands Of Round Trips
+# Here Connections Stay Open And Each Runs On Its Own Thread In The Server, Responses Are Matched Back To Their Commands By Packet ID
+# Protocol: https://wiki.vg/RCON
+default_port: int = 25575
+
+# Vanilla Reads Each Request With A Single 1460 Byte Read And Drops The Connection When The Read Holds More (Or Less) Than One Packet,
+#   So By Default A Connection Waits For Each Answer Before Sending The Next Command
+default_max_in_flight: int = 1
+
+# Only For Servers That Read RCON As A Stream, Pass It As max_in_flight To Write Commands Without Waiting For Answers (Pipelining)
+pipelined_max_in_flight: int = 64
+
+# Length, Request ID And Type, All Little Endian
+_packet_length: struct.Struct = struct.Struct("<i")
+_packet_header: struct.Struct = struct.Struct("<ii")
+
+packet_type_response: int = 0
+packet_type_command: int = 2
+packet_type_login: int = 3
+
+# Minecraft Answers Any Type It Doesn't Know With "Unknown request", Which Marks The End Of A Response Split Into Fragments
+packet_type_terminator: int = 200
+
+# Minecraft Splits Responses Into Packets Of At Most This Many Bytes
+max_response_fragment: int = 4096
+
+# Minecraft Reads Requests Into A 1460 Byte Buffer, Which Also Holds The Length, ID, Type And Both Null Bytes
+max_command_length: int = 1460 - 14
+
+# Minecraft Answers A Failed Login With This Request ID
+failed_login_id: int = -1
+
+
+class RconError(Exception):
+    pass
+
+
+class RconAuthenticationError(RconError):
+    pass
+
+
+def encode_packet(request_id: int, packet_type: int, payload: str) -> bytes:
+    # The Payload Is Null Terminated, Followed By One More Null Byte
+    body: bytes = _packet_header.pack(request_id, packet_type) + payload.encode("utf-8") + b"\0\0"
+    return _packet_length.pack(len(body)) + body
+
+
+async def read_packet(reader: asyncio.StreamReader) -> Tuple[int, int, bytes]:
+    # Returns The Request ID, Type And Payload (Without The Null Bytes)
+    length: int = _packet_length.unpack(await reader.readexactly(_packet_length.size))[0]
+    if length < _packet_header.size + 2:
+        raise RconError("Packet is too short (%s bytes)" % length)
+
+    body: bytes = await reader.readexactly(length)
+    request_id, packet_type = _packet_header.unpack_from(body)
+    return request_id, packet_type, body[_packet_header.size:-2]
+
+
+class RconConnection:
+    def __init__(self, host: str, port: int, password: str, max_in_flight: int = default_max_in_flight):
+        self.host: str = host
+        self.port: int = port
+        self.password: str = password
+
+        self.reader: Optional[asyncio.StreamReader] = None
+        self.writer: Optional[asyncio.StreamWriter] = None
+        self.reader_task: Optional[asyncio.Task] = None
+        self.closed: bool = True
+
+        # Backpressure: Sending Waits While This Many Commands Are Unanswered
+        self.slots: asyncio.Semaphore = asyncio.Semaphore(max_in_flight)
+        self.request_ids: Iterator[int] = itertools.count(start=1)
+
+        # Unanswered Commands, Oldest First (Minecraft Answers Them In The Order They Were Sent)
+        self.pending: Dict[int, asyncio.Future] = {}
+        self.order: Deque[int] = deque()
+        self.fragments: Dict[int, List[bytes]] = {}
+
+        # Terminator Request ID -> The Command Whose Response It Ends
+        self.terminators: Dict[int, int] = {}
+
+    def in_flight(self) -> int:
+        return len(self.pending)
+
+    async def connect(self):
+        self.reader, self.writer = await asyncio.open_connection(host=self.host, port=self.port)
+
+        try:
+            self.writer.write(encode_packet(request_id=self.next_request_id(), packet_type=packet_type_login, payload=self.password))
+            await self.writer.drain()
+
+            # Minecraft Answers The Login With A Command Type Packet
+            request_id, _, _ = await read_packet(reader=self.reader)
+        except (asyncio.IncompleteReadError, ConnectionError) as e:
+            self.writer.close()
+            raise RconError("Connection to %s:%s was lost while logging in" % (self.host, self.port)) from e
+
+        if request_id == failed_login_id:
+            self.writer.close()
+            raise RconAuthenticationError("Wrong RCON password for %s:%s" % (self.host, self.port))
+
+        self.closed: bool = False
+        self.reader_task: asyncio.Task = asyncio.ensure_future(self.read_responses())
+
+    def next_request_id(self) -> int:
+        # Request IDs Are Signed 32 Bit Integers, And -1 Means A Failed Login
+        return next(self.request_ids) % 0x7FFFFFFF + 1
+
+    async def send(self, command: str) -> asyncio.Future:
+        # Returns Once The Command Is Written, The Future Resolves To Its Response
+        if len(command.encode("utf-8")) > max_command_length:
+            raise RconError("Command is longer than Minecraft accepts (%s bytes)" % max_command_length)
+
+        await self.slots.acquire()
+        if self.closed:
+            self.slots.release()
+            raise RconError("Connection to %s:%s is closed" % (self.host, self.port))
+
+        request_id: int = self.next_request_id()
+        future: asyncio.Future = asyncio.get_running_loop().create_future()
+        self.pending[request_id] = future
+        self.order.append(request_id)
+        self.fragments[request_id] = []
+
+        self.writer.write(encode_packet(request_id=request_id, packet_type=packet_type_command, payload=command))
+
+        # Also Waits While The Socket's Send Buffer Is Full
+        await self.writer.drain()
+        return future
+
+    async def command(self, command: str) -> str:
+        return await (await self.send(command=command))
+
+    async def read_responses(self):
+        try:
+            while True:
+                request_id, _, payload = await read_packet(reader=self.reader)
+                self.handle_response(request_id=request_id, payload=payload)
+        except (asyncio.IncompleteReadError, ConnectionError, RconError) as e:
+            self.fail(error=RconError("Connection to %s:%s was lost: %s" % (self.host, self.port, e)))
+
+    def handle_response(self, request_id: int, payload: bytes):
+        if request_id in self.terminators:
+            self.complete(request_id=self.terminators.pop(request_id))
+            return
+
+        if request_id not in self.pending:
+            return
+
+        # Responses Come Back In Order, So An Answer To A Later Command Means The Earlier Ones Are Finished
+        while len(self.order) > 0 and self.order[0] != request_id:
+            self.complete(request_id=self.order[0])
+
+        self.fragments[request_id].append(payload)
+
+        # Once A Terminator Was Sent The Response Is Finished By Its Answer, Not By A Short Fragment,
+        #   So The Next Command Can't Reach The Server In The Same Read As The Terminator
+        if request_id in self.terminators.values():
+            return
+
+        if len(payload) < max_response_fragment:
+            self.complete(request_id=request_id)
+            return
+
+        # A Full Fragment Might Be Followed By More, Minecraft's Answer To The Terminator Comes After The Last One
+        terminator_id: int = self.next_request_id()
+        self.terminators[terminator_id] = request_id
+        self.writer.write(encode_packet(request_id=terminator_id, packet_type=packet_type_terminator, payload=""))
+
+    def complete(self, request_id: int):
+        future: Optional[asyncio.Future] = self.pending.pop(request_id, None)
+        if future is None:
+            return
+
+        self.order.remove(request_id)
+        response: str = b"".join(self.fragments.pop(request_id)).decode("utf-8", errors="replace")
+        if not future.done():
+            future.set_result(response)
+
+        self.slots.release()
+
+    def fail(self, error: RconError):
+        self.closed: bool = True
+        for request_id, future in self.pending.items():
+            if not future.done():
+                future.set_exception(error)
+
+            self.slots.release()
+
+        self.pending.clear()
+        self.order.clear()
+        self.fragments.clear()
+        self.terminators.clear()
+
+    async def close(self):
+        if self.writer is None:
+            return
+
+        self.closed: bool = True
+        self.writer.close()
+        try:
+            await self.writer.wait_closed()
+        except ConnectionError:
+            pass
+
+        if self.reader_task is not None:
+            self.reader_task.cancel()
+
+        self.fail(error=RconError("Connection to %s:%s was closed" % (self.host, self.port)))
+
+
+class RconPool:
+    # Commands Go To Whichever Connection Has The Fewest Unanswered Commands, Reconnecting Connections That Were Lost
+    # Minecraft Runs Commands From Different Connections In Any Order, run_commands(...) Waits For Every Response,
+    #   So Anything Sent After It Returns (E.g. /save-all After A Batch Of /forceload) Runs After The Whole Batch
+    def __init__(self, password: str, host: str = "127.0.0.1", port: int = default_port, connections: int = 1, max_in_flight: int = default_max_in_flight):
+        self.connections: List[RconConnection] = [RconConnection(host=host, port=port, password=password, max_in_flight=max_in_flight) for _ in range(connections)]
+
+    async def connect(self):
+        await asyncio.gather(*[connection.connect() for connection in self.connections])
+
+    async def send(self, command: str) -> asyncio.Future:
+        connection: RconConnection = min(self.connections, key=lambda pooled: pooled.in_flight())
+        if connection.closed:
+            await connection.connect()
+
+        return await connection.send(command=command)
+
+    async def command(self, command: str) -> str:
+        return await (await self.send(command=command))
+
+    async def run_commands(self, commands: Iterable[str]) -> List[str]:
+        # Responses Are In The Same Order As The Commands
+        futures: List[asyncio.Future] = []
+        for command in commands:
+            futures.append(await self.send(command=command))
+
+        return list(await asyncio.gather(*futures))
+
+    async def close(self):
+        await asyncio.gather(*[connection.close() for connection in self.connections])
+
+    async def __aenter__(self) -> "RconPool":
+        await self.connect()
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.close()
+
+
+def run_rcon_commands(password: str, commands: List[str], host: str = "127.0.0.1", port: int = default_port, connections: int = 1,
+                      max_in_flight: int = default_max_in_flight) -> List[str]:
+    # For Scripts That Aren't Async Themselves
+    async def run() -> List[str]:
+        async with RconPool(password=password, host=host, port=port, connections=connections, max_in_flight=max_in_flight) as pool:
+            return await pool.run_commands(commands=commands)
+
+    return asyncio.run(run())
+
@@ -0,0 +1,188 @@
+import gzip
+import mmap
+import os
+import struct
+import zlib
+from typing import BinaryIO, Dict, List, NamedTuple, Optional, Tuple, Union
+
+from nbt.region import ChunkDataError, ChunkHeaderError, InconceivedChunk, NoRegionHeader, RegionHeaderError
+
+# Read Only Region File Reader That Maps The Whole .mca File Instead Of Seeking And Reading Each Header Entry And Chunk
+# nbt.region.RegionFile Does Two Reads Per Header Entry And Copies Each Chunk Into A New bytes Object Before Decompressing,
+# Here The Header Is Unpacked In One Go And Compressed Chunks Are Handed To zlib As Slices Of The Mapping
+sector_length: int = 4096
+header_length: int = 2 * sector_length
+
+# Same Values As The Compression Byte In Front Of Each Chunk
+compression_gzip: int = 1
+compression_zlib: int = 2
+# 1.15.1+ Can Store Uncompressed Chunks, The NBT Library Uses 0 For The Same Thing
+compression_none: int = 3
+compression_none_legacy: int = 0
+# 1.15.1+ Moves Chunks Too Big For The Region File Into A Separate c.x.z.mcc File
+compression_external_flag: int = 128
+
+_header_entries: struct.Struct = struct.Struct(">1024I")
+_chunk_header: struct.Struct = struct.Struct(">IB")
+
+
+class ChunkLocation(NamedTuple):
+    # Same Field Names As nbt.region.ChunkMetadata, So Either Can Be Passed Around
+    x: int
+    z: int
+    blockstart: int
+    blocklength: int
+    timestamp: int
+
+
+class RegionUsage(NamedTuple):
+    chunks: int
+    # Bytes Taken Up By Chunks, Going By The Sector Counts In The Location Table
+    chunk_bytes: int
+
+
+def read_region_usage(filename: str) -> RegionUsage:
+    # Only Reads The Location Table, So Scans Can Be Planned Without Mapping Every Region File
+    with open(filename, mode="rb") as f:
+        # Same As MappedRegionFile, Files Too Small For A Header Don't Have Any Chunks To Read
+        if os.fstat(f.fileno()).st_size < header_length:
+            return RegionUsage(chunks=0, chunk_bytes=0)
+
+        locations: Tuple[int, ...] = _header_entries.unpack(f.read(sector_length))
+
+    present: List[int] = [location for location in locations if location != 0]
+    return RegionUsage(chunks=len(present), chunk_bytes=sum(location & 0xFF for location in present) * sector_length)
+
+
+def decompress_chunk(x: int, z: int, compression: int, data: Union[bytes, memoryview]) -> bytes:
+    # A New bytes Object Per Chunk On Purpose: zlib Can't Decompress Into An Existing Buffer, And The Result Outlives This Call
+    #   (Projected Tags, Prefilters And NBTFile Buffers Read From It), So A Reused Buffer Would Have To Be Copied Out Again Anyway
+    try:
+        if compression == compression_zlib:
+            return zlib.decompress(data)
+
+        if compression == compression_gzip:
+            return gzip.decompress(data)
+
+        if compression in (compression_none, compression_none_legacy):
+            return bytes(data)
+    except (zlib.error, OSError, EOFError) as e:
+        # The Details Are Irrelevant, Just That The Data Is Garbled
+        raise ChunkDataError(str(e)) from None
+
+    raise ChunkDataError("Unknown chunk compression/format (%s)" % compression)
+
+
+class MappedRegionFile:
+    def __init__(self, filename: str):
+        self.filename: str = filename
+        self.file: BinaryIO = open(filename, mode="rb")
+        self.size: int = os.fstat(self.file.fileno()).st_size
+
+        self.map: Optional[mmap.mmap] = None
+        self.view: Optional[memoryview] = None
+        self.locations: Dict[Tuple[int, int], ChunkLocation] = {}
+        self.metadata: List[ChunkLocation] = []
+
+        # Some Region Files Are 0 Bytes And Minecraft Treats Them As Empty, Same As The NBT Library
+        if self.size == 0:
+            return
+
+        if self.size < header_length:
+            self.file.close()
+            raise NoRegionHeader("The region file is %d bytes, too small in size to have a header." % self.size)
+
+        self.map: mmap.mmap = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        self.view: memoryview = memoryview(self.map)
+
+        locations: Tuple[int, ...] = _header_entries.unpack_from(self.map, 0)
+        timestamps: Tuple[int, ...] = _header_entries.unpack_from(self.map, sector_length)
+
+        # Same Order As RegionFile.get_metadata(), So Output Doesn't Change Between Readers
+        for x in range(32):
+            for z in range(32):
+                index: int = x + z * 32
+                if locations[index] == 0:
+                    # Chunk Was Never Generated
+                    continue
+
+                location: ChunkLocation = ChunkLocation(x=x, z=z, blockstart=locations[index] >> 8,
+                                                        blocklength=locations[index] & 0xFF, timestamp=timestamps[index])
+                self.locations[(x, z)] = location
+                self.metadata.append(location)
+
+    def get_metadata(self) -> List[ChunkLocation]:
+        return self.metadata
+
+    def chunk_count(self) -> int:
+        return len(self.metadata)
+
+    def get_blockdata(self, x: int, z: int) -> bytes:
+        # Raises The Same RegionFileFormatError Subclasses As RegionFile.get_blockdata(...)
+        compression, data = self.get_stored_chunk(x=x, z=z)
+        try:
+            return decompress_chunk(x=x, z=z, compression=compression, data=data)
+        finally:
+            # The Mapping Can't Be Closed While Slices Of It Are Still Around
+            data.release()
+
+    def get_stored_chunk(self, x: int, z: int) -> Tuple[int, memoryview]:
+        # The Compression Byte And A Slice Of The Mapping With The Compressed Chunk, Which Has To Be Released Once Used
+        location: Optional[ChunkLocation] = self.locations.get((x, z))
+        if location is None:
+            raise InconceivedChunk("Chunk %d,%d is not present in region" % (x, z))
+
+        if location.blocklength == 0:
+            raise RegionHeaderError("Chunk %d,%d has zero length" % (x, z))
+
+        if location.blockstart < 2:
+            raise RegionHeaderError("Chunk %d,%d is in the region header" % (x, z))
+
+        start: int = location.blockstart * sector_length
+        if start + 5 >= self.size:
+            raise RegionHeaderError("Chunk %d,%d is partially/completely outside the file" % (x, z))
+
+        length, compression = _chunk_header.unpack_from(self.map, start)
+        if length <= 1:
+            raise ChunkHeaderError("Chunk %d,%d has zero length" % (x, z))
+
+        if compression & compression_external_flag:
+            raise ChunkDataError("Chunk %d,%d is stored in an external .mcc file" % (x, z))
+
+        # The Length Includes The Compression Byte, And Truncated Files Are Read As Far As They Go
+        return compression, self.view[start + 5:min(start + 4 + length, self.size)]
+
+    def get_raw_chunk(self, x: int, z: int) -> Optional[bytes]:
+        # The Stored Chunk As-Is (Length, Compression Byte And Compressed Data), For Copying Chunks Without Recompressing Them
+        # Returns None When Nothing Of The Chunk Is Inside The File
+        location: Optional[ChunkLocation] = self.locations.get((x, z))
+        if location is None or location.blockstart < 2:
+            return None
+
+        start: int = location.blockstart * sector_length
+        if start >= self.size:
+            return None
+
+        end: int = min(start + location.blocklength * sector_length, self.size)
+        if start + 5 <= self.size:
+            # Trailing Bytes Of The Last Sector Aren't Part Of The Chunk
+            length: int = _chunk_header.unpack_from(self.map, start)[0]
+            if length > 1:
+                end: int = min(start + 4 + length, self.size)
+
+        return self.map[start:end]
+
+    def close(self):
+        if self.view is not None:
+            self.view.release()
+
+        if self.map is not None:
+            self.map.close()
+
+        self.file.close()
+
+    def __enter__(self) -> "MappedRegionFile":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
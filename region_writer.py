@@ -0,0 +1,119 @@
+import os
+import shutil
+import tempfile
+import time
+import zlib
+from io import BytesIO
+from typing import BinaryIO, Dict, List, Optional, Tuple
+
+from nbt.nbt import NBTFile
+from nbt.region import ChunkDataError
+
+from region_reader import ChunkLocation, MappedRegionFile, compression_zlib, header_length, sector_length
+from region_reader import _chunk_header, _header_entries
+
+# Rewrites A Region File Offline With Some Of Its Chunks Replaced
+# Untouched Chunks Are Copied Over Still Compressed, Only Replaced Chunks Are Encoded Again,
+#   The New File Is Written Front To Back In One Go Next To The Old One, Then Swapped In With os.replace(...)
+# Chunks Are Packed Back To Back, So Space Left Behind By Shrunk Or Moved Chunks Is Given Back
+
+# The Sector Count Is A Single Byte, Bigger Chunks Need An External .mcc File (Which This Doesn't Write)
+max_chunk_sectors: int = 255
+
+# Written In Blocks Of This Many Bytes
+write_buffer_size: int = 1 << 20
+
+
+def encode_chunk(chunk: NBTFile) -> bytes:
+    # Uncompressed NBT, Same As RegionFile.get_blockdata(...) Returns
+    buffer: BytesIO = BytesIO()
+    chunk.write_file(buffer=buffer)
+    return buffer.getvalue()
+
+
+def compress_chunk(x: int, z: int, chunk_bytes: bytes) -> bytes:
+    compressed: bytes = zlib.compress(chunk_bytes)
+
+    # The Length Includes The Compression Byte
+    stored_chunk: bytes = _chunk_header.pack(len(compressed) + 1, compression_zlib) + compressed
+    if get_sector_count(size=len(stored_chunk)) > max_chunk_sectors:
+        raise ChunkDataError("Chunk %d,%d is too big to store in a region file" % (x, z))
+
+    return stored_chunk
+
+
+def get_sector_count(size: int) -> int:
+    return (size + sector_length - 1) // sector_length
+
+
+def rewrite_region(region_path: str, updated_chunks: Dict[Tuple[int, int], bytes], timestamp: Optional[int] = None):
+    # Updated Chunks Map Chunk Coordinates Within The Region (0-31) To Uncompressed NBT
+    # They Get The Given Timestamp (Defaults To Now), So Caches Keyed On Timestamps See Them As Changed
+    if timestamp is None:
+        timestamp: int = int(time.time())
+
+    # Encoded Up Front, So A Chunk That Can't Be Stored Fails Before Anything Is Written
+    stored_updates: Dict[Tuple[int, int], bytes] = {(x, z): compress_chunk(x=x, z=z, chunk_bytes=chunk_bytes)
+                                                    for (x, z), chunk_bytes in updated_chunks.items()}
+
+    locations: List[int] = [0] * 1024
+    timestamps: List[int] = [0] * 1024
+
+    # Same Folder, So The Final Rename Can't Cross File Systems
+    temporary_file, temporary_path = tempfile.mkstemp(prefix=os.path.basename(region_path) + ".", suffix=".tmp", dir=os.path.dirname(os.path.abspath(region_path)))
+    try:
+        with open(temporary_file, mode="w+b", buffering=write_buffer_size) as output:
+            # Header Is Filled In Last, Once Every Chunk Has A Place
+            output.write(b"\0" * header_length)
+
+            region: MappedRegionFile = MappedRegionFile(filename=region_path)
+            try:
+                # Original File Order, So Copies Read The Old File Front To Back
+                present_chunks: List[ChunkLocation] = sorted(region.get_metadata(), key=lambda location: location.blockstart)
+                new_chunks: List[Tuple[int, int]] = [position for position in stored_updates if position not in region.locations]
+
+                next_sector: int = 2
+                for position in [(location.x, location.z) for location in present_chunks] + new_chunks:
+                    if position in stored_updates:
+                        stored_chunk: Optional[bytes] = stored_updates[position]
+                        chunk_timestamp: int = timestamp
+                    else:
+                        stored_chunk: Optional[bytes] = region.get_raw_chunk(x=position[0], z=position[1])
+                        chunk_timestamp: int = region.locations[position].timestamp
+
+                    # Nothing Of The Chunk Was Inside The Old File, So There's Nothing To Keep
+                    if stored_chunk is None or len(stored_chunk) == 0:
+                        continue
+
+                    sector_count: int = min(get_sector_count(size=len(stored_chunk)), max_chunk_sectors)
+                    write_sectors(output=output, data=stored_chunk[:sector_count * sector_length], sector_count=sector_count)
+
+                    index: int = position[0] + position[1] * 32
+                    locations[index] = next_sector << 8 | sector_count
+                    timestamps[index] = chunk_timestamp
+                    next_sector += sector_count
+            finally:
+                region.close()
+
+            output.seek(0)
+            output.write(_header_entries.pack(*locations))
+            output.write(_header_entries.pack(*timestamps))
+            output.flush()
+            os.fsync(output.fileno())
+
+        # mkstemp(...) Creates The File Readable By Its Owner Only, The Server (Or Whoever Copies The World) Needs The Old Permissions
+        shutil.copymode(region_path, temporary_path)
+
+        # Either The Old Or The New Region Is In Place, Never Half Of Each
+        os.replace(temporary_path, region_path)
+    except BaseException:
+        if os.path.exists(temporary_path):
+            os.remove(temporary_path)
+
+        raise
+
+
+def write_sectors(output: BinaryIO, data: bytes, sector_count: int):
+    # Padded With Zeros To A Whole Number Of Sectors
+    output.write(data)
+    output.write(b"\0" * (sector_count * sector_length - len(data)))
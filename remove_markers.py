@@ -1,13 +1,57 @@
+import argparse
 import os
 import sys
-from typing import List, Optional
+from io import BytesIO
+from typing import Dict, List, Optional, Tuple
 
 import nbt
-from nbt.world import WorldFolder
-from nbt.nbt import TAG, TAG_Int
+from nbt.nbt import TAG
+from nbt.region import RegionFileFormatError
 
+from output_sinks import ChunkErrorRecord, EntityRecord, Record, format_record, record_from_dict, record_to_dict
+from projected_nbt import get_snbt, get_string_pattern
+from region_reader import MappedRegionFile
+from region_writer import encode_chunk, rewrite_region
+from scan_checkpoint import ScanCheckpoint, open_checkpoint
+from scan_engine import ChunkContext, ChunkVisitor, ProjectionPath, RegionTask, get_region_tasks, iter_scan
+from scan_profile import ScanProfiler, default_top, open_profiler, profile_modes
+from scan_stats import ScanStats, default_stats_file_name, open_stats
 
-def check_entities(chunk: nbt.chunk, dimension: str, folder: str):
+marker_id: str = "minecraft:marker"
+
+# If This Isn't Anywhere In The Decompressed Chunk, It Has No Markers
+marker_pattern: bytes = get_string_pattern(value=marker_id)
+
+
+def get_marker_record(entity: nbt.nbt.TAG_Compound, dimension: str) -> EntityRecord:
+    x, y, z = [position.value for position in entity["Pos"]]
+
+    # Markers Are Meant For Datapacks To Be Able To Store NBT Data
+    data: Optional[str] = None
+    if "data" in entity:
+        data: str = get_snbt(tag=entity["data"])
+
+    # Check If UUID Exists (hermitcraft7 has a turtle that doesn't have a UUID)
+    e_uuid: Optional[list] = None
+    if "UUID" in entity:
+        e_uuid: list = entity["UUID"].value
+
+    return EntityRecord(dimension=dimension, id=marker_id, x=x, y=y, z=z, data=data, uuid=e_uuid)
+
+
+def format_removed_markers(records: List[Record]) -> List[str]:
+    # Same Lines remove_markers_2.py Prints: Every Marker, Then What Was Removed
+    lines: List[str] = []
+    for record in records:
+        lines.extend(format_record(record=record))
+
+    for record in records:
+        lines.append("Removing %s With UUID %s" % (record.id, record.uuid))
+
+    return lines
+
+
+def check_entities(chunk: nbt.chunk, dimension: str, records: List[Record]):
     chunk_data: nbt.nbt = {}
     pre_format_change: bool = True
     if "Level" in chunk:
@@ -21,31 +65,12 @@ def check_entities(chunk: nbt.chunk, dimension: str, folder: str):
     if "Entities" in chunk_data:
         entities_to_remove: List[TAG] = []
         for entity in chunk_data["Entities"]:
-            e_id: str = entity["id"].value
-            x, y, z = entity["Pos"]
-
             # Temporarily Block All Non-Markers From The Entity Output List
-            if e_id != "minecraft:marker":
+            if entity["id"].value != marker_id:
                 continue
-            entities_to_remove.append(entity)
-
-            print("%s - (%s, %s, %s) - %s" % (e_id, x, y, z, dimension))
-            print("-" * 40)
-
-            # Markers Are Meant For Datapacks To Be Able To Store NBT Data
-            if e_id == "minecraft:marker":
-                print("Data: %s" % entity["data"])
 
-            # TODO: Parse UUID To 32 Character Hex String (Format Changes In 1.16)
-            #   See: https://minecraft.fandom.com/wiki/Universally_unique_identifier
-            # Check If UUID Exists (hermitcraft7 has a turtle that doesn't have a UUID)
-            e_uuid: Optional[str] = None
-            if "UUID" in entity:
-                e_uuid: str = entity["UUID"]
-
-            print("UUID: %s" % e_uuid)
-            print("-" * 40)
-            print(" ")
+            entities_to_remove.append(entity)
+            records.append(get_marker_record(entity=entity, dimension=dimension))
 
         # Don't Bother Copying Chunks Which Weren't Modified
         if len(entities_to_remove) == 0:
@@ -55,165 +80,177 @@ def check_entities(chunk: nbt.chunk, dimension: str, folder: str):
             return False, pre_format_change, chunk
 
         for entity in entities_to_remove:
-            # Note: This code does not verify these NBT Keys Exist
-            print("Removing %s With UUID %s" % (entity["id"].value, entity["UUID"]))
             chunk_data["Entities"].remove(entity)
 
-        # print(chunk_data.pretty_tree())
-
-        if pre_format_change:
-            chunk = chunk_data
-        else:
-            chunk["Level"] = chunk_data
-
+        # The Entities Were Removed In Place, So The Chunk Is Already Up To Date
+        # (This Used To Set chunk["Level"] = chunk_data, Which For 1.17+ Chunks Made The Chunk Contain Itself
+        #   And Sent NBTFile.write_file(...) Into Infinite Recursion)
         return True, pre_format_change, chunk
     return False, pre_format_change, chunk
 
 
-def main_single_player(world_folder: str):
-    nether_path: str = os.path.join(world_folder, "DIM-1")
-    overworld_path: str = world_folder
-    the_end_path: str = os.path.join(world_folder, "DIM1")
-    custom_dimensions_path: str = os.path.join(world_folder, "dimensions")
+class MarkerVisitor(ChunkVisitor):
+    # Results Are The Markers Found In Each Chunk, Finding Them Is Read Only So It Can Run In The Worker Processes
+    name: str = "markers"
 
-    dimensions_to_scan: List[str] = [overworld_path]
+    # Pre-1.17 Entities Live In The Terrain Region Files
+    terrain_paths: List[ProjectionPath] = [
+        ("Level", "Entities")
+    ]
 
-    # If The Nether Exists, Add To The Scan List
-    if os.path.exists(nether_path):
-        dimensions_to_scan.append(nether_path)
+    # 1.17+ Entity Region Files Only Need The Entity List
+    entity_paths: List[ProjectionPath] = [
+        ("Entities",)
+    ]
 
-    # If The End Exists, Add To The Scan List
-    if os.path.exists(the_end_path):
-        dimensions_to_scan.append(the_end_path)
+    def __init__(self, include_terrain: bool = True):
+        self.include_terrain: bool = include_terrain
 
-    # If Custom Dimensions Exist, Add To The Scan List
-    if os.path.exists(custom_dimensions_path):
-        for namespace in os.listdir(custom_dimensions_path):
-            namespace_path: str = os.path.join(custom_dimensions_path, namespace)
-            if os.path.isfile(namespace_path):
-                continue
+    def get_paths(self, task: RegionTask) -> List[ProjectionPath]:
+        if task.entities:
+            return self.entity_paths
+
+        # 1.17+ Terrain Chunks Don't Have Entities, So The region Folder Is Never Opened
+        if self.include_terrain and not task.split_entities:
+            return self.terrain_paths
+
+        return []
+
+    def prefilter(self, chunk_bytes: bytes) -> bool:
+        # Almost No Chunks Have Markers, So Only Parse The Ones Whose Raw Bytes Mention One
+        return marker_pattern in chunk_bytes
+
+    def empty_result(self, context: ChunkContext) -> List[Record]:
+        return []
 
-            for dimension in os.listdir(namespace_path):
-                dimension_path: str = os.path.join(namespace_path, dimension)
-                if os.path.isfile(dimension_path):
-                    continue
+    def visit(self, chunk: nbt.nbt.NBTFile, context: ChunkContext) -> List[Record]:
+        chunk_data: nbt.nbt = {}
+        if "Level" in chunk:
+            # Pre-1.17 Entity Storage
+            chunk_data: nbt.nbt = chunk["Level"]
+        elif "Entities" in chunk:
+            # 1.17+ Entity Storage
+            chunk_data: nbt.nbt = chunk
 
-                # print(dimension_path)
-                dimensions_to_scan.append(dimension_path)
+        records: List[Record] = []
+        if "Entities" in chunk_data:
+            for entity in chunk_data["Entities"]:
+                if entity["id"].value == marker_id:
+                    records.append(get_marker_record(entity=entity, dimension=context.dimension))
+
+        return records
+
+    def is_empty(self, result: List[Record]) -> bool:
+        return len(result) == 0
+
+    def encode_result(self, result: List[Record]) -> List[dict]:
+        return [record_to_dict(record=record) for record in result]
+
+    def decode_result(self, value: List[dict]) -> List[Record]:
+        return [record_from_dict(record_dict=record_dict) for record_dict in value]
+
+    def error(self, context: ChunkContext, error: Exception) -> List[Record]:
+        return [ChunkErrorRecord(dimension=context.dimension, region=os.path.basename(context.region_path), chunk_x=context.x, chunk_z=context.z, error=str(error))]
+
+
+def remove_region_markers(region_path: str, marked_chunks: List[ChunkContext], records: List[Record]) -> int:
+    # Only Chunks That Actually Have Markers Get Fully Decoded And Encoded Again, Every Other Chunk Is Copied As-Is
+    # Returns How Many Chunks Were Rewritten, The Removed Markers Are Added To records
+    updated_chunks: Dict[Tuple[int, int], bytes] = {}
+
+    region: MappedRegionFile = MappedRegionFile(filename=region_path)
+    try:
+        for context in marked_chunks:
+            chunk: nbt.nbt.NBTFile = nbt.nbt.NBTFile(buffer=BytesIO(region.get_blockdata(x=context.x, z=context.z)))
+
+            # Check Entities (Behavior Is Different Starting In 1.17)
+            was_modified, pre_format_change, modified_chunk = check_entities(chunk=chunk, dimension=context.dimension, records=records)
+
+            if was_modified:
+                # Region Files Are Indexed By The Chunk Coordinates Within The Region, Not The World
+                updated_chunks[(context.x, context.z)] = encode_chunk(chunk=chunk)
+    finally:
+        # Has To Be Closed Before The Rewritten Region Replaces It
+        region.close()
+
+    if len(updated_chunks) > 0:
+        rewrite_region(region_path=region_path, updated_chunks=updated_chunks)
+
+    return len(updated_chunks)
+
+
+def main_single_player(world_folder: str, workers: int = 1, stats: Optional[ScanStats] = None, profiler: Optional[ScanProfiler] = None, checkpoint: Optional[ScanCheckpoint] = None):
+    # Markers Are Found In The Worker Processes, Then Each Affected Region (Terrain Or 1.17+ entities) Is Rewritten Offline
+    visitor: MarkerVisitor = MarkerVisitor(include_terrain=True)
 
     try:
-        for dimension in dimensions_to_scan:
-            try:
-                world = WorldFolder(dimension)
-            except nbt.world.UnknownWorldFormat:
-                # E.g Empty World
+        for region_result in iter_scan(region_tasks=get_region_tasks(world_folder=world_folder), visitors=[visitor], workers=workers, stats=stats, profiler=profiler, checkpoint=checkpoint):
+            marked_chunks: List[ChunkContext] = []
+            for context, records in region_result.results[visitor.name]:
+                for record in records:
+                    if isinstance(record, ChunkErrorRecord):
+                        print("\n".join(format_record(record=record)))
+
+                if any(isinstance(record, EntityRecord) for record in records):
+                    marked_chunks.append(context)
+
+            if len(marked_chunks) == 0:
+                continue
+
+            # Regions From A Checkpoint (--resume) Were Already Rewritten, So Only What Happened Is Printed Again
+            if not region_result.resumed:
+                removed_markers: List[Record] = []
+                try:
+                    region_result.notes["rewritten_chunks"] = remove_region_markers(region_path=region_result.task.region_path, marked_chunks=marked_chunks, records=removed_markers)
+                except RegionFileFormatError as e:
+                    region_result.notes["rewrite_error"] = str(e)
+
+                region_result.notes["output"] = "".join(line + "\n" for line in format_removed_markers(records=removed_markers))
+
+            sys.stdout.write(region_result.notes["output"])
+            if "rewrite_error" in region_result.notes:
+                # The Region Is Left Untouched
+                print("Failed To Rewrite %s!!! - %s" % (region_result.task.region_path, region_result.notes["rewrite_error"]))
                 continue
 
-            # For Retrieving The Right Dimension Name Regardless Of Trailing Slashes
-            # TODO: Grab Actual In Game Dimension Names (Like With /execute in namespace:dimension_name) When Possible
-            if dimension.endswith("/") or dimension.endswith("\\"):
-                dimension_folder_name: str = os.path.basename(os.path.dirname(dimension))
-            else:
-                dimension_folder_name: str = os.path.basename(dimension)
-
-            # For Creating Temporary Storage Of Modified Entity List (1.16-)
-            # if not os.path.exists(os.path.join(dimension, "temp_region")):
-            #     os.makedirs(os.path.join(dimension, "temp_region"))
-
-            # For Creating Temporary Storage Of Modified Entity List (1.17+)
-            # if not os.path.exists(os.path.join(dimension, "temp_entities")):
-            #     os.makedirs(os.path.join(dimension, "temp_entities"))
-
-            for region in world.iter_regions():
-                modified_chunks: List[nbt.nbt] = []
-                for chunk in region.iter_chunks():
-                    try:
-                        # Check Entities (Behavior Is Different Starting In 1.17)
-                        was_modified, pre_format_change, modified_chunk = check_entities(chunk=chunk, dimension=dimension_folder_name, folder=dimension)
-
-                        if was_modified:
-                            modified_chunks.append(chunk)
-                    except UnicodeDecodeError as e:
-                        # This won't catch the issue as the issue is in world.iter_nbt(), not check_storages(...)
-                        # hermitcraft6 currently breaks the scanner. Docm77 Alien Tech Books Are To Blame
-                        # TODO: See Bug Report With Patch For Fix: https://github.com/twoolie/NBT/issues/144
-                        print("Failed To Read Chunk (%s, %s) Due To Invalid Data!!!" % ("x", "z"))
-                        print("-" * 40)
-                        print("Trace: %s" % e)
-                        print("-" * 40)
-
-                # Untested
-                if len(modified_chunks) > 0:
-                    for chunk in modified_chunks:
-                        chunk_data: nbt.nbt = chunk["Level"]
-                        x_pos: TAG_Int = chunk_data["xPos"]
-                        z_pos: TAG_Int = chunk_data["zPos"]
-
-                        region.write_chunk(x=x_pos.value, z=z_pos.value, nbt_file=chunk)
-
-            # Region File Name - For Grabbing Entities From Entities Folder If It Exists (Post 1.17)
-            entity_files_path: str = os.path.join(dimension, "entities")
-            if os.path.exists(entity_files_path):
-                entity_region_file_names: List[str] = os.listdir(entity_files_path)
-                entity_region_file_list: List[str] = []
-                for region_file in entity_region_file_names:
-                    if region_file.endswith(".mca"):
-                        entity_region_file_list.append(os.path.join(entity_files_path, region_file))
-
-                world.set_regionfiles(entity_region_file_list)
-
-            for region in world.iter_regions():
-                modified_chunks: List[nbt.nbt] = []
-                for chunk in region.iter_chunks():
-                    try:
-                        # Check Entities (Behavior Is Different Starting In 1.17)
-                        was_modified, pre_format_change, modified_chunk = check_entities(chunk=chunk, dimension=dimension_folder_name, folder=dimension)
-
-                        if was_modified:
-                            modified_chunks.append(chunk)
-                    except UnicodeDecodeError as e:
-                        # This won't catch the issue as the issue is in world.iter_nbt(), not check_storages(...)
-                        # hermitcraft6 currently breaks the scanner. Docm77 Alien Tech Books Are To Blame
-                        # TODO: See Bug Report With Patch For Fix: https://github.com/twoolie/NBT/issues/144
-                        print("Failed To Read Chunk (%s, %s) Due To Invalid Data!!!" % ("x", "z"))
-                        print("-" * 40)
-                        print("Trace: %s" % e)
-                        print("-" * 40)
-
-                if len(modified_chunks) > 0:
-                    # Turns Out I Don't Need To Write The Region File Myself
-                    #   So, This Commented Out Code Is Useless Code Now
-                    # r.-1.0.mca
-                    # region_file_name: str = "r.%s.%s.mca" % (region.loc.x, region.loc.z)
-                    # region_file_path: str = os.path.join(dimension, "temp_entities", region_file_name)
-                    # print("Saving Modified Region File To: %s" % region_file_path)
-
-                    for chunk in modified_chunks:
-                        # print(chunk.pretty_tree())
-                        chunk_data: nbt.nbt = chunk["Position"]
-
-                        # Cause For Reasons, The Int Array Is An Actual Int And Not An Int Tag
-                        x_pos: int = chunk_data[0]
-                        z_pos: int = chunk_data[1]
-
-                        # Causes Infinite Recursion Loop For Some Reason, Makes It Impossible To Edit Chunks
-                        # TODO: Figure Out What To Do About: https://github.com/twoolie/NBT/blob/b735d465d198965e7347d24493bfe2e4e30fe39a/nbt/nbt.py#L703
-                        # region.write_chunk(x=x_pos, z=z_pos, nbt_file=chunk)
-
-                    # print(region.pretty_tree())
-                    # region.write_file(region_file_path)
+            print("Rewrote %s Chunks In %s" % (region_result.notes["rewritten_chunks"], region_result.task.region_path))
     except KeyboardInterrupt:
         return 3
 
 
 if __name__ == "__main__":
-    if len(sys.argv) == 1:
+    parser: argparse.ArgumentParser = argparse.ArgumentParser(description="Removes Every Marker Entity From A World")
+    parser.add_argument("world_folder", nargs="?", default=None, help="Path To The World Folder")
+    parser.add_argument("--workers", type=int, default=1, help="Number Of Processes To Search Region Files With")
+    parser.add_argument("--stats", nargs="?", default=None, const="", help="Show Live Progress And Write Throughput And Phase Timings (Optionally Takes A Report File Path, Defaults To %s)" % default_stats_file_name)
+    parser.add_argument("--profile", nargs="?", default=None, const="", help="Profile The Scan Across Worker Processes (Optionally Takes An Output File Path, Defaults To scan_profile.pstats Or scan_profile.folded)")
+    parser.add_argument("--profile-mode", choices=profile_modes, default="cprofile", help="Deterministic cProfile Or Low Overhead Stack Sampling")
+    parser.add_argument("--profile-top", type=int, default=default_top, help="Number Of Functions To Show In The Profile Summary")
+    parser.add_argument("--checkpoint", nargs="?", default=None, const="", help="Save Finished Regions So An Interrupted Scan Can Be Resumed (Optionally Takes A File Path, Defaults To A File In The World Folder)")
+    parser.add_argument("--resume", action="store_true", help="Continue An Interrupted Scan After The Last Region It Finished (Implies --checkpoint)")
+    arguments: argparse.Namespace = parser.parse_args()
+
+    if arguments.world_folder is None:
         print("No World Folder Specified!!!")
         sys.exit(1)
 
-    world_folder_path: str = sys.argv[1]
+    world_folder_path: str = arguments.world_folder
     if not os.path.exists(world_folder_path):
         print("World Folder Does Not Exist!!!")
         sys.exit(2)
 
-    sys.exit(main_single_player(world_folder=world_folder_path))
\ No newline at end of file
+    scan_stats: Optional[ScanStats] = open_stats(stats_path=arguments.stats)
+    scan_profiler: Optional[ScanProfiler] = open_profiler(profile_path=arguments.profile, mode=arguments.profile_mode, top=arguments.profile_top)
+    scan_checkpoint: Optional[ScanCheckpoint] = open_checkpoint(world_folder=world_folder_path, name="remove_markers", checkpoint_path=arguments.checkpoint, resume=arguments.resume)
+    exit_code: Optional[int] = main_single_player(world_folder=world_folder_path, workers=arguments.workers, stats=scan_stats, profiler=scan_profiler, checkpoint=scan_checkpoint)
+    if scan_stats is not None:
+        scan_stats.finish()
+
+    if scan_profiler is not None:
+        scan_profiler.finish()
+
+    # Only Kept For --resume When The Scan Was Interrupted
+    if scan_checkpoint is not None:
+        scan_checkpoint.finish(interrupted=exit_code == 3)
+
+    sys.exit(exit_code)
@@ -1,296 +1,113 @@
+import argparse
 import os
 import sys
-from typing import List, Optional
+from typing import List, Optional, Tuple
 
-import nbt
-from nbt.world import WorldFolder
-from nbt.nbt import TAG, TAG_Int
-
-import humanize
+from forceload_plan import ForceloadPlanWriter, default_chunk_budget, default_wait_ticks
+from output_sinks import EntityRecord, format_record
+from remove_markers import MarkerVisitor
+from scan_checkpoint import ScanCheckpoint, open_checkpoint
+from scan_engine import get_region_tasks, iter_scan
+from scan_profile import ScanProfiler, default_top, open_profiler, profile_modes
+from scan_stats import ScanStats, default_stats_file_name, open_stats
 
 # This one utilizes Force Loaded Chunks And Datapack Generation
-# As Currently Trying To Save 1.17+ Entity Files Causes The NBT Library To Crash
-datapack_script_path: str = os.path.join("World_Cleaner_Datapack", "data", "worldcleaner", "functions", "main", "killmarkers.mcfunction")
-
-
-def check_entities(chunk: nbt.chunk, dimension: str, folder: str):
-    chunk_data: nbt.nbt = {}
-    pre_format_change: bool = True
-    if "Level" in chunk:
-        # Pre-1.17 Entity Storage
-        chunk_data: nbt.nbt = chunk["Level"]
-    elif "Entities" in chunk:
-        # 1.17+ Entity Storage
-        chunk_data: nbt.nbt = chunk
-        pre_format_change: bool = False
-
-    if "Entities" in chunk_data:
-        entities_to_remove: List[TAG] = []
-        for entity in chunk_data["Entities"]:
-            e_id: str = entity["id"].value
-            x, y, z = entity["Pos"]
-
-            # Temporarily Block All Non-Markers From The Entity Output List
-            if e_id != "minecraft:marker":
-                continue
-            entities_to_remove.append(entity)
-
-            print("%s - (%s, %s, %s) - %s" % (e_id, x, y, z, dimension))
-            print("-" * 40)
-
-            # Markers Are Meant For Datapacks To Be Able To Store NBT Data
-            if e_id == "minecraft:marker":
-                print("Data: %s" % entity["data"])
-
-            # TODO: Parse UUID To 32 Character Hex String (Format Changes In 1.16)
-            #   See: https://minecraft.fandom.com/wiki/Universally_unique_identifier
-            # Check If UUID Exists (hermitcraft7 has a turtle that doesn't have a UUID)
-            e_uuid: Optional[str] = None
-            if "UUID" in entity:
-                e_uuid: str = entity["UUID"]
-
-            print("UUID: %s" % e_uuid)
-            print("-" * 40)
-            print(" ")
+# For Worlds That Are Running On A Server, remove_markers.py Rewrites The Region Files Of Worlds That Aren't Loaded
+datapack_plan_path: str = os.path.join("World_Cleaner_Datapack", "data", "worldcleaner", "functions", "plan")
 
-        # Don't Bother Copying Chunks Which Weren't Modified
-        if len(entities_to_remove) == 0:
-            # I could use an optional and check that, but I'm lazy tonight
-            # I also don't need to return pre_format_change cause I run two for loops to check both versions of data,
-            #   however, I kept it in for debugging purposes.
-            return False, pre_format_change, chunk
+# Written By Older Versions Of This Script, Which Loaded Every Marked Chunk In A Single Tick
+legacy_datapack_script_path: str = os.path.join("World_Cleaner_Datapack", "data", "worldcleaner", "functions", "main", "killmarkers.mcfunction")
 
-        for entity in entities_to_remove:
-            # Note: This code does not verify these NBT Keys Exist
-            print("Removing %s With UUID %s" % (entity["id"].value, entity["UUID"]))
-            chunk_data["Entities"].remove(entity)
 
-        # print(chunk_data.pretty_tree())
+def get_dimension_id(dimension_folder_name: str) -> str:
+    # Cause I'm Lazy And This Is For My SSP Only, This Won't Check For Custom Dimensions
+    if dimension_folder_name == "DIM-1":
+        return "minecraft:the_nether"
 
-        if pre_format_change:
-            chunk = chunk_data
-        else:
-            chunk["Level"] = chunk_data
+    if dimension_folder_name == "DIM1":
+        return "minecraft:the_end"
 
-        return True, pre_format_change, chunk
-    return False, pre_format_change, chunk
+    return "minecraft:overworld"
 
 
-def main_single_player(world_folder: str):
-    nether_path: str = os.path.join(world_folder, "DIM-1")
-    overworld_path: str = world_folder
-    the_end_path: str = os.path.join(world_folder, "DIM1")
-    custom_dimensions_path: str = os.path.join(world_folder, "dimensions")
-
-    dimensions_to_scan: List[str] = [overworld_path]
-
-    # If The Nether Exists, Add To The Scan List
-    if os.path.exists(nether_path):
-        dimensions_to_scan.append(nether_path)
-
-    # If The End Exists, Add To The Scan List
-    if os.path.exists(the_end_path):
-        dimensions_to_scan.append(the_end_path)
-
-    # If Custom Dimensions Exist, Add To The Scan List
-    if os.path.exists(custom_dimensions_path):
-        for namespace in os.listdir(custom_dimensions_path):
-            namespace_path: str = os.path.join(custom_dimensions_path, namespace)
-            if os.path.isfile(namespace_path):
-                continue
-
-            for dimension in os.listdir(namespace_path):
-                dimension_path: str = os.path.join(namespace_path, dimension)
-                if os.path.isfile(dimension_path):
-                    continue
-
-                # print(dimension_path)
-                dimensions_to_scan.append(dimension_path)
+def main_single_player(world_folder: str, workers: int = 1, chunk_budget: int = default_chunk_budget, wait_ticks: int = default_wait_ticks, stats: Optional[ScanStats] = None, profiler: Optional[ScanProfiler] = None, checkpoint: Optional[ScanCheckpoint] = None):
+    # Markers Were Added In 1.17, So Only The entities Folder Needs Checking
+    visitor: MarkerVisitor = MarkerVisitor(include_terrain=False)
 
+    # Streams Region By Region: Workers Only Hand Back Chunks That Have Markers (Never Chunk Trees),
+    #   Each Region's Chunks Are Added To The Plan As Soon As It's Done, And Only The Step Being Filled Is Kept
+    plan_writer: ForceloadPlanWriter = ForceloadPlanWriter(plan_folder=datapack_plan_path, chunk_budget=chunk_budget, wait_ticks=wait_ticks)
     try:
-        for dimension in dimensions_to_scan:
-            try:
-                world = WorldFolder(dimension)
-            except nbt.world.UnknownWorldFormat:
-                # E.g Empty World
-                continue
-
-            # For Retrieving The Right Dimension Name Regardless Of Trailing Slashes
-            # TODO: Grab Actual In Game Dimension Names (Like With /execute in namespace:dimension_name) When Possible
-            if dimension.endswith("/") or dimension.endswith("\\"):
-                dimension_folder_name: str = os.path.basename(os.path.dirname(dimension))
-            else:
-                dimension_folder_name: str = os.path.basename(dimension)
-
-            # Cause I'm Lazy And This Is For My SSP Only, This Won't Check For Custom Dimensions
-            if dimension_folder_name == "DIM-1":
-                dimension_id: str = "minecraft:the_nether"
-            elif dimension_folder_name == "DIM1":
-                dimension_id: str = "minecraft:the_end"
-            else:
-                dimension_id: str = "minecraft:overworld"
-
-            # for region in world.iter_regions():
-                # modified_chunks: List[nbt.nbt] = []
-                # for chunk in region.iter_chunks():
-                #     try:
-                #         # Check Entities (Behavior Is Different Starting In 1.17)
-                #         was_modified, pre_format_change, modified_chunk = check_entities(chunk=chunk, dimension=dimension_folder_name, folder=dimension)
-                #
-                #         if was_modified:
-                #             modified_chunks.append(chunk)
-                #     except UnicodeDecodeError as e:
-                #         # This won't catch the issue as the issue is in world.iter_nbt(), not check_storages(...)
-                #         # hermitcraft6 currently breaks the scanner. Docm77 Alien Tech Books Are To Blame
-                #         # TODO: See Bug Report With Patch For Fix: https://github.com/twoolie/NBT/issues/144
-                #         print("Failed To Read Chunk (%s, %s) Due To Invalid Data!!!" % ("x", "z"))
-                #         print("-" * 40)
-                #         print("Trace: %s" % e)
-                #         print("-" * 40)
-                #
-                # # Untested
-                # if len(modified_chunks) > 0:
-                #     datapack_script = open(datapack_script_path, mode="w")
-                #
-                #     datapack_script.write("# say Performing Marker Cleanup For 1.16- World Data (This Should Never Run As Markers Were Added in 1.17)\n")
-                #     datapack_script.write("data modify storage cleanup:marker current_dimension set value \"%s\"\n" % dimension_id)
-                #     for chunk in modified_chunks:
-                #         chunk_data: nbt.nbt = chunk["Level"]
-                #         x_pos: TAG_Int = chunk_data["xPos"]
-                #         z_pos: TAG_Int = chunk_data["zPos"]
-                #
-                #         # Cause Forceload Takes Block Coords
-                #         block_x: int = x_pos.value << 4
-                #         block_z: int = z_pos.value << 4
-                #
-                #         region.write_chunk(x=x_pos.value, z=z_pos.value, nbt_file=chunk)
-                #
-                #         # This'll Deal With Async Chunk Loading
-                #         datapack_script.write("say Killing Markers In Chunk (%s, %s) in %s\n" % (x_pos.value, z_pos.value, dimension_id))
-                #         datapack_script.write("execute in %s run forceload add %s %s\n" % (dimension_id, block_x, block_z))
-                #
-                #         # So, the problem is, the variables will be replaced before the function finishes running
-                #         # datapack_script.write("data modify storage cleanup:marker current_block_x set value %s\n" % block_x)
-                #         # datapack_script.write("data modify storage cleanup:marker current_block_z set value %s\n" % block_z)
-                #         # datapack_script.write("schedule function worldcleaner:main/deletemarkers 1t append\n")
-                #
-                #         # Won't Work Due To Async Chunk Loading
-                #         # datapack_script.write("say Killing Markers In Chunk (%s, %s) in %s\n" % (x_pos.value, z_pos.value, dimension_id))
-                #         # datapack_script.write("execute in %s run forceload add %s %s\n" % (dimension_id, block_x, block_z))
-                #         # datapack_script.write("execute in %s run kill @e[type=minecraft:marker]\n" % dimension_id)
-                #         # datapack_script.write("execute in %s run forceload remove %s %s\n" % (dimension_id, block_x, block_z))
-                #
-                #     datapack_script.write("schedule function worldcleaner:main/deletemarkers 1t append\n")
-                #
-                #     # For 3 Dimensions
-                #     datapack_script.write("schedule function worldcleaner:main/unloadoverworld 1t append\n")
-                #     datapack_script.write("schedule function worldcleaner:main/unloadnether 1t append\n")
-                #     datapack_script.write("schedule function worldcleaner:main/unloadend 1t append\n")
-                #     # datapack_script.write("execute in %s run forceload remove all\n\n" % dimension_id)
-                #     datapack_script.flush()
-                #     datapack_script.close()
+        for region_result in iter_scan(region_tasks=get_region_tasks(world_folder=world_folder), visitors=[visitor], workers=workers, stats=stats, profiler=profiler, checkpoint=checkpoint):
+            marked_chunks: List[Tuple[int, int]] = []
+            for context, records in region_result.results[visitor.name]:
+                has_markers: bool = False
+                for record in records:
+                    print("\n".join(format_record(record=record)))
 
-            # Region File Name - For Grabbing Entities From Entities Folder If It Exists (Post 1.17)
-            entity_files_path: str = os.path.join(dimension, "entities")
-            if os.path.exists(entity_files_path):
-                entity_region_file_names: List[str] = os.listdir(entity_files_path)
-                entity_region_file_list: List[str] = []
-                for region_file in entity_region_file_names:
-                    if region_file.endswith(".mca"):
-                        entity_region_file_list.append(os.path.join(entity_files_path, region_file))
+                for record in records:
+                    if isinstance(record, EntityRecord):
+                        print("Removing %s With UUID %s" % (record.id, record.uuid))
+                        has_markers: bool = True
 
-                world.set_regionfiles(entity_region_file_list)
+                if has_markers:
+                    marked_chunks.append(context.get_chunk_coordinates())
 
-            for region in world.iter_regions():
-                modified_chunks: List[nbt.nbt] = []
-                for chunk in region.iter_chunks():
-                    try:
-                        # Check Entities (Behavior Is Different Starting In 1.17)
-                        was_modified, pre_format_change, modified_chunk = check_entities(chunk=chunk, dimension=dimension_folder_name, folder=dimension)
+            if len(marked_chunks) > 0:
+                plan_writer.add_chunks(dimension_id=get_dimension_id(dimension_folder_name=region_result.task.dimension), chunks=marked_chunks)
 
-                        if was_modified:
-                            modified_chunks.append(chunk)
-                    except UnicodeDecodeError as e:
-                        # This won't catch the issue as the issue is in world.iter_nbt(), not check_storages(...)
-                        # hermitcraft6 currently breaks the scanner. Docm77 Alien Tech Books Are To Blame
-                        # TODO: See Bug Report With Patch For Fix: https://github.com/twoolie/NBT/issues/144
-                        print("Failed To Read Chunk (%s, %s) Due To Invalid Data!!!" % ("x", "z"))
-                        print("-" * 40)
-                        print("Trace: %s" % e)
-                        print("-" * 40)
-
-                if len(modified_chunks) > 0:
-                    datapack_script = open(datapack_script_path, mode="a")
-                    # Turns Out I Don't Need To Write The Region File Myself
-                    #   So, This Commented Out Code Is Useless Code Now
-                    # r.-1.0.mca
-                    # region_file_name: str = "r.%s.%s.mca" % (region.loc.x, region.loc.z)
-                    # region_file_path: str = os.path.join(dimension, "temp_entities", region_file_name)
-                    # print("Saving Modified Region File To: %s" % region_file_path)
-
-                    current_chunk_counter: int = 0
-                    num_modified_chunks: int = len(modified_chunks)
-                    datapack_script.write("# say Performing Marker Cleanup For 1.17+ World Data\n")
-                    for chunk in modified_chunks:
-                        # print(chunk.pretty_tree())
-                        chunk_data: nbt.nbt = chunk["Position"]
-
-                        # Cause For Reasons, The Int Array Is An Actual Int And Not An Int Tag
-                        x_pos: int = chunk_data[0]
-                        z_pos: int = chunk_data[1]
-
-                        # Causes Infinite Recursion Loop For Some Reason, Makes It Impossible To Edit Chunks
-                        # TODO: Figure Out What To Do About: https://github.com/twoolie/NBT/blob/b735d465d198965e7347d24493bfe2e4e30fe39a/nbt/nbt.py#L703
-                        # region.write_chunk(x=x_pos, z=z_pos, nbt_file=chunk)
-
-                        # Cause Forceload Takes Block Coords
-                        block_x: int = x_pos << 4
-                        block_z: int = z_pos << 4
-
-                        current_chunk_counter += 1
-
-                        # This'll Deal With Async Chunk Loading
-                        datapack_script.write("say Killing Markers In Chunk (%s, %s) in %s - (On Chunk %s/%s)\n" % (x_pos, z_pos, dimension_id, humanize.intcomma(current_chunk_counter), humanize.intcomma(num_modified_chunks)))
-                        datapack_script.write("execute in %s run forceload add %s %s\n" % (dimension_id, block_x, block_z))
-
-                        # So, the problem is, the variables will be replaced before the function finishes running
-                        # datapack_script.write("data modify storage cleanup:marker current_block_x set value %s\n" % block_x)
-                        # datapack_script.write("data modify storage cleanup:marker current_block_z set value %s\n" % block_z)
-                        # datapack_script.write("schedule function worldcleaner:main/deletemarkers 1t append\n")
-
-                        # Won't Work Due To Async Chunk Loading
-                        # datapack_script.write("say Killing Markers In Chunk (%s, %s) in %s - (On Chunk %s/%s)\n" % (x_pos, z_pos, dimension_id, humanize.intcomma(current_chunk_counter), humanize.intcomma(num_modified_chunks)))
-                        # datapack_script.write("execute in %s run forceload add %s %s\n" % (dimension_id, block_x, block_z))
-                        # datapack_script.write("execute in %s run kill @e[type=minecraft:marker]\n" % dimension_id)
-                        # datapack_script.write("execute in %s run forceload remove %s %s\n" % (dimension_id, block_x, block_z))
-
-                    datapack_script.write("schedule function worldcleaner:main/deletemarkers 10t append\n")
-
-                    # For 3 Dimensions
-                    datapack_script.write("schedule function worldcleaner:main/unloadoverworld 10t append\n")
-                    datapack_script.write("schedule function worldcleaner:main/unloadnether 10t append\n")
-                    datapack_script.write("schedule function worldcleaner:main/unloadend 10t append\n")
-                    # datapack_script.write("execute in %s run forceload remove all\n\n" % dimension_id)
-                    datapack_script.flush()
-                    datapack_script.close()
-
-                    # print(region.pretty_tree())
-                    # region.write_file(region_file_path)
+        plan_writer.close()
     except KeyboardInterrupt:
         return 3
+    finally:
+        # Keeps The Last Complete Plan When The Scan Didn't Finish
+        plan_writer.abort()
+
+    print("Planned %s Chunks In %s Steps Of Up To %s Chunks" % (plan_writer.chunks, plan_writer.steps, chunk_budget))
 
 
 if __name__ == "__main__":
-    if len(sys.argv) == 1:
+    parser: argparse.ArgumentParser = argparse.ArgumentParser(description="Generates A Datapack Plan That Kills Every Marker Entity In A World A Few Chunks At A Time")
+    parser.add_argument("world_folder", nargs="?", default=None, help="Path To The World Folder")
+    parser.add_argument("--workers", type=int, default=1, help="Number Of Processes To Search Region Files With")
+    parser.add_argument("--stats", nargs="?", default=None, const="", help="Show Live Progress And Write Throughput And Phase Timings (Optionally Takes A Report File Path, Defaults To %s)" % default_stats_file_name)
+    parser.add_argument("--profile", nargs="?", default=None, const="", help="Profile The Scan Across Worker Processes (Optionally Takes An Output File Path, Defaults To scan_profile.pstats Or scan_profile.folded)")
+    parser.add_argument("--profile-mode", choices=profile_modes, default="cprofile", help="Deterministic cProfile Or Low Overhead Stack Sampling")
+    parser.add_argument("--profile-top", type=int, default=default_top, help="Number Of Functions To Show In The Profile Summary")
+    parser.add_argument("--checkpoint", nargs="?", default=None, const="", help="Save Finished Regions So An Interrupted Scan Can Be Resumed (Optionally Takes A File Path, Defaults To A File In The World Folder)")
+    parser.add_argument("--resume", action="store_true", help="Continue An Interrupted Scan After The Last Region It Finished (Implies --checkpoint)")
+    parser.add_argument("--chunk-budget", type=int, default=default_chunk_budget, help="Most Chunks The Server Forceloads At Once")
+    parser.add_argument("--wait-ticks", type=int, default=default_wait_ticks, help="Ticks To Wait For Forceloaded Chunks' Entities Before Killing Markers")
+    arguments: argparse.Namespace = parser.parse_args()
+
+    if arguments.world_folder is None:
         print("No World Folder Specified!!!")
         sys.exit(1)
 
-    world_folder_path: str = sys.argv[1]
+    world_folder_path: str = arguments.world_folder
     if not os.path.exists(world_folder_path):
         print("World Folder Does Not Exist!!!")
         sys.exit(2)
 
-    if os.path.exists(datapack_script_path):
-        os.remove(datapack_script_path)
+    if arguments.chunk_budget < 1 or arguments.wait_ticks < 1:
+        print("Chunk Budget And Wait Ticks Have To Be At Least 1!!!")
+        sys.exit(4)
+
+    if os.path.exists(legacy_datapack_script_path):
+        os.remove(legacy_datapack_script_path)
+
+    scan_stats: Optional[ScanStats] = open_stats(stats_path=arguments.stats)
+    scan_profiler: Optional[ScanProfiler] = open_profiler(profile_path=arguments.profile, mode=arguments.profile_mode, top=arguments.profile_top)
+    scan_checkpoint: Optional[ScanCheckpoint] = open_checkpoint(world_folder=world_folder_path, name="remove_markers_2", checkpoint_path=arguments.checkpoint, resume=arguments.resume)
+    exit_code: Optional[int] = main_single_player(world_folder=world_folder_path, workers=arguments.workers, chunk_budget=arguments.chunk_budget, wait_ticks=arguments.wait_ticks, stats=scan_stats, profiler=scan_profiler, checkpoint=scan_checkpoint)
+    if scan_stats is not None:
+        scan_stats.finish()
+
+    if scan_profiler is not None:
+        scan_profiler.finish()
+
+    # Only Kept For --resume When The Scan Was Interrupted
+    if scan_checkpoint is not None:
+        scan_checkpoint.finish(interrupted=exit_code == 3)
 
-    sys.exit(main_single_player(world_folder=world_folder_path))
\ No newline at end of file
+    sys.exit(exit_code)
\ No newline at end of file
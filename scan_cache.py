@@ -0,0 +1,73 @@
+import json
+import os
+import sqlite3
+from typing import Any, Dict, Tuple
+
+# Per Chunk Results Are Keyed On (Dimension, Region, Chunk) And Only Reused While The Region Header Timestamp Matches
+# Results Are Stored As JSON (See ChunkVisitor.encode_result(...)), A Cache Inside A Downloaded World Can't Run Code When It's Read
+# Bump This When The Layout Of Cached Results Changes, So Old Caches Are Ignored Instead Of Misread
+cache_version: int = 7
+default_cache_file_name: str = "world_scanner_cache.sqlite3"
+
+# (Chunk X, Chunk Z) -> (Timestamp, Result)
+ChunkResults = Dict[Tuple[int, int], Tuple[int, Any]]
+
+
+def get_default_cache_path(world_folder: str) -> str:
+    return os.path.join(world_folder, default_cache_file_name)
+
+
+def get_region_key(region_path: str) -> str:
+    # E.g. region/r.0.0.mca or entities/r.0.0.mca, So Terrain And 1.17+ Entity Regions Don't Collide
+    return "%s/%s" % (os.path.basename(os.path.dirname(region_path)), os.path.basename(region_path))
+
+
+def is_cached(cached_results: ChunkResults, x: int, z: int, timestamp: int) -> bool:
+    # A Timestamp Of 0 Means The Game Never Recorded When The Chunk Was Saved, So It Can't Be Trusted
+    if timestamp == 0 or (x, z) not in cached_results:
+        return False
+
+    return cached_results[(x, z)][0] == timestamp
+
+
+class ScanCache:
+    def __init__(self, cache_path: str, namespace: str):
+        # Each Script Gets Its Own Namespace, As They Store Different Results For The Same Chunk
+        self.namespace: str = "%s:%s" % (namespace, cache_version)
+        self.connection: sqlite3.Connection = sqlite3.connect(cache_path, timeout=60)
+
+        # WAL Lets Worker Processes Read While The Parent Writes
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("CREATE TABLE IF NOT EXISTS chunk_results ("
+                                "namespace TEXT NOT NULL, "
+                                "dimension TEXT NOT NULL, "
+                                "region TEXT NOT NULL, "
+                                "chunk_x INTEGER NOT NULL, "
+                                "chunk_z INTEGER NOT NULL, "
+                                "timestamp INTEGER NOT NULL, "
+                                "result TEXT NOT NULL, "
+                                "PRIMARY KEY (namespace, dimension, region, chunk_x, chunk_z))")
+        self.connection.commit()
+
+    def get_region(self, dimension: str, region: str) -> ChunkResults:
+        cached_results: ChunkResults = {}
+        rows = self.connection.execute("SELECT chunk_x, chunk_z, timestamp, result FROM chunk_results "
+                                       "WHERE namespace = ? AND dimension = ? AND region = ?",
+                                       (self.namespace, dimension, region))
+
+        for chunk_x, chunk_z, timestamp, result in rows:
+            cached_results[(chunk_x, chunk_z)] = (timestamp, json.loads(result))
+
+        return cached_results
+
+    def put_region(self, dimension: str, region: str, results: ChunkResults):
+        if len(results) == 0:
+            return
+
+        self.connection.executemany("INSERT OR REPLACE INTO chunk_results VALUES (?, ?, ?, ?, ?, ?, ?)",
+                                    [(self.namespace, dimension, region, chunk_x, chunk_z, timestamp, json.dumps(result, separators=(",", ":")))
+                                     for (chunk_x, chunk_z), (timestamp, result) in results.items()])
+        self.connection.commit()
+
+    def close(self):
+        self.connection.close()
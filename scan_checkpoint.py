@@ -0,0 +1,171 @@
+import hashlib
+import json
+import os
+import sys
+from typing import Any, Dict, List, NamedTuple, Optional, TextIO, Tuple
+
+# Keeps Every Region A Scan Has Finished (Results Included), So A Scan Stopped With Ctrl-C (Or A Crash) Can Pick Up Where It Left Off
+# Regions Are Only Written After The Front-End Is Done With Them, Then --resume Hands The Saved Ones Back Before Scanning The Rest,
+#   Which Rebuilds Totals, Marker Lists, Output Files, ... Exactly As An Uninterrupted Scan Would
+# Only Used With --checkpoint Or --resume, Plain Scans Never Write Anything Next To The World
+# Bump This When The Layout Of Saved Regions Changes, So Old Checkpoints Are Started Over Instead Of Misread
+checkpoint_version: int = 3
+
+
+class CheckpointRegion(NamedTuple):
+    # Position In The Scan's Region Order
+    index: int
+    # Size And Modification Time Of The Region File After The Front-End Was Done, A Changed Region Is Scanned Again
+    size: int
+    modified: int
+    # As Encoded By The Scan Engine, Plain JSON
+    result: Any
+
+
+def get_default_checkpoint_path(world_folder: str, name: str) -> str:
+    # Each Script Gets Its Own File, So Scans Of The Same World Don't Resume Each Other
+    return os.path.join(world_folder, "world_scanner_checkpoint.%s.jsonl" % name)
+
+
+def get_scan_key(visitor_names: List[str], regions: List[Tuple[str, str, bool]]) -> str:
+    # A Checkpoint Only Belongs To The Same Analyses (Visitor Names Include Their Options) Over The Same Regions
+    return hashlib.sha1(repr((checkpoint_version, sorted(visitor_names), regions)).encode("utf-8")).hexdigest()
+
+
+def get_region_state(region_path: str) -> Tuple[int, int]:
+    try:
+        stat: os.stat_result = os.stat(region_path)
+    except OSError:
+        return -1, -1
+
+    return stat.st_size, stat.st_mtime_ns
+
+
+def read_records(f) -> Tuple[List[Any], List[int]]:
+    # Returns Every Complete Record (One JSON Document Per Line) And Where Each One Ends
+    records: List[Any] = []
+    ends: List[int] = []
+    end: int = f.tell()
+    for line in f:
+        # Cut Off By The Interruption
+        if not line.endswith(b"\n"):
+            break
+
+        try:
+            records.append(json.loads(line))
+        except ValueError:
+            break
+
+        end += len(line)
+        ends.append(end)
+
+    return records, ends
+
+
+class ScanCheckpoint:
+    def __init__(self, checkpoint_path: str, resume: bool = False, message_stream: Optional[TextIO] = sys.stderr):
+        self.checkpoint_path: str = checkpoint_path
+        self.resume: bool = resume
+        # Messages Go To stderr, So A Resumed Scan's stdout Matches An Uninterrupted One
+        self.message_stream: Optional[TextIO] = message_stream
+
+        self.file = None
+        self.regions_saved: int = 0
+
+    def write_message(self, message: str):
+        if self.message_stream is not None:
+            self.message_stream.write(message + "\n")
+
+    def start(self, scan_key: str, region_paths: List[str]) -> List[Any]:
+        # Returns The Results Of The Regions To Hand Back Before Scanning Continues, Always A Prefix Of The Scan's Regions
+        saved_regions: List[CheckpointRegion] = []
+        ends: List[int] = []
+        if self.resume:
+            saved_regions, ends = self.load(scan_key=scan_key)
+
+        resumed: List[Any] = []
+        for region in saved_regions:
+            # Everything After A Changed Region Is Scanned Again As Well, As Regions Are Handed Back In Order
+            if region.index != len(resumed) or region.index >= len(region_paths) or get_region_state(region_path=region_paths[region.index]) != (region.size, region.modified):
+                break
+
+            resumed.append(region.result)
+
+        try:
+            if len(ends) > 0:
+                # Regions After The Last One Still Valid (And A Record Cut Off Halfway) Are Dropped From The File
+                self.file = open(self.checkpoint_path, mode="r+b")
+                self.file.seek(ends[len(resumed)])
+                self.file.truncate()
+            else:
+                self.file = open(self.checkpoint_path, mode="wb")
+                self.write_record(record={"version": checkpoint_version, "scan_key": scan_key})
+        except OSError as e:
+            # E.g. A Read Only World Download, Scanning Still Works, It Just Can't Be Resumed
+            self.write_message("Can't Write Checkpoint %s, The Scan Can't Be Resumed!!! - %s" % (self.checkpoint_path, e))
+            self.file = None
+
+        if self.resume:
+            self.write_message("Resuming After %s Of %s Regions" % (len(resumed), len(region_paths)))
+
+        self.regions_saved: int = len(resumed)
+        return resumed
+
+    def load(self, scan_key: str) -> Tuple[List[CheckpointRegion], List[int]]:
+        # Also Returns Where The Header (First) And Each Saved Region End
+        if not os.path.isfile(self.checkpoint_path):
+            self.write_message("No Checkpoint At %s, Starting Over" % self.checkpoint_path)
+            return [], []
+
+        try:
+            with open(self.checkpoint_path, mode="rb") as f:
+                records, ends = read_records(f=f)
+        except OSError:
+            return [], []
+
+        if len(records) == 0 or records[0] != {"version": checkpoint_version, "scan_key": scan_key}:
+            self.write_message("Checkpoint %s Is From A Different Scan, Starting Over" % self.checkpoint_path)
+            return [], []
+
+        regions: List[CheckpointRegion] = []
+        for record in records[1:]:
+            try:
+                regions.append(CheckpointRegion(index=record["index"], size=record["size"], modified=record["modified"], result=record["result"]))
+            except (KeyError, TypeError):
+                break
+
+        return regions, ends[:len(regions) + 1]
+
+    def write_record(self, record: Dict[str, Any]):
+        self.file.write((json.dumps(record, separators=(",", ":")) + "\n").encode("utf-8"))
+        self.file.flush()
+
+    def put_region(self, index: int, region_path: str, result: Any):
+        # result Has To Be Plain JSON
+        if self.file is None:
+            return
+
+        size, modified = get_region_state(region_path=region_path)
+        self.write_record(record={"index": index, "size": size, "modified": modified, "result": result})
+        self.regions_saved += 1
+
+    def finish(self, interrupted: bool = False):
+        if self.file is None:
+            return
+
+        self.file.close()
+        self.file = None
+        if interrupted:
+            self.write_message("Saved %s Finished Regions To %s, Run Again With --resume To Continue" % (self.regions_saved, self.checkpoint_path))
+            return
+
+        # Nothing Left To Resume
+        os.remove(self.checkpoint_path)
+
+
+def open_checkpoint(world_folder: str, name: str, checkpoint_path: Optional[str] = None, resume: bool = False) -> Optional[ScanCheckpoint]:
+    # For The --checkpoint And --resume Arguments: None Without Either, "" (Or Only --resume) Means The Default File Inside The World Folder
+    if checkpoint_path is None and not resume:
+        return None
+
+    return ScanCheckpoint(checkpoint_path=checkpoint_path if checkpoint_path else get_default_checkpoint_path(world_folder=world_folder, name=name), resume=resume)
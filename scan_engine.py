@@ -0,0 +1,583 @@
+import itertools
+import multiprocessing
+import multiprocessing.pool
+import os
+import re
+import sys
+import time
+from typing import Any, Dict, FrozenSet, Iterator, List, NamedTuple, Optional, TextIO, Tuple
+
+import humanize
+import nbt
+from nbt.nbt import MalformedFileError, NBTFile
+from nbt.region import RegionFileFormatError
+
+from palette_index import ChunkSummary, RegionIndex, get_chunk_summary, index_entity_paths, index_terrain_paths
+from projected_nbt import ChunkHeader, Projection, make_projection, read_chunk_header, read_projected_nbt
+from region_reader import MappedRegionFile, RegionUsage, decompress_chunk, read_region_usage
+from scan_cache import ChunkResults, ScanCache, get_region_key, is_cached
+from scan_checkpoint import ScanCheckpoint, get_scan_key
+from scan_profile import ScanProfiler, make_region_profiler
+from scan_stats import RegionStats, ScanStats
+
+# Shared Scan Loop For Every Script, Each Chunk Is Decoded Once And Handed To Every Registered Visitor
+# Visitors Run In The Worker Processes, So They Only Return Results, The Front-End Scripts Collect Them In Region Order
+region_file_pattern: re.Pattern = re.compile(r"^r\.(-?\d+)\.(-?\d+)\.mca$")
+
+ProjectionPath = Tuple[str, ...]
+
+# 20w45a (1.17) Moved Entities Out Of The Terrain Region Files And Into The entities Folder
+entity_split_data_version: int = 2681
+
+
+class RegionTask(NamedTuple):
+    region_path: str
+    dimension: str
+    # True For 1.17+ Region Files From The entities Folder
+    entities: bool
+    # True When The World Keeps Its Entities In The entities Folder, So Terrain Chunks Don't Have Any
+    split_entities: bool = False
+
+
+class ChunkContext(NamedTuple):
+    dimension: str
+    region_path: str
+    region_x: int
+    region_z: int
+    # Chunk Coordinates Within The Region (0-31)
+    x: int
+    z: int
+    timestamp: int
+    entities: bool
+    split_entities: bool = False
+
+    def get_chunk_coordinates(self) -> Tuple[int, int]:
+        return self.region_x * 32 + self.x, self.region_z * 32 + self.z
+
+
+class RegionResult(NamedTuple):
+    task: RegionTask
+    # Visitor Name -> [(Chunk, Result)] In Chunk Order, Leaving Out Empty Results (Or Whatever ChunkVisitor.combine_results(...) Made Of Them)
+    results: Dict[str, List[Tuple[ChunkContext, Any]]]
+    # Only Collected With --stats
+    stats: Optional[RegionStats] = None
+    # Only Collected With --profile
+    profile: Any = None
+    # Chunks Thrown Away For Not Being Fully Generated, Counted With Or Without --stats
+    skipped_chunks: int = 0
+    # True When The Region Was Handed Back From A Checkpoint (--resume) Instead Of Scanned, Anything The Front-End Did To The World Is Already Done
+    resumed: bool = False
+    # Front-Ends Can Keep What They Did With The Region Here, It's Saved With The Checkpoint (So Only Plain JSON)
+    notes: Optional[Dict[str, Any]] = None
+
+
+class ChunkVisitor:
+    # Name Doubles As The Cache Namespace, So It Has To Change When The Result Layout Does
+    name: str = ""
+
+    # Tags To Decode For Terrain (region) And 1.17+ Entity (entities) Chunks, No Paths Means The Visitor Skips Those Regions
+    terrain_paths: List[ProjectionPath] = []
+    entity_paths: List[ProjectionPath] = []
+
+    def get_paths(self, task: RegionTask) -> List[ProjectionPath]:
+        # Override To Decode Different Tags Depending On The World Format
+        return self.entity_paths if task.entities else self.terrain_paths
+
+    def wants_region(self, task: RegionTask) -> bool:
+        return len(self.get_paths(task=task)) > 0
+
+    def index_filter(self, summary: ChunkSummary) -> bool:
+        # With The Palette Index, Return False To Skip Reading Chunks The Visitor Can Rule Out From Their Block And Entity IDs
+        return True
+
+    def full_chunks_only(self, task: RegionTask) -> bool:
+        # Return True When Chunks That Aren't Fully Generated (Status Isn't full) Would Only Be Thrown Away,
+        #   So They Are Skipped Before Anything Is Decoded
+        return False
+
+    def prefilter(self, chunk_bytes: bytes) -> bool:
+        # Return False To Skip Decoding Chunks The Visitor Can Rule Out From The Raw Bytes
+        return True
+
+    def empty_result(self, context: ChunkContext) -> Any:
+        # Result For Chunks Ruled Out By prefilter(...)
+        return None
+
+    def visit(self, chunk: nbt.nbt.NBTFile, context: ChunkContext) -> Any:
+        raise NotImplementedError(self.__class__.__name__)
+
+    def error(self, context: ChunkContext, error: Exception) -> Any:
+        # Result For Chunks That Couldn't Be Decoded Due To Invalid Data
+        return self.empty_result(context=context)
+
+    def is_empty(self, result: Any) -> bool:
+        # Empty Results Are Cached But Not Handed Back, So A Region's Results Only Grow With The Chunks That Matter
+        return False
+
+    def is_final(self, result: Any) -> bool:
+        # Return True Once The Visitor Doesn't Need Any More Chunks From This Region
+        return False
+
+    def combine_results(self, results: List[Tuple[ChunkContext, Any]]) -> List[Tuple[ChunkContext, Any]]:
+        # Runs Where The Region Was Scanned, Override To Hand A Region's Results Back As Fewer (E.g. One Merged Total Instead Of One Per Chunk)
+        return results
+
+    def encode_result(self, result: Any) -> Any:
+        # Results Are Stored As JSON (Never Pickled, Caches Live In Downloaded World Folders), Override When A Result Isn't Plain JSON
+        return result
+
+    def decode_result(self, value: Any) -> Any:
+        # Inverse Of encode_result(...), JSON Hands Tuples Back As Lists
+        return value
+
+
+class IndexVisitor(ChunkVisitor):
+    # Builds Palette Index Entries For Chunks Whose Entries Are Missing Or Out Of Date, Alongside The Front-End's Visitors
+    name: str = "palette_index"
+    terrain_paths: List[ProjectionPath] = index_terrain_paths
+    entity_paths: List[ProjectionPath] = index_entity_paths
+
+    def visit(self, chunk: nbt.nbt.NBTFile, context: ChunkContext) -> ChunkSummary:
+        return get_chunk_summary(chunk=chunk)
+
+
+def get_dimensions_to_scan(world_folder: str) -> List[str]:
+    nether_path: str = os.path.join(world_folder, "DIM-1")
+    overworld_path: str = world_folder
+    the_end_path: str = os.path.join(world_folder, "DIM1")
+    custom_dimensions_path: str = os.path.join(world_folder, "dimensions")
+
+    dimensions_to_scan: List[str] = [overworld_path]
+
+    # If The Nether Exists, Add To The Scan List
+    if os.path.exists(nether_path):
+        dimensions_to_scan.append(nether_path)
+
+    # If The End Exists, Add To The Scan List
+    if os.path.exists(the_end_path):
+        dimensions_to_scan.append(the_end_path)
+
+    # If Custom Dimensions Exist, Add To The Scan List
+    if os.path.exists(custom_dimensions_path):
+        for namespace in os.listdir(custom_dimensions_path):
+            namespace_path: str = os.path.join(custom_dimensions_path, namespace)
+            if os.path.isfile(namespace_path):
+                continue
+
+            for dimension in os.listdir(namespace_path):
+                dimension_path: str = os.path.join(namespace_path, dimension)
+                if os.path.isfile(dimension_path):
+                    continue
+
+                # print(dimension_path)
+                dimensions_to_scan.append(dimension_path)
+
+    return dimensions_to_scan
+
+
+def get_dimension_folder_name(dimension: str) -> str:
+    # For Retrieving The Right Dimension Name Regardless Of Trailing Slashes
+    # TODO: Grab Actual In Game Dimension Names (Like With /execute in namespace:dimension_name) When Possible
+    if dimension.endswith("/") or dimension.endswith("\\"):
+        return os.path.basename(os.path.dirname(dimension))
+
+    return os.path.basename(dimension)
+
+
+def get_region_coordinates(region_path: str) -> Tuple[int, int]:
+    match: Optional[re.Match] = region_file_pattern.match(os.path.basename(region_path))
+    return int(match.group(1)), int(match.group(2))
+
+
+def get_region_files(folder: str) -> List[str]:
+    # Sorted By Region Coordinates So The Scan Order (And Output) Is The Same Every Run
+    region_files: List[Tuple[Tuple[int, int], str]] = []
+    if not os.path.exists(folder):
+        return []
+
+    for region_file in os.listdir(folder):
+        if region_file_pattern.match(region_file) is not None:
+            region_path: str = os.path.join(folder, region_file)
+            region_files.append((get_region_coordinates(region_path=region_path), region_path))
+
+    region_files.sort()
+    return [region_path for _, region_path in region_files]
+
+
+def has_split_entities(world_folder: str) -> bool:
+    # The World Format Is Detected Once From level.dat, Rather Than Checking Every Chunk For Entities
+    level_path: str = os.path.join(world_folder, "level.dat")
+    if os.path.isfile(level_path):
+        try:
+            level: NBTFile = NBTFile(filename=level_path)
+            if "Data" in level and "DataVersion" in level["Data"]:
+                return level["Data"]["DataVersion"].value >= entity_split_data_version
+        except (MalformedFileError, OSError, EOFError):
+            # Unreadable level.dat, So Fall Back To Looking For The Folder
+            pass
+
+    # E.g. Worlds Without A level.dat, Or Pre-1.9 Ones Without A DataVersion
+    return any(os.path.isdir(os.path.join(dimension, "entities")) for dimension in get_dimensions_to_scan(world_folder=world_folder))
+
+
+def get_region_tasks(world_folder: str) -> List[RegionTask]:
+    split_entities: bool = has_split_entities(world_folder=world_folder)
+
+    region_tasks: List[RegionTask] = []
+    for dimension in get_dimensions_to_scan(world_folder=world_folder):
+        dimension_folder_name: str = get_dimension_folder_name(dimension=dimension)
+
+        # Terrain Regions (Block Entities, Blocks And Pre-1.17 Entities)
+        for region_path in get_region_files(folder=os.path.join(dimension, "region")):
+            region_tasks.append(RegionTask(region_path=region_path, dimension=dimension_folder_name, entities=False, split_entities=split_entities))
+
+        # Region File Name - For Grabbing Entities From Entities Folder If It Exists (Post 1.17)
+        for region_path in get_region_files(folder=os.path.join(dimension, "entities")):
+            region_tasks.append(RegionTask(region_path=region_path, dimension=dimension_folder_name, entities=True, split_entities=split_entities))
+
+    return region_tasks
+
+
+def _get_projection(visitors: List[ChunkVisitor], task: RegionTask, projections: Dict[FrozenSet[str], Projection]) -> Projection:
+    # One Decode Has To Satisfy Every Visitor Looking At The Chunk, So Their Paths Are Merged (And Remembered Per Combination)
+    key: FrozenSet[str] = frozenset(visitor.name for visitor in visitors)
+    if key not in projections:
+        paths: List[ProjectionPath] = []
+        for visitor in visitors:
+            paths.extend(visitor.get_paths(task=task))
+
+        projections[key] = make_projection(paths=paths)
+
+    return projections[key]
+
+
+def _read_chunk(region: MappedRegionFile, x: int, z: int, stats: Optional[RegionStats]) -> bytes:
+    if stats is None:
+        return region.get_blockdata(x, z)
+
+    # Decompressed Straight From The Mapping, The Same As Without Stats, So Measuring Doesn't Add A Copy Of Every Chunk
+    # Pages Of The Mapping Are Read From Disk As zlib Gets To Them, So That Time Counts As Decompression
+    started: float = time.perf_counter()
+    compression, view = region.get_stored_chunk(x=x, z=z)
+    located: float = time.perf_counter()
+    try:
+        chunk_bytes: bytes = decompress_chunk(x=x, z=z, compression=compression, data=view)
+        stats.compressed_bytes += view.nbytes
+    finally:
+        view.release()
+
+    stats.phases["region_io"] += located - started
+    stats.phases["decompression"] += time.perf_counter() - located
+    stats.decompressed_bytes += len(chunk_bytes)
+    return chunk_bytes
+
+
+def scan_region(task: RegionTask, visitors: List[ChunkVisitor], cache_path: Optional[str] = None, collect_stats: bool = False,
+                use_index: bool = False) -> Tuple[RegionResult, Dict[str, ChunkResults]]:
+    # Also Returns Freshly Computed Results Per Visitor, So The Caller Can Cache Them
+    stats: Optional[RegionStats] = RegionStats() if collect_stats else None
+    started: float = time.perf_counter()
+
+    visitors: List[ChunkVisitor] = [visitor for visitor in visitors if visitor.wants_region(task=task)]
+    results: Dict[str, List[Tuple[ChunkContext, Any]]] = {visitor.name: [] for visitor in visitors}
+    new_results: Dict[str, ChunkResults] = {visitor.name: {} for visitor in visitors}
+
+    cached_results: Dict[str, ChunkResults] = {}
+    if cache_path is not None:
+        for visitor in visitors:
+            cache: ScanCache = ScanCache(cache_path=cache_path, namespace=visitor.name)
+            cached_results[visitor.name] = cache.get_region(dimension=task.dimension, region=get_region_key(region_path=task.region_path))
+            cache.close()
+
+    # Each Region Is Scanned By One Process, So Its Index Is Read And Written Here Without Locking
+    region_index: Optional[RegionIndex] = RegionIndex(region_path=task.region_path).load() if use_index else None
+    index_visitor: IndexVisitor = IndexVisitor()
+
+    region_x, region_z = get_region_coordinates(region_path=task.region_path)
+    projections: Dict[FrozenSet[str], Projection] = {}
+    active_visitors: List[ChunkVisitor] = list(visitors)
+    skipped_chunks: int = 0
+
+    try:
+        region: MappedRegionFile = MappedRegionFile(filename=task.region_path)
+    except RegionFileFormatError:
+        # Too Small To Have A Header, So There Aren't Any Chunks To Read
+        return RegionResult(task=task, results=results, stats=stats), new_results
+
+    if stats is not None:
+        stats.phases["region_io"] += time.perf_counter() - started
+
+    try:
+        for metadata in region.get_metadata():
+            if len(active_visitors) == 0:
+                break
+
+            if stats is not None:
+                stats.chunks += 1
+
+            context: ChunkContext = ChunkContext(dimension=task.dimension, region_path=task.region_path, region_x=region_x, region_z=region_z,
+                                                 x=metadata.x, z=metadata.z, timestamp=metadata.timestamp, entities=task.entities, split_entities=task.split_entities)
+            chunk_results: Dict[str, Any] = {}
+
+            # Unchanged Since The Last Run, So Reuse The Result Instead Of Decoding The Chunk
+            pending_visitors: List[ChunkVisitor] = []
+            for visitor in active_visitors:
+                if visitor.name in cached_results and is_cached(cached_results=cached_results[visitor.name], x=metadata.x, z=metadata.z, timestamp=metadata.timestamp):
+                    chunk_results[visitor.name] = visitor.decode_result(value=cached_results[visitor.name][(metadata.x, metadata.z)][1])
+                else:
+                    pending_visitors.append(visitor)
+
+            if len(pending_visitors) == 0 and stats is not None:
+                stats.cached_chunks += 1
+
+            # Chunks The Index Rules Out For Every Visitor Are Never Read
+            summary: Optional[ChunkSummary] = region_index.get_summary(x=metadata.x, z=metadata.z, timestamp=metadata.timestamp) if region_index is not None else None
+            reading_visitors: List[ChunkVisitor] = []
+            for visitor in pending_visitors:
+                if summary is None or visitor.index_filter(summary=summary):
+                    reading_visitors.append(visitor)
+                else:
+                    chunk_results[visitor.name] = visitor.empty_result(context=context)
+
+            if summary is not None and len(pending_visitors) > 0 and len(reading_visitors) == 0 and stats is not None:
+                stats.indexed_chunks += 1
+
+            refresh_index: bool = region_index is not None and summary is None and index_visitor.wants_region(task=task)
+            if len(reading_visitors) > 0 or refresh_index:
+                try:
+                    chunk_bytes: bytes = _read_chunk(region=region, x=metadata.x, z=metadata.z, stats=stats)
+                except RegionFileFormatError:
+                    # Same As WorldFolder.iter_nbt(), Unreadable Chunks Are Skipped
+                    continue
+
+                checked: float = time.perf_counter() if stats is not None else 0.0
+
+                # Only DataVersion And Status Are Read Here, Which Is Far Cheaper Than Decoding Proto-Chunks Just To Ignore Them
+                status_visitors: List[ChunkVisitor] = [visitor for visitor in reading_visitors if visitor.full_chunks_only(task=task)]
+                if len(status_visitors) > 0:
+                    try:
+                        header: Optional[ChunkHeader] = read_chunk_header(data=chunk_bytes)
+                    except MalformedFileError:
+                        # Left For The Real Decode To Report
+                        header: Optional[ChunkHeader] = None
+
+                    if header is not None and not header.is_full():
+                        for visitor in status_visitors:
+                            chunk_results[visitor.name] = visitor.empty_result(context=context)
+
+                        reading_visitors: List[ChunkVisitor] = [visitor for visitor in reading_visitors if visitor not in status_visitors]
+                        skipped_chunks += 1
+
+                decode_visitors: List[ChunkVisitor] = []
+                for visitor in reading_visitors:
+                    if visitor.prefilter(chunk_bytes=chunk_bytes):
+                        decode_visitors.append(visitor)
+                    else:
+                        chunk_results[visitor.name] = visitor.empty_result(context=context)
+
+                if stats is not None:
+                    parsed: float = time.perf_counter()
+                    stats.phases["checks"] += parsed - checked
+
+                # Out Of Date Index Entries Are Rebuilt From The Same Decode
+                projection_visitors: List[ChunkVisitor] = decode_visitors + [index_visitor] if refresh_index else decode_visitors
+                if len(projection_visitors) > 0:
+                    try:
+                        chunk: nbt.nbt.NBTFile = read_projected_nbt(data=chunk_bytes, projection=_get_projection(visitors=projection_visitors, task=task, projections=projections))
+                    except MalformedFileError:
+                        # Same As WorldFolder.iter_nbt(), Unreadable Chunks Are Skipped
+                        continue
+                    except UnicodeDecodeError as e:
+                        # hermitcraft6 currently breaks the scanner. Docm77 Alien Tech Books Are To Blame
+                        # TODO: See Bug Report With Patch For Fix: https://github.com/twoolie/NBT/issues/144
+                        for visitor in decode_visitors:
+                            chunk_results[visitor.name] = visitor.error(context=context, error=e)
+                    else:
+                        if stats is not None:
+                            visited: float = time.perf_counter()
+                            stats.phases["parsing"] += visited - parsed
+
+                        for visitor in decode_visitors:
+                            chunk_results[visitor.name] = visitor.visit(chunk=chunk, context=context)
+
+                        if refresh_index:
+                            region_index.put_summary(x=metadata.x, z=metadata.z, timestamp=metadata.timestamp, summary=index_visitor.visit(chunk=chunk, context=context))
+
+                        if stats is not None:
+                            stats.phases["checks"] += time.perf_counter() - visited
+
+            # Only Sent Back To The Parent When There's A Cache To Write Them To, Including Chunks The Index Ruled Out Without Reading
+            if cache_path is not None:
+                for visitor in pending_visitors:
+                    new_results[visitor.name][(metadata.x, metadata.z)] = (metadata.timestamp, chunk_results[visitor.name])
+
+            for visitor in list(active_visitors):
+                if not visitor.is_empty(result=chunk_results[visitor.name]):
+                    results[visitor.name].append((context, chunk_results[visitor.name]))
+
+                if visitor.is_final(result=chunk_results[visitor.name]):
+                    active_visitors.remove(visitor)
+    finally:
+        region.close()
+
+    if region_index is not None:
+        region_index.save()
+
+    for visitor in visitors:
+        results[visitor.name] = visitor.combine_results(results=results[visitor.name])
+
+    if stats is not None:
+        stats.skipped_chunks += skipped_chunks
+
+    return RegionResult(task=task, results=results, stats=stats, skipped_chunks=skipped_chunks), new_results
+
+
+def _scan_region_task(worker_task: Tuple[RegionTask, List[ChunkVisitor], Optional[str], bool, Optional[str], bool]) -> Tuple[RegionResult, Dict[str, ChunkResults]]:
+    # Runs In A Worker Process, Workers Only Read The Cache, The Parent Writes The New Results
+    task, visitors, cache_path, collect_stats, profile_mode, use_index = worker_task
+    if profile_mode is None:
+        return scan_region(task=task, visitors=visitors, cache_path=cache_path, collect_stats=collect_stats, use_index=use_index)
+
+    # Profiled Where The Region Is Scanned, The Parent Merges Every Region's Profile
+    profiler = make_region_profiler(mode=profile_mode)
+    profiler.start()
+    try:
+        region_result, new_results = scan_region(task=task, visitors=visitors, cache_path=cache_path, collect_stats=collect_stats, use_index=use_index)
+    finally:
+        profiler.stop()
+
+    return region_result._replace(profile=profiler.get_data()), new_results
+
+
+def _scan_indexed_region_task(indexed_task: Tuple[int, tuple]) -> Tuple[int, Tuple[RegionResult, Dict[str, ChunkResults]]]:
+    # The Index Tells The Parent Where The Region Goes Back In The Scan Order
+    index, worker_task = indexed_task
+    return index, _scan_region_task(worker_task=worker_task)
+
+
+def _get_empty_region(task: RegionTask, visitors: List[ChunkVisitor], collect_stats: bool) -> Tuple[RegionResult, Dict[str, ChunkResults]]:
+    # Same Result scan_region(...) Would Give A Region Without Chunks, Without Handing It To A Worker
+    results: Dict[str, List[Tuple[ChunkContext, Any]]] = {visitor.name: [] for visitor in visitors if visitor.wants_region(task=task)}
+    return RegionResult(task=task, results=results, stats=RegionStats() if collect_stats else None), {}
+
+
+def _iter_largest_first(pool: multiprocessing.pool.Pool, worker_tasks: List[tuple], usages: List[RegionUsage],
+                        finished: Dict[int, Tuple[RegionResult, Dict[str, ChunkResults]]]) -> Iterator[Tuple[RegionResult, Dict[str, ChunkResults]]]:
+    # Regions Are Handed Out Largest First, So The Scan Doesn't End With One Worker On A Huge Spawn Region While The Rest Sit Idle,
+    #   But Are Handed Back In Task Order, So Output Still Matches A Single Process Scan
+    # finished Starts Out With The Empty Regions, Which Never Go To A Worker
+    order: List[int] = sorted([index for index in range(len(worker_tasks)) if index not in finished], key=lambda index: -usages[index].chunk_bytes)
+    next_index: int = 0
+    for index, scanned_region in pool.imap_unordered(_scan_indexed_region_task, [(index, worker_tasks[index]) for index in order], chunksize=1):
+        finished[index] = scanned_region
+        while next_index in finished:
+            yield finished.pop(next_index)
+            next_index += 1
+
+    # Only Empty Regions Can Be Left, E.g. When Every Region Was Empty
+    while next_index in finished:
+        yield finished.pop(next_index)
+        next_index += 1
+
+
+def _encode_region_result(region_result: RegionResult, named_visitors: Dict[str, ChunkVisitor]) -> Dict[str, Any]:
+    # For The Checkpoint, Which Is JSON Like The Cache, Stats And Profiles Aren't Kept
+    return {
+        "task": list(region_result.task),
+        "results": {name: [[list(context), named_visitors[name].encode_result(result=result)] for context, result in results] for name, results in region_result.results.items()},
+        "skipped_chunks": region_result.skipped_chunks,
+        "notes": region_result.notes
+    }
+
+
+def _decode_region_result(value: Dict[str, Any], named_visitors: Dict[str, ChunkVisitor]) -> RegionResult:
+    results: Dict[str, List[Tuple[ChunkContext, Any]]] = {name: [(ChunkContext(*context), named_visitors[name].decode_result(value=result)) for context, result in results]
+                                                          for name, results in value["results"].items()}
+    return RegionResult(task=RegionTask(*value["task"]), results=results, skipped_chunks=value["skipped_chunks"], resumed=True, notes=value["notes"])
+
+
+def iter_scan(region_tasks: List[RegionTask], visitors: List[ChunkVisitor], workers: int = 1, cache_path: Optional[str] = None,
+              stats: Optional[ScanStats] = None, profiler: Optional[ScanProfiler] = None, use_index: bool = False,
+              checkpoint: Optional[ScanCheckpoint] = None) -> Iterator[RegionResult]:
+    # Regions No Visitor Cares About Are Never Opened
+    region_tasks: List[RegionTask] = [task for task in region_tasks if any(visitor.wants_region(task=task) for visitor in visitors)]
+    collect_stats: bool = stats is not None
+    profile_mode: Optional[str] = profiler.mode if profiler is not None else None
+    if stats is not None:
+        stats.start(regions_total=len(region_tasks))
+
+    # Regions Finished Before The Scan Was Interrupted Are Handed Back First, Only The Rest Are Scanned
+    named_visitors: Dict[str, ChunkVisitor] = {visitor.name: visitor for visitor in visitors}
+    resumed_regions: List[RegionResult] = []
+    if checkpoint is not None:
+        saved_regions: List[Any] = checkpoint.start(scan_key=get_scan_key(visitor_names=[visitor.name for visitor in visitors],
+                                                                          regions=[(task.dimension, get_region_key(region_path=task.region_path), task.entities) for task in region_tasks]),
+                                                    region_paths=[task.region_path for task in region_tasks])
+        resumed_regions: List[RegionResult] = [_decode_region_result(value=value, named_visitors=named_visitors) for value in saved_regions]
+
+    remaining_tasks: List[RegionTask] = region_tasks[len(resumed_regions):]
+
+    caches: Dict[str, ScanCache] = {}
+    if cache_path is not None:
+        for visitor in visitors:
+            caches[visitor.name] = ScanCache(cache_path=cache_path, namespace=visitor.name)
+
+    # Only The Location Tables Are Read Here, Empty Regions (0 Bytes, Header Only Or Without Chunks) Are Never Opened By A Worker
+    usages: List[RegionUsage] = [read_region_usage(filename=task.region_path) for task in remaining_tasks]
+    worker_tasks: List[tuple] = [(task, visitors, cache_path, collect_stats, profile_mode, use_index) for task in remaining_tasks]
+    empty_regions: Dict[int, Tuple[RegionResult, Dict[str, ChunkResults]]] = {index: _get_empty_region(task=task, visitors=visitors, collect_stats=collect_stats)
+                                                                              for index, (task, usage) in enumerate(zip(remaining_tasks, usages)) if usage.chunks == 0}
+
+    pool: Optional[multiprocessing.pool.Pool] = None
+    try:
+        if workers <= 1:
+            scanned_regions: Iterator[Tuple[RegionResult, Dict[str, ChunkResults]]] = (empty_regions[index] if index in empty_regions else _scan_region_task(worker_task=worker_task)
+                                                                                       for index, worker_task in enumerate(worker_tasks))
+        else:
+            pool: multiprocessing.pool.Pool = multiprocessing.Pool(processes=workers)
+            scanned_regions: Iterator[Tuple[RegionResult, Dict[str, ChunkResults]]] = _iter_largest_first(pool=pool, worker_tasks=worker_tasks, usages=usages, finished=empty_regions)
+
+        all_regions: Iterator[Tuple[RegionResult, Dict[str, ChunkResults]]] = itertools.chain(((region_result, {}) for region_result in resumed_regions), scanned_regions)
+        for index, (region_result, new_results) in enumerate(all_regions):
+            if not region_result.resumed:
+                region_result: RegionResult = region_result._replace(notes={})
+
+            if profiler is not None:
+                profiler.add_region(data=region_result.profile)
+
+            written: float = time.perf_counter()
+            for name, results in new_results.items():
+                if name in caches:
+                    caches[name].put_region(dimension=region_result.task.dimension, region=get_region_key(region_path=region_result.task.region_path),
+                                            results={position: (timestamp, named_visitors[name].encode_result(result=result)) for position, (timestamp, result) in results.items()})
+
+            if stats is None:
+                yield region_result
+            else:
+                stats.phases["region_io"] += time.perf_counter() - written
+                stats.add_region(region_stats=region_result.stats)
+
+                # The Front-End Handles The Region While This Generator Is Paused
+                handed_over: float = time.perf_counter()
+                yield region_result
+                stats.add_output(seconds=time.perf_counter() - handed_over)
+
+            # Only Saved Once The Front-End Is Done With It, A Region Interrupted Halfway Through Is Handled Again On --resume
+            if checkpoint is not None and not region_result.resumed:
+                checkpoint.put_region(index=index, region_path=region_result.task.region_path, result=_encode_region_result(region_result=region_result, named_visitors=named_visitors))
+    finally:
+        # Also Runs When The Front-End Stops Early (E.g. A Barrier Was Found)
+        if pool is not None:
+            pool.terminate()
+            pool.join()
+
+        for cache in caches.values():
+            cache.close()
+
+
+def print_skipped_chunks(skipped_chunks: int, stream: TextIO = sys.stderr):
+    # Printed At The End Of Every Scan Whose Visitors Only Look At Fully Generated Chunks, With Or Without --stats
+    # Goes To stderr Like The --stats Progress, So It Doesn't Mix With Output Piped From stdout
+    # Chunks Answered From The Scan Cache Aren't Read, So They Aren't Counted Again
+    stream.write("Skipped %s Chunks That Aren't Fully Generated Yet\n" % humanize.intcomma(skipped_chunks))
+    stream.flush()
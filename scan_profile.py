@@ -0,0 +1,202 @@
+import cProfile
+import pstats
+import sys
+import threading
+from collections import Counter
+from types import FrameType
+from typing import Any, Dict, List, Optional, TextIO, Tuple
+
+# Profiling For --profile That Keeps Working With --workers
+# Each Region Is Profiled Where It's Scanned (In The Worker Processes), The Data Comes Back With The Region's Results,
+#   And The Parent Merges It Into One pstats File (cProfile) Or One Collapsed Stacks File (Sampling)
+profile_modes: List[str] = ["cprofile", "sample"]
+default_profile_file_names: Dict[str, str] = {
+    "cprofile": "scan_profile.pstats",
+    # One "frame;frame;frame count" Line Per Stack, Which flamegraph.pl And speedscope Read
+    "sample": "scan_profile.folded"
+}
+
+default_top: int = 25
+
+# Seconds Between Samples
+sample_interval: float = 0.001
+
+# Time Spent Under Functions With This Prefix (check_storages, check_signs, check_entities, ...) Is Also Summed Up Per Function
+check_prefix: str = "check_"
+
+
+class RawStats:
+    # pstats.Stats(...) Takes Anything With create_stats() And A stats Dictionary, Which Is What Comes Back From The Workers
+    def __init__(self, stats: dict):
+        self.stats: dict = stats
+
+    def create_stats(self):
+        pass
+
+
+class CProfileRegionProfiler:
+    def __init__(self):
+        self.profile: cProfile.Profile = cProfile.Profile()
+
+    def start(self):
+        self.profile.enable()
+
+    def stop(self):
+        self.profile.disable()
+
+    def get_data(self) -> dict:
+        # A Plain Dictionary, So It Can Be Pickled Back To The Parent
+        self.profile.create_stats()
+        return self.profile.stats
+
+
+class SamplingRegionProfiler:
+    # Looks At The Scanning Thread's Stack Every sample_interval Seconds From A Background Thread,
+    #   Which Costs Far Less Than cProfile's Hook On Every Call (But Misses Anything Shorter Than The Interval)
+    def __init__(self, interval: float = sample_interval):
+        self.interval: float = interval
+        self.thread_id: int = threading.get_ident()
+        self.stacks: Counter = Counter()
+        self.stopped: threading.Event = threading.Event()
+        self.thread: Optional[threading.Thread] = None
+
+        # Stacks Are Cut Off Above Whoever Started The Profiler, Forked Workers Would Otherwise Carry The Parent's Frames
+        self.root: Optional[FrameType] = None
+        self.switch_interval: float = sys.getswitchinterval()
+
+    def start(self):
+        self.thread_id: int = threading.get_ident()
+        self.root: FrameType = sys._getframe(1)
+
+        # The Sampler Only Runs When It Gets The GIL, Which Is Every 5ms By Default
+        self.switch_interval: float = sys.getswitchinterval()
+        sys.setswitchinterval(self.interval)
+
+        self.thread: threading.Thread = threading.Thread(target=self.run, daemon=True)
+        self.thread.start()
+
+    def run(self):
+        while not self.stopped.wait(self.interval):
+            frame: Optional[FrameType] = sys._current_frames().get(self.thread_id)
+            if frame is not None:
+                self.stacks[get_stack(frame=frame, root=self.root)] += 1
+
+    def stop(self):
+        self.stopped.set()
+        self.thread.join()
+        sys.setswitchinterval(self.switch_interval)
+        self.root: Optional[FrameType] = None
+
+    def get_data(self) -> Counter:
+        return self.stacks
+
+
+def get_stack(frame: FrameType, root: Optional[FrameType] = None) -> Tuple[str, ...]:
+    # Outermost Frame First, Starting At root When It's On The Stack
+    stack: List[str] = []
+    while frame is not None:
+        code = frame.f_code
+        stack.append("%s (%s:%s)" % (code.co_name, code.co_filename, code.co_firstlineno))
+        if frame is root:
+            break
+
+        frame = frame.f_back
+
+    stack.reverse()
+    return tuple(stack)
+
+
+def get_function_name(label: str) -> str:
+    return label.split(" ", 1)[0]
+
+
+def make_region_profiler(mode: str) -> Any:
+    if mode == "sample":
+        return SamplingRegionProfiler()
+
+    return CProfileRegionProfiler()
+
+
+class ScanProfiler:
+    def __init__(self, mode: str = "cprofile", output_path: Optional[str] = None, top: int = default_top, summary_stream: Optional[TextIO] = sys.stderr):
+        self.mode: str = mode
+        self.output_path: str = output_path if output_path is not None else default_profile_file_names[mode]
+        self.top: int = top
+        # Summary Goes To stderr, So It Doesn't Mix With Output Piped From stdout
+        self.summary_stream: Optional[TextIO] = summary_stream
+
+        self.stats: Optional[pstats.Stats] = None
+        self.stacks: Counter = Counter()
+
+    def add_region(self, data: Any):
+        if data is None:
+            return
+
+        if self.mode == "sample":
+            self.stacks.update(data)
+            return
+
+        if self.stats is None:
+            self.stats: pstats.Stats = pstats.Stats(RawStats(stats=data), stream=self.summary_stream)
+        else:
+            self.stats.add(RawStats(stats=data))
+
+    def finish(self):
+        if self.mode == "sample":
+            self.write_samples()
+        elif self.stats is not None:
+            self.stats.dump_stats(self.output_path)
+            if self.summary_stream is not None:
+                self.stats.sort_stats("cumulative").print_stats(self.top)
+                self.print_check_times()
+
+        if self.summary_stream is not None:
+            self.summary_stream.write("Profile Written To %s\n" % self.output_path)
+
+    def print_check_times(self):
+        # Cumulative Time Includes Everything A Check Calls, Which Is What Makes A Check Expensive
+        check_times: List[Tuple[str, int, float]] = []
+        for (filename, line, name), (_, calls, _, cumulative, _) in self.stats.stats.items():
+            if name.startswith(check_prefix):
+                check_times.append(("%s (%s:%s)" % (name, filename, line), calls, cumulative))
+
+        self.summary_stream.write("Time Per Check Function:\n")
+        for label, calls, cumulative in sorted(check_times, key=lambda check_time: check_time[2], reverse=True):
+            self.summary_stream.write("%10.3fs %10s Calls  %s\n" % (cumulative, calls, label))
+
+    def write_samples(self):
+        with open(self.output_path, mode="w") as f:
+            for stack, count in self.stacks.most_common():
+                f.write("%s %s\n" % (";".join(stack), count))
+
+        if self.summary_stream is None:
+            return
+
+        total: int = sum(self.stacks.values())
+        own: Counter = Counter()
+        inclusive: Counter = Counter()
+        checks: Counter = Counter()
+        for stack, count in self.stacks.items():
+            own[stack[-1]] += count
+            for label in set(stack):
+                inclusive[label] += count
+
+            # Tagged With The Innermost Check Function, So Nested Checks Aren't Counted Twice
+            for label in reversed(stack):
+                if get_function_name(label=label).startswith(check_prefix):
+                    checks[label] += count
+                    break
+
+        self.summary_stream.write("%s Samples\n" % total)
+        for title, counts in [("Own Samples", own), ("Inclusive Samples", inclusive), ("Samples Per Check Function", checks)]:
+            self.summary_stream.write("%s:\n" % title)
+            for label, count in counts.most_common(self.top):
+                self.summary_stream.write("%10s %6.1f%%  %s\n" % (count, 100 * count / total if total > 0 else 0.0, label))
+
+
+def open_profiler(profile_path: Optional[str], mode: str = "cprofile", top: int = default_top) -> Optional[ScanProfiler]:
+    # For The --profile Argument: None Means Off, "" Means On With The Default File Path
+    if profile_path is None:
+        return None
+
+    return ScanProfiler(mode=mode, output_path=profile_path if profile_path != "" else None, top=top)
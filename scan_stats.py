@@ -0,0 +1,127 @@
+import json
+import sys
+import time
+from typing import Dict, List, Optional, TextIO
+
+import humanize
+
+# Throughput And Phase Timings For --stats, So It's Clear Whether A World Scans Slowly Because Of The Disk Or The CPU
+# Worker Processes Time Their Own Phases Per Region (RegionStats), The Parent Adds Them Up (ScanStats),
+#   So Phase Times Are Summed Across Workers And Can Add Up To More Than The Wall Clock
+default_stats_file_name: str = "scan_stats.json"
+
+# region_io: Opening Regions, Reading Headers, The Scan Cache And Finding Chunks In The File
+# decompression: zlib/gzip, Including Reading The Compressed Chunk From Disk As It Goes
+# parsing: Decoding The (Projected) NBT
+# checks: The Visitors' Prefilters And Checks
+# output: Everything The Front-End Script Does With The Results (Runs In The Parent)
+phases: List[str] = ["region_io", "decompression", "parsing", "checks", "output"]
+
+# Seconds Between Live Progress Lines
+progress_interval: float = 0.5
+
+
+class RegionStats:
+    def __init__(self):
+        self.chunks: int = 0
+        # Chunks Answered Entirely From The Scan Cache
+        self.cached_chunks: int = 0
+        # Chunks The Palette Index Ruled Out Without Reading Them
+        self.indexed_chunks: int = 0
+        # Chunks Thrown Away Before Decoding For Not Being Fully Generated (Proto-Chunks)
+        self.skipped_chunks: int = 0
+        self.compressed_bytes: int = 0
+        self.decompressed_bytes: int = 0
+        self.phases: Dict[str, float] = dict.fromkeys(phases, 0.0)
+
+    def add(self, other: "RegionStats"):
+        self.chunks += other.chunks
+        self.cached_chunks += other.cached_chunks
+        self.indexed_chunks += other.indexed_chunks
+        self.skipped_chunks += other.skipped_chunks
+        self.compressed_bytes += other.compressed_bytes
+        self.decompressed_bytes += other.decompressed_bytes
+        for phase, seconds in other.phases.items():
+            self.phases[phase] += seconds
+
+
+class ScanStats(RegionStats):
+    def __init__(self, report_path: Optional[str] = None, progress_stream: Optional[TextIO] = sys.stderr):
+        super().__init__()
+        self.report_path: Optional[str] = report_path
+        # Progress Goes To stderr, So It Doesn't Mix With Output Piped From stdout
+        self.progress_stream: Optional[TextIO] = progress_stream
+
+        self.started: float = time.perf_counter()
+        self.last_progress: float = 0.0
+        self.regions_total: int = 0
+        self.regions_done: int = 0
+
+    def start(self, regions_total: int):
+        self.regions_total += regions_total
+
+    def add_region(self, region_stats: Optional[RegionStats]):
+        self.regions_done += 1
+        if region_stats is not None:
+            self.add(other=region_stats)
+
+        self.print_progress()
+
+    def add_output(self, seconds: float):
+        self.phases["output"] += seconds
+
+    def get_elapsed(self) -> float:
+        return time.perf_counter() - self.started
+
+    def print_progress(self, final: bool = False):
+        if self.progress_stream is None:
+            return
+
+        now: float = time.perf_counter()
+        if not final and now - self.last_progress < progress_interval:
+            return
+
+        self.last_progress: float = now
+        elapsed: float = self.get_elapsed()
+        self.progress_stream.write("\rRegions %s/%s - %s Chunks (%s/s, %s Not Fully Generated) - %s Read, %s Decompressed - %.1fs%s" % (
+            humanize.intcomma(self.regions_done), humanize.intcomma(self.regions_total), humanize.intcomma(self.chunks),
+            humanize.intcomma(round(self.chunks / elapsed)) if elapsed > 0 else "0", humanize.intcomma(self.skipped_chunks),
+            humanize.naturalsize(self.compressed_bytes), humanize.naturalsize(self.decompressed_bytes), elapsed, "\n" if final else ""))
+        self.progress_stream.flush()
+
+    def get_report(self) -> dict:
+        elapsed: float = self.get_elapsed()
+        phase_total: float = sum(self.phases.values())
+        return {
+            "seconds": elapsed,
+            "regions": self.regions_done,
+            "regions_total": self.regions_total,
+            "regions_remaining": self.regions_total - self.regions_done,
+            "chunks": self.chunks,
+            "cached_chunks": self.cached_chunks,
+            "indexed_chunks": self.indexed_chunks,
+            "skipped_chunks": self.skipped_chunks,
+            "chunks_per_second": self.chunks / elapsed if elapsed > 0 else 0.0,
+            "compressed_bytes": self.compressed_bytes,
+            "decompressed_bytes": self.decompressed_bytes,
+            "phases": self.phases,
+            # Mostly region_io Means The Disk Is What To Speed Up, Mostly The Others Means More Workers Will Help
+            "phase_fractions": {phase: seconds / phase_total if phase_total > 0 else 0.0 for phase, seconds in self.phases.items()}
+        }
+
+    def finish(self):
+        self.print_progress(final=True)
+        if self.report_path is None:
+            return
+
+        with open(self.report_path, mode="w") as f:
+            json.dump(self.get_report(), f, indent=2)
+            f.write("\n")
+
+
+def open_stats(stats_path: Optional[str]) -> Optional[ScanStats]:
+    # For The --stats Argument: None Means Off, "" Means On With The Default Report Path
+    if stats_path is None:
+        return None
+
+    return ScanStats(report_path=stats_path if stats_path != "" else default_stats_file_name)
@@ -1,13 +1,21 @@
+import argparse
 import os
 import sys
 import uuid
 from typing import List, Optional
 
 import nbt
-from nbt.world import WorldFolder
 
+from output_sinks import BlockEntityRecord, ChunkErrorRecord, EntityRecord, ItemRecord, OutputSink, Record, SignRecord, open_sink, output_formats, record_from_dict, record_to_dict
+from projected_nbt import get_snbt, is_full_status
+from scan_cache import get_default_cache_path
+from scan_checkpoint import ScanCheckpoint, open_checkpoint
+from scan_engine import ChunkContext, ChunkVisitor, ProjectionPath, RegionTask, get_region_tasks, iter_scan, print_skipped_chunks
+from scan_profile import ScanProfiler, default_top, open_profiler, profile_modes
+from scan_stats import ScanStats, default_stats_file_name, open_stats
 
-def check_block_entities(chunk: nbt.chunk, dimension: str):
+
+def check_block_entities(chunk: nbt.chunk, dimension: str, records: List[Record]):
     # TODO: Look Up Chunk Version Differences And Create Handlers
     #   For Each Of The Differences (Then Abstract The Data To My Own Format)
     chunk_version: Optional[int] = None
@@ -31,7 +39,7 @@ def check_block_entities(chunk: nbt.chunk, dimension: str):
     # print(f"Dimension: %s - Chunk (%s, %s)" % (dimension, x_pos, z_pos))
 
     # If Not full, chunk is not fully generated yet and can be ignored for illegal item searching
-    if chunk_status is not None and chunk_status.value.strip() != "full":
+    if chunk_status is not None and not is_full_status(status=chunk_status.value):
         return
 
     # Figure Out What To Do With Above Code So It's Not Duplicated
@@ -54,56 +62,46 @@ def check_block_entities(chunk: nbt.chunk, dimension: str):
         #   * Figure Out Where To Stick TankStorage and Items
 
         # Check Storages With `Items` tag
-        check_storages(be_id=be_id, entity=entity, x=x, y=y, z=z, dimension=dimension)
+        check_storages(be_id=be_id, entity=entity, x=x, y=y, z=z, dimension=dimension, records=records)
 
         # Check Lecterns
-        check_lecterns(be_id=be_id, entity=entity, x=x, y=y, z=z, dimension=dimension)
+        check_lecterns(be_id=be_id, entity=entity, x=x, y=y, z=z, dimension=dimension, records=records)
 
         # Check Jukeboxes
-        check_jukeboxes(be_id=be_id, entity=entity, x=x, y=y, z=z, dimension=dimension)
+        check_jukeboxes(be_id=be_id, entity=entity, x=x, y=y, z=z, dimension=dimension, records=records)
 
         # Check Signs
-        check_signs(be_id=be_id, entity=entity, x=x, y=y, z=z, dimension=dimension)
+        check_signs(be_id=be_id, entity=entity, x=x, y=y, z=z, dimension=dimension, records=records)
 
 
-def check_signs(be_id: str, entity: nbt.nbt, x: int, y: int, z: int, dimension: str):
+def check_signs(be_id: str, entity: nbt.nbt, x: int, y: int, z: int, dimension: str, records: List[Record]):
     if be_id == "minecraft:sign":
         if "Text1" not in entity:
-            print("%s - (%s, %s, %s) - %s" % (be_id, x, y, z, dimension))
-            print("-" * 40)
-            print("Cannot Read Pre-1.8 Signs!!! Skipping For Now!!!")
-            print("-" * 40)
+            # Cannot Read Pre-1.8 Signs!!! Skipping For Now!!!
+            records.append(SignRecord(dimension=dimension, id=be_id, x=x, y=y, z=z, readable=False))
             return
 
         glowing: bool = False
         if "GlowingText" in entity:
-            glowing: bool = entity["GlowingText"]
+            glowing: bool = entity["GlowingText"].value
 
         # What Version Was Color Added?
         color: Optional[str] = None
         if "Color" in entity:
-            color: str = entity["Color"]
+            color: str = entity["Color"].value
 
         # Text1-4 Had Been Added In 1.8
         # TODO: Make Sure To Check If This Exists (Versus Old Style Of NBT Data)
-        line_one: str = entity["Text1"]
-        line_two: str = entity["Text2"]
-        line_three: str = entity["Text3"]
-        line_four: str = entity["Text4"]
-
-        print("%s - (%s, %s, %s) - %s" % (be_id, x, y, z, dimension))
-        print("-" * 40)
-        print("Glowing: %s" % glowing)
-        print("Color: %s" % color)
-        print("Line 1: %s" % line_one)
-        print("Line 2: %s" % line_two)
-        print("Line 3: %s" % line_three)
-        print("Line 4: %s" % line_four)
-        print("-" * 40)
-        print(" ")
-
-
-def check_lecterns(be_id: str, entity: nbt.nbt, x: int, y: int, z: int, dimension: str):
+        line_one: str = entity["Text1"].value
+        line_two: str = entity["Text2"].value
+        line_three: str = entity["Text3"].value
+        line_four: str = entity["Text4"].value
+
+        records.append(SignRecord(dimension=dimension, id=be_id, x=x, y=y, z=z, readable=True, glowing=glowing, color=color,
+                                  lines=[line_one, line_two, line_three, line_four]))
+
+
+def check_lecterns(be_id: str, entity: nbt.nbt, x: int, y: int, z: int, dimension: str, records: List[Record]):
     if be_id == "minecraft:lectern":
         book: Optional[nbt.nbt] = None
         page: Optional[int] = None
@@ -112,23 +110,17 @@ def check_lecterns(be_id: str, entity: nbt.nbt, x: int, y: int, z: int, dimensio
             book: nbt.nbt = entity["Book"]
 
         if "Page" in entity:
-            page: int = entity["Page"]
+            page: int = entity["Page"].value
 
         # Check For Book Item
+        items: List[ItemRecord] = []
         if book is not None:
-            print("%s - (%s, %s, %s) - %s" % (be_id, x, y, z, dimension))
-            print("-" * 40)
-            print_item(item=book)  # Lecterns Don't Have A Slot Tag
-
-        # Check For Page Tag Separately In Case It Doesn't Exist
-        if page is not None:
-            print("Page: %s" % page)
+            items.append(get_item(item=book))  # Lecterns Don't Have A Slot Tag
 
-        print("-" * 40)
-        print(" ")
+        records.append(BlockEntityRecord(kind="lectern", dimension=dimension, id=be_id, x=x, y=y, z=z, page=page, items=items))
 
 
-def check_jukeboxes(be_id: str, entity: nbt.nbt, x: int, y: int, z: int, dimension: str):
+def check_jukeboxes(be_id: str, entity: nbt.nbt, x: int, y: int, z: int, dimension: str, records: List[Record]):
     # What's With The `Record` Tag Pre-1.13?
     if be_id == "minecraft:jukebox":
         record: Optional[nbt.nbt] = None
@@ -136,15 +128,12 @@ def check_jukeboxes(be_id: str, entity: nbt.nbt, x: int, y: int, z: int, dimensi
         if "RecordItem" in entity:
             record: nbt.nbt = entity["RecordItem"]
 
-            print("%s - (%s, %s, %s) - %s" % (be_id, x, y, z, dimension))
-            print("-" * 40)
-            print_item(item=record)  # Jukeboxes Don't Have A Slot Tag
-            print("-" * 40)
-            print(" ")
+            # Jukeboxes Don't Have A Slot Tag
+            records.append(BlockEntityRecord(kind="jukebox", dimension=dimension, id=be_id, x=x, y=y, z=z, items=[get_item(item=record)]))
 
 
 # https://minecraft.fandom.com/wiki/Chunk_format
-def check_storages(be_id: str, entity: nbt.nbt, x: int, y: int, z: int, dimension: str):
+def check_storages(be_id: str, entity: nbt.nbt, x: int, y: int, z: int, dimension: str, records: List[Record]):
     # if "LootTableSeed" in entity:
     #     print("%s - (%s, %s, %s) - %s" % (be_id, x, y, z, dimension))
     #     print("-" * 40)
@@ -155,11 +144,9 @@ def check_storages(be_id: str, entity: nbt.nbt, x: int, y: int, z: int, dimensio
 
     # https://minecraft.fandom.com/wiki/Chunk_format#Block_entity_format
     if "Items" in entity and len(entity["Items"]) > 0:
-        print("%s - (%s, %s, %s) - %s" % (be_id, x, y, z, dimension))
-        print("-" * 40)
-
+        custom_name: Optional[str] = None
         if "CustomName" in entity:
-            print("Custom Name: %s" % entity["CustomName"])
+            custom_name: str = entity["CustomName"].value
 
         items: nbt.nbt = entity["Items"]
         if "Items" in items:
@@ -167,30 +154,26 @@ def check_storages(be_id: str, entity: nbt.nbt, x: int, y: int, z: int, dimensio
             # See Items.Items[]
             items: nbt.nbt = items["Items"]
 
-        for item in items:
-            print_item(item=item)
-
-        print("-" * 40)
-        print(" ")
+        records.append(BlockEntityRecord(kind="storage", dimension=dimension, id=be_id, x=x, y=y, z=z, custom_name=custom_name,
+                                         items=[get_item(item=item) for item in items]))
 
 
-def print_item(item: nbt.nbt):
+def get_item(item: nbt.nbt) -> ItemRecord:
     # Block Entity Names Used To Not Be Prefixed With "minecraft:". E.g. Chest instead of minecraft:chest
     # Block Entities Could Still Have The Item ID System - https://minecraft-ids.grahamedgecombe.com/
-    # TODO: Make Something Cleaner Than Nested If Statements And Copied Messages
+    slot: Optional[int] = None
     if "Slot" in item:
-        if "tag" in item:
-            print("%s - Slot: %s - Count: %s - Tag: %s" % (item["id"], item["Slot"], item["Count"], item["tag"]))
-        else:
-            print("%s - Slot: %s - Count: %s" % (item["id"], item["Slot"], item["Count"]))
-    else:
-        if "tag" in item:
-            print("%s - Count: %s - Tag: %s" % (item["id"], item["Count"], item["tag"]))
-        else:
-            print("%s - Count: %s" % (item["id"], item["Count"]))
-
-
-def check_entities(chunk: nbt.chunk, dimension: str):
+        slot: int = item["Slot"].value
+
+    # Item Tags Are Kept As SNBT, So Structured Output Has The Whole Tag
+    tag: Optional[str] = None
+    if "tag" in item:
+        tag: str = get_snbt(tag=item["tag"])
+
+    return ItemRecord(id=str(item["id"]), count=item["Count"].value, slot=slot, tag=tag)
+
+
+def check_entities(chunk: nbt.chunk, dimension: str, records: List[Record]):
     chunk_data: nbt.nbt = {}
     if "Level" in chunk:
         # Pre-1.17 Entity Storage
@@ -203,7 +186,7 @@ def check_entities(chunk: nbt.chunk, dimension: str):
     if "Entities" in chunk_data:
         for entity in chunk_data["Entities"]:
             e_id: str = entity["id"].value
-            x, y, z = entity["Pos"]
+            x, y, z = [position.value for position in entity["Pos"]]
 
             # Temporarily Block All Non-Markers From The Entity Output List
             # if e_id != "minecraft:marker":
@@ -214,145 +197,143 @@ def check_entities(chunk: nbt.chunk, dimension: str):
             if ("Items" in entity and len(entity["Items"]) == 0) or e_id == "minecraft:chest_minecart" and "Items" not in entity:
                 return
 
-            print("%s - (%s, %s, %s) - %s" % (e_id, x, y, z, dimension))
-            print("-" * 40)
-
+            block: Optional[str] = None
             if e_id == "minecraft:falling_block":
-                print("Block: %s" % entity["BlockState"]["Name"])
+                block: str = entity["BlockState"]["Name"].value
 
             # Item Entities and Item Frames
+            item: Optional[ItemRecord] = None
             if "Item" in entity:
-                print("Item: ", end="")
-                print_item(entity["Item"])
+                item: ItemRecord = get_item(entity["Item"])
 
             # Chest Minecarts
+            items: List[ItemRecord] = []
             if "Items" in entity and len(entity["Items"]) > 0:
-                items: nbt.nbt = entity["Items"]
-                for item in items:
-                    print_item(item=item)
+                items: List[ItemRecord] = [get_item(item=embedded_item) for embedded_item in entity["Items"]]
 
             # Custom Name (e.g. name tagged)
             custom_name: Optional[str] = None
             if "CustomName" in entity:
-                custom_name: str = entity["CustomName"]
-                print("Name: %s" % custom_name)
+                custom_name: str = entity["CustomName"].value
 
-            health: Optional[str] = None
+            health: Optional[float] = None
             if "Health" in entity:
-                health: str = entity["Health"]
-                print("Health: %s" % health)
+                health: float = entity["Health"].value
 
             # Markers Are Meant For Datapacks To Be Able To Store NBT Data
+            data: Optional[str] = None
             if e_id == "minecraft:marker":
-                print("Data: %s" % entity["data"])
+                data: str = get_snbt(tag=entity["data"])
 
             # TODO: Parse UUID To 32 Character Hex String (Format Changes In 1.16)
             #   See: https://minecraft.fandom.com/wiki/Universally_unique_identifier
             # Check If UUID Exists (hermitcraft7 has a turtle that doesn't have a UUID)
             e_uuid: Optional[str] = None
             if "UUID" in entity:
-                e_uuid: str = entity["UUID"]
+                e_uuid: str = entity["UUID"].value
 
-            print("UUID: %s" % e_uuid)
-            print("-" * 40)
-            print(" ")
+            records.append(EntityRecord(dimension=dimension, id=e_id, x=x, y=y, z=z, block=block, item=item, items=items,
+                                        custom_name=custom_name, health=health, data=data, uuid=e_uuid))
 
 
-def main_single_player(world_folder: str):
-    # TODO: Scan Player Inventories And Ender Chests
+class ItemSearchVisitor(ChunkVisitor):
+    # Results Are The Output Records Of Each Chunk
+    # Only The Tags Read By check_block_entities(...) And check_entities(...) Get Decoded, Sections Are Skipped
+    block_entity_paths: List[ProjectionPath] = [
+        ("DataVersion",),
+        ("Level", "Status"),
+        ("Level", "xPos"),
+        ("Level", "zPos"),
+        ("Level", "TileEntities")
+    ]
+
+    # Pre-1.17 Entities Are Stored In The Terrain Chunks
+    terrain_entity_paths: List[ProjectionPath] = [
+        ("Level", "Entities")
+    ]
+
+    # 1.17+ Entity Region Files Only Need The Entity List
+    entity_paths: List[ProjectionPath] = [
+        ("DataVersion",),
+        ("Position",),
+        ("Entities",)
+    ]
+
+    def __init__(self, entities_only: bool = False):
+        self.entities_only: bool = entities_only
+        self.name: str = "scanner:entities" if entities_only else "scanner"
+
+    def get_paths(self, task: RegionTask) -> List[ProjectionPath]:
+        if task.entities:
+            return self.entity_paths
 
-    nether_path: str = os.path.join(world_folder, "DIM-1")
-    overworld_path: str = world_folder
-    the_end_path: str = os.path.join(world_folder, "DIM1")
-    custom_dimensions_path: str = os.path.join(world_folder, "dimensions")
+        paths: List[ProjectionPath] = []
+        if not self.entities_only:
+            paths.extend(self.block_entity_paths)
 
-    dimensions_to_scan: List[str] = [overworld_path]
+        # 1.17+ Terrain Chunks Don't Have Entities, So Entity Only Scans Never Open The region Folder
+        if not task.split_entities:
+            paths.extend(self.terrain_entity_paths)
 
-    # If The Nether Exists, Add To The Scan List
-    if os.path.exists(nether_path):
-        dimensions_to_scan.append(nether_path)
+        return paths
 
-    # If The End Exists, Add To The Scan List
-    if os.path.exists(the_end_path):
-        dimensions_to_scan.append(the_end_path)
+    def full_chunks_only(self, task: RegionTask) -> bool:
+        # check_block_entities(...) Ignores Chunks That Aren't Fully Generated, But Pre-1.17 Entities Are Checked In Every Chunk
+        return not task.entities and task.split_entities
 
-    # If Custom Dimensions Exist, Add To The Scan List
-    if os.path.exists(custom_dimensions_path):
-        for namespace in os.listdir(custom_dimensions_path):
-            namespace_path: str = os.path.join(custom_dimensions_path, namespace)
-            if os.path.isfile(namespace_path):
-                continue
+    def empty_result(self, context: ChunkContext) -> List[Record]:
+        return []
 
-            for dimension in os.listdir(namespace_path):
-                dimension_path: str = os.path.join(namespace_path, dimension)
-                if os.path.isfile(dimension_path):
-                    continue
+    def visit(self, chunk: nbt.nbt.NBTFile, context: ChunkContext) -> List[Record]:
+        records: List[Record] = []
+        if not context.entities and not self.entities_only:
+            # Check Block Entities
+            check_block_entities(chunk=chunk, dimension=context.dimension, records=records)
 
-                # print(dimension_path)
-                dimensions_to_scan.append(dimension_path)
+        # Check Entities (Behavior Is Different Starting In 1.17)
+        if context.entities or not context.split_entities:
+            check_entities(chunk=chunk, dimension=context.dimension, records=records)
 
+        return records
+
+    def is_empty(self, result: List[Record]) -> bool:
+        return len(result) == 0
+
+    def encode_result(self, result: List[Record]) -> List[dict]:
+        return [record_to_dict(record=record) for record in result]
+
+    def decode_result(self, value: List[dict]) -> List[Record]:
+        return [record_from_dict(record_dict=record_dict) for record_dict in value]
+
+    def error(self, context: ChunkContext, error: Exception) -> List[Record]:
+        return [ChunkErrorRecord(dimension=context.dimension, region=os.path.basename(context.region_path), chunk_x=context.x, chunk_z=context.z, error=str(error))]
+
+
+def main_single_player(world_folder: str, workers: int = 1, cache_path: Optional[str] = None, output_format: str = "text", output_path: Optional[str] = None,
+                       entities_only: bool = False, stats: Optional[ScanStats] = None, profiler: Optional[ScanProfiler] = None, checkpoint: Optional[ScanCheckpoint] = None):
+    # TODO: Scan Player Inventories And Ender Chests
+    visitor: ItemSearchVisitor = ItemSearchVisitor(entities_only=entities_only)
+
+    sink: OutputSink = open_sink(output_format=output_format, output_path=output_path)
+    skipped_chunks: int = 0
     try:
-        for dimension in dimensions_to_scan:
-            try:
-                world = WorldFolder(dimension)
-            except nbt.world.UnknownWorldFormat:
-                # E.g Empty World
-                continue
-
-            # For Retrieving The Right Dimension Name Regardless Of Trailing Slashes
-            # TODO: Grab Actual In Game Dimension Names (Like With /execute in namespace:dimension_name) When Possible
-            if dimension.endswith("/") or dimension.endswith("\\"):
-                dimension_folder_name: str = os.path.basename(os.path.dirname(dimension))
-            else:
-                dimension_folder_name: str = os.path.basename(dimension)
-
-            for chunk in world.iter_nbt():
-                try:
-                    # Check Block Entities
-                    check_block_entities(chunk=chunk, dimension=dimension_folder_name)
-
-                    # Check Entities (Behavior Is Different Starting In 1.17)
-                    check_entities(chunk=chunk, dimension=dimension_folder_name)
-                except UnicodeDecodeError as e:
-                    # This won't catch the issue as the issue is in world.iter_nbt(), not check_storages(...)
-                    # hermitcraft6 currently breaks the scanner. Docm77 Alien Tech Books Are To Blame
-                    # TODO: See Bug Report With Patch For Fix: https://github.com/twoolie/NBT/issues/144
-                    print("Failed To Read Chunk (%s, %s) Due To Invalid Data!!!" % ("x", "z"))
-                    print("-" * 40)
-                    print("Trace: %s" % e)
-                    print("-" * 40)
-
-            # Region File Name - For Grabbing Entities From Entities Folder If It Exists (Post 1.17)
-            entity_files_path: str = os.path.join(dimension, "entities")
-            if os.path.exists(entity_files_path):
-                entity_region_file_names: List[str] = os.listdir(entity_files_path)
-                entity_region_file_list: List[str] = []
-                for region_file in entity_region_file_names:
-                    if region_file.endswith(".mca"):
-                        entity_region_file_list.append(os.path.join(entity_files_path, region_file))
-
-                world.set_regionfiles(entity_region_file_list)
-
-            for chunk in world.iter_nbt():
-                try:
-                    # Check Entities (Behavior Is Different Starting In 1.17)
-                    check_entities(chunk=chunk, dimension=dimension_folder_name)
-                except UnicodeDecodeError as e:
-                    # This won't catch the issue as the issue is in world.iter_nbt(), not check_storages(...)
-                    # hermitcraft6 currently breaks the scanner. Docm77 Alien Tech Books Are To Blame
-                    # TODO: See Bug Report With Patch For Fix: https://github.com/twoolie/NBT/issues/144
-                    print("Failed To Read Chunk (%s, %s) Due To Invalid Data!!!" % ("x", "z"))
-                    print("-" * 40)
-                    print("Trace: %s" % e)
-                    print("-" * 40)
-
-            # Check Player Inventories
-            # ...
-
-            # Check Player Ender Chests
-            # ...
+        for region_result in iter_scan(region_tasks=get_region_tasks(world_folder=world_folder), visitors=[visitor], workers=workers, cache_path=cache_path, stats=stats, profiler=profiler, checkpoint=checkpoint):
+            for _, records in region_result.results[visitor.name]:
+                sink.write_all(records=records)
+
+            skipped_chunks += region_result.skipped_chunks
+
+        # Check Player Inventories
+        # ...
+
+        # Check Player Ender Chests
+        # ...
+
+        print_skipped_chunks(skipped_chunks=skipped_chunks)
     except KeyboardInterrupt:
         return 3
+    finally:
+        sink.close()
 
 
 # List Of Worlds To Test Against
@@ -360,13 +341,48 @@ def main_single_player(world_folder: str):
 # https://www.2b2t.online/wiki/World%20Downloads
 # https://download.scicraft.net/
 if __name__ == "__main__":
-    if len(sys.argv) == 1:
+    parser: argparse.ArgumentParser = argparse.ArgumentParser(description="Scans A World For Block Entities And Entities")
+    parser.add_argument("world_folder", nargs="?", default=None, help="Path To The World Folder")
+    parser.add_argument("--workers", type=int, default=1, help="Number Of Processes To Scan Region Files With")
+    parser.add_argument("--stats", nargs="?", default=None, const="", help="Show Live Progress And Write Throughput And Phase Timings (Optionally Takes A Report File Path, Defaults To %s)" % default_stats_file_name)
+    parser.add_argument("--profile", nargs="?", default=None, const="", help="Profile The Scan Across Worker Processes (Optionally Takes An Output File Path, Defaults To scan_profile.pstats Or scan_profile.folded)")
+    parser.add_argument("--profile-mode", choices=profile_modes, default="cprofile", help="Deterministic cProfile Or Low Overhead Stack Sampling")
+    parser.add_argument("--profile-top", type=int, default=default_top, help="Number Of Functions To Show In The Profile Summary")
+    parser.add_argument("--checkpoint", nargs="?", default=None, const="", help="Save Finished Regions So An Interrupted Scan Can Be Resumed (Optionally Takes A File Path, Defaults To A File In The World Folder)")
+    parser.add_argument("--resume", action="store_true", help="Continue An Interrupted Scan After The Last Region It Finished (Implies --checkpoint)")
+    parser.add_argument("--cache", nargs="?", default=None, const="", help="Reuse Results Of Chunks That Haven't Changed Since The Last Run (Optionally Takes A Cache File Path)")
+    parser.add_argument("--output-format", choices=output_formats, default="text", help="Format To Write Found Block Entities, Entities And Items In")
+    parser.add_argument("--output", default=None, help="File To Write Output To (Defaults To Standard Output)")
+    parser.add_argument("--entities-only", action="store_true", help="Only Search Entities, Skipping Block Entities")
+    arguments: argparse.Namespace = parser.parse_args()
+
+    if arguments.world_folder is None:
         print("No World Folder Specified!!!")
         sys.exit(1)
 
-    world_folder_path: str = sys.argv[1]
+    world_folder_path: str = arguments.world_folder
     if not os.path.exists(world_folder_path):
         print("World Folder Does Not Exist!!!")
         sys.exit(2)
 
-    sys.exit(main_single_player(world_folder=world_folder_path))
+    # Defaults To A Cache File Inside The World Folder
+    scan_cache_path: Optional[str] = arguments.cache
+    if scan_cache_path == "":
+        scan_cache_path: str = get_default_cache_path(world_folder=world_folder_path)
+
+    scan_stats: Optional[ScanStats] = open_stats(stats_path=arguments.stats)
+    scan_profiler: Optional[ScanProfiler] = open_profiler(profile_path=arguments.profile, mode=arguments.profile_mode, top=arguments.profile_top)
+    scan_checkpoint: Optional[ScanCheckpoint] = open_checkpoint(world_folder=world_folder_path, name="scanner", checkpoint_path=arguments.checkpoint, resume=arguments.resume)
+    exit_code: Optional[int] = main_single_player(world_folder=world_folder_path, workers=arguments.workers, cache_path=scan_cache_path,
+                                                  output_format=arguments.output_format, output_path=arguments.output, entities_only=arguments.entities_only, stats=scan_stats, profiler=scan_profiler, checkpoint=scan_checkpoint)
+    if scan_stats is not None:
+        scan_stats.finish()
+
+    if scan_profiler is not None:
+        scan_profiler.finish()
+
+    # Only Kept For --resume When The Scan Was Interrupted
+    if scan_checkpoint is not None:
+        scan_checkpoint.finish(interrupted=exit_code == 3)
+
+    sys.exit(exit_code)
@@ -1,69 +1,77 @@
 # Potentially may use official server jars with RCON
 # in combination with the scanner in order to scan "not generated" chunks
-import subprocess
+import asyncio
 
-from mcrcon import MCRcon
-from typing import Optional
+from typing import List, Optional
 
 import os
-import json
 import requests
 
+from download_cache import DownloadCache, DownloadError, default_cache_folder, link_file
+from rcon_client import run_rcon_commands
+from server_supervisor import ServerSupervisor
+
 working_dir: str = "working"
 jar_path: str = os.path.join(working_dir, "server.jar")
 server_path: str = os.path.join(working_dir, "server")
 eula_path: str = os.path.join(server_path, "eula.txt")
 server_properties_path: str = os.path.join(server_path, "server.properties")
 user_agent: str = "Chunk Scanner - https://github.com/alexis-evelyn/WorldScanner"
-server_manifest_list: str = "https://launchermeta.mojang.com/mc/game/version_manifest.json"
+# The v2 List Also Has Each Version Manifest's SHA-1
+server_manifest_list: str = "https://launchermeta.mojang.com/mc/game/version_manifest_v2.json"
 
+# Manifests And Jars Are Shared Between Working Directories (See download_cache.py)
+cache_dir: str = os.environ.get("WORLD_SCANNER_CACHE", default_cache_folder)
+download_cache: Optional[DownloadCache] = None
 
-def retrieve_json_document(url: str) -> Optional[dict]:
-    headers: dict = {
-        "User-Agent": user_agent
-    }
 
-    response: requests.Response = requests.get(url=url, headers=headers)
+def get_download_cache() -> DownloadCache:
+    # Shared By Every Download, So They All Go Over The Same Pooled Session
+    global download_cache
+    if download_cache is None:
+        download_cache = DownloadCache(cache_folder=cache_dir, user_agent=user_agent)
 
-    if response.status_code == 200:
-        results: dict = json.loads(response.text)
-        return results
+    return download_cache
 
 
-def retrieve_binary(url: str) -> Optional[bytes]:
-    headers: dict = {
-        "User-Agent": user_agent
-    }
+def retrieve_json_document(url: str, sha1: Optional[str] = None) -> Optional[dict]:
+    # With A SHA-1 The Cached Copy Is Used As-Is, Without One It's Revalidated With Mojang First
+    try:
+        return get_download_cache().get_json(url=url, sha1=sha1)
+    except (requests.RequestException, DownloadError, ValueError) as e:
+        print("Failed To Retrieve %s - %s" % (url, e))
+        return None
 
-    response: requests.Response = requests.get(url=url, headers=headers)
 
-    if response.status_code == 200:
-        return response.content
+def download_server_jar(manifest: str, manifest_sha1: Optional[str] = None):
+    server_manifest: Optional[dict] = retrieve_json_document(url=manifest, sha1=manifest_sha1)
+    if server_manifest is not None:
+        server_download: dict = server_manifest["downloads"]["server"]
 
+        # Every Version's Jar Stays In The Cache, So Other Worlds (Or Switching Back To A Version) Don't Download It Again
+        try:
+            cached_jar_path: str = get_download_cache().get_blob(url=server_download["url"], sha1=server_download["sha1"])
+        except (requests.RequestException, DownloadError) as e:
+            print("Failed To Download Server Jar - %s" % e)
+            return
 
-def download_server_jar(manifest: str):
-    server_manifest: Optional[dict] = retrieve_json_document(url=manifest)
-    url: Optional[str] = None
-    if server_manifest is not None:
-        url: str = server_manifest["downloads"]["server"]["url"]
-        jar: Optional[bytes] = retrieve_binary(url=url)
-        with open(jar_path, mode="wb") as f:
-            f.write(jar)
-            f.close()  # Not Needed With The `with` syntax
+        link_file(source=cached_jar_path, destination=jar_path)
 
 
 def download_latest_release():
     # Scan For Latest Version Of Minecraft
     manifest: Optional[dict] = retrieve_json_document(url=server_manifest_list)
     url: Optional[str] = None
+    sha1: Optional[str] = None
     if manifest is not None:
         latest_version: str = manifest["latest"]["release"]
 
         for version in manifest["versions"]:
             if version["id"] == latest_version:
                 url: str = version["url"]
+                sha1: str = version["sha1"]
 
-    download_server_jar(manifest=url)
+    download_server_jar(manifest=url, manifest_sha1=sha1)
 
 
 # For Automatically Setting The Eula On New Jar Download
@@ -114,29 +122,42 @@ def setup_server_properties(world_name: str = "world", level_seed: str = "", lev
         f.close()  # Not Needed With The `with` syntax
 
 
-# MCRCON - https://pypi.org/project/mcrcon/
-# - Use /forceload, /locate, and /locatebiomes to find chunks to generate
+# RCON (See rcon_client.py) - Commands Go Over One Connection That Stays Open Instead Of A New One Each
+# - Use /forceload, /locate, and /locatebiomes to find chunks to generate (pregenerator.py Handles /forceload)
 # - Use /save-all to force server save
 # - Use /whitelist and /op to OP Bot Player
 # - /forceload uses BlockPos
 # - /whitelist Uses The Online Mode UUID Even When Offline (Making It Useless In Offline Mode)
 # For Controlling The Server Without A Fake Client
 def send_rcon_message(rcon_password: str):
-    with MCRcon("127.0.0.1", rcon_password) as mcr:
-        resp = mcr.command("/whitelist add ScientistEvelyn")
+    responses: List[str] = run_rcon_commands(password=rcon_password, commands=["/whitelist add ScientistEvelyn"])
+    for resp in responses:
         print(resp)
 
 
 # Py4J - https://stackoverflow.com/a/3793523/6828099
-def launch_server_test():
+def get_server_command() -> List[str]:
     # Variables From Manifest To Aid Launching Jar
     # server_manifest["javaVersion"]["majorVersion"]
 
     # Use Equivalent Of `java -jar ../server.jar nogui`
-    # TODO: Implement Threading And Streaming stdin/stdout/stderr!!!
     # TODO: Check Java Version And Compare Against Manifest Minimum
-    result = subprocess.run(["java", "-jar", os.path.abspath(jar_path), "nogui"], cwd=os.path.abspath(server_path), input=None, capture_output=True, timeout=None, check=False)
-    print(result)
+    return ["java", "-jar", os.path.abspath(jar_path), "nogui"]
+
+
+async def run_server_test(supervisor: ServerSupervisor):
+    # The Log Is Streamed Line By Line (See server_supervisor.py), So This Returns As Soon As The Server Is Up
+    await supervisor.start()
+    try:
+        await supervisor.wait_until_ready()
+        print("Server Started In %s Seconds" % supervisor.startup_seconds)
+    finally:
+        print("Server Exited With %s" % await supervisor.stop())
+
+
+def launch_server_test():
+    supervisor: ServerSupervisor = ServerSupervisor(command=get_server_command(), cwd=os.path.abspath(server_path), echo=True)
+    asyncio.run(run_server_test(supervisor=supervisor))
 
 
 # Quarry - https://github.com/barneygale/quarry/
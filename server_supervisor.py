@@ -0,0 +1,245 @@
+import asyncio
+import re
+import time
+from collections import deque
+from typing import Callable, Deque, List, NamedTuple, Optional, Pattern
+
+from rcon_client import RconPool
+
+# Runs A Minecraft Server And Reads Its Log As It's Written, Instead Of Waiting For It To Exit With The Whole Log In Memory
+# The Log Tells When The Server Is Ready, When A Save Has Finished And When The Server Is Falling Behind,
+#   So RCON Work Can Start As Soon As The Server Is Up And Slow Down When It Can't Keep Up
+ready_pattern: Pattern = re.compile(r"Done \((?P<seconds>[\d.,]+)s\)! For help, type")
+
+# The RCON Listener Is Started After "Done", Connections Before This Line Are Refused
+rcon_ready_pattern: Pattern = re.compile(r"RCON running on (?P<address>\S+)")
+
+# Vanilla Logs "RCON running on" Right After "Done", Not Seeing It By Then Means enable-rcon Is Off (Or RCON Failed To Bind)
+rcon_ready_seconds: float = 30.0
+
+# "Saved the game" Is The Feedback Of /save-all (Logged As "[Rcon: Saved the game]" When Sent Over RCON)
+# /save-all flush Logs "All chunks are saved" Once Per Dimension Before It, So Only The Feedback Means The Whole Save Is Done
+save_pattern: Pattern = re.compile(r"Saved the game")
+
+# Logged At Most Every 15 Seconds, Once The Server Is 2 Seconds Behind
+lag_pattern: Pattern = re.compile(r"Can't keep up! Is the server overloaded\? Running (?P<milliseconds>\d+)ms or (?P<ticks>\d+) ticks behind")
+
+# Vanilla /debug stop
+debug_pattern: Pattern = re.compile(r"Stopped (?:debug|tick) profiling after (?P<seconds>[\d.,]+) seconds and (?P<ticks>\d+) ticks \((?P<tps>[\d.,]+) ticks per second\)")
+
+# Paper /tps And /mspt (Color Codes Are Stripped First, A * Means TPS Is Capped At 20)
+paper_tps_pattern: Pattern = re.compile(r"TPS from last 1m, 5m, 15m: \*?(?P<tps>[\d.]+)")
+paper_mspt_pattern: Pattern = re.compile(r"◴\s*(?P<mspt>[\d.]+)/")
+
+# Forge /forge tps
+forge_pattern: Pattern = re.compile(r"Overall: Mean tick time: (?P<mspt>[\d.]+) ms\. Mean TPS: (?P<tps>[\d.]+)")
+
+color_code_pattern: Pattern = re.compile(r"§.")
+
+# Full Speed Is 20 Ticks A Second, So 50 Milliseconds A Tick
+target_tps: float = 20.0
+target_mspt: float = 1000 / target_tps
+
+# Log Lines And Samples Kept Around, Older Ones Are Dropped
+recent_line_count: int = 1000
+sample_count: int = 100
+
+# Minecraft Logs Whole Stack Traces And NBT Dumps As Single Lines Sometimes
+line_limit: int = 1 << 20
+
+
+class PerformanceSample(NamedTuple):
+    timestamp: float
+    tps: Optional[float]
+    mspt: Optional[float]
+    # Which Command/Log Message It Came From
+    source: str
+
+
+def parse_number(text: str) -> float:
+    # Some Locales Write Decimal Commas
+    return float(text.replace(",", "."))
+
+
+def parse_performance(text: str, timestamp: Optional[float] = None) -> Optional[PerformanceSample]:
+    # Works On Log Lines And RCON Responses Alike
+    if timestamp is None:
+        timestamp: float = time.time()
+
+    text: str = color_code_pattern.sub("", text)
+
+    match = forge_pattern.search(text)
+    if match is not None:
+        return PerformanceSample(timestamp=timestamp, tps=float(match.group("tps")), mspt=float(match.group("mspt")), source="forge")
+
+    match = debug_pattern.search(text)
+    if match is not None:
+        return PerformanceSample(timestamp=timestamp, tps=parse_number(match.group("tps")), mspt=None, source="debug")
+
+    match = paper_tps_pattern.search(text)
+    if match is not None:
+        return PerformanceSample(timestamp=timestamp, tps=float(match.group("tps")), mspt=None, source="tps")
+
+    match = paper_mspt_pattern.search(text)
+    if match is not None:
+        return PerformanceSample(timestamp=timestamp, tps=None, mspt=float(match.group("mspt")), source="mspt")
+
+    return None
+
+
+class ServerSupervisor:
+    def __init__(self, command: List[str], cwd: Optional[str] = None, echo: bool = False, on_line: Optional[Callable[[str], None]] = None):
+        self.command: List[str] = command
+        self.cwd: Optional[str] = cwd
+        # Prints Each Log Line As It Comes In
+        self.echo: bool = echo
+        self.on_line: Optional[Callable[[str], None]] = on_line
+
+        self.process: Optional[asyncio.subprocess.Process] = None
+        self.reader_tasks: List[asyncio.Task] = []
+
+        self.recent_lines: Deque[str] = deque(maxlen=recent_line_count)
+        self.samples: Deque[PerformanceSample] = deque(maxlen=sample_count)
+
+        self.ready: asyncio.Event = asyncio.Event()
+        self.startup_seconds: Optional[float] = None
+        self.rcon_ready: asyncio.Event = asyncio.Event()
+
+        # Counts Up On Every Finished Save, So A Save Can Be Waited For Without Catching An Earlier One
+        self.save_count: int = 0
+        self.saved: asyncio.Condition = asyncio.Condition()
+
+        self.last_lag_time: Optional[float] = None
+        self.lag_warnings: int = 0
+
+    async def start(self):
+        self.process: asyncio.subprocess.Process = await asyncio.create_subprocess_exec(*self.command, cwd=self.cwd, limit=line_limit,
+                                                                                        stdin=asyncio.subprocess.PIPE, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE)
+        self.reader_tasks: List[asyncio.Task] = [asyncio.ensure_future(self.read_stream(stream=self.process.stdout)),
+                                                 asyncio.ensure_future(self.read_stream(stream=self.process.stderr))]
+
+    async def read_stream(self, stream: asyncio.StreamReader):
+        while True:
+            try:
+                line: bytes = await stream.readline()
+            except ValueError:
+                # Longer Than line_limit, What Was Read Of It Is Dropped
+                continue
+
+            if len(line) == 0:
+                return
+
+            await self.handle_line(line=line.decode("utf-8", errors="replace").rstrip("\r\n"))
+
+    async def handle_line(self, line: str):
+        self.recent_lines.append(line)
+        if self.echo:
+            print(line)
+
+        if self.on_line is not None:
+            self.on_line(line)
+
+        if not self.ready.is_set():
+            match = ready_pattern.search(line)
+            if match is not None:
+                self.startup_seconds: float = parse_number(match.group("seconds"))
+                self.ready.set()
+                return
+
+        if not self.rcon_ready.is_set() and rcon_ready_pattern.search(line) is not None:
+            self.rcon_ready.set()
+            return
+
+        if save_pattern.search(line) is not None:
+            async with self.saved:
+                self.save_count += 1
+                self.saved.notify_all()
+
+            return
+
+        if lag_pattern.search(line) is not None:
+            self.last_lag_time: float = time.time()
+            self.lag_warnings += 1
+            return
+
+        self.record_sample(text=line)
+
+    def record_sample(self, text: str) -> Optional[PerformanceSample]:
+        # Also For RCON Responses, Which Don't Show Up In The Log
+        sample: Optional[PerformanceSample] = parse_performance(text=text)
+        if sample is not None:
+            self.samples.append(sample)
+
+        return sample
+
+    def latest_sample(self) -> Optional[PerformanceSample]:
+        return self.samples[-1] if len(self.samples) > 0 else None
+
+    def is_falling_behind(self, min_tps: float = 19.0, max_mspt: float = target_mspt, window: float = 30.0) -> bool:
+        # Only Recent Warnings And Samples Count, An Old Lag Spike Shouldn't Hold Work Back Forever
+        now: float = time.time()
+        if self.last_lag_time is not None and now - self.last_lag_time < window:
+            return True
+
+        sample: Optional[PerformanceSample] = self.latest_sample()
+        if sample is None or now - sample.timestamp >= window:
+            return False
+
+        return (sample.tps is not None and sample.tps < min_tps) or (sample.mspt is not None and sample.mspt > max_mspt)
+
+    async def measure_performance(self, pool: RconPool, seconds: float = 5.0) -> Optional[PerformanceSample]:
+        # Vanilla Has No /tps, But /debug Reports How Many Ticks Ran While It Was Profiling
+        await pool.command(command="debug start")
+        await asyncio.sleep(seconds)
+        return self.record_sample(text=await pool.command(command="debug stop"))
+
+    async def wait_until_ready(self, timeout: Optional[float] = None):
+        # Raises RuntimeError If The Server Exits First
+        if not await self.wait_for_event(event=self.ready, timeout=timeout):
+            raise asyncio.TimeoutError("Server wasn't ready after %s seconds" % timeout)
+
+    async def wait_until_rcon_ready(self, timeout: Optional[float] = None):
+        # Waits For The Server To Be Ready First, Then For Its RCON Listener
+        await self.wait_until_ready(timeout=timeout)
+        if not await self.wait_for_event(event=self.rcon_ready, timeout=rcon_ready_seconds if timeout is None else timeout):
+            raise asyncio.TimeoutError("Server didn't start RCON (Is enable-rcon Set In server.properties?)")
+
+    async def wait_for_event(self, event: asyncio.Event, timeout: Optional[float] = None) -> bool:
+        # Returns False On Timeout, Raises RuntimeError If The Server Exits First
+        exited: asyncio.Task = asyncio.ensure_future(self.process.wait())
+        waiting: asyncio.Task = asyncio.ensure_future(event.wait())
+        try:
+            done, _ = await asyncio.wait([exited, waiting], timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            exited.cancel()
+            waiting.cancel()
+
+        if waiting in done:
+            return True
+
+        if exited in done:
+            raise RuntimeError("Server exited with %s before it was ready" % self.process.returncode)
+
+        return False
+
+    async def wait_for_save(self, since: int, timeout: Optional[float] = None):
+        # Pass save_count From Before The Save Was Requested
+        async with self.saved:
+            await asyncio.wait_for(self.saved.wait_for(lambda: self.save_count > since), timeout=timeout)
+
+    async def send_console(self, command: str):
+        self.process.stdin.write((command + "\n").encode("utf-8"))
+        await self.process.stdin.drain()
+
+    async def stop(self, timeout: float = 60.0) -> int:
+        # Asks The Server To Save And Stop, And Kills It If It Takes Longer Than timeout
+        if self.process.returncode is None:
+            try:
+                await self.send_console(command="stop")
+                await asyncio.wait_for(self.process.wait(), timeout=timeout)
+            except (asyncio.TimeoutError, ConnectionError):
+                self.process.kill()
+                await self.process.wait()
+
+        await asyncio.gather(*self.reader_tasks)
+        return self.process.returncode
@@ -0,0 +1,134 @@
+import random
+from collections import Counter
+from typing import List, NamedTuple
+
+import numpy as np
+import pytest
+from nbt.nbt import TAG_Long_Array
+
+from block_states import (BlockStatesError, Section, count_section_blocks, find_section_blocks, get_bits, get_padded_length, get_spanning_length,
+                          unpack_block_states, unpack_padded, unpack_spanning)
+
+bit_widths: List[int] = [4, 5, 6, 7, 8, 9, 12, 13, 16]
+
+
+class RawLongs(NamedTuple):
+    # Same Shape As projected_nbt.PackedLongArray, Big Endian Bytes Instead Of Python ints
+    raw: bytes
+
+
+def to_signed(value: int) -> int:
+    return value - (1 << 64) if value >= 1 << 63 else value
+
+
+def pack_padded(values: List[int], bits: int) -> List[int]:
+    # 1.16+: As Many Whole Values As Fit In Each Long, Starting From The Low Bits
+    values_per_long: int = 64 // bits
+    longs: List[int] = [0] * get_padded_length(bits=bits, count=len(values))
+    for index, value in enumerate(values):
+        longs[index // values_per_long] |= value << (index % values_per_long * bits)
+
+    return [to_signed(value=value) for value in longs]
+
+
+def pack_spanning(values: List[int], bits: int) -> List[int]:
+    # Before 1.16: One Bit Stream, Values Can Continue In The Next Long
+    stream: int = 0
+    for index, value in enumerate(values):
+        stream |= value << (index * bits)
+
+    return [to_signed(value=(stream >> (index * 64)) & ((1 << 64) - 1)) for index in range(get_spanning_length(bits=bits, count=len(values)))]
+
+
+def make_long_array(longs: List[int]) -> TAG_Long_Array:
+    long_array: TAG_Long_Array = TAG_Long_Array()
+    long_array.value = longs
+    return long_array
+
+
+def make_values(palette_size: int, seed: int) -> List[int]:
+    rnd: random.Random = random.Random(seed)
+    return [rnd.randrange(palette_size) for _ in range(4096)]
+
+
+def get_palette_size(bits: int) -> int:
+    # Smallest Palette That Needs This Many Bits
+    return 5 if bits == 4 else (1 << (bits - 1)) + 1
+
+
+def make_section(values: List[int], palette: List[str], spanning: bool = False) -> Section:
+    bits: int = get_bits(palette_size=len(palette))
+    longs: List[int] = pack_spanning(values=values, bits=bits) if spanning else pack_padded(values=values, bits=bits)
+    return Section(y=-2, palette=palette, block_states=make_long_array(longs=longs))
+
+
+@pytest.mark.parametrize("bits", bit_widths)
+def test_padded_round_trip(bits: int):
+    values: List[int] = make_values(palette_size=1 << bits, seed=bits)
+    longs: np.ndarray = np.array(pack_padded(values=values, bits=bits), dtype=np.int64).view(np.uint64)
+    assert unpack_padded(longs=longs, bits=bits).tolist() == values
+
+
+@pytest.mark.parametrize("bits", bit_widths)
+def test_spanning_round_trip(bits: int):
+    values: List[int] = make_values(palette_size=1 << bits, seed=bits)
+    longs: np.ndarray = np.array(pack_spanning(values=values, bits=bits), dtype=np.int64).view(np.uint64)
+    assert unpack_spanning(longs=longs, bits=bits).tolist() == values
+
+
+@pytest.mark.parametrize("spanning", [False, True])
+@pytest.mark.parametrize("bits", bit_widths)
+def test_layout_is_picked_by_length(bits: int, spanning: bool):
+    palette_size: int = get_palette_size(bits=bits)
+    values: List[int] = make_values(palette_size=palette_size, seed=bits)
+    longs: List[int] = pack_spanning(values=values, bits=bits) if spanning else pack_padded(values=values, bits=bits)
+
+    assert unpack_block_states(block_states=make_long_array(longs=longs), palette_size=palette_size).tolist() == values
+
+    # Projected Chunks Hand Over The Raw Bytes Instead
+    raw: RawLongs = RawLongs(raw=np.array(longs, dtype=np.int64).astype(">i8").tobytes())
+    assert unpack_block_states(block_states=raw, palette_size=palette_size).tolist() == values
+
+
+def test_wrong_length_raises():
+    with pytest.raises(BlockStatesError):
+        unpack_block_states(block_states=make_long_array(longs=[0] * 100), palette_size=20)
+
+
+@pytest.mark.parametrize("spanning", [False, True])
+def test_counts_match_the_values(spanning: bool):
+    palette: List[str] = ["minecraft:air", "minecraft:stone", "minecraft:dirt", "minecraft:barrier", "minecraft:water", "minecraft:sand",
+                          "minecraft:gravel", "minecraft:glass", "minecraft:bedrock", "minecraft:lava", "minecraft:ice", "minecraft:snow",
+                          "minecraft:clay", "minecraft:obsidian", "minecraft:tnt", "minecraft:sponge", "minecraft:gold_block", "minecraft:iron_block"]
+    values: List[int] = make_values(palette_size=len(palette), seed=1)
+    section: Section = make_section(values=values, palette=palette, spanning=spanning)
+    expected: Counter = Counter(palette[value] for value in values)
+
+    assert count_section_blocks(section=section) == expected
+    assert count_section_blocks(section=section, block_ids=frozenset(["minecraft:barrier", "minecraft:diamond_block"])) == Counter({"minecraft:barrier": expected["minecraft:barrier"]})
+    assert count_section_blocks(section=section, block_ids=frozenset(["minecraft:diamond_block"])) == Counter()
+
+
+@pytest.mark.parametrize("spanning", [False, True])
+def test_found_positions_match_the_values(spanning: bool):
+    palette: List[str] = ["minecraft:air", "minecraft:stone", "minecraft:barrier", "minecraft:dirt", "minecraft:sand"]
+    values: List[int] = make_values(palette_size=len(palette), seed=2)
+    section: Section = make_section(values=values, palette=palette, spanning=spanning)
+
+    # YZX Order Within The Section, Offset By The Chunk And Section Positions
+    expected: List[List[int]] = [[3 * 16 + (index & 15), -2 * 16 + (index >> 8), -5 * 16 + ((index >> 4) & 15)] for index, value in enumerate(values) if value == 2]
+    assert find_section_blocks(section=section, block_id="minecraft:barrier", chunk_x=3, chunk_z=-5).tolist() == expected
+    assert find_section_blocks(section=section, block_id="minecraft:diamond_block", chunk_x=3, chunk_z=-5).shape == (0, 3)
+
+
+def test_single_entry_palette_without_data():
+    # 1.18+ Leaves The Data Out When The Whole Section Is One Block
+    section: Section = Section(y=0, palette=["minecraft:stone"], block_states=None)
+
+    assert count_section_blocks(section=section) == Counter({"minecraft:stone": 4096})
+    assert count_section_blocks(section=section, block_ids=frozenset(["minecraft:air"])) == Counter()
+
+    positions: np.ndarray = find_section_blocks(section=section, block_id="minecraft:stone", chunk_x=1, chunk_z=2)
+    assert positions.shape == (4096, 3)
+    assert positions[0].tolist() == [16, 0, 32]
+    assert positions[-1].tolist() == [31, 15, 47]
@@ -0,0 +1,111 @@
+import os
+import sqlite3
+from typing import List
+
+import pytest
+
+from benchmark import WorldOptions, generate_world
+from catalog import build_catalog, catalog_version, get_catalog_version, get_record_items, main_query, query_catalog
+from output_sinks import ChunkErrorRecord, Record
+from scan_engine import get_region_tasks, iter_scan
+from scanner import ItemSearchVisitor
+
+
+def make_world(world_folder: str, seed: int):
+    generate_world(world_folder=world_folder, options=WorldOptions(regions=2, chunks_per_region=32, block_entities=1.0, entities=1.0, seed=seed))
+
+
+def scan_records(world_folder: str) -> List[Record]:
+    # What scanner.py Finds, In Scan Order
+    visitor: ItemSearchVisitor = ItemSearchVisitor()
+    records: List[Record] = []
+    for region_result in iter_scan(region_tasks=get_region_tasks(world_folder=world_folder), visitors=[visitor]):
+        for _, chunk_records in region_result.results[visitor.name]:
+            records.extend(record for record in chunk_records if not isinstance(record, ChunkErrorRecord))
+
+    return records
+
+
+@pytest.fixture(scope="module")
+def world(tmp_path_factory):
+    world_folder: str = str(tmp_path_factory.mktemp("world"))
+    make_world(world_folder=world_folder, seed=1)
+    catalog_path: str = os.path.join(world_folder, "catalog.sqlite3")
+    build_catalog(world_folder=world_folder, catalog_path=catalog_path)
+    return world_folder, catalog_path, scan_records(world_folder=world_folder)
+
+
+def test_everything_scanned_is_cataloged(world):
+    _, catalog_path, records = world
+    assert len(records) > 0
+    assert query_catalog(catalog_path=catalog_path) == records
+    assert get_catalog_version(catalog_path=catalog_path) == catalog_version
+
+
+def test_bounding_box_is_inclusive(world):
+    _, catalog_path, records = world
+    # Half The World Along X, Edges Included
+    xs: List[float] = sorted(record.x for record in records)
+    minimum: List[float] = [xs[0], 0.0, min(record.z for record in records)]
+    maximum: List[float] = [xs[len(xs) // 2], 70.0, max(record.z for record in records)]
+    expected: List[Record] = [record for record in records if all(low <= value <= high for low, value, high in zip(minimum, [record.x, record.y, record.z], maximum))]
+
+    assert 0 < len(expected) < len(records)
+    assert query_catalog(catalog_path=catalog_path, minimum=minimum, maximum=maximum) == expected
+
+    # A Box Around A Single Record's Exact Position Still Finds It
+    record: Record = records[len(records) // 2]
+    position: List[float] = [record.x, record.y, record.z]
+    assert record in query_catalog(catalog_path=catalog_path, minimum=position, maximum=position)
+
+
+def test_id_and_dimension_queries(world):
+    _, catalog_path, records = world
+    # The Overworld Is Named After The World Folder
+    dimension: str = records[0].dimension
+    chests: List[Record] = query_catalog(catalog_path=catalog_path, record_id="minecraft:chest", dimension=dimension)
+    assert chests == [record for record in records if record.id == "minecraft:chest"]
+    assert 0 < len(chests) < len(records)
+    assert query_catalog(catalog_path=catalog_path, record_id="minecraft:chest", dimension="DIM-1") == []
+
+
+def test_item_query_finds_containers_and_item_entities(world):
+    _, catalog_path, records = world
+    holding: List[Record] = query_catalog(catalog_path=catalog_path, item_id="minecraft:diamond")
+    assert holding == [record for record in records if any(item.id == "minecraft:diamond" for item in get_record_items(record=record))]
+    assert {record.id for record in holding} == {"minecraft:chest", "minecraft:item"}
+
+    # Combined With The Other Conditions
+    assert query_catalog(catalog_path=catalog_path, item_id="minecraft:diamond", record_id="minecraft:item") == [record for record in holding if record.id == "minecraft:item"]
+
+
+def test_rebuild_replaces_the_previous_catalog(tmp_path):
+    world_folder: str = str(tmp_path)
+    catalog_path: str = os.path.join(world_folder, "catalog.sqlite3")
+    make_world(world_folder=world_folder, seed=2)
+    build_catalog(world_folder=world_folder, catalog_path=catalog_path)
+    old_records: List[Record] = scan_records(world_folder=world_folder)
+
+    # Same Regions, Different Contents
+    make_world(world_folder=world_folder, seed=3)
+    build_catalog(world_folder=world_folder, catalog_path=catalog_path)
+    new_records: List[Record] = scan_records(world_folder=world_folder)
+
+    assert new_records != old_records
+    assert query_catalog(catalog_path=catalog_path) == new_records
+
+    connection: sqlite3.Connection = sqlite3.connect(catalog_path)
+    try:
+        assert connection.execute("SELECT COUNT(*) FROM items").fetchone()[0] == sum(len(get_record_items(record=record)) for record in new_records)
+    finally:
+        connection.close()
+
+
+def test_query_refuses_an_old_catalog(tmp_path):
+    catalog_path: str = os.path.join(str(tmp_path), "old.sqlite3")
+    connection: sqlite3.Connection = sqlite3.connect(catalog_path)
+    connection.execute("PRAGMA user_version = %s" % (catalog_version - 1))
+    connection.close()
+
+    assert main_query(catalog_path=catalog_path) == 4
+    assert main_query(catalog_path=os.path.join(str(tmp_path), "missing.sqlite3")) == 4
@@ -0,0 +1,136 @@
+import hashlib
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Tuple
+
+import pytest
+import requests
+
+from download_cache import DownloadCache, DownloadError
+
+
+class MojangStandIn:
+    # Serves Files From Localhost With An ETag Each, Answering Conditional Requests With 304, And Remembers Every Request
+    def __init__(self):
+        self.files: Dict[str, bytes] = {}
+        self.requests: List[Tuple[str, Optional[str]]] = []
+
+        stand_in: MojangStandIn = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                stand_in.requests.append((self.path, self.headers.get("If-None-Match")))
+                body: Optional[bytes] = stand_in.files.get(self.path)
+                if body is None:
+                    self.send_error(404)
+                    return
+
+                etag: str = "\"%s\"" % hashlib.sha1(body).hexdigest()
+                if self.headers.get("If-None-Match") == etag:
+                    self.send_response(304)
+                    self.end_headers()
+                    return
+
+                self.send_response(200)
+                self.send_header("ETag", etag)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *arguments):
+                pass
+
+        self.server: ThreadingHTTPServer = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.thread: threading.Thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+
+    def get_url(self, path: str) -> str:
+        return "http://127.0.0.1:%s%s" % (self.server.server_address[1], path)
+
+    def stop(self):
+        # Afterwards Every Request Fails To Connect, Like Being Offline
+        self.server.shutdown()
+        self.server.server_close()
+
+
+@pytest.fixture
+def stand_in():
+    server: MojangStandIn = MojangStandIn()
+    yield server
+    server.stop()
+
+
+def read_file(path: str) -> bytes:
+    with open(path, mode="rb") as f:
+        return f.read()
+
+
+def test_known_sha1_is_only_downloaded_once(tmp_path, stand_in: MojangStandIn):
+    stand_in.files["/server.jar"] = b"jar contents"
+    sha1: str = hashlib.sha1(b"jar contents").hexdigest()
+    url: str = stand_in.get_url(path="/server.jar")
+
+    path: str = DownloadCache(cache_folder=str(tmp_path)).get_blob(url=url, sha1=sha1)
+    assert read_file(path=path) == b"jar contents"
+
+    stand_in.stop()
+    assert DownloadCache(cache_folder=str(tmp_path)).get_blob(url=url, sha1=sha1.upper()) == path
+    assert len(stand_in.requests) == 1
+
+
+def test_sha1_mismatch_is_rejected(tmp_path, stand_in: MojangStandIn):
+    stand_in.files["/server.jar"] = b"tampered contents"
+    sha1: str = hashlib.sha1(b"jar contents").hexdigest()
+    cache: DownloadCache = DownloadCache(cache_folder=str(tmp_path))
+
+    with pytest.raises(DownloadError):
+        cache.get_blob(url=stand_in.get_url(path="/server.jar"), sha1=sha1)
+
+    # Neither The Expected Nor The Downloaded SHA-1 Ends Up In The Cache, Nor Does The Partial Download
+    assert not cache.has_blob(sha1=sha1)
+    assert not cache.has_blob(sha1=hashlib.sha1(b"tampered contents").hexdigest())
+    assert [name for _, _, names in os.walk(cache.blob_folder) for name in names] == []
+
+
+def test_unchanged_file_is_revalidated(tmp_path, stand_in: MojangStandIn):
+    stand_in.files["/version_manifest.json"] = b"{\"versions\": []}"
+    url: str = stand_in.get_url(path="/version_manifest.json")
+
+    path: str = DownloadCache(cache_folder=str(tmp_path)).get_file(url=url)
+    assert DownloadCache(cache_folder=str(tmp_path)).get_file(url=url) == path
+    assert [etag for _, etag in stand_in.requests] == [None, "\"%s\"" % hashlib.sha1(b"{\"versions\": []}").hexdigest()]
+
+    # A Changed File Is Downloaded Again
+    stand_in.files["/version_manifest.json"] = b"{\"versions\": [1]}"
+    changed_path: str = DownloadCache(cache_folder=str(tmp_path)).get_file(url=url)
+    assert changed_path != path
+    assert read_file(path=changed_path) == b"{\"versions\": [1]}"
+
+
+def test_cached_copy_is_used_when_offline(tmp_path, stand_in: MojangStandIn):
+    stand_in.files["/version_manifest.json"] = b"{\"versions\": []}"
+    url: str = stand_in.get_url(path="/version_manifest.json")
+    cache: DownloadCache = DownloadCache(cache_folder=str(tmp_path))
+
+    path: str = cache.get_file(url=url)
+    stand_in.stop()
+    assert cache.get_json(url=url) == {"versions": []}
+    assert cache.get_file(url=url) == path
+
+    # Nothing To Fall Back On
+    with pytest.raises(requests.ConnectionError):
+        cache.get_file(url=stand_in.get_url(path="/other.json"))
+
+
+def test_cached_copy_is_used_when_the_server_errors(tmp_path, stand_in: MojangStandIn):
+    stand_in.files["/version_manifest.json"] = b"{\"versions\": []}"
+    url: str = stand_in.get_url(path="/version_manifest.json")
+    cache: DownloadCache = DownloadCache(cache_folder=str(tmp_path))
+
+    path: str = cache.get_file(url=url)
+    del stand_in.files["/version_manifest.json"]
+    assert cache.get_file(url=url) == path
+
+    with pytest.raises(DownloadError):
+        cache.get_file(url=stand_in.get_url(path="/other.json"))
@@ -0,0 +1,116 @@
+import os
+import random
+import re
+from typing import Dict, List, Set, Tuple
+
+import pytest
+
+from forceload_plan import ChunkRange, ForceloadPlanWriter, merge_chunk_ranges, split_chunk_range
+
+dimension_id: str = "minecraft:overworld"
+
+
+def get_covered(ranges: List[ChunkRange]) -> List[Tuple[int, int]]:
+    # Every Chunk Of Every Range, Chunks Covered Twice Are Listed Twice
+    return [(x, z) for chunk_range in ranges for x in range(chunk_range.x1, chunk_range.x2 + 1) for z in range(chunk_range.z1, chunk_range.z2 + 1)]
+
+
+def read_plan(plan_folder: str) -> Dict[str, str]:
+    functions: Dict[str, str] = {}
+    for name in os.listdir(plan_folder):
+        with open(os.path.join(plan_folder, name), mode="r") as f:
+            functions[name] = f.read()
+
+    return functions
+
+
+def test_rectangle_is_one_range():
+    chunks: List[Tuple[int, int]] = [(x, z) for x in range(-2, 3) for z in range(4, 7)]
+    assert merge_chunk_ranges(dimension_id=dimension_id, chunks=chunks + chunks[:3]) == [ChunkRange(dimension_id=dimension_id, x1=-2, z1=4, x2=2, z2=6)]
+
+
+def test_rows_only_merge_over_the_same_columns():
+    # An L Shape And A Lone Chunk Past A Gap
+    chunks: List[Tuple[int, int]] = [(0, 0), (1, 0), (2, 0), (0, 1), (1, 1), (2, 1), (0, 2), (5, 2), (0, 4)]
+    assert merge_chunk_ranges(dimension_id=dimension_id, chunks=chunks) == [
+        ChunkRange(dimension_id=dimension_id, x1=0, z1=0, x2=2, z2=1),
+        ChunkRange(dimension_id=dimension_id, x1=0, z1=2, x2=0, z2=2),
+        ChunkRange(dimension_id=dimension_id, x1=5, z1=2, x2=5, z2=2),
+        ChunkRange(dimension_id=dimension_id, x1=0, z1=4, x2=0, z2=4),
+    ]
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_merged_ranges_cover_exactly_the_chunks(seed: int):
+    rnd: random.Random = random.Random(seed)
+    chunks: Set[Tuple[int, int]] = {(rnd.randint(-20, 20), rnd.randint(-20, 20)) for _ in range(400)}
+    covered: List[Tuple[int, int]] = get_covered(ranges=merge_chunk_ranges(dimension_id=dimension_id, chunks=chunks))
+
+    assert len(covered) == len(chunks)
+    assert set(covered) == chunks
+
+
+@pytest.mark.parametrize("width, height, max_chunks", [(4, 4, 16), (4, 10, 16), (5, 7, 16), (40, 3, 16), (17, 1, 16), (1, 50, 7)])
+def test_split_ranges_stay_under_the_limit(width: int, height: int, max_chunks: int):
+    chunk_range: ChunkRange = ChunkRange(dimension_id=dimension_id, x1=-3, z1=10, x2=width - 4, z2=height + 9)
+    pieces: List[ChunkRange] = split_chunk_range(chunk_range=chunk_range, max_chunks=max_chunks)
+
+    assert all(piece.chunk_count() <= max_chunks for piece in pieces)
+    covered: List[Tuple[int, int]] = get_covered(ranges=pieces)
+    assert len(covered) == chunk_range.chunk_count()
+    assert set(covered) == set(get_covered(ranges=[chunk_range]))
+
+
+def write_plan(plan_folder: str, chunks: List[Tuple[int, int]], chunk_budget: int = 8) -> ForceloadPlanWriter:
+    plan_writer: ForceloadPlanWriter = ForceloadPlanWriter(plan_folder=plan_folder, chunk_budget=chunk_budget)
+    plan_writer.add_chunks(dimension_id=dimension_id, chunks=chunks)
+    plan_writer.close()
+    plan_writer.abort()
+    return plan_writer
+
+
+def test_closing_swaps_the_whole_plan_in(tmp_path):
+    plan_folder: str = os.path.join(str(tmp_path), "plan")
+    write_plan(plan_folder=plan_folder, chunks=[(x, 0) for x in range(100)])
+    assert "step_13.mcfunction" in os.listdir(plan_folder)
+
+    chunks: List[Tuple[int, int]] = [(x, z) for x in range(5) for z in range(3)] + [(10, 10)]
+    plan_writer: ForceloadPlanWriter = write_plan(plan_folder=plan_folder, chunks=chunks)
+    functions: Dict[str, str] = read_plan(plan_folder=plan_folder)
+
+    # Steps Of The Bigger Plan Before Are Gone, As Is The Staging Folder
+    steps: List[str] = sorted(name for name in functions if name.startswith("step_"))
+    assert steps == ["step_%s.mcfunction" % step for step in range(1, plan_writer.steps + 1)]
+    assert os.listdir(str(tmp_path)) == ["plan"]
+
+    forceloaded: List[Tuple[int, int]] = []
+    for step in steps:
+        ranges: List[ChunkRange] = [ChunkRange(dimension_id, *[int(value) >> 4 for value in match.groups()])
+                                    for match in re.finditer(r"forceload add (-?\d+) (-?\d+) (-?\d+) (-?\d+)", functions[step])]
+        assert sum(chunk_range.chunk_count() for chunk_range in ranges) <= 8
+        forceloaded.extend(get_covered(ranges=ranges))
+
+    assert sorted(forceloaded) == sorted(chunks)
+    assert "{plan: %s}" % plan_writer.plan_id in functions["start.mcfunction"]
+
+
+def test_abort_leaves_the_old_plan_alone(tmp_path):
+    plan_folder: str = os.path.join(str(tmp_path), "plan")
+    write_plan(plan_folder=plan_folder, chunks=[(0, 0), (1, 0)])
+    old_plan: Dict[str, str] = read_plan(plan_folder=plan_folder)
+
+    plan_writer: ForceloadPlanWriter = ForceloadPlanWriter(plan_folder=plan_folder, chunk_budget=1)
+    plan_writer.add_chunks(dimension_id=dimension_id, chunks=[(x, 5) for x in range(20)])
+    plan_writer.abort()
+
+    assert read_plan(plan_folder=plan_folder) == old_plan
+    assert os.listdir(str(tmp_path)) == ["plan"]
+
+
+def test_abort_without_a_plan_writes_nothing(tmp_path):
+    plan_folder: str = os.path.join(str(tmp_path), "plan")
+    plan_writer: ForceloadPlanWriter = ForceloadPlanWriter(plan_folder=plan_folder)
+    plan_writer.add_chunks(dimension_id=dimension_id, chunks=[(0, 0)])
+    plan_writer.abort()
+
+    assert os.listdir(str(tmp_path)) == []
@@ -0,0 +1,66 @@
+import csv
+import json
+import os
+from typing import List
+
+import pytest
+
+from item_aggregator import ItemAggregate
+
+
+def make_totals(by_dimension: bool = True, by_container: bool = True) -> ItemAggregate:
+    item_totals: ItemAggregate = ItemAggregate(by_dimension=by_dimension, by_container=by_container)
+    item_totals.add(item_id="minecraft:dirt", count=10, dimension="world", container="minecraft:chest")
+    item_totals.add(item_id="minecraft:dirt", count=5, dimension="DIM-1", container="minecraft:chest")
+    item_totals.add(item_id="minecraft:diamond", count=3, dimension="world", container="minecraft:shulker_box")
+    return item_totals
+
+
+def test_breakdowns_are_only_kept_when_asked_for():
+    item_totals: ItemAggregate = make_totals(by_dimension=False, by_container=True)
+    assert dict(item_totals.counts) == {("minecraft:dirt", "", "minecraft:chest"): 15, ("minecraft:diamond", "", "minecraft:shulker_box"): 3}
+
+
+def test_merging_adds_counts_in_any_order():
+    first: ItemAggregate = make_totals()
+    second: ItemAggregate = ItemAggregate(by_dimension=True, by_container=True)
+    second.add(item_id="minecraft:dirt", count=1, dimension="world", container="minecraft:chest")
+    second.add(item_id="minecraft:cobblestone", count=64, dimension="DIM1", container="minecraft:barrel")
+
+    merged: ItemAggregate = ItemAggregate(by_dimension=True, by_container=True).merge(other=first).merge(other=second)
+    reversed_merge: ItemAggregate = ItemAggregate(by_dimension=True, by_container=True).merge(other=second).merge(other=first)
+    assert merged.counts == reversed_merge.counts
+    assert merged.counts[("minecraft:dirt", "world", "minecraft:chest")] == 11
+    assert merged.get_total() == first.get_total() + second.get_total()
+
+    # Merging Doesn't Change What Was Merged In
+    assert second.get_total() == 65
+
+
+def test_merging_different_breakdowns_fails():
+    with pytest.raises(ValueError):
+        make_totals(by_container=False).merge(other=make_totals())
+
+
+def test_counts_round_trip_through_json():
+    item_totals: ItemAggregate = make_totals()
+    counts: List[list] = json.loads(json.dumps(item_totals.get_counts()))
+    assert ItemAggregate(by_dimension=True, by_container=True).add_counts(counts=counts).counts == item_totals.counts
+
+    # Adding Counts Sums Them Up With What's Already There
+    doubled: ItemAggregate = make_totals().add_counts(counts=counts)
+    assert doubled.get_total() == item_totals.get_total() * 2
+
+
+def test_csv_has_the_table_rows(tmp_path):
+    item_totals: ItemAggregate = make_totals(by_dimension=False)
+    csv_path: str = os.path.join(str(tmp_path), "total_item_list.csv")
+    item_totals.write_csv(csv_path=csv_path)
+
+    with open(csv_path, mode="r", newline="", encoding="utf-8") as f:
+        rows: List[List[str]] = list(csv.reader(f))
+
+    # Largest Counts First, Every Row Has The Grand Total
+    assert rows == [["Item ID", "Container", "Count", "Total"],
+                    ["minecraft:dirt", "minecraft:chest", "15", "18"],
+                    ["minecraft:diamond", "minecraft:shulker_box", "3", "18"]]
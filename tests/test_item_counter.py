@@ -0,0 +1,114 @@
+import json
+from typing import List, Optional, Tuple
+
+from nbt.nbt import NBTFile, TAG_Byte, TAG_Compound, TAG_Int, TAG_List, TAG_String
+
+from item_aggregator import ItemAggregate
+from item_counter import ItemCountVisitor, StorageRecord, check_block_entities, format_storage_record
+from output_sinks import ChunkErrorRecord
+from projected_nbt import get_snbt
+
+
+def make_item(item_id: str, count: int, slot: Optional[int] = None, contents: Optional[List[TAG_Compound]] = None, bundle: bool = False) -> TAG_Compound:
+    item: TAG_Compound = TAG_Compound()
+    item.tags.append(TAG_String(name="id", value=item_id))
+    item.tags.append(TAG_Byte(name="Count", value=count))
+    if slot is not None:
+        item.tags.append(TAG_Byte(name="Slot", value=slot))
+
+    if contents is not None:
+        items: TAG_List = TAG_List(name="Items", type=TAG_Compound)
+        items.tags.extend(contents)
+        tag: TAG_Compound = TAG_Compound(name="tag")
+        if bundle:
+            tag.tags.append(items)
+        else:
+            block_entity_tag: TAG_Compound = TAG_Compound(name="BlockEntityTag")
+            block_entity_tag.tags.append(items)
+            tag.tags.append(block_entity_tag)
+
+        item.tags.append(tag)
+
+    return item
+
+
+def make_chunk(block_entity: TAG_Compound) -> NBTFile:
+    block_entities: TAG_List = TAG_List(name="TileEntities", type=TAG_Compound)
+    block_entities.tags.append(block_entity)
+    level: TAG_Compound = TAG_Compound(name="Level")
+    level.tags.append(TAG_String(name="Status", value="full"))
+    level.tags.append(block_entities)
+    chunk: NBTFile = NBTFile()
+    chunk.tags.append(level)
+    return chunk
+
+
+def make_storage(be_id: str, items: List[TAG_Compound], total_stored: Optional[int] = None) -> TAG_Compound:
+    block_entity: TAG_Compound = TAG_Compound()
+    block_entity.tags.append(TAG_String(name="id", value=be_id))
+    for axis, value in zip("xyz", [1, 64, -2]):
+        block_entity.tags.append(TAG_Int(name=axis, value=value))
+
+    if total_stored is not None:
+        block_entity.tags.append(TAG_Int(name="totalStoredAmount", value=total_stored))
+
+    item_list: TAG_List = TAG_List(name="Items", type=TAG_Compound)
+    item_list.tags.extend(items)
+    block_entity.tags.append(item_list)
+    return block_entity
+
+
+def count_chunk(chunk: NBTFile) -> Tuple[List[StorageRecord], ItemAggregate]:
+    records: List[StorageRecord] = []
+    item_totals: ItemAggregate = ItemAggregate(by_container=True)
+    check_block_entities(chunk=chunk, dimension="world", records=records, item_totals=item_totals)
+    return records, item_totals
+
+
+def test_stacked_shulker_boxes_multiply_without_changing_the_chunk():
+    shulker_box: TAG_Compound = make_item(item_id="minecraft:shulker_box", count=1, slot=1, contents=[make_item(item_id="minecraft:diamond", count=10, slot=0)])
+    chunk: NBTFile = make_chunk(block_entity=make_storage(be_id="techreborn:storage_unit", items=[make_item(item_id="minecraft:dirt", count=5, slot=0), shulker_box],
+                                                          total_stored=3))
+    before: str = get_snbt(tag=chunk)
+
+    records, item_totals = count_chunk(chunk=chunk)
+    assert dict(item_totals.counts) == {("minecraft:dirt", "", "techreborn:storage_unit"): 5,
+                                        ("minecraft:shulker_box", "", "techreborn:storage_unit"): 3,
+                                        ("minecraft:diamond", "", "minecraft:shulker_box"): 30}
+
+    # Counted Twice (E.g. By Another Visitor Or From A Shared Chunk), Nothing Adds Up Twice
+    assert count_chunk(chunk=chunk)[1].counts == item_totals.counts
+    assert get_snbt(tag=chunk) == before
+
+    # Printed As Stored, Apart From The Storage Unit's Output Slot
+    assert format_storage_record(record=records[0])[:7] == [
+        "techreborn:storage_unit - (1, 64, -2) - world",
+        "-" * 40,
+        "minecraft:dirt - Slot: 0 - Count: 5",
+        "minecraft:shulker_box - Slot: 1 - Count: 3 - Tag: {BlockEntityTag:{Items:[{id:\"minecraft:diamond\",Count:10b,Slot:0b}]}}",
+        "-" * 20,
+        "minecraft:diamond - Slot: 0 - Count: 10",
+        "-" * 20
+    ]
+
+
+def test_bundles_are_counted_inside_their_container():
+    bundle: TAG_Compound = make_item(item_id="minecraft:bundle", count=2, slot=0, contents=[make_item(item_id="minecraft:arrow", count=7)], bundle=True)
+    records, item_totals = count_chunk(chunk=make_chunk(block_entity=make_storage(be_id="minecraft:chest", items=[bundle])))
+
+    assert item_totals.counts[("minecraft:arrow", "", "minecraft:bundle")] == 14
+    assert [[(item.id, item.count) for item in items] for items in records[0].contents] == [[("minecraft:arrow", 7)]]
+
+
+def test_results_round_trip_through_json():
+    visitor: ItemCountVisitor = ItemCountVisitor(by_container=True)
+    shulker_box: TAG_Compound = make_item(item_id="minecraft:shulker_box", count=1, slot=3, contents=[make_item(item_id="minecraft:diamond", count=10, slot=0)])
+    records, item_totals = count_chunk(chunk=make_chunk(block_entity=make_storage(be_id="minecraft:barrel", items=[shulker_box])))
+    records.append(ChunkErrorRecord(dimension="world", region="r.0.0.mca", chunk_x=1, chunk_z=2, error="broken"))
+
+    decoded_records, decoded_totals = visitor.decode_result(value=json.loads(json.dumps(visitor.encode_result(result=(records, item_totals)))))
+    assert decoded_records == records
+    assert decoded_totals.counts == item_totals.counts
+
+    # Errors Are Printed The Way They Always Were
+    assert format_storage_record(record=decoded_records[1]) == ["Failed To Read Chunk (1, 2) Due To Invalid Data!!!", "-" * 40, "Trace: broken", "-" * 40]
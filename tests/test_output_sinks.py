@@ -0,0 +1,85 @@
+import csv
+import json
+import os
+from typing import List
+
+import pytest
+
+from output_sinks import (BlockEntityRecord, ChunkErrorRecord, CsvSink, EntityRecord, ItemRecord, JsonLinesSink, Record, SignRecord, TextSink, open_sink,
+                          record_from_dict, record_to_dict, row_fields)
+
+chest: BlockEntityRecord = BlockEntityRecord(kind="storage", dimension="world", id="minecraft:chest", x=10, y=64, z=-3, custom_name="{\"text\":\"Loot\"}",
+                                             items=[ItemRecord(id="minecraft:dirt", count=64, slot=0),
+                                                    ItemRecord(id="minecraft:diamond_sword", count=1, slot=5, tag="{Damage:3}")])
+lectern: BlockEntityRecord = BlockEntityRecord(kind="lectern", dimension="DIM-1", id="minecraft:lectern", x=0, y=70, z=0, page=2,
+                                               items=[ItemRecord(id="minecraft:written_book", count=1, tag="{pages:[\"hi\"]}")])
+jukebox: BlockEntityRecord = BlockEntityRecord(kind="jukebox", dimension="world", id="minecraft:jukebox", x=1, y=2, z=3,
+                                               items=[ItemRecord(id="minecraft:music_disc_cat", count=1)])
+sign: SignRecord = SignRecord(dimension="world", id="minecraft:sign", x=5, y=65, z=5, readable=True, glowing=1, color="black", lines=["a", "b", "", "d"])
+old_sign: SignRecord = SignRecord(dimension="world", id="Sign", x=6, y=65, z=5, readable=False)
+item_frame: EntityRecord = EntityRecord(dimension="world", id="minecraft:item_frame", x=1.5, y=64.0, z=-0.5, item=ItemRecord(id="minecraft:map", count=1, tag="{map:4}"),
+                                        health=None, uuid=[1, -2, 3, -4])
+horse: EntityRecord = EntityRecord(dimension="world", id="minecraft:horse", x=0.0, y=70.0, z=0.0, items=[ItemRecord(id="minecraft:saddle", count=1, slot=0)],
+                                   custom_name="{\"text\":\"Bob\"}", health=20.0, uuid=[5, 6, 7, 8])
+chunk_error: ChunkErrorRecord = ChunkErrorRecord(dimension="world", region="r.0.0.mca", chunk_x=4, chunk_z=31, error="Partial File Parse")
+
+records: List[Record] = [chest, lectern, jukebox, sign, old_sign, item_frame, horse, chunk_error]
+
+
+def write_records(sink_class: type, output_path: str) -> str:
+    sink = sink_class(output_path=output_path)
+    sink.write_all(records=records)
+    sink.close()
+
+    with open(output_path, mode="r", encoding="utf-8", newline="") as f:
+        return f.read()
+
+
+@pytest.mark.parametrize("record", records)
+def test_records_round_trip_through_dicts(record: Record):
+    assert record_from_dict(record_dict=json.loads(json.dumps(record_to_dict(record=record)))) == record
+
+
+def test_text_matches_the_old_output(tmp_path):
+    # Same Lines The Scanner Printed Before Records, Apart From Chunk Errors, Which Now Say Which Chunk
+    expected: List[str] = [
+        "minecraft:chest - (10, 64, -3) - world", "-" * 40, "Custom Name: {\"text\":\"Loot\"}",
+        "minecraft:dirt - Slot: 0 - Count: 64", "minecraft:diamond_sword - Slot: 5 - Count: 1 - Tag: {Damage:3}", "-" * 40, " ",
+        "minecraft:lectern - (0, 70, 0) - DIM-1", "-" * 40, "minecraft:written_book - Count: 1 - Tag: {pages:[\"hi\"]}", "Page: 2", "-" * 40, " ",
+        "minecraft:jukebox - (1, 2, 3) - world", "-" * 40, "minecraft:music_disc_cat - Count: 1", "-" * 40, " ",
+        "minecraft:sign - (5, 65, 5) - world", "-" * 40, "Glowing: 1", "Color: black", "Line 1: a", "Line 2: b", "Line 3: ", "Line 4: d", "-" * 40, " ",
+        "Sign - (6, 65, 5) - world", "-" * 40, "Cannot Read Pre-1.8 Signs!!! Skipping For Now!!!", "-" * 40,
+        "minecraft:item_frame - (1.5, 64.0, -0.5) - world", "-" * 40, "Item: minecraft:map - Count: 1 - Tag: {map:4}", "UUID: [1, -2, 3, -4]", "-" * 40, " ",
+        "minecraft:horse - (0.0, 70.0, 0.0) - world", "-" * 40, "minecraft:saddle - Slot: 0 - Count: 1", "Name: {\"text\":\"Bob\"}", "Health: 20.0",
+        "UUID: [5, 6, 7, 8]", "-" * 40, " ",
+        "Failed To Read Chunk (4, 31) In r.0.0.mca Due To Invalid Data!!!", "-" * 40, "Trace: Partial File Parse", "-" * 40,
+    ]
+    assert write_records(sink_class=TextSink, output_path=os.path.join(str(tmp_path), "out.txt")) == "\n".join(expected) + "\n"
+
+
+def test_json_lines_are_one_record_each(tmp_path):
+    lines: List[str] = write_records(sink_class=JsonLinesSink, output_path=os.path.join(str(tmp_path), "out.jsonl")).splitlines()
+    assert [record_from_dict(record_dict=json.loads(line)) for line in lines] == records
+    assert json.loads(lines[0])["record_type"] == "block_entity"
+
+
+def test_csv_has_a_row_per_record_and_item(tmp_path):
+    text: str = write_records(sink_class=CsvSink, output_path=os.path.join(str(tmp_path), "out.csv"))
+    rows: List[List[str]] = list(csv.reader(text.splitlines()))
+    assert rows[0] == row_fields
+
+    table: List[dict] = list(csv.DictReader(text.splitlines()))
+    assert [row["record_type"] for row in table] == ["block_entity", "item", "item", "block_entity", "item", "block_entity", "item",
+                                                     "sign", "sign", "entity", "item", "entity", "item", "chunk_error"]
+
+    # Items Carry Their Container's Position
+    assert table[2] == {**dict.fromkeys(row_fields, ""), "record_type": "item", "dimension": "world", "id": "minecraft:diamond_sword", "x": "10", "y": "64", "z": "-3",
+                        "container_id": "minecraft:chest", "slot": "5", "count": "1", "tag": "{Damage:3}"}
+    assert [table[7]["line_%s" % line_number] for line_number in range(1, 5)] == ["a", "b", "", "d"]
+    assert table[9]["uuid"] == "[1, -2, 3, -4]"
+    assert (table[13]["id"], table[13]["x"], table[13]["z"], table[13]["error"]) == ("r.0.0.mca", "4", "31", "Partial File Parse")
+
+
+def test_unknown_format_raises():
+    with pytest.raises(ValueError):
+        open_sink(output_format="xml")
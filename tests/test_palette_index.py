@@ -0,0 +1,115 @@
+import os
+import zlib
+from typing import Dict, List, Optional, Set, Tuple
+
+import pytest
+
+import scan_engine
+from benchmark import WorldOptions, generate_world
+from palette_index import ChunkSummary, RegionIndex, get_index_path, index_version
+from region_reader import MappedRegionFile
+from scan_engine import get_region_files, get_region_tasks, iter_scan
+from scan_stats import RegionStats, ScanStats
+from world_query import QueryVisitor
+
+barrier_block_id: str = "minecraft:barrier"
+
+summary: ChunkSummary = ChunkSummary(blocks=frozenset(["minecraft:stone", "minecraft:air"]), block_entities=frozenset(["minecraft:chest"]),
+                                     entities=frozenset())
+other_summary: ChunkSummary = ChunkSummary(blocks=frozenset(["minecraft:stone", barrier_block_id]), block_entities=frozenset(),
+                                           entities=frozenset(["minecraft:item", "minecraft:marker"]))
+
+
+def test_summaries_round_trip(tmp_path):
+    region_path: str = os.path.join(str(tmp_path), "r.0.0.mca")
+    region_index: RegionIndex = RegionIndex(region_path=region_path)
+    region_index.put_summary(x=0, z=0, timestamp=100, summary=summary)
+    region_index.put_summary(x=31, z=2, timestamp=200, summary=other_summary)
+    region_index.save()
+
+    loaded: RegionIndex = RegionIndex(region_path=region_path).load()
+    assert loaded.chunks == region_index.chunks
+    assert loaded.get_summary(x=31, z=2, timestamp=200) == other_summary
+
+    # Only Trusted While The Timestamp Matches, And Never For A Timestamp Of 0
+    assert loaded.get_summary(x=31, z=2, timestamp=201) is None
+    assert loaded.get_summary(x=5, z=5, timestamp=100) is None
+    loaded.put_summary(x=1, z=1, timestamp=0, summary=summary)
+    assert loaded.get_summary(x=1, z=1, timestamp=0) is None
+
+
+def test_unchanged_index_is_not_written(tmp_path):
+    region_path: str = os.path.join(str(tmp_path), "r.0.0.mca")
+    RegionIndex(region_path=region_path).load().save()
+    assert not os.path.exists(get_index_path(region_path=region_path))
+
+
+@pytest.mark.parametrize("sidecar", [
+    zlib.compress(("{\"version\":%s,\"names\":[\"minecraft:barrier\"],\"chunks\":[[0,0,1,[0],[],[]]]}" % (index_version - 1)).encode("utf-8")),
+    b"not zlib",
+    zlib.compress(b"{not json"),
+])
+def test_out_of_date_sidecar_is_ignored(tmp_path, sidecar: bytes):
+    region_path: str = os.path.join(str(tmp_path), "r.0.0.mca")
+    with open(get_index_path(region_path=region_path), mode="wb") as f:
+        f.write(sidecar)
+
+    assert RegionIndex(region_path=region_path).load().chunks == {}
+
+
+@pytest.fixture
+def world_folder(tmp_path) -> str:
+    folder: str = str(tmp_path)
+    generate_world(world_folder=folder, options=WorldOptions(regions=2, chunks_per_region=64, barrier_chance=0.05, split_entities=False, seed=4))
+    return folder
+
+
+def query_barriers(world_folder: str, stats: ScanStats) -> List[Tuple[str, int, int]]:
+    visitor: QueryVisitor = QueryVisitor(blocks=[barrier_block_id], block_entities=[], entities=[])
+    matches: List[Tuple[str, int, int]] = []
+    for region_result in iter_scan(region_tasks=get_region_tasks(world_folder=world_folder), visitors=[visitor], stats=stats, use_index=True):
+        matches.extend((os.path.basename(region_result.task.region_path), context.x, context.z) for context, _ in region_result.results[visitor.name])
+
+    return matches
+
+
+def test_stale_sidecar_is_rebuilt_by_a_scan(world_folder: str):
+    region_paths: List[str] = get_region_files(folder=os.path.join(world_folder, "region"))
+    for region_path in region_paths:
+        with open(get_index_path(region_path=region_path), mode="wb") as f:
+            f.write(zlib.compress(b"{\"version\":0,\"names\":[],\"chunks\":[]}"))
+
+    query_barriers(world_folder=world_folder, stats=ScanStats(progress_stream=None))
+
+    # Every Chunk Has An Entry Again, Under The Region Header's Timestamp
+    for region_path in region_paths:
+        region_index: RegionIndex = RegionIndex(region_path=region_path).load()
+        with MappedRegionFile(filename=region_path) as region:
+            assert all(region_index.get_summary(x=location.x, z=location.z, timestamp=location.timestamp) is not None for location in region.get_metadata())
+
+
+def test_chunks_without_the_block_are_never_read(world_folder: str, monkeypatch):
+    first_matches: List[Tuple[str, int, int]] = query_barriers(world_folder=world_folder, stats=ScanStats(progress_stream=None))
+
+    indexed: Dict[Tuple[str, int, int], ChunkSummary] = {}
+    for region_path in get_region_files(folder=os.path.join(world_folder, "region")):
+        for (x, z), (_, chunk_summary) in RegionIndex(region_path=region_path).load().chunks.items():
+            indexed[(os.path.basename(region_path), x, z)] = chunk_summary
+
+    with_barriers: Set[Tuple[str, int, int]] = {chunk for chunk, chunk_summary in indexed.items() if barrier_block_id in chunk_summary.blocks}
+    assert 0 < len(with_barriers) < len(indexed)
+    assert set(first_matches) == with_barriers
+
+    # Second Scan, Only Chunks Whose Palette Lists A Barrier Are Read
+    read_chunks: List[Tuple[str, int, int]] = []
+    read_chunk = scan_engine._read_chunk
+
+    def recording_read_chunk(region: MappedRegionFile, x: int, z: int, stats: Optional[RegionStats]) -> bytes:
+        read_chunks.append((os.path.basename(region.filename), x, z))
+        return read_chunk(region=region, x=x, z=z, stats=stats)
+
+    monkeypatch.setattr(scan_engine, "_read_chunk", recording_read_chunk)
+    stats: ScanStats = ScanStats(progress_stream=None)
+    assert query_barriers(world_folder=world_folder, stats=stats) == first_matches
+    assert set(read_chunks) == with_barriers
+    assert stats.indexed_chunks == len(indexed) - len(with_barriers)
@@ -0,0 +1,169 @@
+import asyncio
+import json
+import os
+from typing import Iterator, List, Optional, Set, Tuple
+
+from nbt.nbt import NBTFile, TAG_Int
+from nbt.region import RegionFile
+
+from fake_rcon_server import FakeRconServer
+from pregenerator import GeneratedChunks, InFlightWindow, PregenerationPlan, iter_region_order, iter_spiral, load_progress, pregenerate, save_progress, take_chunks
+from rcon_client import RconPool
+from server_supervisor import PerformanceSample
+
+password: str = "test"
+
+
+class QuietSupervisor:
+    # Stands In For ServerSupervisor, The Server Never Falls Behind And Measurements Are Counted
+    def __init__(self, tps: float = 20.0):
+        self.tps: float = tps
+        self.measurements: int = 0
+
+    async def measure_performance(self, pool: RconPool, seconds: float) -> PerformanceSample:
+        self.measurements += 1
+        await pool.command(command="debug start")
+        await pool.command(command="debug stop")
+        return PerformanceSample(timestamp=0.0, tps=self.tps, mspt=None, source="debug")
+
+    def is_falling_behind(self, window: float) -> bool:
+        return False
+
+
+def make_region(region_folder: str, region_x: int, region_z: int, chunks: List[Tuple[int, int]]):
+    os.makedirs(region_folder, exist_ok=True)
+    with open(os.path.join(region_folder, "r.%s.%s.mca" % (region_x, region_z)), mode="w+b") as f:
+        region: RegionFile = RegionFile(fileobj=f)
+        for x, z in chunks:
+            chunk: NBTFile = NBTFile()
+            chunk.tags.append(TAG_Int(name="xPos", value=(region_x << 5) + x))
+            chunk.tags.append(TAG_Int(name="zPos", value=(region_z << 5) + z))
+            region.write_chunk(x, z, chunk)
+
+
+def test_window_grows_by_step_and_halves():
+    window: InFlightWindow = InFlightWindow(initial=64, minimum=16, maximum=160, step=32)
+    good: PerformanceSample = PerformanceSample(timestamp=0.0, tps=20.0, mspt=20.0, source="forge")
+
+    assert window.update(sample=None, falling_behind=False) == 96
+    assert window.update(sample=good, falling_behind=False) == 128
+    assert window.update(sample=None, falling_behind=False) == 160
+    assert window.update(sample=None, falling_behind=False) == 160
+
+    assert window.update(sample=None, falling_behind=True) == 80
+    assert window.update(sample=good, falling_behind=True) == 40
+
+    # A Bad Measurement Halves It Without Any Warning
+    assert window.update(sample=PerformanceSample(timestamp=0.0, tps=15.0, mspt=None, source="debug"), falling_behind=False) == 20
+    assert window.update(sample=PerformanceSample(timestamp=0.0, tps=None, mspt=80.0, source="mspt"), falling_behind=False) == 16
+    assert window.update(sample=None, falling_behind=True) == 16
+
+
+def test_spiral_covers_the_bounds_nearest_first():
+    bounds: Tuple[int, int, int, int] = (-3, -1, 4, 6)
+    center: Tuple[int, int] = (1, 2)
+    chunks: List[Tuple[int, int]] = list(iter_spiral(bounds=bounds, center=center))
+
+    assert chunks[0] == center
+    assert len(chunks) == len(set(chunks)) == 8 * 8
+    assert set(chunks) == {(x, z) for x in range(-3, 5) for z in range(-1, 7)}
+
+    rings: List[int] = [max(abs(x - center[0]), abs(z - center[1])) for x, z in chunks]
+    assert rings == sorted(rings)
+
+
+def test_region_order_finishes_each_region_first():
+    plan: PregenerationPlan = PregenerationPlan(center_x=0, center_z=0, radius=600, order="region")
+    chunks: List[Tuple[int, int]] = list(plan.iter_chunks())
+    min_x, min_z, max_x, max_z = plan.get_chunk_bounds()
+
+    assert len(chunks) == len(set(chunks)) == plan.chunk_count()
+    assert set(chunks) == {(x, z) for x in range(min_x, max_x + 1) for z in range(min_z, max_z + 1)}
+
+    regions: List[Tuple[int, int]] = [(x >> 5, z >> 5) for x, z in chunks]
+    visited: List[Tuple[int, int]] = [region for index, region in enumerate(regions) if index == 0 or regions[index - 1] != region]
+    assert visited[0] == (0, 0)
+    assert len(visited) == len(set(visited))
+
+    # Clipped To The Bounds, But Still Spiralling Out From The Center's Region
+    assert set(iter_region_order(bounds=(-2, -2, 40, 1), center=(0, 0))) == {(x, z) for x in range(-2, 41) for z in range(-2, 2)}
+
+
+def test_taking_chunks_skips_generated_ones(tmp_path):
+    region_folder: str = os.path.join(str(tmp_path), "region")
+    make_region(region_folder=region_folder, region_x=0, region_z=0, chunks=[(0, 0), (1, 0), (3, 0)])
+    generated: GeneratedChunks = GeneratedChunks(region_folder=region_folder)
+
+    chunks: Iterator[Tuple[int, int]] = iter([(0, 0), (1, 0), (2, 0), (3, 0), (4, 0), (5, 0), (6, 0)])
+    assert take_chunks(chunks=chunks, generated=generated, limit=2) == ([(2, 0), (4, 0)], 5)
+    assert take_chunks(chunks=chunks, generated=generated, limit=2) == ([(5, 0), (6, 0)], 2)
+    assert take_chunks(chunks=chunks, generated=generated, limit=2) == ([], 0)
+
+    # Regions Without A File Still Need Everything
+    assert take_chunks(chunks=iter([(32, 0), (-1, -1)]), generated=generated, limit=10) == ([(32, 0), (-1, -1)], 2)
+
+
+def test_progress_round_trip(tmp_path):
+    progress_path: str = os.path.join(str(tmp_path), "pregeneration.json")
+    plan: PregenerationPlan = PregenerationPlan(center_x=100, center_z=-50, radius=1000)
+    assert load_progress(progress_path=progress_path, plan=plan) == 0
+
+    save_progress(progress_path=progress_path, plan=plan, cursor=1234)
+    assert load_progress(progress_path=progress_path, plan=plan) == 1234
+    assert os.listdir(str(tmp_path)) == ["pregeneration.json"]
+
+    # Progress Of Another Plan Doesn't Count
+    assert load_progress(progress_path=progress_path, plan=plan._replace(order="region")) == 0
+
+    with open(progress_path, mode="w") as f:
+        f.write("{\"plan\": ")
+
+    assert load_progress(progress_path=progress_path, plan=plan) == 0
+
+
+def run_pregeneration(world_folder: str, plan: PregenerationPlan, supervisor: QuietSupervisor, sample_interval: Optional[float] = None) -> Tuple[int, List[str]]:
+    async def run() -> Tuple[int, List[str]]:
+        async with FakeRconServer(password=password) as server:
+            async with RconPool(password=password, port=server.port) as pool:
+                forceloaded: int = await pregenerate(plan=plan, world_folder=world_folder, supervisor=supervisor, pool=pool, window=InFlightWindow(initial=16, minimum=16),
+                                                     hold_seconds=0.0, round_seconds=0.0, adjust_seconds=0.0, sample_interval=sample_interval, sample_seconds=0.0)
+
+            return forceloaded, server.commands
+
+    return asyncio.run(run())
+
+
+def test_pregeneration_forceloads_missing_chunks_without_profiling(tmp_path):
+    world_folder: str = str(tmp_path)
+    make_region(region_folder=os.path.join(world_folder, "region"), region_x=0, region_z=0, chunks=[(0, 0), (1, 1)])
+    plan: PregenerationPlan = PregenerationPlan(center_x=0, center_z=0, radius=40)
+    supervisor: QuietSupervisor = QuietSupervisor()
+
+    forceloaded, commands = run_pregeneration(world_folder=world_folder, plan=plan, supervisor=supervisor)
+    assert forceloaded == plan.chunk_count() - 2
+
+    # /debug Is Never Run Unless Asked For, Every Forceload Is Removed Again
+    assert supervisor.measurements == 0
+    assert not any("debug" in command for command in commands)
+    added: List[str] = [command.split("forceload add ")[1] for command in commands if "forceload add" in command]
+    removed: List[str] = [command.split("forceload remove ")[1] for command in commands if "forceload remove " in command and not command.endswith("remove all")]
+    assert sorted(added) == sorted(removed)
+
+    covered: Set[Tuple[int, int]] = set()
+    for coordinates in added:
+        from_x, from_z, to_x, to_z = [int(value) >> 4 for value in coordinates.split()]
+        covered |= {(x, z) for x in range(from_x, to_x + 1) for z in range(from_z, to_z + 1)}
+
+    assert covered == set(plan.iter_chunks()) - {(0, 0), (1, 1)}
+
+    with open(os.path.join(world_folder, "pregeneration.json"), mode="r") as f:
+        assert json.load(f)["cursor"] == plan.chunk_count()
+
+
+def test_pregeneration_measures_only_when_asked(tmp_path):
+    plan: PregenerationPlan = PregenerationPlan(center_x=0, center_z=0, radius=40)
+    supervisor: QuietSupervisor = QuietSupervisor()
+
+    # A Long Interval Means One Measurement For The Whole Run
+    run_pregeneration(world_folder=str(tmp_path), plan=plan, supervisor=supervisor, sample_interval=3600.0)
+    assert supervisor.measurements == 1
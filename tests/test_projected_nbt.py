@@ -0,0 +1,268 @@
+import struct
+from io import BytesIO
+from typing import List, Optional, Tuple
+
+import pytest
+from nbt.nbt import TAG, TAG_COMPOUND, TAG_LIST, MalformedFileError, NBTFile, TAG_Byte, TAG_Byte_Array, TAG_Compound, TAG_Double, TAG_Float, TAG_Int, TAG_Int_Array
+from nbt.nbt import TAG_List, TAG_Long, TAG_Long_Array, TAG_Short, TAG_String
+
+from block_counter import is_full_chunk
+from projected_nbt import ChunkHeader, Projection, get_snbt, is_full_status, make_projection, read_chunk_header, read_projected_nbt, skip_payload
+
+
+@pytest.mark.parametrize("status, full", [
+    (None, True),
+    ("full", True),
+    ("minecraft:full", True),
+    (" full ", True),
+    ("features", False),
+    ("minecraft:features", False),
+    ("", False),
+])
+def test_full_status(status: Optional[str], full: bool):
+    assert is_full_status(status=status) == full
+    assert ChunkHeader(data_version=None, status=status).is_full() == full
+
+
+@pytest.mark.parametrize("status, full", [(None, True), ("minecraft:full", True), ("minecraft:carvers", False)])
+def test_decoded_chunk_matches_header(status: Optional[str], full: bool):
+    chunk: NBTFile = NBTFile()
+    level: TAG_Compound = TAG_Compound(name="Level")
+    if status is not None:
+        level.tags.append(TAG_String(name="Status", value=status))
+
+    chunk.tags.append(level)
+    assert is_full_chunk(chunk=chunk) == full
+
+
+def make_long_array(name: str, values: List[int]) -> TAG_Long_Array:
+    long_array: TAG_Long_Array = TAG_Long_Array(name=name)
+    long_array.value = values
+    return long_array
+
+
+def make_section(y: int, block_ids: List[str]) -> TAG_Compound:
+    section: TAG_Compound = TAG_Compound()
+    section.tags.append(TAG_Byte(name="Y", value=y))
+    palette: TAG_List = TAG_List(name="Palette", type=TAG_Compound)
+    for block_id in block_ids:
+        state: TAG_Compound = TAG_Compound()
+        state.tags.append(TAG_String(name="Name", value=block_id))
+        palette.tags.append(state)
+
+    section.tags.append(palette)
+    section.tags.append(make_long_array(name="BlockStates", values=[y, -1, 1 << 40]))
+    light: TAG_Byte_Array = TAG_Byte_Array(name="BlockLight")
+    light.value = bytearray(range(256))
+    section.tags.append(light)
+    return section
+
+
+def make_chunk() -> NBTFile:
+    # Every Tag Type, Lists Of Compounds, Lists Of Lists And Empty Lists
+    chunk: NBTFile = NBTFile()
+    chunk.name = ""
+    chunk.tags.append(TAG_Int(name="DataVersion", value=2730))
+
+    level: TAG_Compound = TAG_Compound(name="Level")
+    level.tags.append(TAG_Int(name="xPos", value=-3))
+    level.tags.append(TAG_Long(name="LastUpdate", value=1 << 50))
+    level.tags.append(TAG_String(name="Status", value="full"))
+
+    sections: TAG_List = TAG_List(name="Sections", type=TAG_Compound)
+    sections.tags.extend([make_section(y=y, block_ids=["minecraft:air", "minecraft:stone"][:y + 2]) for y in range(-1, 3)])
+    level.tags.append(sections)
+
+    block_entity: TAG_Compound = TAG_Compound()
+    block_entity.tags.append(TAG_String(name="id", value="minecraft:chest"))
+    block_entity.tags.append(TAG_Short(name="Short", value=-7))
+    block_entity.tags.append(TAG_Float(name="Float", value=0.5))
+    block_entity.tags.append(TAG_Double(name="Double", value=-2.25))
+    int_array: TAG_Int_Array = TAG_Int_Array(name="UUID")
+    int_array.value = [1, -2, 3, -4]
+    block_entity.tags.append(int_array)
+    nested: TAG_List = TAG_List(name="Nested", type=TAG_List)
+    for length in [0, 2]:
+        inner: TAG_List = TAG_List(type=TAG_Int)
+        inner.tags.extend([TAG_Int(value=value) for value in range(length)])
+        nested.tags.append(inner)
+
+    block_entity.tags.append(nested)
+    block_entities: TAG_List = TAG_List(name="TileEntities", type=TAG_Compound)
+    block_entities.tags.append(block_entity)
+    level.tags.append(block_entities)
+    level.tags.append(TAG_List(name="Entities", type=TAG_Compound))
+    chunk.tags.append(level)
+    chunk.tags.append(TAG_Byte(name="Trailing", value=1))
+    return chunk
+
+
+def get_bytes(chunk: NBTFile) -> bytes:
+    buffer: BytesIO = BytesIO()
+    chunk.write_file(buffer=buffer)
+    return buffer.getvalue()
+
+
+def project(tag: TAG_Compound, projection: Projection) -> List[TAG]:
+    # The Children Of A Fully Parsed Compound That A Projection Keeps, Built Independently Of read_projected_nbt(...)
+    kept: List[TAG] = []
+    for child in tag.tags:
+        raw_name: bytes = child.name.encode("utf-8")
+        if raw_name not in projection:
+            continue
+
+        child_projection: Optional[Projection] = projection[raw_name]
+        if child_projection is not None and child.id == TAG_COMPOUND:
+            projected: TAG_Compound = TAG_Compound(name=child.name)
+            projected.tags.extend(project(tag=child, projection=child_projection))
+            kept.append(projected)
+        elif child_projection is not None and child.id == TAG_LIST and child.tagID == TAG_COMPOUND:
+            projected_list: TAG_List = TAG_List(name=child.name, type=TAG_Compound)
+            for element in child.tags:
+                projected_element: TAG_Compound = TAG_Compound()
+                projected_element.tags.extend(project(tag=element, projection=child_projection))
+                projected_list.tags.append(projected_element)
+
+            kept.append(projected_list)
+        else:
+            kept.append(child)
+
+    return kept
+
+
+@pytest.mark.parametrize("paths", [
+    [("DataVersion",), ("Level", "Status")],
+    [("Level", "Sections", "Palette")],
+    [("Level", "Sections", "Y"), ("Level", "Sections", "BlockStates"), ("Level", "Sections", "Palette", "Name")],
+    [("Level", "TileEntities")],
+    [("Level", "Entities"), ("Level", "TileEntities", "Nested"), ("Trailing",)],
+    # A Whole Subtree Wins Over A Deeper Path Into It
+    [("Level",), ("Level", "Sections", "Y")],
+    [("Level", "Missing"), ("Missing",)],
+])
+def test_projection_matches_a_full_parse(paths: List[Tuple[str, ...]]):
+    chunk: NBTFile = make_chunk()
+    data: bytes = get_bytes(chunk=chunk)
+    full: NBTFile = NBTFile(buffer=BytesIO(data))
+    projection: Projection = make_projection(paths=paths)
+
+    expected: TAG_Compound = TAG_Compound()
+    expected.tags.extend(project(tag=full, projection=projection))
+    assert get_snbt(tag=read_projected_nbt(data=data, projection=projection)) == get_snbt(tag=expected)
+
+
+def test_projected_long_arrays_keep_their_values():
+    data: bytes = get_bytes(chunk=make_chunk())
+    projected: NBTFile = read_projected_nbt(data=data, projection=make_projection(paths=[("Level", "Sections", "BlockStates")]))
+    block_states: TAG_Long_Array = projected["Level"]["Sections"][0]["BlockStates"]
+
+    assert block_states.raw == struct.pack(">3q", -1, -1, 1 << 40)
+    assert block_states.value == [-1, -1, 1 << 40]
+
+
+def test_skipping_covers_every_tag():
+    data: bytes = get_bytes(chunk=make_chunk())
+    # Root Compound Payload Starts After Its Type And (Empty) Name
+    assert skip_payload(data=data, offset=3, tag_type=TAG_COMPOUND) == len(data)
+    assert read_projected_nbt(data=data, projection={}).tags == []
+
+
+def make_header_chunk(data_version: Optional[int], status: Optional[str], in_level: bool, data_version_last: bool = False) -> NBTFile:
+    # Sections Before And After Status, So Finding It Means Skipping Over Real Payloads
+    chunk: NBTFile = NBTFile()
+    level: TAG_Compound = TAG_Compound(name="Level")
+    level.tags.append(TAG_Int(name="xPos", value=3))
+    sections: TAG_List = TAG_List(name="Sections", type=TAG_Compound)
+    sections.tags.append(make_section(y=0, block_ids=["minecraft:stone"]))
+    level.tags.append(sections)
+    if status is not None:
+        (level if in_level else chunk).tags.append(TAG_String(name="Status", value=status))
+
+    level.tags.append(TAG_Long(name="LastUpdate", value=100))
+    if data_version is not None and not data_version_last:
+        chunk.tags.append(TAG_Int(name="DataVersion", value=data_version))
+
+    chunk.tags.append(level if in_level else sections)
+    if data_version is not None and data_version_last:
+        chunk.tags.append(TAG_Int(name="DataVersion", value=data_version))
+
+    return chunk
+
+
+@pytest.mark.parametrize("data_version_last", [False, True])
+@pytest.mark.parametrize("status, full", [("full", True), ("minecraft:full", True), ("carvers", False), ("minecraft:liquid_carvers", False), (None, True)])
+def test_header_of_pre_1_18_chunk(status: Optional[str], full: bool, data_version_last: bool):
+    # Before 1.18 Status Lives In Level
+    header: ChunkHeader = read_chunk_header(data=get_bytes(chunk=make_header_chunk(data_version=2586, status=status, in_level=True, data_version_last=data_version_last)))
+    assert header == ChunkHeader(data_version=2586, status=status)
+    assert header.is_full() == full
+
+
+@pytest.mark.parametrize("data_version_last", [False, True])
+@pytest.mark.parametrize("status, full", [("minecraft:full", True), ("minecraft:noise", False), (None, True)])
+def test_header_of_1_18_chunk(status: Optional[str], full: bool, data_version_last: bool):
+    # 1.18+ Moved Everything Out Of Level, Status Included
+    header: ChunkHeader = read_chunk_header(data=get_bytes(chunk=make_header_chunk(data_version=2975, status=status, in_level=False, data_version_last=data_version_last)))
+    assert header == ChunkHeader(data_version=2975, status=status)
+    assert header.is_full() == full
+
+
+def test_header_without_data_version():
+    # E.g. 2b2t World Downloads
+    assert read_chunk_header(data=get_bytes(chunk=make_header_chunk(data_version=None, status="full", in_level=True))) == ChunkHeader(data_version=None, status="full")
+
+
+def test_truncated_header_raises():
+    data: bytes = get_bytes(chunk=make_header_chunk(data_version=2975, status="minecraft:full", in_level=False, data_version_last=True))
+    status_end: int = data.index(b"minecraft:full") + len("minecraft:full")
+    for length in range(status_end):
+        with pytest.raises(MalformedFileError):
+            read_chunk_header(data=data[:length])
+
+
+def test_truncated_data_raises():
+    data: bytes = get_bytes(chunk=make_chunk())
+    projection: Projection = make_projection(paths=[("Level", "Sections", "Palette"), ("Level", "TileEntities"), ("Trailing",)])
+    for length in range(len(data)):
+        with pytest.raises(MalformedFileError):
+            read_projected_nbt(data=data[:length], projection=projection)
+
+
+def test_not_a_compound_raises():
+    with pytest.raises(MalformedFileError):
+        read_projected_nbt(data=b"\x08\x00\x00", projection={})
+
+
+@pytest.mark.parametrize("tag, snbt", [
+    (TAG_Byte(value=-3), "-3b"),
+    (TAG_Short(value=300), "300s"),
+    (TAG_Int(value=7), "7"),
+    (TAG_Long(value=1 << 40), "1099511627776L"),
+    (TAG_Float(value=0.5), "0.5f"),
+    (TAG_Double(value=-2.25), "-2.25d"),
+    (TAG_String(value="say \"hi\" \\ bye"), "\"say \\\"hi\\\" \\\\ bye\""),
+])
+def test_snbt_suffixes_and_quotes(tag: TAG, snbt: str):
+    assert get_snbt(tag=tag) == snbt
+
+
+def test_snbt_names_and_arrays():
+    compound: TAG_Compound = TAG_Compound()
+    compound.tags.append(TAG_Byte(name="plain_Name-1.+", value=1))
+    compound.tags.append(TAG_Byte(name="minecraft:id", value=2))
+    compound.tags.append(TAG_Byte(name="with space", value=3))
+    compound.tags.append(TAG_Byte(name="", value=4))
+
+    byte_array: TAG_Byte_Array = TAG_Byte_Array(name="Bytes")
+    byte_array.value = bytearray([1, 255])
+    int_array: TAG_Int_Array = TAG_Int_Array(name="Ints")
+    int_array.value = [1, -2]
+    compound.tags.extend([byte_array, int_array, make_long_array(name="Longs", values=[3])])
+
+    strings: TAG_List = TAG_List(name="Strings", type=TAG_String)
+    strings.tags.append(TAG_String(value="a"))
+    compound.tags.append(strings)
+    compound.tags.append(TAG_List(name="Empty", type=TAG_Compound))
+
+    assert get_snbt(tag=compound) == ("{plain_Name-1.+:1b,\"minecraft:id\":2b,\"with space\":3b,\"\":4b,"
+                                      "Bytes:[B;1b,-1b],Ints:[I;1,-2],Longs:[L;3L],Strings:[\"a\"],Empty:[]}")
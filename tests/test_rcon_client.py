@@ -0,0 +1,138 @@
+import asyncio
+from typing import List
+
+import pytest
+
+from fake_rcon_server import FakeRconServer
+from rcon_client import RconAuthenticationError, RconConnection, RconError, RconPool, max_response_fragment, pipelined_max_in_flight
+
+password: str = "test"
+
+
+def echo(command: str) -> str:
+    return "ran %s" % command
+
+
+def test_default_client_works_against_vanilla_reads():
+    commands: List[str] = ["forceload add %s 0" % (index << 4) for index in range(200)]
+
+    async def run() -> List[str]:
+        async with FakeRconServer(password=password, handler=echo) as server:
+            async with RconPool(password=password, port=server.port, connections=3) as pool:
+                responses: List[str] = await pool.run_commands(commands=commands)
+
+            assert server.dropped_connections == 0
+            return responses
+
+    assert asyncio.run(run()) == [echo(command=command) for command in commands]
+
+
+def test_vanilla_reads_drop_pipelined_commands():
+    async def run():
+        async with FakeRconServer(password=password, handler=echo) as server:
+            async with RconPool(password=password, port=server.port, max_in_flight=pipelined_max_in_flight) as pool:
+                with pytest.raises(RconError):
+                    await pool.run_commands(commands=["say %s" % index for index in range(5)])
+
+            assert server.dropped_connections == 1
+
+    asyncio.run(run())
+
+
+def test_pipelined_commands_are_sent_before_any_answer():
+    async def run() -> List[str]:
+        async with FakeRconServer(password=password, handler=echo, pipelining=True) as server:
+            connection: RconConnection = RconConnection(host="127.0.0.1", port=server.port, password=password, max_in_flight=pipelined_max_in_flight)
+            await connection.connect()
+
+            server.answering.clear()
+            futures: List[asyncio.Future] = [await connection.send(command="say %s" % index) for index in range(5)]
+            assert connection.in_flight() == 5
+            assert not any(future.done() for future in futures)
+
+            server.answering.set()
+            responses: List[str] = list(await asyncio.gather(*futures))
+            await connection.close()
+            return responses
+
+    assert asyncio.run(run()) == ["ran say %s" % index for index in range(5)]
+
+
+def test_pool_responses_match_their_commands():
+    commands: List[str] = ["forceload add %s 0" % (index << 4) for index in range(500)]
+
+    async def run() -> List[str]:
+        async with FakeRconServer(password=password, handler=echo, pipelining=True) as server:
+            async with RconPool(password=password, port=server.port, connections=3, max_in_flight=16) as pool:
+                return await pool.run_commands(commands=commands)
+
+    assert asyncio.run(run()) == [echo(command=command) for command in commands]
+
+
+def test_answer_to_a_later_command_finishes_earlier_ones():
+    async def run():
+        connection: RconConnection = RconConnection(host="127.0.0.1", port=0, password=password, max_in_flight=3)
+        futures: List[asyncio.Future] = []
+        for request_id in [1, 2, 3]:
+            futures.append(asyncio.get_running_loop().create_future())
+            connection.pending[request_id] = futures[-1]
+            connection.order.append(request_id)
+            connection.fragments[request_id] = []
+
+        # Unknown IDs Are Ignored
+        connection.handle_response(request_id=7, payload=b"stray")
+        assert not any(future.done() for future in futures)
+
+        connection.handle_response(request_id=2, payload=b"two")
+        assert [future.result() for future in futures[:2]] == ["", "two"]
+        assert not futures[2].done()
+        assert list(connection.order) == [3]
+
+    asyncio.run(run())
+
+
+@pytest.mark.parametrize("pipelining", [False, True])
+@pytest.mark.parametrize("length", [0, max_response_fragment - 1, max_response_fragment, max_response_fragment * 2, 10000])
+def test_fragmented_responses_are_reassembled(length: int, pipelining: bool):
+    async def run() -> List[str]:
+        async with FakeRconServer(password=password, handler=lambda command: "x" * length if command == "long" else echo(command=command), pipelining=pipelining) as server:
+            async with RconPool(password=password, port=server.port, max_in_flight=pipelined_max_in_flight if pipelining else 1) as pool:
+                return await pool.run_commands(commands=["long", "after"])
+
+    assert asyncio.run(run()) == ["x" * length, "ran after"]
+
+
+def test_wrong_password_is_rejected():
+    async def run() -> FakeRconServer:
+        async with FakeRconServer(password=password) as server:
+            connection: RconConnection = RconConnection(host="127.0.0.1", port=server.port, password="wrong")
+            with pytest.raises(RconAuthenticationError):
+                await connection.connect()
+
+            assert connection.closed
+            return server
+
+    assert asyncio.run(run()).commands == []
+
+
+@pytest.mark.parametrize("max_in_flight", [1, 2])
+def test_sending_waits_while_too_many_commands_are_unanswered(max_in_flight: int):
+    async def run() -> List[str]:
+        async with FakeRconServer(password=password, handler=echo, pipelining=max_in_flight > 1) as server:
+            connection: RconConnection = RconConnection(host="127.0.0.1", port=server.port, password=password, max_in_flight=max_in_flight)
+            await connection.connect()
+
+            server.answering.clear()
+            futures: List[asyncio.Future] = [await connection.send(command="command %s" % index) for index in range(max_in_flight)]
+            last: asyncio.Task = asyncio.ensure_future(connection.send(command="last"))
+            await asyncio.sleep(0.1)
+            assert not last.done()
+            assert connection.in_flight() == max_in_flight
+
+            server.answering.set()
+            futures.append(await last)
+            responses: List[str] = list(await asyncio.gather(*futures))
+            await connection.close()
+            return responses
+
+    assert asyncio.run(run()) == ["ran command %s" % index for index in range(max_in_flight)] + ["ran last"]
@@ -0,0 +1,140 @@
+import gzip
+import os
+import struct
+from typing import List, Tuple
+
+import pytest
+from nbt.nbt import NBTFile, TAG_Byte_Array, TAG_Int
+from nbt.region import NoRegionHeader, RegionFile, RegionFileFormatError
+
+from region_reader import ChunkLocation, MappedRegionFile, compression_gzip, compression_none, read_region_usage, RegionUsage, sector_length
+
+positions: List[Tuple[int, int]] = [(0, 0), (5, 1), (31, 31), (2, 7), (17, 0)]
+
+
+def encode_chunk(x: int, z: int, padding: int) -> NBTFile:
+    chunk: NBTFile = NBTFile()
+    chunk.tags.append(TAG_Int(name="xPos", value=x))
+    chunk.tags.append(TAG_Int(name="zPos", value=z))
+
+    # Random Bytes Don't Compress, So Chunks Take Up Several Sectors
+    padding_tag: TAG_Byte_Array = TAG_Byte_Array(name="Padding")
+    padding_tag.value = bytearray(os.urandom(padding))
+    chunk.tags.append(padding_tag)
+    return chunk
+
+
+def append_chunk(region_path: str, x: int, z: int, compression: int, chunk_bytes: bytes):
+    # Writes A Chunk With Any Compression Byte At The End Of The File, Which RegionFile Can't Do
+    stored_chunk: bytes = struct.pack(">IB", len(chunk_bytes) + 1, compression) + chunk_bytes
+    sectors: int = -(-len(stored_chunk) // sector_length)
+    with open(region_path, mode="r+b") as f:
+        f.seek(0, os.SEEK_END)
+        start: int = f.tell() // sector_length
+        f.write(stored_chunk + b"\0" * (sectors * sector_length - len(stored_chunk)))
+        f.seek(4 * (x + z * 32))
+        f.write(struct.pack(">I", start << 8 | sectors))
+        f.seek(sector_length + 4 * (x + z * 32))
+        f.write(struct.pack(">I", 1234))
+
+
+def make_region(folder) -> str:
+    region_path: str = os.path.join(str(folder), "r.0.0.mca")
+    with open(region_path, mode="w+b") as f:
+        region: RegionFile = RegionFile(fileobj=f)
+        for index, (x, z) in enumerate(positions):
+            region.write_chunk(x, z, encode_chunk(x=x, z=z, padding=2000 * (index + 1)))
+
+    return region_path
+
+
+def compare_regions(region_path: str):
+    # Same Metadata In The Same Order, And The Same Data (Or A RegionFileFormatError From Both) For Every Chunk
+    with MappedRegionFile(filename=region_path) as mapped_region:
+        region: RegionFile = RegionFile(filename=region_path)
+        try:
+            assert [tuple(location) for location in mapped_region.get_metadata()] == [(metadata.x, metadata.z, metadata.blockstart, metadata.blocklength, metadata.timestamp)
+                                                                                      for metadata in region.get_metadata()]
+            assert mapped_region.chunk_count() == region.chunk_count()
+
+            for metadata in region.get_metadata():
+                try:
+                    expected: bytes = region.get_blockdata(metadata.x, metadata.z)
+                except RegionFileFormatError:
+                    with pytest.raises(RegionFileFormatError):
+                        mapped_region.get_blockdata(x=metadata.x, z=metadata.z)
+
+                    continue
+
+                assert mapped_region.get_blockdata(x=metadata.x, z=metadata.z) == expected
+        finally:
+            region.close()
+
+
+def test_chunks_match_the_nbt_library(tmp_path):
+    region_path: str = make_region(folder=tmp_path)
+    append_chunk(region_path=region_path, x=9, z=9, compression=compression_gzip, chunk_bytes=gzip.compress(b"\x0a\x00\x00\x00"))
+    compare_regions(region_path=region_path)
+
+    usage: RegionUsage = read_region_usage(filename=region_path)
+    assert usage.chunks == len(positions) + 1
+    assert usage.chunk_bytes == os.path.getsize(region_path) - 2 * sector_length
+
+
+def test_uncompressed_chunks_are_read_as_is(tmp_path):
+    region_path: str = make_region(folder=tmp_path)
+    append_chunk(region_path=region_path, x=3, z=3, compression=compression_none, chunk_bytes=b"\x0a\x00\x00\x00")
+
+    with MappedRegionFile(filename=region_path) as mapped_region:
+        assert mapped_region.get_blockdata(x=3, z=3) == b"\x0a\x00\x00\x00"
+
+
+def test_zero_byte_file_has_no_chunks(tmp_path):
+    region_path: str = os.path.join(str(tmp_path), "r.0.0.mca")
+    open(region_path, mode="wb").close()
+
+    compare_regions(region_path=region_path)
+    assert read_region_usage(filename=region_path).chunks == 0
+
+
+def test_header_only_file_has_no_chunks(tmp_path):
+    region_path: str = os.path.join(str(tmp_path), "r.0.0.mca")
+    with open(region_path, mode="wb") as f:
+        f.write(b"\0" * 2 * sector_length)
+
+    compare_regions(region_path=region_path)
+    with MappedRegionFile(filename=region_path) as mapped_region:
+        assert mapped_region.get_metadata() == []
+
+
+def test_file_too_small_for_a_header_raises(tmp_path):
+    region_path: str = os.path.join(str(tmp_path), "r.0.0.mca")
+    with open(region_path, mode="wb") as f:
+        f.write(b"\0" * 100)
+
+    with pytest.raises(NoRegionHeader):
+        RegionFile(filename=region_path)
+
+    with pytest.raises(NoRegionHeader):
+        MappedRegionFile(filename=region_path)
+
+
+@pytest.mark.parametrize("cut", [100, 5000, 3 * sector_length + 10])
+def test_truncated_file_keeps_whole_chunks_readable(tmp_path, cut: int):
+    region_path: str = make_region(folder=tmp_path)
+    with open(region_path, mode="r+b") as f:
+        f.truncate(os.path.getsize(region_path) - cut)
+
+    compare_regions(region_path=region_path)
+
+    # Cutting Into The Last Chunk Breaks Only That One, Cutting The Padding After It Breaks Nothing
+    with MappedRegionFile(filename=region_path) as mapped_region:
+        locations: List[ChunkLocation] = sorted(mapped_region.get_metadata(), key=lambda location: location.blockstart)
+        for location in locations[:-1]:
+            mapped_region.get_blockdata(x=location.x, z=location.z)
+
+        if cut > 100:
+            with pytest.raises(RegionFileFormatError):
+                mapped_region.get_blockdata(x=locations[-1].x, z=locations[-1].z)
+        else:
+            mapped_region.get_blockdata(x=locations[-1].x, z=locations[-1].z)
@@ -0,0 +1,99 @@
+import os
+import stat
+from typing import Dict, List, Optional, Tuple
+
+import pytest
+from nbt.nbt import NBTFile, TAG_Byte_Array, TAG_Int, TAG_String
+from nbt.region import ChunkDataError, RegionFile
+
+from region_reader import MappedRegionFile
+from region_writer import encode_chunk, rewrite_region
+
+old_timestamp: int = 1000
+new_timestamp: int = 2000
+
+
+def make_chunk(x: int, z: int, text: str, padding: int = 0) -> NBTFile:
+    chunk: NBTFile = NBTFile()
+    chunk.tags.append(TAG_Int(name="xPos", value=x))
+    chunk.tags.append(TAG_Int(name="zPos", value=z))
+    chunk.tags.append(TAG_String(name="Text", value=text))
+
+    # Random Bytes Don't Compress, So The Chunk Takes Up About padding Bytes In The Region
+    padding_tag: TAG_Byte_Array = TAG_Byte_Array(name="Padding")
+    padding_tag.value = bytearray(os.urandom(padding))
+    chunk.tags.append(padding_tag)
+    return chunk
+
+
+def make_region(folder, positions: List[Tuple[int, int]], mode: int) -> str:
+    region_path: str = os.path.join(str(folder), "r.0.0.mca")
+    with open(region_path, mode="w+b") as f:
+        region: RegionFile = RegionFile(fileobj=f)
+        for x, z in positions:
+            # Big Enough For Some Chunks To Take Up Several Sectors
+            region.write_chunk(x, z, make_chunk(x=x, z=z, text="%s,%s" % (x, z), padding=3000 * (x + 1)))
+
+    # Old Timestamps, So Rewritten Chunks Stand Out
+    with open(region_path, mode="r+b") as f:
+        for x, z in positions:
+            f.seek(4096 + 4 * (x + z * 32))
+            f.write(old_timestamp.to_bytes(4, "big"))
+
+    os.chmod(region_path, mode)
+    return region_path
+
+
+def read_region(region_path: str) -> Dict[Tuple[int, int], Tuple[int, Optional[bytes]]]:
+    # Timestamp And Stored Bytes Of Every Chunk
+    with MappedRegionFile(filename=region_path) as region:
+        return {(location.x, location.z): (location.timestamp, region.get_raw_chunk(x=location.x, z=location.z)) for location in region.get_metadata()}
+
+
+@pytest.mark.parametrize("mode", [0o644, 0o664, 0o640])
+def test_rewritten_region_keeps_everything_else(tmp_path, mode: int):
+    region_path: str = make_region(folder=tmp_path, positions=[(0, 0), (1, 0), (2, 5), (31, 31)], mode=mode)
+    before: Dict[Tuple[int, int], Tuple[int, Optional[bytes]]] = read_region(region_path=region_path)
+
+    replaced_chunk: NBTFile = make_chunk(x=1, z=0, text="replaced")
+    added_chunk: NBTFile = make_chunk(x=7, z=3, text="added")
+    rewrite_region(region_path=region_path, updated_chunks={(1, 0): encode_chunk(chunk=replaced_chunk), (7, 3): encode_chunk(chunk=added_chunk)}, timestamp=new_timestamp)
+
+    after: Dict[Tuple[int, int], Tuple[int, Optional[bytes]]] = read_region(region_path=region_path)
+    assert set(after) == set(before) | {(7, 3)}
+
+    # Untouched Chunks Are Copied Byte For Byte With Their Old Timestamps
+    for position in [(0, 0), (2, 5), (31, 31)]:
+        assert after[position] == before[position]
+
+    # Only Replaced (Or Added) Chunks Get The New Timestamp
+    assert after[(1, 0)][0] == new_timestamp
+    assert after[(7, 3)][0] == new_timestamp
+
+    region: RegionFile = RegionFile(filename=region_path)
+    try:
+        assert region.get_nbt(1, 0)["Text"].value == "replaced"
+        assert region.get_nbt(7, 3)["Text"].value == "added"
+        assert region.get_nbt(2, 5)["Text"].value == "2,5"
+    finally:
+        region.close()
+
+    assert stat.S_IMODE(os.stat(region_path).st_mode) == mode
+
+    # Nothing Is Left Behind Next To The Region
+    assert os.listdir(str(tmp_path)) == ["r.0.0.mca"]
+
+
+def test_chunk_too_big_leaves_region_alone(tmp_path):
+    region_path: str = make_region(folder=tmp_path, positions=[(0, 0)], mode=0o644)
+    with open(region_path, mode="rb") as f:
+        original: bytes = f.read()
+
+    too_big: NBTFile = make_chunk(x=0, z=0, text="too big", padding=256 * 4096)
+    with pytest.raises(ChunkDataError):
+        rewrite_region(region_path=region_path, updated_chunks={(0, 0): encode_chunk(chunk=too_big)})
+
+    with open(region_path, mode="rb") as f:
+        assert f.read() == original
+
+    assert os.listdir(str(tmp_path)) == ["r.0.0.mca"]
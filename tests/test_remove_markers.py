@@ -0,0 +1,111 @@
+import os
+import re
+from io import BytesIO
+from typing import Dict, List, Set, Tuple
+
+import nbt
+import pytest
+
+import remove_markers
+import remove_markers_2
+from benchmark import WorldOptions, generate_world
+from output_sinks import Record
+from region_reader import MappedRegionFile
+from scan_engine import get_region_files
+
+
+def get_marked_chunks(world_folder: str) -> Dict[Tuple[int, int], int]:
+    # Read Straight From The Region Files: World Chunk -> Markers In It
+    marked_chunks: Dict[Tuple[int, int], int] = {}
+    for folder_name, entity_path in [("entities", ["Entities"]), ("region", ["Level", "Entities"])]:
+        for region_path in get_region_files(folder=os.path.join(world_folder, folder_name)):
+            _, region_x, region_z, _ = os.path.basename(region_path).split(".")
+            with MappedRegionFile(filename=region_path) as region:
+                for location in region.get_metadata():
+                    entities: nbt.nbt.TAG = nbt.nbt.NBTFile(buffer=BytesIO(region.get_blockdata(x=location.x, z=location.z)))
+                    for key in entity_path:
+                        entities: nbt.nbt.TAG = entities[key] if key in entities else []
+
+                    markers: int = sum(1 for entity in entities if entity["id"].value == remove_markers.marker_id)
+                    if markers > 0:
+                        marked_chunks[(int(region_x) * 32 + location.x, int(region_z) * 32 + location.z)] = markers
+
+    return marked_chunks
+
+
+def test_plan_forceloads_exactly_the_marked_chunks(tmp_path, monkeypatch, capsys):
+    world_folder: str = os.path.join(str(tmp_path), "world")
+    generate_world(world_folder=world_folder, options=WorldOptions(regions=2, chunks_per_region=64, marker_chance=0.3, seed=5))
+    marked_chunks: Dict[Tuple[int, int], int] = get_marked_chunks(world_folder=world_folder)
+    assert len(marked_chunks) > 8
+
+    # The Datapack Is Written Relative To The Working Directory
+    monkeypatch.chdir(str(tmp_path))
+    remove_markers_2.main_single_player(world_folder=world_folder, workers=2, chunk_budget=8)
+
+    plan_folder: str = os.path.join(str(tmp_path), remove_markers_2.datapack_plan_path)
+    forceloaded: List[Tuple[int, int]] = []
+    for name in os.listdir(plan_folder):
+        if not name.startswith("step_"):
+            continue
+
+        with open(os.path.join(plan_folder, name), mode="r") as f:
+            step: str = f.read()
+
+        step_chunks: List[Tuple[int, int]] = []
+        for match in re.finditer(r"execute in minecraft:overworld run forceload add (-?\d+) (-?\d+) (-?\d+) (-?\d+)", step):
+            x1, z1, x2, z2 = [int(value) >> 4 for value in match.groups()]
+            step_chunks.extend((x, z) for x in range(x1, x2 + 1) for z in range(z1, z2 + 1))
+
+        assert 0 < len(step_chunks) <= 8
+        forceloaded.extend(step_chunks)
+
+    # Every Marked Chunk Once, Nothing Else
+    assert sorted(forceloaded) == sorted(marked_chunks)
+    assert capsys.readouterr().out.count("Removing minecraft:marker With UUID [") == sum(marked_chunks.values())
+
+    # Only Reads The World
+    assert get_marked_chunks(world_folder=world_folder) == marked_chunks
+
+
+@pytest.mark.parametrize("split_entities", [True, False])
+def test_every_marker_is_removed(tmp_path, capsys, split_entities: bool):
+    world_folder: str = str(tmp_path)
+    generate_world(world_folder=world_folder, options=WorldOptions(regions=2, chunks_per_region=64, marker_chance=0.3, split_entities=split_entities, seed=6))
+    marked_chunks: Dict[Tuple[int, int], int] = get_marked_chunks(world_folder=world_folder)
+    assert len(marked_chunks) > 0
+
+    remove_markers.main_single_player(world_folder=world_folder, workers=2)
+    assert get_marked_chunks(world_folder=world_folder) == {}
+
+    # Printed Like remove_markers_2.py, Never As Raw NBT Tags
+    output: str = capsys.readouterr().out
+    assert "TAG_" not in output
+    assert output.count("Removing minecraft:marker With UUID [") == sum(marked_chunks.values())
+    assert output.count("minecraft:marker - (") == sum(marked_chunks.values())
+
+    rewritten: List[int] = [int(count) for count in re.findall(r"Rewrote (\d+) Chunks In ", output)]
+    assert sum(rewritten) == len(marked_chunks)
+
+
+def test_check_entities_collects_what_it_removes(tmp_path):
+    world_folder: str = str(tmp_path)
+    generate_world(world_folder=world_folder, options=WorldOptions(regions=1, chunks_per_region=64, marker_chance=0.5, seed=7))
+    region_path: str = get_region_files(folder=os.path.join(world_folder, "entities"))[0]
+
+    removed: Set[int] = set()
+    with MappedRegionFile(filename=region_path) as region:
+        for location in region.get_metadata():
+            chunk: nbt.nbt.NBTFile = nbt.nbt.NBTFile(buffer=BytesIO(region.get_blockdata(x=location.x, z=location.z)))
+            entities: int = len(chunk["Entities"])
+            records: List[Record] = []
+            was_modified, pre_format_change, modified_chunk = remove_markers.check_entities(chunk=chunk, dimension="world", records=records)
+
+            assert not pre_format_change
+            assert was_modified == (len(records) > 0)
+            assert len(modified_chunk["Entities"]) == entities - len(records)
+            assert all(entity["id"].value != remove_markers.marker_id for entity in modified_chunk["Entities"])
+            assert all(isinstance(record.uuid, list) and record.dimension == "world" for record in records)
+            removed.add(len(records))
+
+    assert 0 in removed and 1 in removed
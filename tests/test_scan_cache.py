@@ -0,0 +1,79 @@
+import os
+from typing import Dict, List, Tuple
+
+import pytest
+
+import scan_cache
+from benchmark import WorldOptions, generate_world
+from output_sinks import Record
+from region_reader import MappedRegionFile
+from region_writer import rewrite_region
+from scan_engine import get_region_tasks, iter_scan
+from scan_stats import ScanStats
+from scanner import ItemSearchVisitor
+
+ChunkRecords = Dict[Tuple[int, int], List[Record]]
+
+
+@pytest.fixture
+def world_folder(tmp_path) -> str:
+    folder: str = os.path.join(str(tmp_path), "world")
+    generate_world(world_folder=folder, options=WorldOptions(regions=1, chunks_per_region=16, block_entities=3.0, split_entities=False))
+    return folder
+
+
+def scan(world_folder: str, cache_path: str) -> Tuple[ChunkRecords, ScanStats]:
+    visitor: ItemSearchVisitor = ItemSearchVisitor()
+    stats: ScanStats = ScanStats(progress_stream=None)
+    records: ChunkRecords = {}
+    for region_result in iter_scan(region_tasks=get_region_tasks(world_folder=world_folder), visitors=[visitor], cache_path=cache_path, stats=stats):
+        for context, chunk_records in region_result.results[visitor.name]:
+            records[(context.x, context.z)] = chunk_records
+
+    return records, stats
+
+
+def test_unchanged_chunks_are_reused(world_folder: str):
+    cache_path: str = os.path.join(world_folder, scan_cache.default_cache_file_name)
+    first_records, first_stats = scan(world_folder=world_folder, cache_path=cache_path)
+    assert first_stats.cached_chunks == 0
+    assert len(first_records) > 0
+
+    second_records, second_stats = scan(world_folder=world_folder, cache_path=cache_path)
+    assert second_stats.cached_chunks == second_stats.chunks == 16
+    assert second_records == first_records
+
+
+def test_chunks_with_new_timestamps_are_decoded_again(world_folder: str):
+    cache_path: str = os.path.join(world_folder, scan_cache.default_cache_file_name)
+    first_records, _ = scan(world_folder=world_folder, cache_path=cache_path)
+
+    # Chunk (5, 0) Copied Over (3, 0), So Its Block Entities Show Up In Both
+    region_path: str = os.path.join(world_folder, "region", "r.0.0.mca")
+    with MappedRegionFile(filename=region_path) as region:
+        moved_chunk: bytes = region.get_blockdata(x=5, z=0)
+        timestamp: int = region.locations[(3, 0)].timestamp
+
+    rewrite_region(region_path=region_path, updated_chunks={(3, 0): moved_chunk}, timestamp=timestamp + 60)
+
+    second_records, second_stats = scan(world_folder=world_folder, cache_path=cache_path)
+    assert second_stats.cached_chunks == 15
+    assert second_records[(3, 0)] == first_records[(5, 0)]
+    assert {position: records for position, records in second_records.items() if position != (3, 0)} == \
+           {position: records for position, records in first_records.items() if position != (3, 0)}
+
+    # And The New Result Is What's Cached From Then On
+    third_records, third_stats = scan(world_folder=world_folder, cache_path=cache_path)
+    assert third_stats.cached_chunks == 16
+    assert third_records == second_records
+
+
+def test_cache_from_an_older_version_is_ignored(world_folder: str, monkeypatch):
+    cache_path: str = os.path.join(world_folder, scan_cache.default_cache_file_name)
+    with monkeypatch.context() as patch:
+        patch.setattr(scan_cache, "cache_version", scan_cache.cache_version - 1)
+        old_records, _ = scan(world_folder=world_folder, cache_path=cache_path)
+
+    records, stats = scan(world_folder=world_folder, cache_path=cache_path)
+    assert stats.cached_chunks == 0
+    assert records == old_records
@@ -0,0 +1,97 @@
+import json
+import os
+from typing import List
+
+from scan_checkpoint import ScanCheckpoint, get_default_checkpoint_path, open_checkpoint
+
+
+def make_regions(folder, count: int) -> List[str]:
+    region_paths: List[str] = []
+    for index in range(count):
+        region_path: str = os.path.join(str(folder), "r.%s.0.mca" % index)
+        with open(region_path, mode="wb") as f:
+            f.write(b"\0" * 8192)
+
+        region_paths.append(region_path)
+
+    return region_paths
+
+
+def save_regions(checkpoint_path: str, region_paths: List[str], count: int, scan_key: str = "key"):
+    checkpoint: ScanCheckpoint = ScanCheckpoint(checkpoint_path=checkpoint_path, message_stream=None)
+    checkpoint.start(scan_key=scan_key, region_paths=region_paths)
+    for index in range(count):
+        checkpoint.put_region(index=index, region_path=region_paths[index], result={"region": index})
+
+    checkpoint.finish(interrupted=True)
+
+
+def resume(checkpoint_path: str, region_paths: List[str], scan_key: str = "key") -> List[dict]:
+    checkpoint: ScanCheckpoint = ScanCheckpoint(checkpoint_path=checkpoint_path, resume=True, message_stream=None)
+    resumed: List[dict] = checkpoint.start(scan_key=scan_key, region_paths=region_paths)
+    checkpoint.finish(interrupted=True)
+    return resumed
+
+
+def test_only_opened_when_asked_for(tmp_path):
+    assert open_checkpoint(world_folder=str(tmp_path), name="scanner") is None
+    assert open_checkpoint(world_folder=str(tmp_path), name="scanner", checkpoint_path="").checkpoint_path == get_default_checkpoint_path(world_folder=str(tmp_path), name="scanner")
+    assert open_checkpoint(world_folder=str(tmp_path), name="scanner", resume=True).resume
+    assert open_checkpoint(world_folder=str(tmp_path), name="scanner", checkpoint_path="other.jsonl").checkpoint_path == "other.jsonl"
+
+
+def test_saved_regions_are_resumed(tmp_path):
+    region_paths: List[str] = make_regions(folder=tmp_path, count=3)
+    checkpoint_path: str = os.path.join(str(tmp_path), "checkpoint.jsonl")
+    save_regions(checkpoint_path=checkpoint_path, region_paths=region_paths, count=2)
+
+    # Every Line Is Plain JSON
+    with open(checkpoint_path, mode="r") as f:
+        assert [json.loads(line).get("index") for line in f] == [None, 0, 1]
+
+    assert resume(checkpoint_path=checkpoint_path, region_paths=region_paths) == [{"region": 0}, {"region": 1}]
+
+
+def test_cut_off_record_is_dropped(tmp_path):
+    region_paths: List[str] = make_regions(folder=tmp_path, count=3)
+    checkpoint_path: str = os.path.join(str(tmp_path), "checkpoint.jsonl")
+    save_regions(checkpoint_path=checkpoint_path, region_paths=region_paths, count=2)
+    size: int = os.path.getsize(checkpoint_path)
+    with open(checkpoint_path, mode="ab") as f:
+        f.write(b"{\"index\":2,\"size\"")
+
+    assert resume(checkpoint_path=checkpoint_path, region_paths=region_paths) == [{"region": 0}, {"region": 1}]
+    assert os.path.getsize(checkpoint_path) == size
+
+
+def test_changed_region_and_later_ones_are_scanned_again(tmp_path):
+    region_paths: List[str] = make_regions(folder=tmp_path, count=3)
+    checkpoint_path: str = os.path.join(str(tmp_path), "checkpoint.jsonl")
+    save_regions(checkpoint_path=checkpoint_path, region_paths=region_paths, count=3)
+    with open(region_paths[1], mode="ab") as f:
+        f.write(b"\0" * 4096)
+
+    assert resume(checkpoint_path=checkpoint_path, region_paths=region_paths) == [{"region": 0}]
+
+    # The File Only Keeps What Was Handed Back
+    with open(checkpoint_path, mode="r") as f:
+        assert len(f.readlines()) == 2
+
+
+def test_different_scan_starts_over(tmp_path):
+    region_paths: List[str] = make_regions(folder=tmp_path, count=2)
+    checkpoint_path: str = os.path.join(str(tmp_path), "checkpoint.jsonl")
+    save_regions(checkpoint_path=checkpoint_path, region_paths=region_paths, count=2)
+
+    assert resume(checkpoint_path=checkpoint_path, region_paths=region_paths, scan_key="other") == []
+
+
+def test_finished_scan_removes_the_checkpoint(tmp_path):
+    region_paths: List[str] = make_regions(folder=tmp_path, count=1)
+    checkpoint_path: str = os.path.join(str(tmp_path), "checkpoint.jsonl")
+    checkpoint: ScanCheckpoint = ScanCheckpoint(checkpoint_path=checkpoint_path, message_stream=None)
+    checkpoint.start(scan_key="key", region_paths=region_paths)
+    checkpoint.put_region(index=0, region_path=region_paths[0], result=None)
+    checkpoint.finish()
+
+    assert not os.path.exists(checkpoint_path)
@@ -0,0 +1,142 @@
+import os
+import subprocess
+import sys
+from typing import Dict, List, Optional
+
+import pytest
+from nbt.nbt import NBTFile, TAG_Compound, TAG_Int
+
+from benchmark import WorldOptions, generate_world, repository_folder
+from block_counter import BlockCountVisitor
+from scan_engine import RegionResult, RegionTask, entity_split_data_version, get_region_tasks, has_split_entities, iter_scan
+from scan_stats import ScanStats
+from scanner import ItemSearchVisitor
+
+
+@pytest.fixture(scope="module", params=[True, False], ids=["split_entities", "legacy"])
+def world_folder(request, tmp_path_factory) -> str:
+    # Small, But Still More Regions Than Workers And A Few Barriers, So Scans Stop Early Somewhere In The Middle
+    folder: str = str(tmp_path_factory.mktemp("world"))
+    generate_world(world_folder=folder, options=WorldOptions(regions=4, chunks_per_region=48, barrier_chance=0.01, split_entities=request.param))
+    return folder
+
+
+def run_script(script: str, world_folder: str, arguments: List[str], workers: int) -> subprocess.CompletedProcess:
+    command: List[str] = [sys.executable, os.path.join(repository_folder, "%s.py" % script), world_folder, "--workers", str(workers)] + arguments
+    return subprocess.run(command, cwd=world_folder, capture_output=True, text=True)
+
+
+@pytest.mark.parametrize("script, arguments", [
+    ("scanner", []),
+    ("barrier_scanner", []),
+    ("item_counter", ["--by-container"]),
+    ("block_counter", ["--per-chunk"]),
+    ("block_counter", ["--blocks", "minecraft:barrier", "--positions"]),
+])
+def test_workers_match_a_single_process(world_folder: str, script: str, arguments: List[str]):
+    serial: subprocess.CompletedProcess = run_script(script=script, world_folder=world_folder, arguments=arguments, workers=1)
+    assert serial.returncode == 0, serial.stderr
+    assert serial.stdout != ""
+
+    # Regions Are Scanned Largest First, But Handed Back In Task Order
+    for workers in [2, 3]:
+        parallel: subprocess.CompletedProcess = run_script(script=script, world_folder=world_folder, arguments=arguments, workers=workers)
+        assert (parallel.returncode, parallel.stdout, parallel.stderr) == (serial.returncode, serial.stdout, serial.stderr)
+
+
+def scan_barriers(world_folder: str, cache_path: Optional[str]) -> ScanStats:
+    visitor: BlockCountVisitor = BlockCountVisitor(block_ids=["minecraft:barrier"])
+    stats: ScanStats = ScanStats(progress_stream=None)
+    for _ in iter_scan(region_tasks=get_region_tasks(world_folder=world_folder), visitors=[visitor], cache_path=cache_path, stats=stats, use_index=True):
+        pass
+
+    return stats
+
+
+def test_chunks_ruled_out_by_the_index_are_cached(world_folder: str, tmp_path):
+    cache_path: str = os.path.join(str(tmp_path), "scan_cache.sqlite")
+
+    # Builds The Index, Then Most Chunks Are Ruled Out By It Without Being Read
+    scan_barriers(world_folder=world_folder, cache_path=None)
+    indexed: ScanStats = scan_barriers(world_folder=world_folder, cache_path=cache_path)
+    assert 0 < indexed.indexed_chunks < indexed.chunks
+
+    # Those Chunks Are Answered From The Cache Next Time, Same As The Ones That Were Read
+    cached: ScanStats = scan_barriers(world_folder=world_folder, cache_path=cache_path)
+    assert cached.chunks == indexed.chunks
+    assert cached.cached_chunks == cached.chunks
+    assert cached.indexed_chunks == 0
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_empty_region_files_are_skipped(tmp_path, workers: int):
+    world_folder: str = str(tmp_path)
+    generate_world(world_folder=world_folder, options=WorldOptions(regions=1, chunks_per_region=8, split_entities=False))
+
+    # Left Behind By Crashes And Pregeneration: 0 Bytes, Cut Off Inside The Header, And A Header Without Chunks
+    region_folder: str = os.path.join(world_folder, "region")
+    for region_file_name, size in [("r.5.5.mca", 0), ("r.6.6.mca", 100), ("r.7.7.mca", 8192)]:
+        with open(os.path.join(region_folder, region_file_name), mode="wb") as f:
+            f.write(b"\0" * size)
+
+    visitor: BlockCountVisitor = BlockCountVisitor()
+    stats: ScanStats = ScanStats(progress_stream=None)
+    region_results: List[RegionResult] = list(iter_scan(region_tasks=get_region_tasks(world_folder=world_folder), visitors=[visitor], workers=workers, stats=stats))
+
+    scanned: Dict[str, RegionResult] = {os.path.basename(region_result.task.region_path): region_result for region_result in region_results}
+    assert sorted(scanned) == ["r.0.0.mca", "r.5.5.mca", "r.6.6.mca", "r.7.7.mca"]
+    assert len(scanned["r.0.0.mca"].results[visitor.name]) == 8
+    for region_file_name in ["r.5.5.mca", "r.6.6.mca", "r.7.7.mca"]:
+        assert scanned[region_file_name].results[visitor.name] == []
+
+    assert (stats.regions_done, stats.chunks) == (4, 8)
+
+
+def write_level(world_folder: str, data_version: Optional[int]):
+    level: NBTFile = NBTFile()
+    data: TAG_Compound = TAG_Compound(name="Data")
+    if data_version is not None:
+        data.tags.append(TAG_Int(name="DataVersion", value=data_version))
+
+    level.tags.append(data)
+    level.write_file(filename=os.path.join(world_folder, "level.dat"))
+
+
+@pytest.mark.parametrize("data_version, entities_folder, split_entities", [
+    # level.dat Decides, Whether Or Not There's An entities Folder
+    (entity_split_data_version, False, True),
+    (entity_split_data_version, True, True),
+    (entity_split_data_version - 1, False, False),
+    (entity_split_data_version - 1, True, False),
+    # Without A DataVersion The entities Folder Decides
+    (None, True, True),
+    (None, False, False),
+])
+def test_data_version_picks_the_entity_layout(tmp_path, data_version: Optional[int], entities_folder: bool, split_entities: bool):
+    world_folder: str = str(tmp_path)
+    write_level(world_folder=world_folder, data_version=data_version)
+    os.makedirs(os.path.join(world_folder, "region"))
+    open(os.path.join(world_folder, "region", "r.0.0.mca"), mode="wb").close()
+    if entities_folder:
+        os.makedirs(os.path.join(world_folder, "entities"))
+        open(os.path.join(world_folder, "entities", "r.0.0.mca"), mode="wb").close()
+
+    assert has_split_entities(world_folder=world_folder) == split_entities
+
+    # Legacy Worlds Check Entities In The Terrain Chunks, Split Ones Leave Them Out And Skip Proto-Chunks Instead
+    region_tasks: List[RegionTask] = get_region_tasks(world_folder=world_folder)
+    assert all(task.split_entities == split_entities for task in region_tasks)
+    terrain_task: RegionTask = region_tasks[0]
+    visitor: ItemSearchVisitor = ItemSearchVisitor()
+    assert (("Level", "Entities") in visitor.get_paths(task=terrain_task)) != split_entities
+    assert visitor.full_chunks_only(task=terrain_task) == split_entities
+
+
+def test_unreadable_level_falls_back_to_the_entities_folder(tmp_path):
+    world_folder: str = str(tmp_path)
+    with open(os.path.join(world_folder, "level.dat"), mode="wb") as f:
+        f.write(b"not nbt")
+
+    assert not has_split_entities(world_folder=world_folder)
+    os.makedirs(os.path.join(world_folder, "entities"))
+    assert has_split_entities(world_folder=world_folder)
@@ -0,0 +1,126 @@
+import io
+import os
+import pstats
+import time
+from collections import Counter
+from typing import Dict, List, Tuple
+
+import pytest
+
+from benchmark import WorldOptions, generate_world
+from scan_engine import get_region_tasks, iter_scan
+from scan_profile import CProfileRegionProfiler, SamplingRegionProfiler, ScanProfiler, get_function_name, open_profiler
+from scanner import ItemSearchVisitor
+
+
+def check_alpha(count: int) -> int:
+    return sum(range(count))
+
+
+def check_beta(count: int) -> int:
+    return check_alpha(count=count) + 1
+
+
+def busy_work(seconds: float) -> int:
+    ended: float = time.perf_counter() + seconds
+    total: int = 0
+    while time.perf_counter() < ended:
+        total += 1
+
+    return total
+
+
+def check_busy(seconds: float) -> int:
+    return busy_work(seconds=seconds)
+
+
+def profile_region(calls: int) -> dict:
+    profiler: CProfileRegionProfiler = CProfileRegionProfiler()
+    profiler.start()
+    for _ in range(calls):
+        check_beta(count=100)
+
+    profiler.stop()
+    return profiler.get_data()
+
+
+def get_calls(stats: pstats.Stats) -> Dict[str, int]:
+    return {name: calls for (_, _, name), (_, calls, _, _, _) in stats.stats.items() if name.startswith("check_")}
+
+
+def test_cprofile_regions_are_merged(tmp_path):
+    output_path: str = os.path.join(str(tmp_path), "scan_profile.pstats")
+    summary: io.StringIO = io.StringIO()
+    profiler: ScanProfiler = ScanProfiler(mode="cprofile", output_path=output_path, summary_stream=summary)
+    profiler.add_region(data=profile_region(calls=2))
+    profiler.add_region(data=None)
+    profiler.add_region(data=profile_region(calls=3))
+    profiler.finish()
+
+    assert get_calls(stats=pstats.Stats(output_path)) == {"check_alpha": 5, "check_beta": 5}
+
+    # Every Check Function Gets A Line With Its Calls Across Every Region
+    check_lines: List[str] = summary.getvalue().split("Time Per Check Function:\n", 1)[1].splitlines()
+    assert sorted(get_function_name(label=line.split("Calls", 1)[1].strip()) for line in check_lines if "Calls" in line) == ["check_alpha", "check_beta"]
+    assert all(" 5 Calls" in line for line in check_lines if "Calls" in line)
+
+
+def test_samples_are_merged_and_tagged_with_the_innermost_check(tmp_path):
+    output_path: str = os.path.join(str(tmp_path), "scan_profile.folded")
+    summary: io.StringIO = io.StringIO()
+    profiler: ScanProfiler = ScanProfiler(mode="sample", output_path=output_path, summary_stream=summary)
+
+    scan: str = "scan_region (scan_engine.py:1)"
+    storages: str = "check_storages (scanner.py:10)"
+    items: str = "check_items (scanner.py:20)"
+    parse: str = "read_projected_nbt (projected_nbt.py:30)"
+    profiler.add_region(data=Counter({(scan, storages, items): 6, (scan, parse): 4}))
+    profiler.add_region(data=Counter({(scan, storages): 3, (scan, storages, items): 2}))
+    profiler.finish()
+
+    with open(output_path, mode="r") as f:
+        folded: Dict[str, int] = {line.rsplit(" ", 1)[0]: int(line.rsplit(" ", 1)[1]) for line in f.read().splitlines()}
+
+    assert folded == {";".join((scan, storages, items)): 8, ";".join((scan, parse)): 4, ";".join((scan, storages)): 3}
+
+    # Nested Checks Count Towards The Inner One Only, So The Check Samples Add Up To The Samples Under Any Check
+    check_section: str = summary.getvalue().split("Samples Per Check Function:\n", 1)[1]
+    checks: Dict[str, int] = {line.split("%", 1)[1].strip(): int(line.split()[0]) for line in check_section.splitlines() if "%" in line}
+    assert checks == {items: 8, storages: 3}
+    assert summary.getvalue().startswith("15 Samples\n")
+
+
+def test_sampler_sees_the_running_check():
+    profiler: SamplingRegionProfiler = SamplingRegionProfiler()
+    profiler.start()
+    check_busy(seconds=0.2)
+    profiler.stop()
+
+    stacks: Counter = profiler.get_data()
+    assert sum(count for stack, count in stacks.items() if any(get_function_name(label=label) == "check_busy" for label in stack)) > 0
+
+    # Cut Off At The Frame That Started The Profiler
+    assert all(get_function_name(label=stack[0]) == "test_sampler_sees_the_running_check" for stack in stacks)
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_worker_profiles_are_merged(tmp_path, workers: int):
+    world_folder: str = str(tmp_path)
+    generate_world(world_folder=world_folder, options=WorldOptions(regions=3, chunks_per_region=16, split_entities=False))
+
+    profiler: ScanProfiler = ScanProfiler(mode="cprofile", output_path=os.path.join(world_folder, "scan_profile.pstats"), summary_stream=None)
+    for _ in iter_scan(region_tasks=get_region_tasks(world_folder=world_folder), visitors=[ItemSearchVisitor()], workers=workers, profiler=profiler):
+        pass
+
+    profiler.finish()
+
+    # Each Region Was Profiled On Its Own, Wherever It Was Scanned
+    calls: Dict[Tuple[str, str], int] = {(os.path.basename(filename), name): calls for (filename, _, name), (_, calls, _, _, _) in pstats.Stats(profiler.output_path).stats.items()}
+    assert calls[("scan_engine.py", "scan_region")] == 3
+    assert calls[("scanner.py", "check_block_entities")] == 3 * 16
+
+
+def test_only_opened_when_asked_for():
+    assert open_profiler(profile_path=None) is None
+    assert open_profiler(profile_path="", mode="sample").output_path == "scan_profile.folded"
+    assert open_profiler(profile_path="out.pstats").output_path == "out.pstats"
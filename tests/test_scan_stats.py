@@ -0,0 +1,88 @@
+import io
+import json
+import os
+from typing import List
+
+import pytest
+
+from scan_stats import RegionStats, ScanStats, default_stats_file_name, open_stats, phases
+
+counters: List[str] = ["chunks", "cached_chunks", "indexed_chunks", "skipped_chunks", "compressed_bytes", "decompressed_bytes"]
+
+
+def make_region_stats(scale: int) -> RegionStats:
+    region_stats: RegionStats = RegionStats()
+    for index, counter in enumerate(counters):
+        setattr(region_stats, counter, (index + 1) * 10 * scale)
+
+    for index, phase in enumerate(phases):
+        region_stats.phases[phase] = 0.25 * (index + 1) * scale
+
+    return region_stats
+
+
+def test_adding_sums_every_counter_and_phase():
+    total: RegionStats = make_region_stats(scale=1)
+    total.add(other=make_region_stats(scale=2))
+    expected: RegionStats = make_region_stats(scale=3)
+
+    assert [getattr(total, counter) for counter in counters] == [getattr(expected, counter) for counter in counters]
+    assert total.phases == pytest.approx(expected.phases)
+
+
+def test_regions_without_stats_still_count_as_done():
+    stats: ScanStats = ScanStats(progress_stream=None)
+    stats.start(regions_total=3)
+    stats.add_region(region_stats=make_region_stats(scale=1))
+    stats.add_region(region_stats=None)
+
+    assert (stats.regions_done, stats.regions_total, stats.chunks) == (2, 3, 10)
+
+
+def test_report_fields():
+    stats: ScanStats = ScanStats(progress_stream=None)
+    stats.start(regions_total=4)
+    for scale in [1, 2]:
+        stats.add_region(region_stats=make_region_stats(scale=scale))
+
+    stats.add_output(seconds=1.0)
+    report: dict = json.loads(json.dumps(stats.get_report()))
+
+    assert set(report) == {"seconds", "regions", "regions_total", "regions_remaining", "chunks", "cached_chunks", "indexed_chunks", "skipped_chunks",
+                           "chunks_per_second", "compressed_bytes", "decompressed_bytes", "phases", "phase_fractions"}
+    assert (report["regions"], report["regions_total"], report["regions_remaining"]) == (2, 4, 2)
+    assert [report[counter] for counter in counters] == [(index + 1) * 30 for index in range(len(counters))]
+    assert report["chunks_per_second"] == pytest.approx(report["chunks"] / report["seconds"])
+
+    # Output Is Timed In The Parent And Added On Top Of What The Regions Brought Back
+    assert report["phases"]["output"] == pytest.approx(0.25 * len(phases) * 3 + 1.0)
+    assert sum(report["phase_fractions"].values()) == pytest.approx(1.0)
+    assert report["phase_fractions"]["region_io"] == pytest.approx(report["phases"]["region_io"] / sum(report["phases"].values()))
+
+
+def test_empty_report_has_no_fractions():
+    report: dict = ScanStats(progress_stream=None).get_report()
+    assert report["phase_fractions"] == dict.fromkeys(phases, 0.0)
+
+
+def test_finish_writes_the_report_and_a_final_progress_line(tmp_path):
+    report_path: str = os.path.join(str(tmp_path), "report.json")
+    progress: io.StringIO = io.StringIO()
+    stats: ScanStats = ScanStats(report_path=report_path, progress_stream=progress)
+    stats.start(regions_total=1)
+    stats.add_region(region_stats=make_region_stats(scale=1))
+    stats.finish()
+
+    with open(report_path, mode="r") as f:
+        assert json.load(f)["chunks"] == 10
+
+    # Progress Lines Overwrite Each Other, The Last One Ends The Line
+    assert progress.getvalue().startswith("\rRegions 1/1 - 10 Chunks")
+    assert progress.getvalue().endswith("\n")
+    assert "40 Not Fully Generated" in progress.getvalue()
+
+
+def test_only_opened_when_asked_for():
+    assert open_stats(stats_path=None) is None
+    assert open_stats(stats_path="").report_path == default_stats_file_name
+    assert open_stats(stats_path="other.json").report_path == "other.json"
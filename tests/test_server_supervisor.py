@@ -0,0 +1,143 @@
+import asyncio
+import os
+import socket
+import sys
+from typing import Awaitable, Callable, List, Optional
+
+import pytest
+
+from rcon_client import RconPool
+from server_supervisor import PerformanceSample, ServerSupervisor, parse_performance
+
+fake_server_path: str = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "fake_minecraft_server.py")
+password: str = "test"
+
+
+def get_free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def run_with_server(body: Callable[[ServerSupervisor, Optional[int]], Awaitable], arguments: Optional[List[str]] = None, rcon: bool = True):
+    # Starts fake_minecraft_server.py Under A Supervisor, Runs body And Stops The Server Again
+    rcon_port: Optional[int] = get_free_port() if rcon else None
+    command: List[str] = [sys.executable, fake_server_path, "--startup-seconds", "0.2"] + (arguments if arguments is not None else [])
+    if rcon_port is not None:
+        command += ["--rcon-port", str(rcon_port), "--rcon-password", password]
+
+    async def run():
+        supervisor: ServerSupervisor = ServerSupervisor(command=command)
+        await supervisor.start()
+        try:
+            await body(supervisor, rcon_port)
+        finally:
+            assert await supervisor.stop(timeout=10) == 0
+
+    asyncio.run(run())
+
+
+def test_ready_then_rcon_ready():
+    async def body(supervisor: ServerSupervisor, rcon_port: int):
+        await supervisor.wait_until_ready(timeout=10)
+        assert supervisor.startup_seconds == 0.2
+
+        await supervisor.wait_until_rcon_ready(timeout=10)
+        lines: List[str] = list(supervisor.recent_lines)
+        done_line: int = next(index for index, line in enumerate(lines) if "Done (" in line)
+        assert "RCON running on" in lines[done_line + 1]
+
+        async with RconPool(password=password, port=rcon_port) as pool:
+            assert await pool.command(command="save-all") == "Saved the game"
+
+    run_with_server(body=body)
+
+
+def test_exiting_before_ready_raises():
+    async def run():
+        supervisor: ServerSupervisor = ServerSupervisor(command=[sys.executable, "-c", "print('Starting')"])
+        await supervisor.start()
+        with pytest.raises(RuntimeError):
+            await supervisor.wait_until_ready(timeout=10)
+
+        await supervisor.stop()
+
+    asyncio.run(run())
+
+
+def test_missing_rcon_times_out():
+    async def body(supervisor: ServerSupervisor, rcon_port: None):
+        with pytest.raises(asyncio.TimeoutError):
+            await supervisor.wait_until_rcon_ready(timeout=0.5)
+
+    run_with_server(body=body, rcon=False)
+
+
+def test_save_waits_for_the_feedback_after_every_dimension():
+    async def body(supervisor: ServerSupervisor, rcon_port: int):
+        await supervisor.wait_until_rcon_ready(timeout=10)
+
+        save_count: int = supervisor.save_count
+        await supervisor.send_console(command="save-all flush")
+        await supervisor.wait_for_save(since=save_count, timeout=10)
+
+        # Lines Are Handled In Order, So Every Dimension's Line Was Seen Before The Save Counted
+        assert sum("All chunks are saved" in line for line in supervisor.recent_lines) == 3
+        assert supervisor.recent_lines[-1].endswith("Saved the game")
+        assert supervisor.save_count == save_count + 1
+
+        async with RconPool(password=password, port=rcon_port) as pool:
+            save_count: int = supervisor.save_count
+            await pool.command(command="save-all flush")
+            await supervisor.wait_for_save(since=save_count, timeout=10)
+
+        assert supervisor.recent_lines[-1].endswith("[Rcon: Saved the game]")
+        assert supervisor.save_count == save_count + 1
+
+    run_with_server(body=body)
+
+
+def test_debug_profiling_measures_tps():
+    async def body(supervisor: ServerSupervisor, rcon_port: int):
+        await supervisor.wait_until_rcon_ready(timeout=10)
+        async with RconPool(password=password, port=rcon_port) as pool:
+            sample: PerformanceSample = await supervisor.measure_performance(pool=pool, seconds=0.1)
+
+        assert (sample.tps, sample.mspt, sample.source) == (17.5, None, "debug")
+        assert supervisor.latest_sample() == sample
+        assert supervisor.is_falling_behind()
+
+    run_with_server(body=body, arguments=["--tps", "17.5"])
+
+
+def test_lag_warnings_mean_falling_behind():
+    async def body(supervisor: ServerSupervisor, rcon_port: None):
+        await supervisor.wait_until_ready(timeout=10)
+        assert not supervisor.is_falling_behind()
+
+        for _ in range(100):
+            if supervisor.lag_warnings > 0:
+                break
+
+            await asyncio.sleep(0.05)
+
+        assert supervisor.lag_warnings > 0
+        assert supervisor.is_falling_behind()
+
+    run_with_server(body=body, arguments=["--lag-every", "0.1"], rcon=False)
+
+
+@pytest.mark.parametrize("text, tps, mspt, source", [
+    ("Stopped debug profiling after 10.01 seconds and 200 ticks (19.98 ticks per second)", 19.98, None, "debug"),
+    ("Stopped debug profiling after 10,01 seconds and 200 ticks (19,98 ticks per second)", 19.98, None, "debug"),
+    ("§6TPS from last 1m, 5m, 15m: §a*20.0§r, §a19.5§r, §a19.9", 20.0, None, "tps"),
+    ("§6◴ §a5.1§7/§a2.3§7/§a18.4§7, §a6.0§7/§a2.3§7/§a21.7", None, 5.1, "mspt"),
+    ("Overall: Mean tick time: 12.345 ms. Mean TPS: 20.000", 20.0, 12.345, "forge"),
+])
+def test_performance_is_parsed(text: str, tps: Optional[float], mspt: Optional[float], source: str):
+    sample: PerformanceSample = parse_performance(text=text, timestamp=0.0)
+    assert sample == PerformanceSample(timestamp=0.0, tps=tps, mspt=mspt, source=source)
+
+
+def test_other_lines_are_not_performance():
+    assert parse_performance(text="[Server thread/INFO]: Saved the game") is None
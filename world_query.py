@@ -0,0 +1,144 @@
+import argparse
+import os
+import sys
+from typing import Dict, FrozenSet, List, Optional, Tuple
+
+import nbt
+
+from palette_index import ChunkSummary, get_chunk_summary, index_entity_paths, index_terrain_paths
+from projected_nbt import get_string_pattern
+from scan_checkpoint import ScanCheckpoint, open_checkpoint
+from scan_engine import ChunkContext, ChunkVisitor, ProjectionPath, RegionTask, get_region_tasks, iter_scan
+from scan_profile import ScanProfiler, default_top, open_profiler, profile_modes
+from scan_stats import ScanStats, default_stats_file_name, open_stats
+
+# Answers "Does This World Contain X" For Blocks, Block Entities And Entities From The Palette Index (See palette_index.py)
+# The First Run Builds The Index, After That Only Chunks Changed Since The Last Run Or Listed As A Match Are Read
+
+
+def get_id(value: str) -> str:
+    # Same As In Commands, No Namespace Means minecraft
+    return value if ":" in value else "minecraft:%s" % value
+
+
+class QueryVisitor(ChunkVisitor):
+    # Results Are The Sorted (Kind, ID) Pairs Each Chunk Contains
+    terrain_paths: List[ProjectionPath] = index_terrain_paths
+    entity_paths: List[ProjectionPath] = index_entity_paths
+
+    def __init__(self, blocks: List[str], block_entities: List[str], entities: List[str]):
+        self.blocks: FrozenSet[str] = frozenset(blocks)
+        self.block_entities: FrozenSet[str] = frozenset(block_entities)
+        self.entities: FrozenSet[str] = frozenset(entities)
+        self.name: str = "world_query"
+
+        # If None Of These Are Anywhere In The Decompressed Chunk, It Can't Contain Any Of Them
+        self.patterns: List[bytes] = [get_string_pattern(value=value) for value in sorted(self.blocks | self.block_entities | self.entities)]
+
+    def get_paths(self, task: RegionTask) -> List[ProjectionPath]:
+        # 1.17+ Entity Regions Are Only Opened For Entity Queries, And Terrain Regions Only Hold Entities Before 1.17
+        if task.entities:
+            return self.entity_paths if len(self.entities) > 0 else []
+
+        if len(self.blocks) > 0 or len(self.block_entities) > 0 or (len(self.entities) > 0 and not task.split_entities):
+            return self.terrain_paths
+
+        return []
+
+    def index_filter(self, summary: ChunkSummary) -> bool:
+        return summary.contains(blocks=self.blocks, block_entities=self.block_entities, entities=self.entities)
+
+    def prefilter(self, chunk_bytes: bytes) -> bool:
+        return any(pattern in chunk_bytes for pattern in self.patterns)
+
+    def empty_result(self, context: ChunkContext) -> Tuple[Tuple[str, str], ...]:
+        return ()
+
+    def visit(self, chunk: nbt.nbt.NBTFile, context: ChunkContext) -> Tuple[Tuple[str, str], ...]:
+        summary: ChunkSummary = get_chunk_summary(chunk=chunk)
+        matches: List[Tuple[str, str]] = [("Block", value) for value in summary.blocks & self.blocks]
+        matches.extend(("Block Entity", value) for value in summary.block_entities & self.block_entities)
+        matches.extend(("Entity", value) for value in summary.entities & self.entities)
+        return tuple(sorted(matches))
+
+    def is_empty(self, result: Tuple[Tuple[str, str], ...]) -> bool:
+        return len(result) == 0
+
+    def decode_result(self, value: List[list]) -> Tuple[Tuple[str, str], ...]:
+        return tuple((kind, match) for kind, match in value)
+
+
+def main_single_player(world_folder: str, blocks: List[str], block_entities: List[str], entities: List[str], list_chunks: bool = False, workers: int = 1,
+                       stats: Optional[ScanStats] = None, profiler: Optional[ScanProfiler] = None, checkpoint: Optional[ScanCheckpoint] = None):
+    visitor: QueryVisitor = QueryVisitor(blocks=blocks, block_entities=block_entities, entities=entities)
+
+    # (Kind, ID) -> Number Of Chunks Containing It
+    chunk_counts: Dict[Tuple[str, str], int] = {("Block", value): 0 for value in sorted(visitor.blocks)}
+    chunk_counts.update({("Block Entity", value): 0 for value in sorted(visitor.block_entities)})
+    chunk_counts.update({("Entity", value): 0 for value in sorted(visitor.entities)})
+
+    try:
+        for region_result in iter_scan(region_tasks=get_region_tasks(world_folder=world_folder), visitors=[visitor], workers=workers, stats=stats, profiler=profiler, checkpoint=checkpoint, use_index=True):
+            for context, matches in region_result.results[visitor.name]:
+                if list_chunks:
+                    print("Chunk (%s, %s) - %s - %s" % (*context.get_chunk_coordinates(), context.dimension, ", ".join(value for _, value in matches)))
+
+                for match in matches:
+                    chunk_counts[match] += 1
+
+        if list_chunks:
+            print("-" * 40)
+
+        for (kind, value), count in chunk_counts.items():
+            print("%s %s: %s" % (kind, value, "Found In %s Chunks" % count if count > 0 else "Not Found"))
+    except KeyboardInterrupt:
+        return 3
+
+
+if __name__ == "__main__":
+    parser: argparse.ArgumentParser = argparse.ArgumentParser(description="Checks If A World Contains Any Of The Given Blocks, Block Entities Or Entities")
+    parser.add_argument("world_folder", nargs="?", default=None, help="Path To The World Folder")
+    parser.add_argument("--workers", type=int, default=1, help="Number Of Processes To Scan Region Files With")
+    parser.add_argument("--stats", nargs="?", default=None, const="", help="Show Live Progress And Write Throughput And Phase Timings (Optionally Takes A Report File Path, Defaults To %s)" % default_stats_file_name)
+    parser.add_argument("--profile", nargs="?", default=None, const="", help="Profile The Scan Across Worker Processes (Optionally Takes An Output File Path, Defaults To scan_profile.pstats Or scan_profile.folded)")
+    parser.add_argument("--profile-mode", choices=profile_modes, default="cprofile", help="Deterministic cProfile Or Low Overhead Stack Sampling")
+    parser.add_argument("--profile-top", type=int, default=default_top, help="Number Of Functions To Show In The Profile Summary")
+    parser.add_argument("--checkpoint", nargs="?", default=None, const="", help="Save Finished Regions So An Interrupted Scan Can Be Resumed (Optionally Takes A File Path, Defaults To A File In The World Folder)")
+    parser.add_argument("--resume", action="store_true", help="Continue An Interrupted Scan After The Last Region It Finished (Implies --checkpoint)")
+    parser.add_argument("--blocks", nargs="+", default=[], help="Block IDs To Look For (E.g. minecraft:barrier minecraft:command_block)")
+    parser.add_argument("--block-entities", nargs="+", default=[], help="Block Entity IDs To Look For")
+    parser.add_argument("--entities", nargs="+", default=[], help="Entity IDs To Look For")
+    parser.add_argument("--chunks", action="store_true", help="List Every Chunk With A Match")
+    arguments: argparse.Namespace = parser.parse_args()
+
+    if arguments.world_folder is None:
+        print("No World Folder Specified!!!")
+        sys.exit(1)
+
+    world_folder_path: str = arguments.world_folder
+    if not os.path.exists(world_folder_path):
+        print("World Folder Does Not Exist!!!")
+        sys.exit(2)
+
+    if len(arguments.blocks) == 0 and len(arguments.block_entities) == 0 and len(arguments.entities) == 0:
+        print("Nothing To Look For, Give --blocks, --block-entities Or --entities!!!")
+        sys.exit(4)
+
+    scan_stats: Optional[ScanStats] = open_stats(stats_path=arguments.stats)
+    scan_profiler: Optional[ScanProfiler] = open_profiler(profile_path=arguments.profile, mode=arguments.profile_mode, top=arguments.profile_top)
+    scan_checkpoint: Optional[ScanCheckpoint] = open_checkpoint(world_folder=world_folder_path, name="world_query", checkpoint_path=arguments.checkpoint, resume=arguments.resume)
+    exit_code: Optional[int] = main_single_player(world_folder=world_folder_path, blocks=[get_id(value=value) for value in arguments.blocks],
+                                                  block_entities=[get_id(value=value) for value in arguments.block_entities],
+                                                  entities=[get_id(value=value) for value in arguments.entities], list_chunks=arguments.chunks,
+                                                  workers=arguments.workers, stats=scan_stats, profiler=scan_profiler, checkpoint=scan_checkpoint)
+    if scan_stats is not None:
+        scan_stats.finish()
+
+    if scan_profiler is not None:
+        scan_profiler.finish()
+
+    # Only Kept For --resume When The Scan Was Interrupted
+    if scan_checkpoint is not None:
+        scan_checkpoint.finish(interrupted=exit_code == 3)
+
+    sys.exit(exit_code)
@@ -0,0 +1,132 @@
+import argparse
+import os
+import sys
+from typing import List, Optional
+
+from barrier_scanner import BarrierVisitor
+from item_aggregator import ItemAggregate
+from item_counter import ItemCountVisitor
+from output_sinks import OutputSink, open_sink, output_formats
+from remove_markers import MarkerVisitor
+from scan_cache import get_default_cache_path
+from scan_checkpoint import ScanCheckpoint, open_checkpoint
+from scan_engine import ChunkVisitor, get_region_tasks, iter_scan
+from scan_profile import ScanProfiler, default_top, open_profiler, profile_modes
+from scan_stats import ScanStats, default_stats_file_name, open_stats
+from scanner import ItemSearchVisitor
+
+# Runs Any Combination Of The Scripts' Analyses While Decoding Each Chunk Only Once
+# Search And Marker Records Go Through The Output Sink, Barrier And Item Count Summaries Are Printed At The End
+
+
+def main_single_player(world_folder: str, search: bool = False, barriers: bool = False, count_items: bool = False, markers: bool = False,
+                       workers: int = 1, cache_path: Optional[str] = None, output_format: str = "text", output_path: Optional[str] = None,
+                       by_dimension: bool = False, by_container: bool = False, stats: Optional[ScanStats] = None, profiler: Optional[ScanProfiler] = None, checkpoint: Optional[ScanCheckpoint] = None):
+    visitors: List[ChunkVisitor] = []
+
+    search_visitor: ItemSearchVisitor = ItemSearchVisitor()
+    if search:
+        visitors.append(search_visitor)
+
+    barrier_visitor: BarrierVisitor = BarrierVisitor()
+    if barriers:
+        visitors.append(barrier_visitor)
+
+    item_count_visitor: ItemCountVisitor = ItemCountVisitor(by_dimension=by_dimension, by_container=by_container)
+    if count_items:
+        visitors.append(item_count_visitor)
+
+    marker_visitor: MarkerVisitor = MarkerVisitor(include_terrain=True)
+    if markers:
+        visitors.append(marker_visitor)
+
+    has_barriers: bool = False
+    item_totals: ItemAggregate = ItemAggregate(by_dimension=by_dimension, by_container=by_container)
+
+    sink: OutputSink = open_sink(output_format=output_format, output_path=output_path)
+    try:
+        for region_result in iter_scan(region_tasks=get_region_tasks(world_folder=world_folder), visitors=visitors, workers=workers, cache_path=cache_path, stats=stats, profiler=profiler, checkpoint=checkpoint):
+            for _, records in region_result.results.get(search_visitor.name, []):
+                sink.write_all(records=records)
+
+            for _, records in region_result.results.get(marker_visitor.name, []):
+                sink.write_all(records=records)
+
+            # Failure Messages Would Otherwise Be Mixed Into The Sink's Output
+            for _, (chunk_has_barriers, message) in region_result.results.get(barrier_visitor.name, []):
+                sys.stderr.write(message)
+                has_barriers: bool = has_barriers or chunk_has_barriers
+
+            for _, (_, chunk_item_totals) in region_result.results.get(item_count_visitor.name, []):
+                item_totals.merge(other=chunk_item_totals)
+    except KeyboardInterrupt:
+        return 3
+    finally:
+        sink.close()
+
+    if barriers:
+        print("Has Barrier Blocks: %s" % has_barriers)
+
+    if count_items:
+        print("-"*100)
+        print(item_totals.format_table())
+        item_totals.write_csv(csv_path=os.path.join(world_folder, "total_item_list.csv"))
+
+
+if __name__ == "__main__":
+    parser: argparse.ArgumentParser = argparse.ArgumentParser(description="Runs Several World Scans In A Single Pass")
+    parser.add_argument("world_folder", nargs="?", default=None, help="Path To The World Folder")
+    parser.add_argument("--search", action="store_true", help="Search For Stored Items And Entities (Same As scanner.py)")
+    parser.add_argument("--barriers", action="store_true", help="Check For Barrier Blocks (Same As barrier_scanner.py)")
+    parser.add_argument("--count-items", action="store_true", help="Count Every Stored Item (Same As item_counter.py)")
+    parser.add_argument("--markers", action="store_true", help="List Every Marker Entity")
+    parser.add_argument("--workers", type=int, default=1, help="Number Of Processes To Scan Region Files With")
+    parser.add_argument("--stats", nargs="?", default=None, const="", help="Show Live Progress And Write Throughput And Phase Timings (Optionally Takes A Report File Path, Defaults To %s)" % default_stats_file_name)
+    parser.add_argument("--profile", nargs="?", default=None, const="", help="Profile The Scan Across Worker Processes (Optionally Takes An Output File Path, Defaults To scan_profile.pstats Or scan_profile.folded)")
+    parser.add_argument("--profile-mode", choices=profile_modes, default="cprofile", help="Deterministic cProfile Or Low Overhead Stack Sampling")
+    parser.add_argument("--profile-top", type=int, default=default_top, help="Number Of Functions To Show In The Profile Summary")
+    parser.add_argument("--checkpoint", nargs="?", default=None, const="", help="Save Finished Regions So An Interrupted Scan Can Be Resumed (Optionally Takes A File Path, Defaults To A File In The World Folder)")
+    parser.add_argument("--resume", action="store_true", help="Continue An Interrupted Scan After The Last Region It Finished (Implies --checkpoint)")
+    parser.add_argument("--cache", nargs="?", default=None, const="", help="Reuse Results Of Chunks That Haven't Changed Since The Last Run (Optionally Takes A Cache File Path)")
+    parser.add_argument("--output-format", choices=output_formats, default="text", help="Format Of The Search And Marker Results")
+    parser.add_argument("--output", default=None, help="File To Write The Search And Marker Results To (Defaults To Standard Output)")
+    parser.add_argument("--by-dimension", action="store_true", help="Break Down Item Totals By Dimension")
+    parser.add_argument("--by-container", action="store_true", help="Break Down Item Totals By Container Type")
+    arguments: argparse.Namespace = parser.parse_args()
+
+    if arguments.world_folder is None:
+        print("No World Folder Specified!!!")
+        sys.exit(1)
+
+    world_folder_path: str = arguments.world_folder
+    if not os.path.exists(world_folder_path):
+        print("World Folder Does Not Exist!!!")
+        sys.exit(2)
+
+    if not (arguments.search or arguments.barriers or arguments.count_items or arguments.markers):
+        print("No Scans Specified!!! (Use --search, --barriers, --count-items And/Or --markers)")
+        sys.exit(4)
+
+    # Defaults To A Cache File Inside The World Folder
+    scan_cache_path: Optional[str] = arguments.cache
+    if scan_cache_path == "":
+        scan_cache_path: str = get_default_cache_path(world_folder=world_folder_path)
+
+    scan_stats: Optional[ScanStats] = open_stats(stats_path=arguments.stats)
+    scan_profiler: Optional[ScanProfiler] = open_profiler(profile_path=arguments.profile, mode=arguments.profile_mode, top=arguments.profile_top)
+    scan_checkpoint: Optional[ScanCheckpoint] = open_checkpoint(world_folder=world_folder_path, name="world_scanner", checkpoint_path=arguments.checkpoint, resume=arguments.resume)
+    exit_code: Optional[int] = main_single_player(world_folder=world_folder_path, search=arguments.search, barriers=arguments.barriers,
+                                                  count_items=arguments.count_items, markers=arguments.markers, workers=arguments.workers,
+                                                  cache_path=scan_cache_path, output_format=arguments.output_format, output_path=arguments.output,
+                                                  by_dimension=arguments.by_dimension, by_container=arguments.by_container, stats=scan_stats, profiler=scan_profiler, checkpoint=scan_checkpoint)
+    if scan_stats is not None:
+        scan_stats.finish()
+
+    if scan_profiler is not None:
+        scan_profiler.finish()
+
+    # Only Kept For --resume When The Scan Was Interrupted
+    if scan_checkpoint is not None:
+        scan_checkpoint.finish(interrupted=exit_code == 3)
+
+    sys.exit(exit_code)